@@ -0,0 +1,232 @@
+"""マッピング処理のベンチマークを実行するモジュールです。
+
+合成したGRDMのデータを用いて、マッピング処理の各フェーズの実行時間とピークメモリを計測します。
+結果をJSONファイルに保存し、別のコミットで保存した結果と比較できます。
+
+    python -m benchmarks.bench_mapping --output bench.json
+    python -m benchmarks.bench_mapping --compare bench.json
+"""
+
+import argparse
+import copy
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from dg_mm import __version__
+from dg_mm.fake_grdm import make_file_metadata, make_member_info, make_project_info, make_project_metadata
+from dg_mm.models.grdm import GrdmMapping
+from dg_mm.models.mapping_definition import DefinitionManager
+
+SCHEMA = "RF"
+STORAGE = "GRDM"
+DEFAULT_SCALES = [10, 1000, 10000, 100000]
+FILTER_PROPERTIES = ["researcher", "funding", "projectItem", "name", "description"]
+PHASES = ["definition_load", "filter", "extraction", "unmapped_fill", "serialization"]
+
+
+def make_source_data(scale: int, project_id: str = "p0001") -> dict:
+    """指定した件数のリストを持つ合成データを作成する関数です。
+
+    Args:
+        scale (int): メンバー、プロジェクトメタデータ、ファイルの件数
+        project_id (str, optional): プロジェクトID。デフォルトはp0001
+
+    Returns:
+        dict: データ取得先ごとのストレージのデータ
+    """
+    return {
+        "project_info": make_project_info(project_id),
+        "member_info": make_member_info(project_id, scale),
+        "project_metadata": make_project_metadata(project_id, scale),
+        "file_metadata": make_file_metadata(project_id, scale),
+    }
+
+
+def make_phases(scale: int) -> dict:
+    """各フェーズの処理を作成する関数です。
+
+    各フェーズは(準備処理, 計測する処理)の組で、準備処理の戻り値が計測する処理の引数になります。
+
+    Args:
+        scale (int): リストの件数
+
+    Returns:
+        dict: フェーズ名と処理の組
+    """
+    mapping = GrdmMapping()
+    definition = DefinitionManager._read_mapping_definition(SCHEMA, STORAGE)
+    source_data = make_source_data(scale)
+    extracted = mapping._extract_metadata(definition, source_data)
+    result = mapping._fill_unmapped_properties(copy.deepcopy(extracted), definition, source_data)
+
+    return {
+        "definition_load": (
+            lambda: None,
+            lambda _: DefinitionManager._read_mapping_definition(SCHEMA, STORAGE)),
+        "filter": (
+            lambda: None,
+            lambda _: DefinitionManager.filter_mapping_definition(definition, FILTER_PROPERTIES)),
+        "extraction": (
+            lambda: None,
+            lambda _: mapping._extract_metadata(definition, source_data)),
+        "unmapped_fill": (
+            lambda: copy.deepcopy(extracted),
+            lambda schema: mapping._fill_unmapped_properties(schema, definition, source_data)),
+        "serialization": (
+            lambda: None,
+            lambda _: json.dumps(result, indent=4, ensure_ascii=False)),
+    }
+
+
+def measure(setup: Callable, func: Callable, repeat: int) -> dict:
+    """処理の実行時間とピークメモリを計測する関数です。
+
+    実行時間はtracemallocを無効にした状態で計測し、ピークメモリは別途1回実行して計測します。
+
+    Args:
+        setup (Callable): 準備処理。計測には含めない
+        func (Callable): 計測する処理
+        repeat (int): 実行時間を計測する回数
+
+    Returns:
+        dict: 実行時間の中央値と最小値(秒)、ピークメモリ(バイト)
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+
+    arg = setup()
+    tracemalloc.start()
+    try:
+        func(arg)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {"median": statistics.median(times), "min": min(times), "peak_bytes": peak}
+
+
+def run(scales: list, repeat: int, phases: list = None) -> dict:
+    """ベンチマークを実行する関数です。
+
+    Args:
+        scales (list): リストの件数の一覧
+        repeat (int): 実行時間を計測する回数
+        phases (list, optional): 計測するフェーズの一覧。デフォルトはすべてのフェーズ
+
+    Returns:
+        dict: 実行環境の情報と計測結果
+    """
+    results = {}
+    for scale in scales:
+        scale_phases = make_phases(scale)
+        results[str(scale)] = {}
+        for phase in phases or PHASES:
+            setup, func = scale_phases[phase]
+            results[str(scale)][phase] = measure(setup, func, repeat)
+            print(f"{scale:>8} {phase:<16} {format_result(results[str(scale)][phase])}", file=sys.stderr)
+
+    return {"meta": get_meta(repeat), "results": results}
+
+
+def get_meta(repeat: int) -> dict:
+    """実行環境の情報を取得する関数です。
+
+    Args:
+        repeat (int): 実行時間を計測した回数
+
+    Returns:
+        dict: 実行環境の情報
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "version": __version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+    }
+
+
+def format_result(result: dict) -> str:
+    """計測結果を表示用の文字列に変換する関数です。
+
+    Args:
+        result (dict): 計測結果
+
+    Returns:
+        str: 表示用の文字列
+    """
+    return f"median={result['median'] * 1000:10.3f}ms min={result['min'] * 1000:10.3f}ms peak={result['peak_bytes'] / 1024:10.1f}KiB"
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """2つの計測結果を比較する関数です。
+
+    Args:
+        baseline (dict): 比較元の計測結果
+        current (dict): 比較先の計測結果
+        threshold (float): 劣化とみなす比率
+
+    Returns:
+        list: 劣化したフェーズの一覧(リストの件数とフェーズ名の組)
+    """
+    regressions = []
+    print(f"{'scale':>8} {'phase':<16} {'baseline':>12} {'current':>12} {'ratio':>7} {'peak ratio':>10}")
+    for scale, phases in current["results"].items():
+        for phase, result in phases.items():
+            base = baseline["results"].get(scale, {}).get(phase)
+            if base is None:
+                continue
+            ratio = result["median"] / base["median"] if base["median"] else float('inf')
+            peak_ratio = result["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] else float('inf')
+            mark = ""
+            if ratio > threshold or peak_ratio > threshold:
+                regressions.append((scale, phase))
+                mark = " !"
+            print(f"{scale:>8} {phase:<16} {base['median'] * 1000:10.3f}ms {result['median'] * 1000:10.3f}ms"
+                  f" {ratio:7.2f} {peak_ratio:10.2f}{mark}")
+    return regressions
+
+
+def main():
+    """ベンチマークを実行するエントリーポイント"""
+    parser = argparse.ArgumentParser(description='マッピング処理のベンチマークを実行する。')
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help='リストの件数。複数指定可能。')
+    parser.add_argument('--phases', nargs='+', choices=PHASES, help='計測するフェーズ。指定しない場合はすべてのフェーズ。')
+    parser.add_argument('--repeat', type=int, default=5, help='実行時間を計測する回数。')
+    parser.add_argument('--output', help='計測結果の出力先(JSON)。')
+    parser.add_argument('--compare', help='比較元の計測結果(JSON)。')
+    parser.add_argument('--threshold', type=float, default=1.2, help='劣化とみなす比率。')
+    args = parser.parse_args()
+
+    current = run(args.scales, args.repeat, args.phases)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=4)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""pytest-benchmarkでマッピング処理のベンチマークを実行するためのモジュールです。
+
+    pytest benchmarks --benchmark-only
+    DG_MM_BENCH_SCALES=10,100000 pytest benchmarks --benchmark-only --benchmark-autosave
+
+"""
+import os
+
+import pytest
+
+from benchmarks.bench_mapping import PHASES, make_phases
+
+pytest.importorskip("pytest_benchmark")
+
+SCALES = [int(scale) for scale in os.environ.get("DG_MM_BENCH_SCALES", "10,1000,10000").split(",")]
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=lambda scale: f"scale={scale}")
+def phases(request):
+    """リストの件数ごとに各フェーズの処理を作成します。"""
+    return make_phases(request.param)
+
+
+@pytest.mark.parametrize("phase", PHASES)
+def test_mapping_phase(benchmark, phases, phase):
+    """各フェーズの実行時間を計測します。"""
+    setup, func = phases[phase]
+    benchmark.pedantic(func, setup=lambda: ((setup(),), {}), rounds=5)
@@ -1,11 +1,28 @@
 import argparse
+import contextlib
 import json
 import os
+import signal
 import sys
+import threading
+import time
 import traceback
 
+from dg_mm.instrumentation import TimingRecorder, span, use_span_hooks
+from dg_mm.models.batch_export import BatchExporter, ExportState, read_project_ids
+from dg_mm.models.definition_artifact import DefinitionArtifact
+from dg_mm.models.definition_compiler import DefinitionCompiler
+from dg_mm.models.json_patch import JsonPatch
+from dg_mm.models.mapping_definition import DefinitionManager
 from dg_mm.models.metadata_manager import MetadataManager
-from dg_mm.errors import MetadatamanagerError, DataFormatError
+from dg_mm.models.result_cache import MEMORY, create_result_cache
+from dg_mm.models.source_archive import SourceArchive
+from dg_mm.models.storage_registry import StorageRegistry
+from dg_mm.compression import COMPRESSION_NAMES, check_options, compressed_writer
+from dg_mm.errors import MetadatamanagerError, DataFormatError, MappingDefinitionError
+from dg_mm.output_format import FORMAT_NAMES, JsonFormat, get_format
+
+EXPORT_STATE_FILE = ".export_state.json"
 
 
 def main():
@@ -14,8 +31,8 @@ def main():
     subparser = parser.add_subparsers()
 
     parser_get = subparser.add_parser('get', help='GRDMを含む研究データ管理サービスからメタデータを収集し、指定したスキーマの形式で取得する。')
-    parser_get.add_argument('--schema', required=True,
-                            help='スキーマの名称を指定する。')
+    parser_get.add_argument('--schema', required=True, action='append',
+                            help='スキーマの名称を指定する。複数回指定した場合は、ストレージからのデータ取得を1回にまとめ、スキーマの名称をキーとしたオブジェクトを出力する。')
     parser_get.add_argument('--storage', required=True,
                             help='ストレージの名称を指定する。')
     parser_get.add_argument('--token',
@@ -30,10 +47,116 @@ def main():
                             help='ファイル出力先。通常は標準出力に出力されるメタデータをファイルに出力したい場合に使用する。既にファイルが存在する場合、上書きせずにエラーになる。')
     parser_get.add_argument('--project-metadata-id', dest='project_metadata_id',
                             help='GRDMのプロジェクトメタデータを指定する。指定しない場合は作成日が一番新しいプロジェクトメタデータを取得する。')
+    parser_get.add_argument('--deadline', type=float,
+                            help='ストレージへのリクエスト全体の制限時間(秒)。超えた場合はエラーになる。0以下を指定した場合は無制限。指定しない場合はストレージの設定ファイルの値を使用する。')
+    parser_get.add_argument('--timings', action='store_true',
+                            help='認証、データ取得先ごとの取得、マッピング、出力などの処理時間の内訳を標準エラー出力に出力する。')
+    parser_get.add_argument('--metrics-file', dest='metrics_file',
+                            help='GRDMへのリクエスト数やエラー数などのメトリクスをPrometheusのテキスト形式で出力するファイルを指定する。')
+    parser_get.add_argument('--profile',
+                            help='処理をプロファイリングし、指定したパスにpstats形式の結果を、パスに.foldedを付けたファイルにflamegraph用のcollapsed stack形式の結果を出力する。')
+    source_group = parser_get.add_mutually_exclusive_group()
+    source_group.add_argument('--source-dir', dest='source_dir',
+                              help='ストレージにアクセスせずに、保存済みのデータからメタデータを作成する。データ取得先ごとのjsonファイル(project_info.jsonなど)を置いたフォルダ、またはそれらを1つにまとめたjsonファイルのパスを指定する。')
+    source_group.add_argument('--save-sources', dest='save_sources',
+                              help='ストレージから取得したデータを、--source-dirで読み込める形式で指定したフォルダに保存する。')
+    parser_get.add_argument('--socket',
+                            help='常駐サーバー(serve)のUnixドメインソケットのパス。指定しない場合は環境変数DG_MM_SOCKETの値を使用する。'
+                            '常駐サーバーが起動している場合は処理を依頼し、起動していない場合はこのプロセスで処理する。')
+    parser_get.add_argument('--no-daemon', dest='no_daemon', action='store_true',
+                            help='常駐サーバーに処理を依頼せず、このプロセスで処理する。')
+    parser_get.add_argument('--format', choices=FORMAT_NAMES, default=JsonFormat.name,
+                            help='出力形式。json(インデント付き)、jsonl(1行のJSON)、msgpack(MessagePack)、cbor(CBOR)から指定する。デフォルトはjson')
+    parser_get.add_argument('--compress', choices=COMPRESSION_NAMES,
+                            help='出力を圧縮する方式。zstdを使用するにはzstandardのインストールが必要です。指定しない場合は圧縮しない。')
+    parser_get.add_argument('--compress-level', dest='compress_level', type=int,
+                            help='圧縮レベル。gzipは1から9、xzは0から9、zstdは1から22で指定する。指定しない場合は圧縮方式ごとの既定値')
+    parser_get.add_argument('--diff',
+                            help='前回取得したメタデータのファイルを指定し、メタデータの代わりにそこからの差分をJSON Patch(RFC 6902)の形式で出力する。')
+    parser_get.add_argument('--result-cache', dest='result_cache',
+                            help='マッピングの結果を再利用するキャッシュのフォルダ。ストレージのデータとマッピング定義が前回と同じ場合はマッピングを省略する。')
+    parser_get.add_argument('--result-cache-max-bytes', dest='result_cache_max_bytes', type=int,
+                            help='キャッシュに保持する結果の合計の大きさの上限(バイト)。デフォルトは256MiB')
+    parser_get.add_argument('--mapping-path', dest='mapping_path', action='append',
+                            help='マッピング定義ファイル({ストレージの名称}_{スキーマの名称}_mapping.json)を探すフォルダ。複数回指定した場合は指定した順に探し、環境変数DG_MM_MAPPING_PATHのフォルダとパッケージ内のフォルダより先に探す。')
     parser_get.set_defaults(func=get_metadata)
 
+    parser_export = subparser.add_parser('export', help='複数のプロジェクトのメタデータを、前回の出力からストレージのデータが変わったものだけ出力する。')
+    parser_export.add_argument('--schema', required=True, action='append',
+                               help='スキーマの名称を指定する。複数回指定可能。')
+    parser_export.add_argument('--storage', required=True,
+                               help='ストレージの名称を指定する。')
+    parser_export.add_argument('--token',
+                               help='ストレージ認証に使用するトークンを指定する。storageにGRDMを指定した場合に必要です。')
+    parser_export.add_argument('--ids', required=True,
+                               help='プロジェクトIDの一覧のファイル。1行に1つのIDを記載する。空行と#で始まる行は無視する。')
+    parser_export.add_argument('--output-dir', dest='output_dir', required=True,
+                               help='出力先のフォルダ。メタデータは「フォルダ/スキーマの名称/プロジェクトID.json」に出力する。')
+    parser_export.add_argument('--state',
+                               help=f'プロジェクトとスキーマごとのフィンガープリントを記録する状態ファイル。デフォルトは出力先のフォルダの{EXPORT_STATE_FILE}')
+    parser_export.add_argument('--filter', nargs='*',
+                               help='スキーマの一部を指定したい場合に使用する。スキーマのプロパティを、ルートから「.」でつなげた形式で指定する。複数指定可能。')
+    parser_export.add_argument('--filter-file', dest='filter_file',
+                               help='スキーマの一部をファイルを用いて指定したい場合に使用する。filterと同時に指定した場合はこちらを優先する。')
+    parser_export.add_argument('--full', action='store_true',
+                               help='ストレージのデータが変わっていないプロジェクトも含めてすべて出力する。')
+    parser_export.add_argument('--format', choices=FORMAT_NAMES, default=JsonFormat.name,
+                               help='メタデータと差分の出力形式。json、jsonl、msgpack、cborから指定する。ファイルの拡張子は出力形式の名称になる。デフォルトはjson')
+    parser_export.add_argument('--compress', choices=COMPRESSION_NAMES,
+                               help='メタデータと差分を圧縮する方式。ファイルの拡張子に.gz、.xz、.zstを付ける。指定しない場合は圧縮しない。')
+    parser_export.add_argument('--compress-level', dest='compress_level', type=int,
+                               help='圧縮レベル。gzipは1から9、xzは0から9、zstdは1から22で指定する。指定しない場合は圧縮方式ごとの既定値')
+    parser_export.add_argument('--patch-dir', dest='patch_dir',
+                               help='前回の出力からの差分をJSON Patch(RFC 6902)の形式で出力するフォルダ。差分は「フォルダ/スキーマの名称/プロジェクトID.json」に出力する。')
+    parser_export.add_argument('--result-cache', dest='result_cache',
+                               help='マッピングの結果を再利用するキャッシュのフォルダ。ストレージのデータとマッピング定義が前回と同じ場合はマッピングを省略する。')
+    parser_export.add_argument('--result-cache-max-bytes', dest='result_cache_max_bytes', type=int,
+                               help='キャッシュに保持する結果の合計の大きさの上限(バイト)。デフォルトは256MiB')
+    parser_export.add_argument('--mapping-path', dest='mapping_path', action='append',
+                               help='マッピング定義ファイル({ストレージの名称}_{スキーマの名称}_mapping.json)を探すフォルダ。複数回指定した場合は指定した順に探し、環境変数DG_MM_MAPPING_PATHのフォルダとパッケージ内のフォルダより先に探す。')
+    parser_export.set_defaults(func=export_metadata)
+
+    parser_serve = subparser.add_parser('serve', help='メタデータ取得を受け付けるサーバーを起動する。接続、設定、マッピング定義をリクエストの間で再利用する。')
+    parser_serve.add_argument('--host', default='127.0.0.1',
+                              help='待ち受けるホスト。デフォルトは127.0.0.1')
+    parser_serve.add_argument('--port', type=int, default=8080,
+                              help='待ち受けるポート。デフォルトは8080')
+    parser_serve.add_argument('--socket',
+                              help='TCPポートの代わりに待ち受けるUnixドメインソケットのパス。指定しない場合は環境変数DG_MM_SOCKETの値を使用する。')
+    parser_serve.add_argument('--workers', type=int, default=4,
+                              help='同時に処理するメタデータ取得の数の上限。デフォルトは4')
+    parser_serve.add_argument('--queue-timeout', dest='queue_timeout', type=float, default=10.0,
+                              help='処理の順番を待つ時間の上限(秒)。超えた場合は503を返す。デフォルトは10')
+    parser_serve.add_argument('--drain-timeout', dest='drain_timeout', type=float, default=30.0,
+                              help='停止時に処理中のリクエストの終了を待つ時間の上限(秒)。デフォルトは30')
+    parser_serve.add_argument('--response-cache-ttl', dest='response_cache_ttl', type=float, default=0,
+                              help='GRDMの成功レスポンスを再利用する時間(秒)。指定しない場合は再利用しない。')
+    parser_serve.add_argument('--response-cache-size', dest='response_cache_size', type=int, default=256,
+                              help='再利用のために保持するレスポンスの数の上限。デフォルトは256')
+    parser_serve.add_argument('--result-cache', dest='result_cache',
+                              help=f'マッピングの結果を再利用するキャッシュ。{MEMORY}を指定した場合はプロセス内に、それ以外はフォルダとして保持する。指定しない場合は再利用しない。')
+    parser_serve.add_argument('--result-cache-max-bytes', dest='result_cache_max_bytes', type=int,
+                              help='キャッシュに保持する結果の合計の大きさの上限(バイト)。デフォルトはプロセス内の場合は64MiB、フォルダの場合は256MiB')
+    parser_serve.add_argument('--mapping-path', dest='mapping_path', action='append',
+                              help='マッピング定義ファイル({ストレージの名称}_{スキーマの名称}_mapping.json)を探すフォルダ。複数回指定した場合は指定した順に探し、環境変数DG_MM_MAPPING_PATHのフォルダとパッケージ内のフォルダより先に探す。')
+    parser_serve.set_defaults(func=serve)
+
+    parser_validate = subparser.add_parser('validate-definition', help='マッピング定義ファイルの誤りを、マッピングを行わずにすべて確認する。')
+    parser_validate.add_argument('file',
+                                 help='確認するマッピング定義ファイルのパス')
+    parser_validate.add_argument('--storage',
+                                 help='ストレージの名称を指定する。指定した場合は、sourceがそのストレージのデータ取得先かも確認する。')
+    parser_validate.set_defaults(func=validate_definition)
+
+    parser_build = subparser.add_parser('build-definitions', help='マッピング定義ファイルを探すフォルダのマッピング定義ファイルを検証し、起動時に1回の読み込みで使用できる形式で保存する。')
+    parser_build.add_argument('--mapping-path', dest='mapping_path', action='append',
+                              help='パッケージ内のフォルダに加えて、マッピング定義ファイルを探すフォルダ。複数回指定可能。')
+    parser_build.set_defaults(func=build_definitions)
+
     try:
         args = parser.parse_args()
+        if getattr(args, 'mapping_path', None):
+            DefinitionManager.configure_search_path(args.mapping_path)
         if hasattr(args, 'func'):
             args.func(args)
         else:
@@ -60,14 +183,9 @@ def get_metadata(args: argparse.Namespace):
     Args:
         args (argparse.Namespace): コマンドライン引数
     """
-    if args.filter_file is not None:
-        if not os.path.exists(args.filter_file):
-            raise FileNotFoundError(f"ファイルが見つかりません: '{args.filter_file}'")
-        try:
-            with open(args.filter_file, 'r') as f:
-                args.filter = json.load(f)
-        except json.JSONDecodeError:
-            raise DataFormatError("フィルタファイルのフォーマットに誤りがあります。")
+    load_filter_file(args)
+    check_options(args.compress, args.compress_level)
+    previous = load_previous_metadata(args.diff) if args.diff is not None else None
 
     if args.file is not None:
         # 存在しないフォルダの場合エラーにする
@@ -79,22 +197,326 @@ def get_metadata(args: argparse.Namespace):
         if os.path.exists(args.file):
             raise FileExistsError(f"The file '{args.file}' already exists")
 
+    # --schemaを複数回指定した場合はスキーマごとの結果をまとめて出力する
+    schemas = list(dict.fromkeys(args.schema))
     params = {
-        'schema': args.schema,
         'storage': args.storage,
         'token': args.token,
         'id': args.id,
         'filter_properties': args.filter,
         'project_metadata_id': args.project_metadata_id
     }
+    if args.deadline is not None:
+        params['deadline'] = args.deadline
+    if forward_to_daemon(args, schemas, params):
+        return
+
+    result_cache = configure_result_cache(args)
     mm = MetadataManager()
-    result = mm.get_metadata(**params)
+    recorder = TimingRecorder() if args.timings else None
+    hooks = [recorder] if recorder is not None else []
+    for hook in hooks:
+        mm.add_span_hook(hook)
+    start = time.perf_counter()
+    if args.profile:
+        # プロファイリングを行わない場合に不要なモジュールを読み込まないよう、ここで読み込む
+        from dg_mm.profiling import profile
+    try:
+        with profile(args.profile) if args.profile else contextlib.nullcontext():
+            result = collect_metadata(mm, schemas, params, args.source_dir, args.save_sources)
+            if args.diff is not None:
+                with use_span_hooks(hooks), span("diff"):
+                    result = JsonPatch.diff(previous, result)
+
+            with use_span_hooks(hooks), span("output"):
+                write_result(result, args.file, args.format, args.compress, args.compress_level)
+    finally:
+        if recorder is not None:
+            print_timings(recorder, time.perf_counter() - start)
+            if result_cache is not None:
+                print_result_cache_stats(result_cache)
+        if args.metrics_file is not None:
+            MetadataManager.export_metrics(args.metrics_file)
+
+
+def load_filter_file(args: argparse.Namespace):
+    """フィルタファイルが指定されている場合に、その内容をargs.filterに設定するメソッドです。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+    """
+    if args.filter_file is not None:
+        if not os.path.exists(args.filter_file):
+            raise FileNotFoundError(f"ファイルが見つかりません: '{args.filter_file}'")
+        try:
+            with open(args.filter_file, 'r') as f:
+                args.filter = json.load(f)
+        except json.JSONDecodeError:
+            raise DataFormatError("フィルタファイルのフォーマットに誤りがあります。")
+
+
+def load_previous_metadata(path: str):
+    """差分の比較元となる前回のメタデータのファイルを読み込むメソッドです。
+
+    Args:
+        path (str): ファイルのパス
+
+    Returns:
+        Any: 前回のメタデータ
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"ファイルが見つかりません: '{path}'")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        raise DataFormatError("前回のメタデータのファイルのフォーマットに誤りがあります。")
+
+
+def export_metadata(args: argparse.Namespace):
+    """複数のプロジェクトのメタデータを、前回から変更があったものだけ出力するメソッドです。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+    """
+    load_filter_file(args)
+    check_options(args.compress, args.compress_level)
+    project_ids = read_project_ids(args.ids)
+    state_path = args.state if args.state is not None else os.path.join(args.output_dir, EXPORT_STATE_FILE)
+    os.makedirs(args.output_dir, exist_ok=True)
+    result_cache = configure_result_cache(args)
+
+    exporter = BatchExporter(
+        schemas=args.schema, storage=args.storage, output_dir=args.output_dir, token=args.token,
+        filter_properties=args.filter, state=ExportState(state_path), force=args.full, patch_dir=args.patch_dir,
+        output_format=get_format(args.format), compression=args.compress, compress_level=args.compress_level)
+    report = exporter.export(project_ids)
 
+    for project_id, message in report.failed.items():
+        print(f"{project_id}: {message}", file=sys.stderr)
+    print(report.summary(), file=sys.stderr)
+    if result_cache is not None:
+        print_result_cache_stats(result_cache)
+    if report.failed:
+        raise MetadatamanagerError(f"{len(report.failed)}件のプロジェクトの出力に失敗しました。")
+
+
+def configure_result_cache(args: argparse.Namespace):
+    """キャッシュのフォルダが指定されている場合に、ストレージのマッピングの結果のキャッシュを設定するメソッドです。
+
+    結果のキャッシュに対応していないストレージの場合は設定しません。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+
+    Returns:
+        BaseResultCache: 設定したキャッシュ。指定されていない場合はNone
+    """
+    if args.result_cache is None:
+        return None
+    mapping_class = StorageRegistry.get_class(args.storage)
+    if not hasattr(mapping_class, "configure_result_cache"):
+        return None
+    result_cache = create_result_cache(args.result_cache, args.result_cache_max_bytes)
+    mapping_class.configure_result_cache(result_cache)
+    return result_cache
+
+
+def forward_to_daemon(args: argparse.Namespace, schemas: list, params: dict) -> bool:
+    """常駐サーバーが起動している場合に、メタデータの取得を依頼して結果を出力するメソッドです。
+
+    処理時間の内訳、メトリクス、プロファイリング、保存済みのデータを用いる処理、差分の出力、マッピング定義ファイルを探すフォルダ、
+    JSON以外の出力形式、圧縮、マッピングの結果のキャッシュはこのプロセスで処理する必要があるため、
+    それらを指定した場合は常駐サーバーに依頼しません。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+        schemas (list): スキーマの名称の一覧
+        params (dict): スキーマの名称以外のget_metadataの引数
+
+    Returns:
+        bool: 常駐サーバーで処理した場合はTrue、このプロセスで処理する必要がある場合はFalse
+    """
+    # 常駐サーバーを利用しない場合に不要なモジュールを読み込まないよう、ここで読み込む
+    from dg_mm.client import SOCKET_ENV, DaemonClient, copy_response
+
+    socket_path = args.socket or os.environ.get(SOCKET_ENV)
+    if not socket_path or args.no_daemon:
+        return False
+    if args.timings or args.metrics_file or args.profile or args.source_dir or args.save_sources or args.diff:
+        return False
+    # 常駐サーバーは起動時に設定したフォルダのマッピング定義を使用するため、フォルダを指定した場合はこのプロセスで行う
+    if args.mapping_path:
+        return False
+    # 常駐サーバーはJSONで返すため、他の出力形式と圧縮はこのプロセスで行う
+    if args.format != JsonFormat.name or args.compress is not None:
+        return False
+    # 常駐サーバーは起動時に設定したキャッシュを使用するため、キャッシュを指定した場合はこのプロセスで行う
+    if args.result_cache:
+        return False
+
+    request = dict(params, schema=schemas[0] if len(schemas) == 1 else schemas)
+    response = DaemonClient(socket_path).request_metadata(request)
+    if response is None:
+        return False
     if args.file is not None:
-        with open(args.file, 'w') as f:
-            json.dump(result, f, indent=4, ensure_ascii=False)
+        with open(args.file, 'wb') as f:
+            copy_response(response, f)
     else:
-        print(json.dumps(result, indent=4, ensure_ascii=False))
+        copy_response(response, sys.stdout.buffer)
+    return True
+
+
+def collect_metadata(mm: MetadataManager, schemas: list, params: dict, source_dir: str = None, save_sources: str = None) -> dict:
+    """メタデータを作成するメソッドです。
+
+    Args:
+        mm (MetadataManager): メタデータの管理を行うインスタンス
+        schemas (list): スキーマの名称の一覧
+        params (dict): スキーマの名称以外のget_metadataの引数
+        source_dir (str, optional): 保存済みのデータのパス。指定した場合はストレージにアクセスしない。
+        save_sources (str, optional): ストレージから取得したデータの保存先のフォルダ
+
+    Returns:
+        dict: スキーマが1つの場合はメタデータ、複数の場合はスキーマの名称とメタデータの組
+    """
+    if source_dir is None and save_sources is None:
+        if len(schemas) == 1:
+            return mm.get_metadata(schema=schemas[0], **params)
+        return mm.get_metadata_for_schemas(schemas=schemas, **params)
+
+    if source_dir is not None:
+        source_data = SourceArchive.load(source_dir)
+    else:
+        source_data = mm.get_source_data(schemas=schemas, **params)
+        SourceArchive.save(source_data, save_sources)
+
+    result = {
+        schema: mm.get_metadata_from_sources(schema, params['storage'], source_data, params['filter_properties'])
+        for schema in schemas
+    }
+    return result[schemas[0]] if len(schemas) == 1 else result
+
+
+def write_result(result: dict, file: str = None, output_format: str = JsonFormat.name,
+                 compression: str = None, compress_level: int = None):
+    """メタデータを出力するメソッドです。
+
+    Args:
+        result (dict): メタデータ
+        file (str, optional): 出力先のファイル。Noneの場合は標準出力に出力する。
+        output_format (str, optional): 出力形式の名称。デフォルトはjson
+        compression (str, optional): 圧縮方式の名称。Noneの場合は圧縮しない。
+        compress_level (int, optional): 圧縮レベル。Noneの場合は圧縮方式ごとの既定値
+    """
+    formatter = get_format(output_format)
+    if file is not None:
+        with open(file, 'wb') as f, compressed_writer(f, compression, compress_level) as writer:
+            formatter.dump(result, writer)
+        return
+
+    with compressed_writer(sys.stdout.buffer, compression, compress_level) as writer:
+        formatter.dump(result, writer)
+        # 圧縮しないJSONは、従来どおり改行で終える
+        if compression is None and output_format == JsonFormat.name:
+            writer.write(b"\n")
+    sys.stdout.buffer.flush()
+
+
+def validate_definition(args: argparse.Namespace):
+    """マッピング定義ファイルの誤りを確認するメソッドです。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+
+    Raises:
+        MappingDefinitionError: マッピング定義に誤りがある
+    """
+    if not os.path.exists(args.file):
+        raise FileNotFoundError(f"ファイルが見つかりません: '{args.file}'")
+    try:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            mapping_definition = json.load(f)
+    except json.JSONDecodeError:
+        raise DataFormatError("マッピング定義ファイルのフォーマットに誤りがあります。")
+
+    sources = None
+    if args.storage is not None:
+        instance = StorageRegistry.get_instance(args.storage)
+        if hasattr(instance, "get_metadata_sources"):
+            sources = instance.get_metadata_sources()
+
+    diagnostics = DefinitionCompiler.validate(mapping_definition, sources)
+    if diagnostics:
+        raise MappingDefinitionError(
+            f"マッピング定義に{len(diagnostics)}件の誤りがあります。:" + ", ".join(diagnostics))
+    print(f"マッピング定義に誤りはありません。({len(mapping_definition)}件のプロパティ)")
+
+
+def build_definitions(args: argparse.Namespace):
+    """マッピング定義ファイルを探すフォルダのマッピング定義ファイルを検証し、保存するメソッドです。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+
+    Raises:
+        MappingDefinitionError: マッピング定義に誤りがある
+    """
+    for _, source_path in sorted(DefinitionManager.list_definitions().items()):
+        print(DefinitionArtifact.build(source_path))
+
+
+def serve(args: argparse.Namespace):
+    """サーバーを起動し、SIGTERMかSIGINTを受け取るまでリクエストを処理するメソッドです。
+
+    シグナルを受け取ると新しいリクエストの受け付けを止め、処理中のリクエストが終わるのを待ってから終了します。
+
+    Args:
+        args (argparse.Namespace): コマンドライン引数
+    """
+    # サーバーを起動しない場合に不要なモジュールを読み込まないよう、ここで読み込む
+    from dg_mm.client import SOCKET_ENV
+    from dg_mm.server import create_server
+
+    server = create_server(
+        host=args.host, port=args.port, unix_socket=args.socket or os.environ.get(SOCKET_ENV),
+        max_workers=args.workers, queue_timeout=args.queue_timeout, drain_timeout=args.drain_timeout,
+        response_cache_ttl=args.response_cache_ttl, response_cache_size=args.response_cache_size,
+        result_cache=create_result_cache(args.result_cache, args.result_cache_max_bytes) if args.result_cache else None)
+
+    def handle_signal(signum, frame):
+        # serve_foreverを実行しているスレッドからは停止できないため、別のスレッドで停止する
+        threading.Thread(target=server.stop, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    print(f"待ち受けを開始しました: {server.address}", file=sys.stderr, flush=True)
+    server.serve_forever()
+    print("サーバーを停止しました。", file=sys.stderr)
+
+
+def print_timings(recorder: TimingRecorder, total: float):
+    """処理時間の内訳を標準エラー出力に出力するメソッドです。
+
+    Args:
+        recorder (TimingRecorder): 処理時間を記録したフック
+        total (float): 全体の処理時間(秒)
+    """
+    print("timings:", file=sys.stderr)
+    if recorder.spans:
+        print(recorder.format(), file=sys.stderr)
+    print(f"{'total':<48} {total * 1000:10.3f} ms", file=sys.stderr)
+
+
+def print_result_cache_stats(result_cache):
+    """マッピングの結果のキャッシュの統計を標準エラー出力に出力するメソッドです。
+
+    Args:
+        result_cache (BaseResultCache): マッピングの結果のキャッシュ
+    """
+    stats = result_cache.stats()
+    print(f"result cache: hits: {stats['hits']}, misses: {stats['misses']}, hit ratio: {stats['hit_ratio']:.2f}",
+          file=sys.stderr)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,164 @@
+"""常駐サーバー(metadatamanager serve)にメタデータの取得を依頼するクライアントのモジュールです。
+
+コマンドラインから呼び出す際に、Unixドメインソケットで待ち受けている常駐サーバーがあれば処理を依頼することで、
+モジュールの読み込みやGRDMへの接続などの初期化をコマンドの実行ごとに行わずに済みます。
+"""
+
+import http.client
+import json
+import socket
+from logging import getLogger
+from typing import BinaryIO, Optional
+
+from dg_mm import errors
+from dg_mm.errors import MetadatamanagerError
+
+logger = getLogger(__name__)
+
+SOCKET_ENV = "DG_MM_SOCKET"
+_CHUNK_SIZE = 64 * 1024
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """Unixドメインソケットに接続するHTTPの接続です。"""
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        """インスタンスの初期化メソッド
+
+        Args:
+            socket_path (str): Unixドメインソケットのパス
+            timeout (float, optional): タイムアウト(秒)。デフォルトはNone(無制限)
+        """
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self):
+        """Unixドメインソケットに接続するメソッドです。"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self._socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class DaemonClient():
+    """常駐サーバーにメタデータの取得を依頼するクラスです。
+
+    Attributes:
+        instance:
+            socket_path(str):常駐サーバーのUnixドメインソケットのパス
+            timeout(float):タイムアウト(秒)。Noneの場合は無制限
+    """
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        """インスタンスの初期化メソッド
+
+        Args:
+            socket_path (str): 常駐サーバーのUnixドメインソケットのパス
+            timeout (float, optional): タイムアウト(秒)。デフォルトはNone(無制限)
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request_metadata(self, params: dict) -> Optional[http.client.HTTPResponse]:
+        """常駐サーバーにメタデータの取得を依頼するメソッドです。
+
+        常駐サーバーに接続できない場合と、停止処理中や混雑により受け付けられなかった場合はNoneを返します。
+        その場合、呼び出し元はプロセス内で処理を行います。
+
+        Args:
+            params (dict): get_metadataの引数。schemaにリストを指定した場合は複数のスキーマを取得する
+
+        Returns:
+            Optional[http.client.HTTPResponse]: 成功したレスポンス。ボディはCLIの標準出力と同じ形式のメタデータ
+
+        Raises:
+            MetadatamanagerError: 常駐サーバーでのメタデータの取得に失敗した
+            FileNotFoundError: 常駐サーバーで必要なファイルが見つからなかった
+        """
+        body = {key: value for key, value in params.items() if key != "token" and value is not None}
+        headers = {"Content-Type": "application/json"}
+        if params.get("token") is not None:
+            headers["Authorization"] = f"Bearer {params['token']}"
+
+        connection = _UnixHTTPConnection(self.socket_path, self.timeout)
+        try:
+            connection.connect()
+        except OSError as e:
+            logger.debug(f"常駐サーバーに接続できない({self.socket_path}: {e})")
+            return None
+
+        connection.request("POST", "/metadata", body=json.dumps(body).encode('utf-8'), headers=headers)
+        response = connection.getresponse()
+        if response.status == 200:
+            return response
+
+        content = response.read()
+        connection.close()
+        if response.status == 503:
+            logger.debug(f"常駐サーバーが処理を受け付けない({self.socket_path})")
+            return None
+        raise _to_error(content)
+
+    def get_metadata(self, params: dict, output: BinaryIO) -> bool:
+        """常駐サーバーにメタデータの取得を依頼し、結果をそのまま出力するメソッドです。
+
+        Args:
+            params (dict): get_metadataの引数
+            output (BinaryIO): 出力先
+
+        Returns:
+            bool: 常駐サーバーで処理した場合はTrue、常駐サーバーを利用できない場合はFalse
+
+        Raises:
+            MetadatamanagerError: 常駐サーバーでのメタデータの取得に失敗した
+        """
+        response = self.request_metadata(params)
+        if response is None:
+            return False
+        copy_response(response, output)
+        return True
+
+
+def copy_response(response: http.client.HTTPResponse, output: BinaryIO):
+    """レスポンスのボディを読み込みながら出力する関数です。
+
+    Args:
+        response (http.client.HTTPResponse): レスポンス
+        output (BinaryIO): 出力先
+    """
+    try:
+        while True:
+            chunk = response.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            output.write(chunk)
+    finally:
+        response.close()
+    output.flush()
+
+
+def _to_error(content: bytes) -> Exception:
+    """常駐サーバーのエラーのレスポンスを例外に変換する関数です。
+
+    Args:
+        content (bytes): レスポンスのボディ
+
+    Returns:
+        Exception: 常駐サーバーで発生した例外と同じ種類の例外。種類が分からない場合はMetadatamanagerError
+    """
+    try:
+        body = json.loads(content.decode('utf-8'))
+        name, message = body["error"], body["message"]
+    except (UnicodeDecodeError, ValueError, KeyError, TypeError):
+        return MetadatamanagerError("常駐サーバーのレスポンスの形式に誤りがあります。")
+
+    if name == "FileNotFoundError":
+        return FileNotFoundError(message)
+    error_type = getattr(errors, name, None)
+    if isinstance(error_type, type) and issubclass(error_type, MetadatamanagerError):
+        return error_type(message)
+    return MetadatamanagerError(message)
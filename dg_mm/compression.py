@@ -0,0 +1,155 @@
+"""出力の圧縮と、圧縮したファイルの読み込みを行うモジュールです。
+
+圧縮はストリームとして行い、圧縮前のデータ全体をメモリに保持しません。
+ただし、書き込みながら変換するのは標準ライブラリのjsonで変換するjson形式のみです。orjsonで変換するjson形式と、
+jsonl、msgpack、cbor形式は変換後のバイト列全体を作成してから書き込むため、その大きさのメモリを一時的に使用します。
+gzipとxzは標準ライブラリで、zstdはzstandardパッケージがインストールされている場合に使用できます。
+
+    pip install dg-metadata-manager[zstd]
+"""
+
+import contextlib
+import gzip
+import lzma
+from typing import BinaryIO, Iterator
+
+from dg_mm.errors import MetadatamanagerError
+
+# 圧縮方式ごとのファイルの拡張子と、圧縮レベルの範囲
+_METHODS = {
+    "gzip": (".gz", 1, 9),
+    "xz": (".xz", 0, 9),
+    "zstd": (".zst", 1, 22),
+}
+
+COMPRESSION_NAMES = tuple(_METHODS)
+
+
+def get_extension(method: str = None) -> str:
+    """圧縮方式に対応するファイルの拡張子を取得する関数です。
+
+    Args:
+        method (str, optional): 圧縮方式の名称。Noneの場合は圧縮しない
+
+    Returns:
+        str: ファイルの拡張子。圧縮しない場合は空文字列
+    """
+    if method is None:
+        return ""
+    return _get_method(method)[0]
+
+
+def check_options(method: str = None, level: int = None):
+    """圧縮方式と圧縮レベルが使用できるかを確認する関数です。
+
+    Args:
+        method (str, optional): 圧縮方式の名称。Noneの場合は圧縮しない
+        level (int, optional): 圧縮レベル。Noneの場合は圧縮方式ごとの既定値
+
+    Raises:
+        MetadatamanagerError: 対応していない圧縮方式、範囲外の圧縮レベル、または必要なパッケージがインストールされていない
+    """
+    if method is None:
+        return
+    _, minimum, maximum = _get_method(method)
+    if level is not None and not minimum <= level <= maximum:
+        raise MetadatamanagerError(f"{method}の圧縮レベルは{minimum}から{maximum}の範囲で指定してください。")
+    if method == "zstd":
+        _import_zstandard()
+
+
+@contextlib.contextmanager
+def compressed_writer(stream: BinaryIO, method: str = None, level: int = None) -> Iterator[BinaryIO]:
+    """書き込んだデータを圧縮して出力先に書き込むストリームを作成する関数です。
+
+    終了時に圧縮したデータをすべて書き込みますが、出力先は閉じません。
+
+    Args:
+        stream (BinaryIO): 出力先
+        method (str, optional): 圧縮方式の名称。Noneの場合は圧縮せずに出力先をそのまま使用する
+        level (int, optional): 圧縮レベル。Noneの場合は圧縮方式ごとの既定値
+
+    Yields:
+        BinaryIO: 書き込み先のストリーム
+
+    Raises:
+        MetadatamanagerError: 対応していない圧縮方式、範囲外の圧縮レベル、または必要なパッケージがインストールされていない
+    """
+    if method is None:
+        yield stream
+        return
+
+    check_options(method, level)
+    if method == "gzip":
+        # 同じ内容から同じファイルを作成するよう、更新日時を記録しない
+        writer = gzip.GzipFile(fileobj=stream, mode='wb', compresslevel=9 if level is None else level, mtime=0)
+    elif method == "xz":
+        writer = lzma.LZMAFile(stream, mode='wb', preset=level)
+    else:
+        zstandard = _import_zstandard()
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        writer = compressor.stream_writer(stream, closefd=False)
+    with writer:
+        yield writer
+
+
+@contextlib.contextmanager
+def decompressed_reader(stream: BinaryIO, method: str = None) -> Iterator[BinaryIO]:
+    """圧縮されたデータを展開しながら読み込むストリームを作成する関数です。読み込み元は閉じません。
+
+    Args:
+        stream (BinaryIO): 読み込み元
+        method (str, optional): 圧縮方式の名称。Noneの場合は読み込み元をそのまま使用する
+
+    Yields:
+        BinaryIO: 読み込み元のストリーム
+
+    Raises:
+        MetadatamanagerError: 対応していない圧縮方式が指定された
+    """
+    if method is None:
+        yield stream
+        return
+
+    _get_method(method)
+    if method == "gzip":
+        reader = gzip.GzipFile(fileobj=stream, mode='rb')
+    elif method == "xz":
+        reader = lzma.LZMAFile(stream, mode='rb')
+    else:
+        reader = _import_zstandard().ZstdDecompressor().stream_reader(stream, closefd=False)
+    with reader:
+        yield reader
+
+
+def _get_method(method: str) -> tuple:
+    """圧縮方式の拡張子と圧縮レベルの範囲を取得する関数です。
+
+    Args:
+        method (str): 圧縮方式の名称
+
+    Returns:
+        tuple: 拡張子、圧縮レベルの最小値、最大値の組
+
+    Raises:
+        MetadatamanagerError: 対応していない圧縮方式である
+    """
+    if method not in _METHODS:
+        raise MetadatamanagerError(f"対応していない圧縮方式が指定されました。({method})")
+    return _METHODS[method]
+
+
+def _import_zstandard():
+    """zstandardパッケージを読み込む関数です。
+
+    Returns:
+        module: zstandardパッケージ
+
+    Raises:
+        MetadatamanagerError: zstandardがインストールされていない
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise MetadatamanagerError("zstdを使用するにはzstandardをインストールしてください。")
+    return zstandard
@@ -0,0 +1,443 @@
+"""ベンチマークや負荷試験のためのローカルで動作する疑似GRDMサーバーのモジュールです。
+
+任意のプロジェクトIDに対して、指定した件数のメンバー、プロジェクトメタデータ、ファイルメタデータを持つ合成データを返します。
+
+    python -m dg_mm.fake_grdm --port 8000 --members 1000 --config-out fake_grdm.ini
+    DG_MM_GRDM_CONFIG=fake_grdm.ini metadatamanager get --schema RF --storage GRDM --token dummy --id p0001
+"""
+
+import argparse
+import configparser
+import json
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger
+from urllib.parse import parse_qs, urlsplit
+
+from dg_mm.util import PackageFileReader
+
+logger = getLogger(__name__)
+
+
+def make_project_info(project_id: str) -> dict:
+    """プロジェクト情報のレスポンスを作成する関数です。
+
+    Args:
+        project_id (str): プロジェクトID
+
+    Returns:
+        dict: プロジェクト情報
+    """
+    return {
+        "data": {
+            "id": project_id,
+            "type": "nodes",
+            "attributes": {
+                "category": "project",
+                "title": f"Synthetic project {project_id}",
+                "description": f"Synthetic project {project_id} for benchmarking.",
+                "date_created": "2024-01-01T00:00:00.000000",
+                "date_modified": "2024-01-02T00:00:00.000000",
+                "public": False,
+                "tags": [],
+            },
+            "links": {
+                "html": f"https://rdm.example.org/{project_id}/",
+                "self": f"https://api.rdm.example.org/v2/nodes/{project_id}/",
+            },
+        }
+    }
+
+
+def make_member(project_id: str, index: int) -> dict:
+    """メンバー情報の1件分のデータを作成する関数です。
+
+    Args:
+        project_id (str): プロジェクトID
+        index (int): メンバーの番号
+
+    Returns:
+        dict: メンバー情報
+    """
+    user_id = f"u{index:06d}"
+    return {
+        "id": f"{project_id}-{user_id}",
+        "type": "contributors",
+        "attributes": {"bibliographic": True, "permission": "admin", "index": index},
+        "embeds": {
+            "users": {
+                "data": {
+                    "id": user_id,
+                    "type": "users",
+                    "attributes": {
+                        "full_name": f"Researcher {index}",
+                        "email": f"researcher{index}@example.org",
+                        "social": {"orcid": f"0000-0000-{index // 10000:04d}-{index % 10000:04d}"},
+                        "employment": [
+                            {"institution_ja": f"研究機関{index % 100}", "department_ja": "研究部門"},
+                        ],
+                    },
+                }
+            }
+        },
+    }
+
+
+def make_member_page(project_id: str, members: int, page: int, page_size: int = 10, next_url: str = None) -> dict:
+    """メンバー情報の1ページ分のレスポンスを作成する関数です。
+
+    Args:
+        project_id (str): プロジェクトID
+        members (int): メンバーの総数
+        page (int): ページ番号(1始まり)
+        page_size (int, optional): 1ページあたりの件数。デフォルトは10
+        next_url (str, optional): 次ページのURL。デフォルトはNone
+
+    Returns:
+        dict: メンバー情報
+    """
+    start = (page - 1) * page_size
+    end = min(start + page_size, members)
+    return {
+        "data": [make_member(project_id, i) for i in range(start, end)],
+        "links": {
+            "first": None,
+            "last": None,
+            "prev": None,
+            "next": next_url,
+            "meta": {"total": members, "per_page": page_size},
+        },
+        "meta": {"version": "2.0"},
+    }
+
+
+def make_member_info(project_id: str, members: int) -> dict:
+    """全ページを結合した後のメンバー情報を作成する関数です。
+
+    Args:
+        project_id (str): プロジェクトID
+        members (int): メンバーの総数
+
+    Returns:
+        dict: メンバー情報
+    """
+    return make_member_page(project_id, members, 1, page_size=max(members, 1))
+
+
+def make_registration(project_id: str, index: int) -> dict:
+    """プロジェクトメタデータの1件分のデータを作成する関数です。
+
+    Args:
+        project_id (str): プロジェクトID
+        index (int): プロジェクトメタデータの番号
+
+    Returns:
+        dict: プロジェクトメタデータ
+    """
+    return {
+        "id": f"{project_id}-r{index:04d}",
+        "type": "registrations",
+        "attributes": {
+            "date_created": f"2024-01-01T00:00:{index % 60:02d}.000000",
+            "registration_responses": {
+                "funder": f"Funder {index}",
+                "program-name-ja": f"研究プログラム{index}",
+                "japan-grant-number": f"JP{index:08d}",
+            },
+        },
+        "relationships": {"registered_from": {"data": {"id": project_id}}},
+    }
+
+
+def make_project_metadata(project_id: str, registrations: int, registration_id: str = None) -> dict:
+    """プロジェクトメタデータのレスポンスを作成する関数です。
+
+    Args:
+        project_id (str): プロジェクトID
+        registrations (int): プロジェクトメタデータの件数
+        registration_id (str, optional): 絞り込むプロジェクトメタデータのID。デフォルトはNone
+
+    Returns:
+        dict: プロジェクトメタデータ。作成日の新しい順に並ぶ
+    """
+    data = [make_registration(project_id, i) for i in reversed(range(registrations))]
+    if registration_id is not None:
+        data = [item for item in data if item["id"] == registration_id]
+    return {
+        "data": data,
+        "links": {"first": None, "last": None, "prev": None, "next": None,
+                  "meta": {"total": len(data), "per_page": 10}},
+        "meta": {"version": "2.0"},
+    }
+
+
+def make_file(index: int) -> dict:
+    """ファイルメタデータの1件分のデータを作成する関数です。
+
+    Args:
+        index (int): ファイルの番号
+
+    Returns:
+        dict: ファイルメタデータ
+    """
+    return {
+        "path": f"osfstorage/data/file{index:06d}.csv",
+        "folder": False,
+        "generated": False,
+        "items": [
+            {
+                "active": True,
+                "schema": "grdm-file-metadata",
+                "data": {
+                    "grdm-file:title-ja": {"value": f"データファイル{index}"},
+                    "grdm-file:data-description-ja": {"value": f"データファイル{index}の説明"},
+                    "grdm-file:data-research-field": {"value": "189"},
+                },
+            }
+        ],
+    }
+
+
+def make_file_metadata(project_id: str, files: int) -> dict:
+    """ファイルメタデータのレスポンスを作成する関数です。
+
+    Args:
+        project_id (str): プロジェクトID
+        files (int): ファイルの件数
+
+    Returns:
+        dict: ファイルメタデータ
+    """
+    return {
+        "data": {
+            "id": project_id,
+            "type": "metadata-node-project",
+            "attributes": {
+                "editable": True,
+                "features": {"exporting": True, "dataset_importing": True},
+                "files": [make_file(i) for i in range(files)],
+                "repositories": [],
+            },
+        }
+    }
+
+
+class FakeGrdmServer():
+    """合成データを返す疑似GRDMサーバーです。
+
+    Attributes:
+        instance:
+            members(int): プロジェクトあたりのメンバー数
+            registrations(int): プロジェクトあたりのプロジェクトメタデータ数
+            files(int): プロジェクトあたりのファイル数
+            latency(float): レスポンスを返すまでの待ち時間(秒)
+            page_size(int): メンバー情報の1ページあたりの件数
+            token(str): 受け付けるトークン。Noneの場合はすべてのトークンを受け付ける
+            request_count(int): 受け付けたリクエストの数
+    """
+
+    def __init__(
+            self, host: str = '127.0.0.1', port: int = 0, members: int = 10, registrations: int = 1,
+            files: int = 10, latency: float = 0.0, page_size: int = 10, token: str = None):
+        """インスタンスの初期化メソッド
+
+        Args:
+            host (str, optional): 待ち受けるホスト。デフォルトは127.0.0.1
+            port (int, optional): 待ち受けるポート。0の場合は空いているポートを使用する。デフォルトは0
+            members (int, optional): プロジェクトあたりのメンバー数。デフォルトは10
+            registrations (int, optional): プロジェクトあたりのプロジェクトメタデータ数。デフォルトは1
+            files (int, optional): プロジェクトあたりのファイル数。デフォルトは10
+            latency (float, optional): レスポンスを返すまでの待ち時間(秒)。デフォルトは0
+            page_size (int, optional): メンバー情報の1ページあたりの件数。デフォルトは10
+            token (str, optional): 受け付けるトークン。デフォルトはNone
+        """
+        self.members = members
+        self.registrations = registrations
+        self.files = files
+        self.latency = latency
+        self.page_size = page_size
+        self.token = token
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """サーバーのURLです。"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeGrdmServer':
+        """別スレッドでサーバーを起動するメソッドです。
+
+        Returns:
+            FakeGrdmServer: 自身のインスタンス
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """サーバーを停止するメソッドです。"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'FakeGrdmServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def make_config(self) -> configparser.ConfigParser:
+        """このサーバーにアクセスするためのGRDMの設定を作成するメソッドです。
+
+        メンバー情報のすべてのページを取得できるよう、リクエスト回数の上限をページ数より大きくします。
+
+        Returns:
+            configparser.ConfigParser: GRDMの設定
+        """
+        config = PackageFileReader.read_ini('data/storage/grdm.ini')
+        pages = math.ceil(self.members / self.page_size)
+        max_requests = max(config["settings"].getint("max_requests"), pages + 1)
+        config["settings"]["max_requests"] = str(max_requests)
+        base_url = self.base_url
+        config["url"] = {
+            "token": f"{base_url}/oauth2/profile",
+            "project_metadata": f"{base_url}/v2/nodes/{{project_id}}/registrations/",
+            "project_metadata_by_id": f"{base_url}/v2/registrations/",
+            "file_metadata": f"{base_url}/api/v1/project/{{project_id}}/metadata/project",
+            "project_info": f"{base_url}/v2/nodes/{{project_id}}/",
+            "member_info": f"{base_url}/v2/nodes/{{project_id}}/contributors/",
+        }
+        return config
+
+    def write_config(self, path: str):
+        """このサーバーにアクセスするためのGRDMの設定ファイルを出力するメソッドです。
+
+        Args:
+            path (str): 出力先のパス
+        """
+        config = self.make_config()
+        with open(path, 'w', encoding='utf-8') as f:
+            config.write(f)
+
+    def handle(self, path: str, query: dict, authorization: str) -> tuple:
+        """リクエストに対するレスポンスを作成するメソッドです。
+
+        Args:
+            path (str): リクエストのパス
+            query (dict): クエリパラメータ
+            authorization (str): Authorizationヘッダーの値
+
+        Returns:
+            tuple: ステータスコードとレスポンスボディ
+        """
+        with self._lock:
+            self.request_count += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if self.token is not None and authorization != f"Bearer {self.token}":
+            return 401, {"errors": [{"detail": "Authentication credentials were not provided."}]}
+
+        if path == "/oauth2/profile":
+            return 200, {"scope": ["osf.full_read", "osf.full_write"], "id": "fake"}
+
+        match = re.fullmatch(r"/v2/nodes/([^/]+)/", path)
+        if match:
+            return 200, make_project_info(match.group(1))
+
+        match = re.fullmatch(r"/v2/nodes/([^/]+)/contributors/", path)
+        if match:
+            project_id = match.group(1)
+            page = int(query.get("page", ["1"])[0])
+            next_url = None
+            if page * self.page_size < self.members:
+                next_url = f"{self.base_url}{path}?page={page + 1}"
+            return 200, make_member_page(project_id, self.members, page, self.page_size, next_url)
+
+        match = re.fullmatch(r"/v2/nodes/([^/]+)/registrations/", path)
+        if match:
+            return 200, make_project_metadata(match.group(1), self.registrations)
+
+        if path == "/v2/registrations/":
+            registration_id = query.get("filter[id]", [""])[0]
+            project_id = registration_id.rsplit("-r", 1)[0]
+            return 200, make_project_metadata(project_id, self.registrations, registration_id)
+
+        match = re.fullmatch(r"/api/v1/project/([^/]+)/metadata/project", path)
+        if match:
+            return 200, make_file_metadata(match.group(1), self.files)
+
+        return 404, {"errors": [{"detail": "Not found."}]}
+
+
+def _make_handler(server: FakeGrdmServer) -> type:
+    """疑似GRDMサーバーのリクエストハンドラーを作成する関数です。
+
+    Args:
+        server (FakeGrdmServer): レスポンスを作成するサーバー
+
+    Returns:
+        type: リクエストハンドラーのクラス
+    """
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # ヘッダーとボディを1回で送信し、接続を再利用するクライアントで遅延ACKの待ちが発生しないようにする
+        wbufsize = -1
+
+        def do_GET(self):
+            parsed = urlsplit(self.path)
+            status, body = server.handle(parsed.path, parse_qs(parsed.query), self.headers.get("Authorization"))
+            content = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return _Handler
+
+
+def main():
+    """疑似GRDMサーバーを起動するエントリーポイント"""
+    parser = argparse.ArgumentParser(description='合成データを返す疑似GRDMサーバーを起動する。')
+    parser.add_argument('--host', default='127.0.0.1', help='待ち受けるホスト。')
+    parser.add_argument('--port', type=int, default=8000, help='待ち受けるポート。')
+    parser.add_argument('--members', type=int, default=10, help='プロジェクトあたりのメンバー数。')
+    parser.add_argument('--registrations', type=int, default=1, help='プロジェクトあたりのプロジェクトメタデータ数。')
+    parser.add_argument('--files', type=int, default=10, help='プロジェクトあたりのファイル数。')
+    parser.add_argument('--latency', type=float, default=0.0, help='レスポンスを返すまでの待ち時間(秒)。')
+    parser.add_argument('--page-size', dest='page_size', type=int, default=10, help='メンバー情報の1ページあたりの件数。')
+    parser.add_argument('--token', help='受け付けるトークン。指定しない場合はすべてのトークンを受け付ける。')
+    parser.add_argument('--config-out', dest='config_out',
+                        help='このサーバーにアクセスするためのGRDMの設定ファイルの出力先。環境変数DG_MM_GRDM_CONFIGに指定して使用する。')
+    args = parser.parse_args()
+
+    server = FakeGrdmServer(args.host, args.port, args.members, args.registrations,
+                            args.files, args.latency, args.page_size, args.token)
+    if args.config_out:
+        server.write_config(args.config_out)
+    print(f"Serving fake GRDM on {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""処理時間の計測(スパン)を行うモジュールです。
+
+計測したい処理をspanで囲むと、フックが登録されている場合に限り処理時間がフックに通知されます。
+フックが登録されていない場合は何も計測しないため、オーバーヘッドはほぼありません。
+
+    with use_span_hooks([recorder]):
+        with span("extraction"):
+            ...
+"""
+
+import contextlib
+import contextvars
+import time
+from typing import Iterator
+
+_span_hooks = contextvars.ContextVar("dg_mm_span_hooks", default=())
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span():
+    """処理時間を計測し、フックに通知するコンテキストマネージャーです。"""
+
+    __slots__ = ("_name", "_attributes", "_hooks", "_start")
+
+    def __init__(self, name: str, attributes: dict, hooks: tuple):
+        self._name = name
+        self._attributes = attributes
+        self._hooks = hooks
+        self._start = None
+
+    def __enter__(self) -> '_Span':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self._start
+        attributes = dict(self._attributes, error=exc_type.__name__) if exc_type is not None else self._attributes
+        for hook in self._hooks:
+            hook(self._name, duration, attributes)
+
+
+def span(name: str, **attributes) -> contextlib.AbstractContextManager:
+    """処理時間を計測するコンテキストマネージャーを取得する関数です。
+
+    Args:
+        name (str): スパンの名前
+        **attributes: フックに渡す付加情報
+
+    Returns:
+        contextlib.AbstractContextManager: フックが登録されていない場合は何もしないコンテキストマネージャー
+    """
+    hooks = _span_hooks.get()
+    if not hooks:
+        return _NULL_SPAN
+    return _Span(name, attributes, hooks)
+
+
+@contextlib.contextmanager
+def use_span_hooks(hooks: list) -> Iterator[None]:
+    """ブロック内で計測したスパンを通知するフックを設定するコンテキストマネージャーです。
+
+    フックはコンテキスト変数に保持されるため、スレッドごとに独立しています。
+
+    Args:
+        hooks (list): フックの一覧。フックは(スパンの名前, 処理時間(秒), 付加情報)を受け取る呼び出し可能オブジェクト
+    """
+    token = _span_hooks.set(_span_hooks.get() + tuple(hooks))
+    try:
+        yield
+    finally:
+        _span_hooks.reset(token)
+
+
+class TimingRecorder():
+    """スパンを記録するフックです。
+
+    Attributes:
+        instance:
+            spans(list): 記録したスパン(名前, 処理時間(秒), 付加情報)の一覧
+    """
+
+    def __init__(self):
+        """インスタンスの初期化メソッド"""
+        self.spans = []
+
+    def __call__(self, name: str, duration: float, attributes: dict):
+        """スパンを記録するメソッドです。
+
+        Args:
+            name (str): スパンの名前
+            duration (float): 処理時間(秒)
+            attributes (dict): 付加情報
+        """
+        self.spans.append((name, duration, attributes))
+
+    def format(self) -> str:
+        """記録したスパンを表示用の文字列に変換するメソッドです。
+
+        Returns:
+            str: スパンごとの処理時間を1行ずつ記載した文字列
+        """
+        lines = []
+        for name, duration, attributes in self.spans:
+            label = name
+            if attributes:
+                label += " (" + ", ".join(f"{key}={value}" for key, value in attributes.items()) + ")"
+            lines.append(f"{label:<48} {duration * 1000:10.3f} ms")
+        return "\n".join(lines)
+
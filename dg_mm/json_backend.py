@@ -0,0 +1,268 @@
+"""JSONの変換に用いるライブラリを切り替えるモジュールです。
+
+orjsonがインストールされている場合はorjsonを、インストールされていない場合は標準ライブラリのjsonを使用します。
+環境変数DG_MM_JSON_BACKEND(stdlib、orjson)で明示的に指定することもできます。
+どちらを使用しても、変換結果は標準ライブラリのjson(ensure_ascii=False)と同じです。
+
+    pip install dg-metadata-manager[fast-json]
+"""
+
+import io
+import json
+import math
+import os
+import re
+from typing import Any, BinaryIO, Union
+
+from dg_mm.errors import MetadatamanagerError
+
+BACKEND_ENV = "DG_MM_JSON_BACKEND"
+
+# orjsonは指数表記を「1e16」、標準ライブラリは「1e+16」と出力するため、指数表記を含む場合は標準ライブラリで変換する
+_EXPONENT = re.compile(rb'[0-9]e[-+]?[0-9]+[,\]}\n]|[0-9]e[-+]?[0-9]+$')
+
+
+class StdlibBackend():
+    """標準ライブラリのjsonで変換するクラスです。"""
+    name = "stdlib"
+
+    @classmethod
+    def loads(cls, data: Union[bytes, str]) -> Any:
+        """JSONを値に変換するメソッドです。
+
+        Args:
+            data (Union[bytes, str]): UTF-8のバイト列、または文字列のJSON
+
+        Returns:
+            Any: 変換した値
+
+        Raises:
+            ValueError: JSONの形式に誤りがある
+        """
+        return json.loads(data)
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        """値を空白のないJSONに変換するメソッドです。
+
+        Args:
+            value (Any): JSONに変換できる値
+
+        Returns:
+            bytes: UTF-8のJSON
+        """
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+    @classmethod
+    def dumps_pretty(cls, value: Any) -> bytes:
+        """値を4文字のインデントを付けたJSONに変換するメソッドです。
+
+        Args:
+            value (Any): JSONに変換できる値
+
+        Returns:
+            bytes: UTF-8のJSON
+        """
+        return json.dumps(value, indent=4, ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def dump_pretty(cls, value: Any, stream: BinaryIO):
+        """値を4文字のインデントを付けたJSONに変換して書き込むメソッドです。
+
+        Args:
+            value (Any): JSONに変換できる値
+            stream (BinaryIO): 出力先。閉じずに残す
+        """
+        # 変換した文字列全体を保持しないよう、書き込みながら変換する。細かい書き込みはTextIOWrapperでまとめる
+        writer = io.TextIOWrapper(stream, encoding='utf-8')
+        try:
+            json.dump(value, writer, indent=4, ensure_ascii=False)
+            writer.flush()
+        finally:
+            writer.detach()
+
+
+class OrjsonBackend(StdlibBackend):
+    """orjsonで変換するクラスです。orjsonで変換できない値と、指数表記やNaN、Infinityを含む値は標準ライブラリで変換します。"""
+    name = "orjson"
+
+    @classmethod
+    def loads(cls, data: Union[bytes, str]) -> Any:
+        import orjson
+        return orjson.loads(data)
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        import orjson
+        try:
+            content = orjson.dumps(value)
+        except TypeError:
+            # 64ビットを超える整数や文字列以外のキーなど
+            return super().dumps(value)
+        if _EXPONENT.search(content) or _has_non_finite(value, content):
+            return super().dumps(value)
+        return content
+
+    @classmethod
+    def dumps_pretty(cls, value: Any) -> bytes:
+        import orjson
+        try:
+            content = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            return super().dumps_pretty(value)
+        if _EXPONENT.search(content) or _has_non_finite(value, content):
+            return super().dumps_pretty(value)
+        return _double_indent(content)
+
+    @classmethod
+    def dump_pretty(cls, value: Any, stream: BinaryIO):
+        stream.write(cls.dumps_pretty(value))
+
+
+_BACKENDS = {backend.name: backend for backend in (StdlibBackend, OrjsonBackend)}
+_backend = None
+
+
+def get_backend() -> type:
+    """使用するJSONの変換のクラスを取得する関数です。
+
+    初回の呼び出し時に、環境変数、またはインストールされているライブラリから決定します。
+
+    Returns:
+        type: JSONの変換のクラス
+
+    Raises:
+        MetadatamanagerError: 環境変数に対応していない名称、またはインストールされていないライブラリが指定された
+    """
+    global _backend
+    if _backend is None:
+        set_backend(os.environ.get(BACKEND_ENV))
+    return _backend
+
+
+def set_backend(name: str = None):
+    """使用するJSONの変換のクラスを設定する関数です。
+
+    Args:
+        name (str, optional): stdlib、またはorjson。Noneの場合はorjsonがインストールされていればorjson
+
+    Raises:
+        MetadatamanagerError: 対応していない名称、またはインストールされていないライブラリが指定された
+    """
+    global _backend
+    if name is None:
+        name = OrjsonBackend.name if _is_orjson_available() else StdlibBackend.name
+    if name not in _BACKENDS:
+        raise MetadatamanagerError(f"対応していないJSONの変換方法が指定されました。({name})")
+    if name == OrjsonBackend.name and not _is_orjson_available():
+        raise MetadatamanagerError("orjsonを使用するにはorjsonをインストールしてください。")
+    _backend = _BACKENDS[name]
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """JSONを値に変換する関数です。
+
+    Args:
+        data (Union[bytes, str]): UTF-8のバイト列、または文字列のJSON
+
+    Returns:
+        Any: 変換した値
+
+    Raises:
+        ValueError: JSONの形式に誤りがある
+    """
+    return get_backend().loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """値を空白のないJSONに変換する関数です。
+
+    Args:
+        value (Any): JSONに変換できる値
+
+    Returns:
+        bytes: UTF-8のJSON
+    """
+    return get_backend().dumps(value)
+
+
+def dumps_pretty(value: Any) -> bytes:
+    """値を4文字のインデントを付けたJSONに変換する関数です。
+
+    Args:
+        value (Any): JSONに変換できる値
+
+    Returns:
+        bytes: UTF-8のJSON
+    """
+    return get_backend().dumps_pretty(value)
+
+
+def dump_pretty(value: Any, stream: BinaryIO):
+    """値を4文字のインデントを付けたJSONに変換して書き込む関数です。
+
+    Args:
+        value (Any): JSONに変換できる値
+        stream (BinaryIO): 出力先。閉じずに残す
+    """
+    get_backend().dump_pretty(value, stream)
+
+
+def _is_orjson_available() -> bool:
+    """orjsonがインストールされているかを確認する関数です。
+
+    Returns:
+        bool: インストールされている場合はTrue
+    """
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _has_non_finite(value: Any, content: bytes) -> bool:
+    """orjsonがnullに変換したNaNやInfinityを含むかを確認する関数です。
+
+    標準ライブラリはNaN、Infinityと出力するため、含む場合は標準ライブラリで変換します。
+    変換結果にnullを含まない場合は、値を確認せずにFalseを返します。
+
+    Args:
+        value (Any): 変換した値
+        content (bytes): orjsonで変換したJSON
+
+    Returns:
+        bool: NaNかInfinityを含む場合はTrue
+    """
+    if b"null" not in content:
+        return False
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _double_indent(content: bytes) -> bytes:
+    """2文字のインデントのJSONを4文字のインデントに変換する関数です。
+
+    JSONの文字列は改行を含まないため、各行の先頭の空白はすべてインデントです。
+
+    Args:
+        content (bytes): 2文字のインデントのJSON
+
+    Returns:
+        bytes: 4文字のインデントのJSON
+    """
+    lines = content.split(b"\n")
+    for i, line in enumerate(lines):
+        stripped = line.lstrip(b" ")
+        if len(stripped) != len(line):
+            lines[i] = b"  " * (len(line) - len(stripped)) + stripped
+    return b"\n".join(lines)
@@ -0,0 +1,290 @@
+"""プロセス内のメトリクス(カウンターとヒストグラム)を管理するモジュールです。
+
+GrdmAccessやGrdmMappingが更新したメトリクスを、辞書またはPrometheusのテキスト形式で出力できます。
+"""
+
+import bisect
+import math
+import os
+import tempfile
+import threading
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (1024, 10240, 102400, 1048576, 10485760, 104857600)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+def _label_key(labels: dict) -> tuple:
+    """ラベルを集計のキーに変換する関数です。"""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(label_key: tuple, extra: tuple = ()) -> str:
+    """ラベルをPrometheusのテキスト形式に変換する関数です。"""
+    items = label_key + extra
+    if not items:
+        return ""
+    escaped = (key + '="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+               for key, value in items)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """値をPrometheusのテキスト形式に変換する関数です。"""
+    if math.isinf(value):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter():
+    """単調に増加するカウンターです。
+
+    Attributes:
+        instance:
+            name(str): メトリクスの名前
+            help(str): メトリクスの説明
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, lock: threading.Lock):
+        self.name = name
+        self.help = help
+        self._lock = lock
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """カウンターを増やすメソッドです。
+
+        Args:
+            amount (float, optional): 増やす量。デフォルトは1
+            **labels: ラベル
+        """
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """カウンターの値を取得するメソッドです。
+
+        Args:
+            **labels: ラベル
+
+        Returns:
+            float: カウンターの値。記録がない場合は0
+        """
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def _snapshot(self) -> list:
+        return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+    def _prometheus_lines(self) -> list:
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in self._values.items()]
+
+    def _reset(self):
+        self._values.clear()
+
+
+class Histogram():
+    """値の分布を記録するヒストグラムです。
+
+    Attributes:
+        instance:
+            name(str): メトリクスの名前
+            help(str): メトリクスの説明
+            buckets(tuple): バケットの上限値の一覧
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, lock: threading.Lock, buckets: tuple = SECONDS_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._lock = lock
+        self._values = {}
+
+    def observe(self, value: float, **labels):
+        """値を記録するメソッドです。
+
+        Args:
+            value (float): 記録する値
+            **labels: ラベル
+        """
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            entry["counts"][index] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def get(self, **labels) -> dict:
+        """記録した値の件数と合計を取得するメソッドです。
+
+        Args:
+            **labels: ラベル
+
+        Returns:
+            dict: 件数(count)と合計(sum)。記録がない場合はどちらも0
+        """
+        with self._lock:
+            entry = self._values.get(_label_key(labels))
+            if entry is None:
+                return {"count": 0, "sum": 0.0}
+            return {"count": entry["count"], "sum": entry["sum"]}
+
+    def _cumulative(self, counts: list) -> list:
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def _snapshot(self) -> list:
+        return [{
+            "labels": dict(key),
+            "buckets": {_format_value(bound): count for bound, count in self._cumulative(entry["counts"])},
+            "sum": entry["sum"],
+            "count": entry["count"],
+        } for key, entry in self._values.items()]
+
+    def _prometheus_lines(self) -> list:
+        lines = []
+        for key, entry in self._values.items():
+            for bound, count in self._cumulative(entry["counts"]):
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(entry['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {entry['count']}")
+        return lines
+
+    def _reset(self):
+        self._values.clear()
+
+
+class MetricsRegistry():
+    """メトリクスを登録し、まとめて出力するクラスです。
+
+    Attributes:
+        instance:
+            _metrics(dict): 名前とメトリクスの組
+            _lock(threading.Lock): メトリクスの更新に用いるロック
+    """
+
+    def __init__(self):
+        """インスタンスの初期化メソッド"""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str) -> Counter:
+        """カウンターを取得するメソッドです。登録されていない場合は作成します。
+
+        Args:
+            name (str): メトリクスの名前
+            help (str): メトリクスの説明
+
+        Returns:
+            Counter: カウンター
+        """
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, help, self._lock)
+            return self._metrics[name]
+
+    def histogram(self, name: str, help: str, buckets: tuple = SECONDS_BUCKETS) -> Histogram:
+        """ヒストグラムを取得するメソッドです。登録されていない場合は作成します。
+
+        Args:
+            name (str): メトリクスの名前
+            help (str): メトリクスの説明
+            buckets (tuple, optional): バケットの上限値の一覧。デフォルトは秒数用のバケット
+
+        Returns:
+            Histogram: ヒストグラム
+        """
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help, self._lock, buckets)
+            return self._metrics[name]
+
+    def snapshot(self) -> dict:
+        """現在の値を辞書として取得するメソッドです。
+
+        Returns:
+            dict: メトリクスの名前ごとの種類、説明、ラベルごとの値
+        """
+        with self._lock:
+            return {name: {"type": metric.type, "help": metric.help, "values": metric._snapshot()}
+                    for name, metric in self._metrics.items()}
+
+    def to_prometheus(self) -> str:
+        """現在の値をPrometheusのテキスト形式で取得するメソッドです。
+
+        Returns:
+            str: Prometheusのテキスト形式の文字列
+        """
+        lines = []
+        with self._lock:
+            for name, metric in self._metrics.items():
+                lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.type}")
+                lines.extend(metric._prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """現在の値をPrometheusのテキスト形式でファイルに出力するメソッドです。
+
+        node_exporterのtextfile collectorが書き込み途中のファイルを読まないよう、一時ファイルに書き込んでから置き換えます。
+
+        Args:
+            path (str): 出力先のパス
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".prom")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def reset(self):
+        """すべてのメトリクスの値を破棄するメソッドです。"""
+        with self._lock:
+            for metric in self._metrics.values():
+                metric._reset()
+
+
+REGISTRY = MetricsRegistry()
+
+GRDM_REQUESTS = REGISTRY.counter(
+    "dg_mm_grdm_requests_total", "GRDMのAPIに送信したリクエストの数")
+GRDM_REQUEST_SECONDS = REGISTRY.histogram(
+    "dg_mm_grdm_request_seconds", "GRDMのAPIのレスポンスを受け取るまでの時間(秒)")
+GRDM_RESPONSE_BYTES = REGISTRY.histogram(
+    "dg_mm_grdm_response_bytes", "GRDMのAPIのレスポンスボディの大きさ(バイト)", BYTES_BUCKETS)
+GRDM_JSON_DECODE_SECONDS = REGISTRY.histogram(
+    "dg_mm_grdm_json_decode_seconds", "GRDMのAPIのレスポンスのJSONの変換にかかった時間(秒)")
+GRDM_REQUESTS_PER_MAPPING = REGISTRY.histogram(
+    "dg_mm_grdm_requests_per_mapping", "1回のマッピングでGRDMのAPIに送信したリクエストの数", COUNT_BUCKETS)
+TOKEN_CACHE = REGISTRY.counter(
+    "dg_mm_token_cache_total", "トークン検証結果のキャッシュの参照結果(hit/miss)の数")
+MAPPINGS = REGISTRY.counter(
+    "dg_mm_mappings_total", "マッピングの実行結果(success/error)ごとの数")
+MAPPING_SECONDS = REGISTRY.histogram(
+    "dg_mm_mapping_seconds", "1回のマッピングにかかった時間(秒)")
+ERRORS = REGISTRY.counter(
+    "dg_mm_errors_total", "発生したエラーの種類ごとの数")
+SERVER_REQUESTS = REGISTRY.counter(
+    "dg_mm_server_requests_total", "serveで受け付けたリクエストのエンドポイントとステータスコードごとの数")
+SERVER_REQUEST_SECONDS = REGISTRY.histogram(
+    "dg_mm_server_request_seconds", "serveでリクエストを処理するのにかかった時間(秒)")
+RESULT_CACHE = REGISTRY.counter(
+    "dg_mm_result_cache_total", "マッピングの結果のキャッシュの参照結果(hit/miss)の数")
@@ -12,3 +12,15 @@ class BaseMapping(Protocol):
 
     def mapping_metadata(self, schema: str, *args: Any, **kwargs: Any):
         """スキーマの定義に従いマッピングを行うメソッドです。"""
+
+    def mapping_metadata_for_schemas(self, schemas: list, *args: Any, **kwargs: Any) -> dict:
+        """複数のスキーマの定義に従いマッピングを行うメソッドです。"""
+
+    def fetch_source_data(self, schemas: list, *args: Any, **kwargs: Any) -> dict:
+        """マッピングを行わずに、マッピングに必要なデータをストレージから取得するメソッドです。"""
+
+    def mapping_metadata_from_sources(self, schema: str, source_data: dict, *args: Any, **kwargs: Any) -> dict:
+        """取得済みのデータからスキーマの定義に従いマッピングを行うメソッドです。"""
+
+    def get_metadata_sources(self) -> list:
+        """マッピング定義のsourceに指定できるデータ取得先の名称の一覧を取得するメソッドです。"""
@@ -0,0 +1,361 @@
+"""複数のプロジェクトのメタデータをまとめて出力するモジュールです。
+
+プロジェクトとスキーマごとにマッピングの入力のフィンガープリントを状態ファイルに記録し、
+前回の出力から入力が変わっていないプロジェクトはマッピングと出力を省略します。
+出力先は「出力先のフォルダ/スキーマの名称/プロジェクトID.拡張子」で、拡張子は出力形式(jsonなど)と
+圧縮方式(gzなど)によります。
+差分の出力先のフォルダを指定した場合は、前回の出力からの差分をJSON Patch(RFC 6902)の形式で
+「差分の出力先のフォルダ/スキーマの名称/プロジェクトID.拡張子」にも出力します。
+"""
+
+import json
+import os
+from logging import getLogger
+from typing import BinaryIO, Callable
+
+from dg_mm.compression import compressed_writer, decompressed_reader, get_extension
+from dg_mm.errors import DataFormatError, InvalidIdError, MetadatamanagerError
+from dg_mm.models.fingerprint import SourceFingerprint
+from dg_mm.models.json_patch import JsonPatch
+from dg_mm.models.metadata_manager import MetadataManager
+from dg_mm.output_format import JsonFormat, OutputFormat
+
+logger = getLogger(__name__)
+
+
+class ExportState():
+    """プロジェクトとスキーマごとのフィンガープリントを記録する状態ファイルです。
+
+    Attributes:
+        class:
+            VERSION(int):状態ファイルの形式のバージョン
+        instance:
+            path(str):状態ファイルのパス
+            _projects(dict):プロジェクトIDと、スキーマの名称とフィンガープリントの組の組
+    """
+    VERSION = 1
+
+    def __init__(self, path: str):
+        """インスタンスの初期化メソッド
+
+        状態ファイルが存在しない場合は、記録がない状態から開始します。
+
+        Args:
+            path (str): 状態ファイルのパス
+
+        Raises:
+            DataFormatError: 状態ファイルの形式に誤りがある
+        """
+        self.path = path
+        self._projects = {}
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.error(f"状態ファイルの読み込みに失敗({path})")
+            raise DataFormatError(f"状態ファイルのフォーマットに誤りがあります。({path})") from e
+        if not isinstance(state, dict) or not isinstance(state.get("projects"), dict):
+            logger.error(f"状態ファイルの形式が不正({path})")
+            raise DataFormatError(f"状態ファイルのフォーマットに誤りがあります。({path})")
+        # 形式が変わった場合は記録を引き継がず、すべて出力し直す
+        if state.get("version") == ExportState.VERSION:
+            self._projects = state["projects"]
+
+    def get(self, project_id: str, schema: str) -> str:
+        """記録されたフィンガープリントを取得するメソッドです。
+
+        Args:
+            project_id (str): プロジェクトID
+            schema (str): スキーマの名称
+
+        Returns:
+            str: フィンガープリント。記録がない場合はNone
+        """
+        return self._projects.get(project_id, {}).get(schema)
+
+    def set(self, project_id: str, schema: str, fingerprint: str):
+        """フィンガープリントを記録するメソッドです。
+
+        Args:
+            project_id (str): プロジェクトID
+            schema (str): スキーマの名称
+            fingerprint (str): フィンガープリント
+        """
+        self._projects.setdefault(project_id, {})[schema] = fingerprint
+
+    def save(self):
+        """状態ファイルに書き込むメソッドです。
+
+        書き込み途中で中断しても前回の状態ファイルが壊れないよう、一時ファイルに書き込んでから置き換えます。
+        """
+        content = json.dumps({"version": ExportState.VERSION, "projects": self._projects})
+        _write_atomic(self.path, lambda f: f.write(content.encode('utf-8')))
+
+
+class ExportReport():
+    """まとめて出力した結果です。
+
+    Attributes:
+        instance:
+            skipped(list):入力が変わっていないため出力を省略したプロジェクトIDの一覧
+            updated(list):出力したプロジェクトIDの一覧
+            failed(dict):失敗したプロジェクトIDとエラーメッセージの組
+    """
+
+    def __init__(self):
+        """インスタンスの初期化メソッド"""
+        self.skipped = []
+        self.updated = []
+        self.failed = {}
+
+    def summary(self) -> str:
+        """件数の要約を取得するメソッドです。
+
+        Returns:
+            str: 件数の要約
+        """
+        return f"skipped: {len(self.skipped)}, updated: {len(self.updated)}, failed: {len(self.failed)}"
+
+
+class BatchExporter():
+    """複数のプロジェクトのメタデータを、変更があったものだけ出力するクラスです。
+
+    Attributes:
+        instance:
+            schemas(list):スキーマの名称の一覧
+            storage(str):ストレージの名称
+            token(str):ストレージの認証情報
+            output_dir(str):出力先のフォルダ
+            filter_properties(list):スキーマの一部のキー
+            state(ExportState):フィンガープリントの記録。Noneの場合は常にすべて出力する
+            force(bool):Trueの場合は入力が変わっていなくてもすべて出力し、フィンガープリントを記録し直す
+            patch_dir(str):前回の出力からの差分の出力先のフォルダ。Noneの場合は差分を出力しない
+            output_format(OutputFormat):メタデータと差分の出力形式
+            compression(str):メタデータと差分の圧縮方式の名称。Noneの場合は圧縮しない
+            compress_level(int):圧縮レベル。Noneの場合は圧縮方式ごとの既定値
+            _manager(MetadataManager):メタデータの取得に用いるインスタンス
+    """
+
+    def __init__(self, schemas: list, storage: str, output_dir: str, token: str = None,
+                 filter_properties: list = None, state: ExportState = None, force: bool = False,
+                 manager: MetadataManager = None, patch_dir: str = None, output_format: OutputFormat = JsonFormat,
+                 compression: str = None, compress_level: int = None):
+        """インスタンスの初期化メソッド
+
+        Args:
+            schemas (list): スキーマの名称の一覧
+            storage (str): ストレージの名称
+            output_dir (str): 出力先のフォルダ
+            token (str, optional): ストレージの認証情報。デフォルトはNone
+            filter_properties (list, optional): スキーマの一部のキー。デフォルトはNone
+            state (ExportState, optional): フィンガープリントの記録。デフォルトはNone(常にすべて出力する)
+            force (bool, optional): Trueの場合は入力が変わっていなくてもすべて出力する。デフォルトはFalse
+            manager (MetadataManager, optional): メタデータの取得に用いるインスタンス。デフォルトはNone
+            patch_dir (str, optional): 前回の出力からの差分の出力先のフォルダ。デフォルトはNone(出力しない)
+            output_format (OutputFormat, optional): メタデータと差分の出力形式。デフォルトはJsonFormat
+            compression (str, optional): 圧縮方式の名称。デフォルトはNone(圧縮しない)
+            compress_level (int, optional): 圧縮レベル。デフォルトはNone(圧縮方式ごとの既定値)
+        """
+        self.schemas = list(dict.fromkeys(schemas))
+        self.storage = storage
+        self.output_dir = output_dir
+        self.token = token
+        self.filter_properties = filter_properties
+        self.state = state
+        self.force = force
+        self._manager = manager if manager is not None else MetadataManager()
+        self.patch_dir = patch_dir
+        self.output_format = output_format
+        self.compression = compression
+        self.compress_level = compress_level
+
+    def export(self, project_ids: list) -> ExportReport:
+        """プロジェクトごとにメタデータを出力するメソッドです。
+
+        プロジェクトで発生したエラーは結果に記録し、残りのプロジェクトの処理を続けます。
+        フィンガープリントの記録は、途中で中断した場合も処理済みのプロジェクトの分を状態ファイルに書き込みます。
+
+        Args:
+            project_ids (list): プロジェクトIDの一覧
+
+        Returns:
+            ExportReport: 出力した結果
+        """
+        report = ExportReport()
+        try:
+            for project_id in dict.fromkeys(project_ids):
+                try:
+                    updated = self._export_project(project_id)
+                except MetadatamanagerError as e:
+                    logger.error(f"プロジェクトの出力に失敗({project_id}: {type(e).__name__})")
+                    report.failed[project_id] = str(e)
+                    continue
+                (report.updated if updated else report.skipped).append(project_id)
+        finally:
+            if self.state is not None:
+                self.state.save()
+        return report
+
+    def get_output_path(self, project_id: str, schema: str) -> str:
+        """プロジェクトとスキーマの出力先のパスを取得するメソッドです。
+
+        Args:
+            project_id (str): プロジェクトID
+            schema (str): スキーマの名称
+
+        Returns:
+            str: 出力先のパス
+        """
+        return os.path.join(self.output_dir, schema, project_id + self._get_extension())
+
+    def get_patch_path(self, project_id: str, schema: str) -> str:
+        """プロジェクトとスキーマの差分の出力先のパスを取得するメソッドです。
+
+        Args:
+            project_id (str): プロジェクトID
+            schema (str): スキーマの名称
+
+        Returns:
+            str: 差分の出力先のパス
+        """
+        return os.path.join(self.patch_dir, schema, project_id + self._get_extension())
+
+    def _export_project(self, project_id: str) -> bool:
+        """1つのプロジェクトのメタデータを、入力が変わったスキーマについて出力するメソッドです。
+
+        Args:
+            project_id (str): プロジェクトID
+
+        Returns:
+            bool: いずれかのスキーマを出力した場合はTrue、すべて省略した場合はFalse
+
+        Raises:
+            InvalidIdError: プロジェクトIDをファイル名に使用できない
+        """
+        # プロジェクトIDを出力先のファイル名に用いるため、出力先のフォルダの外を指すIDは受け付けない
+        if project_id in (".", "..") or os.path.basename(project_id) != project_id or "/" in project_id:
+            logger.error(f"ファイル名に使用できないプロジェクトID({project_id})")
+            raise InvalidIdError("ファイル名に使用できないプロジェクトIDが指定されました。")
+
+        source_data = self._manager.get_source_data(
+            schemas=self.schemas, storage=self.storage, token=self.token, id=project_id,
+            filter_properties=self.filter_properties)
+
+        updated = False
+        for schema in self.schemas:
+            path = self.get_output_path(project_id, schema)
+            fingerprint = SourceFingerprint.compute(schema, self.storage, source_data, self.filter_properties)
+            if self._is_unchanged(project_id, schema, fingerprint, path):
+                continue
+
+            metadata = self._manager.get_metadata_from_sources(schema, self.storage, source_data, self.filter_properties)
+            if self.patch_dir is not None:
+                self._write_patch(project_id, schema, metadata, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, lambda f: self._dump(metadata, f))
+            if self.state is not None:
+                self.state.set(project_id, schema, fingerprint)
+            updated = True
+        return updated
+
+    def _write_patch(self, project_id: str, schema: str, metadata: dict, path: str):
+        """前回の出力からの差分を出力するメソッドです。差分がない場合は出力しません。
+
+        前回の出力がない、または読み込めない場合は、メタデータ全体を追加する差分を出力します。
+
+        Args:
+            project_id (str): プロジェクトID
+            schema (str): スキーマの名称
+            metadata (dict): 今回のメタデータ
+            path (str): 前回の出力のパス
+        """
+        previous = None
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f, decompressed_reader(f, self.compression) as reader:
+                    previous = self.output_format.loads(reader.read())
+            except (DataFormatError, OSError, EOFError):
+                logger.error(f"前回の出力の読み込みに失敗({path})")
+
+        patch = JsonPatch.diff(previous, metadata)
+        if not patch:
+            return
+        patch_path = self.get_patch_path(project_id, schema)
+        os.makedirs(os.path.dirname(patch_path), exist_ok=True)
+        _write_atomic(patch_path, lambda f: self._dump(patch, f))
+
+    def _dump(self, data, stream: BinaryIO):
+        """データを出力形式に変換し、圧縮しながら書き込むメソッドです。
+
+        Args:
+            data (Any): 出力するデータ
+            stream (BinaryIO): 出力先
+        """
+        with compressed_writer(stream, self.compression, self.compress_level) as writer:
+            self.output_format.dump(data, writer)
+
+    def _get_extension(self) -> str:
+        """出力するファイルの拡張子を取得するメソッドです。
+
+        Returns:
+            str: 出力形式と圧縮方式の拡張子をつなげたもの
+        """
+        return self.output_format.extension + get_extension(self.compression)
+
+    def _is_unchanged(self, project_id: str, schema: str, fingerprint: str, path: str) -> bool:
+        """前回の出力から入力が変わっていないかを判定するメソッドです。
+
+        Args:
+            project_id (str): プロジェクトID
+            schema (str): スキーマの名称
+            fingerprint (str): 今回の入力のフィンガープリント
+            path (str): 出力先のパス
+
+        Returns:
+            bool: 記録されたフィンガープリントと一致し、前回の出力が残っている場合はTrue
+        """
+        if self.state is None or self.force:
+            return False
+        return self.state.get(project_id, schema) == fingerprint and os.path.exists(path)
+
+
+def read_project_ids(path: str) -> list:
+    """プロジェクトIDの一覧のファイルを読み込む関数です。
+
+    1行に1つのプロジェクトIDを記載します。空行と「#」で始まる行は無視します。
+
+    Args:
+        path (str): ファイルのパス
+
+    Returns:
+        list: プロジェクトIDの一覧
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"ファイルが見つかりません: '{path}'")
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def _write_atomic(path: str, write: Callable[[BinaryIO], None]):
+    """一時ファイルに書き込んでから置き換えることで、ファイルを書き込み途中の状態にせずに出力する関数です。
+
+    Args:
+        path (str): 出力先のパス
+        write (Callable[[BinaryIO], None]): 一時ファイルに内容を書き込む関数
+    """
+    # mkstempは所有者のみが読める権限で作成するため、通常のファイルと同じ権限になるopenで作成する
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
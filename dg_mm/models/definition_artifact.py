@@ -0,0 +1,213 @@
+"""検証済みのマッピング定義をバイナリファイルに保存し、読み込むモジュールです。
+
+マッピング定義ファイル(JSON)を読み込むたびに行う変換と検証を省くため、検証済みのマッピング定義を
+マッピング定義ファイルと同じフォルダの__pycache__にmarshal形式で保存します(Pythonの.pycと同様)。
+保存したファイルは、1行目のヘッダーと、2行目以降のマッピング定義で構成します。
+
+    DGMMDEF {"format": 1, "version": "1.0.0", "marshal": 4, "size": 1234, "mtime_ns": ..., "sha256": "..."}
+
+ヘッダーの形式、パッケージのバージョン、marshalの形式が一致しない場合は使用しません。
+マッピング定義ファイルの大きさと更新日時がヘッダーと一致する場合は、1回の読み込みで保存した内容を使用します。
+一致しない場合はマッピング定義ファイルのハッシュ値を比較し、異なる場合はJSONから読み込み直して保存し直します。
+保存に失敗した場合(読み取り専用の場所にインストールされている場合など)は、保存せずにJSONから読み込んだ内容を使用します。
+sys.dont_write_bytecode(環境変数PYTHONDONTWRITEBYTECODE)が設定されている場合は保存しません。
+
+marshalは任意のオブジェクトを復元できないため、pickleと異なり、保存したファイルの読み込みでコードが実行されることはありません。
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+import threading
+from logging import getLogger
+
+import dg_mm
+from dg_mm.models.definition_compiler import CompiledComponents, DefinitionCompiler
+from dg_mm.util import PackageFileReader
+
+logger = getLogger(__name__)
+
+
+class DefinitionArtifact():
+    """検証済みのマッピング定義のバイナリファイルを管理するクラスです。
+
+    Attributes:
+        class:
+            MAGIC(bytes):ファイルの先頭の文字列
+            FORMAT_VERSION(int):ファイルの形式のバージョン。形式を変更した場合に更新する
+            CACHE_DIR(str):マッピング定義ファイルと同じフォルダの中の、保存先のフォルダ
+            SUFFIX(str):保存するファイルの拡張子
+    """
+    MAGIC = b"DGMMDEF"
+    FORMAT_VERSION = 1
+    CACHE_DIR = "__pycache__"
+    SUFFIX = ".marshal"
+
+    @classmethod
+    def get_path(cls, source_path: str) -> str:
+        """マッピング定義ファイルに対応する、保存先のファイルのパスを取得するメソッドです。
+
+        Args:
+            source_path (str): マッピング定義ファイルのパス
+
+        Returns:
+            str: 保存先のファイルのパス
+        """
+        directory, file_name = os.path.split(source_path)
+        return os.path.join(directory, cls.CACHE_DIR, os.path.splitext(file_name)[0] + cls.SUFFIX)
+
+    @classmethod
+    def load(cls, source_path: str) -> dict:
+        """検証済みのマッピング定義を読み込むメソッドです。
+
+        保存したファイルが有効な場合はその内容を、無効な場合はマッピング定義ファイルを読み込んで検証し、保存した内容を返します。
+
+        Args:
+            source_path (str): マッピング定義ファイルのパス
+
+        Returns:
+            dict: スキーマのプロパティとCompiledComponentsの組
+
+        Raises:
+            MappingDefinitionError: マッピング定義に誤りがある
+            OSError: マッピング定義ファイルを読み込めない
+            ValueError: マッピング定義ファイルのJSONの形式に誤りがある
+        """
+        stat = os.stat(source_path)
+        artifact_path = cls.get_path(source_path)
+        header, payload = cls._read(artifact_path)
+
+        if header is not None and header["size"] == stat.st_size and header["mtime_ns"] == stat.st_mtime_ns:
+            mapping_definition = cls._restore(payload)
+            if mapping_definition is not None:
+                return mapping_definition
+
+        with open(source_path, mode='rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+
+        mapping_definition = None
+        if header is not None and header["sha256"] == digest:
+            # 内容が同じで更新日時のみが異なる場合(インストールやチェックアウトなど)は、検証をやり直さない
+            mapping_definition = cls._restore(payload)
+        if mapping_definition is None:
+            mapping_definition = DefinitionCompiler.compile(PackageFileReader.decode_json(content, 'utf-8'))
+        cls._write(artifact_path, stat, digest, mapping_definition)
+        return mapping_definition
+
+    @classmethod
+    def build(cls, source_path: str) -> str:
+        """マッピング定義ファイルを検証し、保存するメソッドです。
+
+        インストール後やコンテナイメージの作成時などに、初回の読み込みを待たずに保存しておくために使用します。
+
+        Args:
+            source_path (str): マッピング定義ファイルのパス
+
+        Returns:
+            str: 保存先のファイルのパス
+
+        Raises:
+            MappingDefinitionError: マッピング定義に誤りがある
+            OSError: マッピング定義ファイルを読み込めない、または保存できない
+            ValueError: マッピング定義ファイルのJSONの形式に誤りがある
+        """
+        stat = os.stat(source_path)
+        with open(source_path, mode='rb') as f:
+            content = f.read()
+        mapping_definition = DefinitionCompiler.compile(PackageFileReader.decode_json(content, 'utf-8'))
+        artifact_path = cls.get_path(source_path)
+        cls._write(artifact_path, stat, hashlib.sha256(content).hexdigest(), mapping_definition, force=True)
+        return artifact_path
+
+    @classmethod
+    def _read(cls, artifact_path: str) -> tuple:
+        """保存したファイルを読み込み、ヘッダーを確認するメソッドです。
+
+        Args:
+            artifact_path (str): 保存先のファイルのパス
+
+        Returns:
+            tuple: ヘッダーとマッピング定義のバイト列の組。ファイルが存在しない、または使用できない場合は(None, None)
+        """
+        try:
+            with open(artifact_path, mode='rb') as f:
+                content = f.read()
+        except OSError:
+            return None, None
+
+        header_line, separator, payload = content.partition(b"\n")
+        if not separator or not header_line.startswith(cls.MAGIC + b" "):
+            return None, None
+        try:
+            header = json.loads(header_line[len(cls.MAGIC) + 1:])
+        except ValueError:
+            return None, None
+        if not isinstance(header, dict) or header.get("format") != cls.FORMAT_VERSION \
+                or header.get("version") != dg_mm.__version__ or header.get("marshal") != marshal.version:
+            return None, None
+        if not all(key in header for key in ("size", "mtime_ns", "sha256")):
+            return None, None
+        return header, payload
+
+    @classmethod
+    def _restore(cls, payload: bytes) -> dict:
+        """保存したマッピング定義を復元するメソッドです。
+
+        Args:
+            payload (bytes): マッピング定義のバイト列
+
+        Returns:
+            dict: スキーマのプロパティとCompiledComponentsの組。復元できない場合はNone
+        """
+        try:
+            states = marshal.loads(payload)
+            return {
+                schema_property: CompiledComponents.from_state(components, state)
+                for schema_property, (components, state) in states.items()}
+        except Exception:
+            return None
+
+    @classmethod
+    def _write(cls, artifact_path: str, stat: os.stat_result, digest: str, mapping_definition: dict, force: bool = False):
+        """検証済みのマッピング定義を保存するメソッドです。
+
+        Args:
+            artifact_path (str): 保存先のファイルのパス
+            stat (os.stat_result): マッピング定義ファイルの状態
+            digest (str): マッピング定義ファイルのSHA-256のハッシュ値
+            mapping_definition (dict): スキーマのプロパティとCompiledComponentsの組
+            force (bool, optional): Trueの場合は、sys.dont_write_bytecodeに関わらず保存し、失敗した場合はOSErrorを送出する
+
+        Raises:
+            OSError: forceがTrueで、保存に失敗した
+        """
+        if sys.dont_write_bytecode and not force:
+            return
+        header = {
+            "format": cls.FORMAT_VERSION,
+            "version": dg_mm.__version__,
+            "marshal": marshal.version,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+        }
+        payload = marshal.dumps({
+            schema_property: (dict(components), components.plan.to_state())
+            for schema_property, components in mapping_definition.items()})
+        content = cls.MAGIC + b" " + json.dumps(header).encode('utf-8') + b"\n" + payload
+
+        tmp_path = f"{artifact_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, artifact_path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if force:
+                raise
+            logger.debug(f"検証済みのマッピング定義を保存できない({artifact_path}: {e})")
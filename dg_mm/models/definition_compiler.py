@@ -0,0 +1,283 @@
+"""マッピング定義を検証し、マッピングの処理に用いる形式に変換するモジュールです。
+
+マッピング定義の構造の誤り(valueのパスに含まれないlistのキー、対応していない型、スキーマのデータ構造の不一致など)は
+マッピングの処理の中ではリストの項目ごとに確認されます。このモジュールではそれらを読み込み時に一度だけ確認し、
+誤りがある場合はすべての誤りを示して読み込みを中止します。
+
+検証したマッピング定義は、プロパティごとにキーの分割やリストの対応の検索を済ませたPropertyPlanを持つ
+CompiledComponentsに変換します。CompiledComponentsはdictのサブクラスのため、従来のマッピング定義と同様に扱えます。
+"""
+
+from logging import getLogger
+from typing import Optional
+
+from dg_mm.errors import MappingDefinitionError
+
+logger = getLogger(__name__)
+
+# マッピング定義で指定できる型
+SUPPORTED_TYPES = ("string", "boolean", "number")
+
+# マッピング定義のプロパティで指定できるキー
+_COMPONENT_KEYS = ("type", "source", "value", "list")
+
+
+class PropertyPlan():
+    """検証済みのプロパティについて、マッピングの処理に必要な値を計算しておくクラスです。
+
+    Attributes:
+        instance:
+            type(str):スキーマの求めるデータの型
+            storage_keys(tuple):ストレージのデータまでのキーの一覧
+            links(tuple):storage_keysの各キーまでのパスに対応するlistの値。定義がない場合はNone
+            schema_keys(tuple):スキーマの最終キーより前のキーごとの(キー, []を除いたキー, リストか, 先頭からの[]を除いたパス)
+            final_key(str):スキーマの最終キー
+    """
+
+    __slots__ = ("type", "storage_keys", "links", "schema_keys", "final_key")
+
+    def __init__(self, schema_property: str, components: dict):
+        """インスタンスの初期化メソッド
+
+        Args:
+            schema_property (str): スキーマのプロパティまでのキーをつなげた文字列
+            components (dict): 検証済みのマッピング定義情報
+        """
+        self.type = components.get("type")
+        value = components.get("value")
+        self.storage_keys = tuple(value.split(".")) if value is not None else ()
+        list_info = components.get("list") or {}
+        self.links = tuple(
+            list_info.get(".".join(self.storage_keys[:index + 1])) for index in range(len(self.storage_keys)))
+
+        keys = schema_property.split(".")
+        base_keys = [key.replace("[]", "") for key in keys]
+        self.schema_keys = tuple(
+            (key, base_keys[index], "[]" in key, ".".join(base_keys[:index + 1]))
+            for index, key in enumerate(keys[:-1]))
+        self.final_key = keys[-1]
+
+    def __repr__(self) -> str:
+        return f"PropertyPlan({self.type!r}, {'.'.join(self.storage_keys)!r})"
+
+    def to_state(self) -> tuple:
+        """計算済みの値を、marshalで保存できる組に変換するメソッドです。
+
+        Returns:
+            tuple: __slots__の順の値の組
+        """
+        return tuple(getattr(self, name) for name in PropertyPlan.__slots__)
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "PropertyPlan":
+        """to_stateで変換した組から、計算をやり直さずにインスタンスを作成するメソッドです。
+
+        Args:
+            state (tuple): __slots__の順の値の組
+
+        Returns:
+            PropertyPlan: 作成したインスタンス
+        """
+        plan = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, state):
+            setattr(plan, name, value)
+        return plan
+
+
+class CompiledComponents(dict):
+    """検証済みのマッピング定義情報です。dictとして扱え、planにPropertyPlanを保持します。"""
+
+    __slots__ = ("plan",)
+
+    def __init__(self, schema_property: str, components: dict):
+        """インスタンスの初期化メソッド
+
+        Args:
+            schema_property (str): スキーマのプロパティまでのキーをつなげた文字列
+            components (dict): 検証済みのマッピング定義情報
+        """
+        super().__init__(components)
+        self.plan = PropertyPlan(schema_property, components)
+
+    def __reduce__(self):
+        return (CompiledComponents.from_state, (dict(self), self.plan.to_state()))
+
+    @classmethod
+    def from_state(cls, components: dict, state: tuple) -> "CompiledComponents":
+        """マッピング定義情報とPropertyPlan.to_stateの組から、計算をやり直さずにインスタンスを作成するメソッドです。
+
+        Args:
+            components (dict): 検証済みのマッピング定義情報
+            state (tuple): PropertyPlan.to_stateで変換した組
+
+        Returns:
+            CompiledComponents: 作成したインスタンス
+        """
+        compiled = cls.__new__(cls)
+        dict.update(compiled, components)
+        compiled.plan = PropertyPlan.from_state(state)
+        return compiled
+
+
+class DefinitionCompiler():
+    """マッピング定義の検証と変換を行うクラスです。"""
+
+    @classmethod
+    def validate(cls, mapping_definition: dict, sources: list = None) -> list:
+        """マッピング定義の構造の誤りを確認するメソッドです。
+
+        Args:
+            mapping_definition (dict): マッピング定義
+            sources (list, optional): 指定できるデータ取得先の一覧。Noneの場合は確認しない
+
+        Returns:
+            list: 誤りのメッセージの一覧。誤りがない場合は空のリスト
+        """
+        if not isinstance(mapping_definition, dict):
+            return ["マッピング定義はオブジェクトで指定してください。"]
+
+        diagnostics = []
+        shapes = {}
+        for schema_property, components in mapping_definition.items():
+            diagnostics.extend(cls._validate_property(schema_property, components, sources))
+            diagnostics.extend(cls._validate_shape(schema_property, shapes))
+        return diagnostics
+
+    @classmethod
+    def compile(cls, mapping_definition: dict, sources: list = None) -> dict:
+        """マッピング定義を検証し、プロパティごとにCompiledComponentsに変換するメソッドです。
+
+        Args:
+            mapping_definition (dict): マッピング定義
+            sources (list, optional): 指定できるデータ取得先の一覧。Noneの場合は確認しない
+
+        Returns:
+            dict: スキーマのプロパティとCompiledComponentsの組
+
+        Raises:
+            MappingDefinitionError: マッピング定義に誤りがある
+        """
+        diagnostics = cls.validate(mapping_definition, sources)
+        if diagnostics:
+            for diagnostic in diagnostics:
+                logger.error(f"マッピング定義の誤り({diagnostic})")
+            raise MappingDefinitionError(
+                f"マッピング定義に{len(diagnostics)}件の誤りがあります。:" + ", ".join(diagnostics))
+        return {
+            schema_property: CompiledComponents(schema_property, components)
+            for schema_property, components in mapping_definition.items()}
+
+    @classmethod
+    def _validate_property(cls, schema_property: str, components: dict, sources: Optional[list]) -> list:
+        """1つのプロパティのマッピング定義情報を確認するメソッドです。
+
+        Args:
+            schema_property (str): スキーマのプロパティまでのキーをつなげた文字列
+            components (dict): マッピング定義情報
+            sources (list, optional): 指定できるデータ取得先の一覧。Noneの場合は確認しない
+
+        Returns:
+            list: 誤りのメッセージの一覧
+        """
+        if not isinstance(components, dict):
+            return [f"マッピング定義情報はオブジェクトで指定してください。({schema_property})"]
+
+        diagnostics = []
+        unknown_keys = [key for key in components if key not in _COMPONENT_KEYS]
+        if unknown_keys:
+            diagnostics.append(f"不明なキー:{unknown_keys}が指定されています。({schema_property})")
+
+        type = components.get("type")
+        if type not in SUPPORTED_TYPES:
+            diagnostics.append(f"type:{type}は有効な型ではありません。({schema_property})")
+
+        value = components.get("value")
+        if value is None:
+            return diagnostics
+        if not isinstance(value, str) or "" in value.split("."):
+            diagnostics.append(f"value:{value}はキーを「.」でつなげた文字列で指定してください。({schema_property})")
+            return diagnostics
+
+        source = components.get("source")
+        if not isinstance(source, str):
+            diagnostics.append(f"sourceが指定されていません。({schema_property})")
+        elif sources is not None and source not in sources:
+            diagnostics.append(f"メタデータ取得先:{source}が存在しません。({schema_property})")
+
+        list_info = components.get("list")
+        if list_info is None:
+            return diagnostics
+        if not isinstance(list_info, dict):
+            diagnostics.append(f"listはオブジェクトで指定してください。({schema_property})")
+            return diagnostics
+
+        storage_keys = value.split(".")
+        schema_lists = cls._get_schema_lists(schema_property)
+        linked = {}
+        for storage_path, link in list_info.items():
+            path_keys = storage_path.split(".")
+            if path_keys != storage_keys[:len(path_keys)]:
+                diagnostics.append(f"listのキー:{storage_path}がvalueのパスに含まれていません。({schema_property})")
+            if isinstance(link, bool) or not isinstance(link, (str, int)):
+                diagnostics.append(
+                    f"list:{storage_path}にはスキーマのリストかインデックスを指定してください。({schema_property})")
+            elif isinstance(link, int):
+                if link < 0:
+                    diagnostics.append(
+                        f"list:{storage_path}のインデックス:{link}は0以上で指定してください。({schema_property})")
+            elif link not in schema_lists:
+                diagnostics.append(
+                    f"list:{storage_path}に対応するスキーマのリスト:{link}がプロパティに含まれていません。({schema_property})")
+            elif link in linked:
+                diagnostics.append(
+                    f"スキーマのリスト:{link}に複数のlist:{[linked[link], storage_path]}が対応しています。({schema_property})")
+            else:
+                linked[link] = storage_path
+        return diagnostics
+
+    @classmethod
+    def _validate_shape(cls, schema_property: str, shapes: dict) -> list:
+        """スキーマのデータ構造がほかのプロパティと一致するかを確認するメソッドです。
+
+        Args:
+            schema_property (str): スキーマのプロパティまでのキーをつなげた文字列
+            shapes (dict): 確認済みのプロパティの[]を除いたパスと、(データ構造, プロパティ)の組。このメソッドで追加する
+
+        Returns:
+            list: 誤りのメッセージの一覧
+        """
+        keys = schema_property.split(".")
+        for key in keys:
+            base_key = key.replace("[]", "")
+            if not base_key or key not in (base_key, base_key + "[]"):
+                return [f"キー:{key}の形式に誤りがあります。({schema_property})"]
+
+        diagnostics = []
+        for index, key in enumerate(keys):
+            path = ".".join(keys[:index + 1]).replace("[]", "")
+            is_list = key.endswith("[]")
+            if index < len(keys) - 1:
+                shape = "list" if is_list else "object"
+            else:
+                shape = "value_list" if is_list else "value"
+            existing = shapes.setdefault(path, (shape, schema_property))
+            if existing[0] != shape:
+                diagnostics.append(
+                    f"{path}のデータ構造がプロパティ:{existing[1]}と異なっています。({schema_property})")
+                break
+        return diagnostics
+
+    @classmethod
+    def _get_schema_lists(cls, schema_property: str) -> list:
+        """プロパティに含まれるスキーマのリストの、[]を除いたパスの一覧を取得するメソッドです。
+
+        Args:
+            schema_property (str): スキーマのプロパティまでのキーをつなげた文字列
+
+        Returns:
+            list: スキーマのリストのパスの一覧
+        """
+        keys = schema_property.split(".")
+        base_keys = [key.replace("[]", "") for key in keys]
+        return [".".join(base_keys[:index + 1]) for index, key in enumerate(keys) if "[]" in key]
+
@@ -0,0 +1,91 @@
+"""マッピングの入力の同一性を判定するフィンガープリントを計算するモジュールです。
+
+フィンガープリントはスキーマのマッピングに用いるデータ取得先のデータ、絞り込んだマッピング定義、
+パッケージのバージョンから計算します。フィンガープリントが同じであれば、マッピングの結果も同じになります。
+"""
+
+import hashlib
+import json
+
+from dg_mm.models.mapping_definition import DefinitionManager
+
+# フィンガープリントの計算方法を変更した場合に更新する
+_FORMAT_VERSION = 1
+
+
+class SourceFingerprint():
+    """マッピングの入力のフィンガープリントを計算するクラスです。"""
+
+    @classmethod
+    def compute(cls, schema: str, storage: str, source_data: dict, filter_properties: list = None) -> str:
+        """スキーマのマッピングの入力のフィンガープリントを計算するメソッドです。
+
+        source_dataのうち、スキーマのマッピング定義が参照するデータ取得先のデータのみを用います。
+
+        Args:
+            schema (str): スキーマの名称
+            storage (str): ストレージの名称
+            source_data (dict): データ取得先ごとのストレージのデータ
+            filter_properties (list, optional): スキーマの一部のキー。デフォルトはNone
+
+        Returns:
+            str: フィンガープリント(SHA-256の16進数表記)
+
+        Raises:
+            MappingDefinitionNotFoundError: マッピング定義ファイルが存在しない
+            KeyNotFoundError: 絞り込むプロパティが存在しない
+        """
+        mapping_definition = DefinitionManager.get_and_filter_mapping_definition(schema, storage, filter_properties)
+        return cls.compute_for_definition(mapping_definition, source_data)
+
+    @classmethod
+    def compute_for_definition(cls, mapping_definition: dict, source_data: dict) -> str:
+        """絞り込んだマッピング定義によるマッピングの入力のフィンガープリントを計算するメソッドです。
+
+        Args:
+            mapping_definition (dict): 絞り込んだマッピング定義
+            source_data (dict): データ取得先ごとのストレージのデータ
+
+        Returns:
+            str: フィンガープリント(SHA-256の16進数表記)
+        """
+        # パッケージの読み込み中に参照しないよう、ここで読み込む
+        import dg_mm
+
+        sources = cls.get_sources(mapping_definition)
+        document = [
+            _FORMAT_VERSION,
+            dg_mm.__version__,
+            mapping_definition,
+            {source: source_data.get(source) for source in sources},
+        ]
+        return cls.hash_document(document)
+
+    @classmethod
+    def get_sources(cls, mapping_definition: dict) -> list:
+        """マッピング定義が参照するデータ取得先を取得するメソッドです。
+
+        Args:
+            mapping_definition (dict): マッピング定義
+
+        Returns:
+            list: 名前順のデータ取得先の一覧
+        """
+        sources = {components.get("source") for components in mapping_definition.values()}
+        sources.discard(None)
+        return sorted(sources)
+
+    @classmethod
+    def hash_document(cls, document) -> str:
+        """JSONに変換できる値のハッシュ値を計算するメソッドです。
+
+        キーの順序や空白によらず同じ値になるよう、キーを並べ替えた区切り文字のないJSONから計算します。
+
+        Args:
+            document (Any): JSONに変換できる値
+
+        Returns:
+            str: ハッシュ値(SHA-256の16進数表記)
+        """
+        canonical = json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
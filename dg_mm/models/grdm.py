@@ -1,10 +1,26 @@
 """GRDMストレージに関するモジュールです。"""
 
-from typing import Optional, Any
+from typing import Optional, Any, Iterator, Union
 from logging import getLogger
+import configparser
+import contextlib
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import requests
 
+from dg_mm import json_backend, metrics
+from dg_mm.instrumentation import span
+from dg_mm.models.definition_compiler import PropertyPlan
+from dg_mm.models.fingerprint import SourceFingerprint
 from dg_mm.models.mapping_definition import DefinitionManager
+from dg_mm.models.mapping_errors import DATA_TYPE, KEY_NOT_FOUND, ErrorDetail, ErrorSummary, MappingErrorCollector
+from dg_mm.models.result_cache import BaseResultCache
+from dg_mm.models.stream_parser import PrunedJsonParser
+from dg_mm.models.transport import BaseTransport, RequestsTransport
 from dg_mm.errors import (
     MappingDefinitionNotFoundError,
     UnauthorizedError,
@@ -27,14 +43,49 @@ logger = getLogger(__name__)
 class GrdmMapping():
     """GRDMとのマッピングを行うクラスです。
 
+    マッピング定義や取得したデータなどの1回のマッピングに関する状態はインスタンスに保持せず、
+    すべて引数で受け渡します。そのため、1つのインスタンスを複数のスレッドから同時に使用できます。
+
     Attributes:
-        instance:
-            _mapping_definition(dict): マッピング定義
-            _new_schema(dict): 作成するスキーマ
+        class:
+            _SOURCE_GETTERS(dict): メタデータ取得先の名称と、データを取得するGrdmAccessのメソッド名の組
+            _PAGED_SOURCES(dict): ページごとに受け取りながらマッピングできるメタデータ取得先の名称と、
+                ページを取得するGrdmAccessのジェネレーターの名前、ページの項目のリストのキーの組
+            _CONVERTERS(dict): マッピング定義の型の名称と、データの型を変換するメソッド名の組
+            _result_cache(BaseResultCache): マッピングの結果のキャッシュ。Noneの場合は使用しない
 
     """
+    _SOURCE_GETTERS = {
+        "project_info": "get_project_info",
+        "member_info": "get_member_info",
+        "project_metadata": "get_project_metadata",
+        "file_metadata": "get_file_metadata",
+    }
+    _PAGED_SOURCES = {
+        "member_info": ("iter_member_info", "data"),
+    }
+    _CONVERTERS = {
+        "string": "_convert_string",
+        "boolean": "_convert_boolean",
+        "number": "_convert_number",
+    }
+    _result_cache = None
+
+    @classmethod
+    def configure_result_cache(cls, result_cache: BaseResultCache = None):
+        """マッピングの結果のキャッシュを設定するメソッドです。
+
+        設定した場合、データ取得先のデータと絞り込んだマッピング定義が以前と同じであれば、
+        マッピングを行わずにキャッシュした結果を返します。
+
+        Args:
+            result_cache (BaseResultCache, optional): キャッシュ。Noneの場合はキャッシュを使用しない
+        """
+        cls._result_cache = result_cache
 
-    def mapping_metadata(self, schema: str, token: str, project_id: str, filter_properties: list = None, project_metadata_id: str = None) -> dict:
+    def mapping_metadata(
+            self, schema: str, token: str, project_id: str, filter_properties: list = None,
+            project_metadata_id: str = None, deadline: float = None) -> dict:
         """スキーマの定義に従いマッピングを行うメソッドです。
 
         Args:
@@ -43,6 +94,7 @@ class GrdmMapping():
             project_id (str): GRDMのプロジェクトを一意に定めるID
             filter_properties (list): スキーマの絞り込みに用いるプロパティの一覧。デフォルトはNone
             project_metadata_id (str): プロジェクトメタデータを一意に定めるID。デフォルトはNone.
+            deadline (float): このメソッド内で行うGRDMへのリクエスト全体の制限時間(秒)。デフォルトはNone(設定ファイルの値を使用)
 
         Returns:
             dict: スキーマにデータを挿入したもの
@@ -53,77 +105,622 @@ class GrdmMapping():
             KeyNotFoundError: 一致するキーが見つからない
             DataTypeError: 型の変換ができない
             DataFormatError: データの形式に誤りがある
+            APIError: GRDMのAPIでエラーが発生した、または通信に失敗した
+
+        """
+        return self.mapping_metadata_for_schemas(
+            [schema], token, project_id, filter_properties, project_metadata_id, deadline)[schema]
+
+    def mapping_metadata_for_schemas(
+            self, schemas: list, token: str, project_id: str, filter_properties: list = None,
+            project_metadata_id: str = None, deadline: float = None) -> dict:
+        """複数のスキーマの定義に従いマッピングを行うメソッドです。
+
+        すべてのスキーマのマッピング定義で必要なデータ取得先からそれぞれ1回だけデータを取得し、
+        取得したデータを各スキーマのマッピングで共有します。
+
+        Args:
+            schemas (list): スキーマを一意に定める文字列の一覧
+            token (str): GRDMの認証に用いるトークン
+            project_id (str): GRDMのプロジェクトを一意に定めるID
+            filter_properties (list): スキーマの絞り込みに用いるプロパティの一覧。すべてのスキーマに適用する。デフォルトはNone
+            project_metadata_id (str): プロジェクトメタデータを一意に定めるID。デフォルトはNone.
+            deadline (float): このメソッド内で行うGRDMへのリクエスト全体の制限時間(秒)。デフォルトはNone(設定ファイルの値を使用)
+
+        Returns:
+            dict: スキーマの名称と、そのスキーマにデータを挿入したものの組
+
+        Raises:
+            InvalidSchemaError: スキーマ不正
+            MappingDefinitionError: マッピング定義の内容に誤りがある
+            KeyNotFoundError: 一致するキーが見つからない
+            DataTypeError: 型の変換ができない
+            DataFormatError: データの形式に誤りがある
+            APIError: GRDMのAPIでエラーが発生した、または通信に失敗した
 
         """
-        # GRDMの認証
         grdm_access = GrdmAccess()
-        grdm_access.check_authentication(token, project_id)
+        grdm_access.set_deadline(deadline)
+        with self._track_mapping(grdm_access), self._convert_http_error():
+            # GRDMの認証
+            with span("check_authentication"):
+                grdm_access.check_authentication(token, project_id)
+
+            mapping_definitions = self._get_mapping_definitions(schemas, filter_properties)
+            metadata_sources = self._find_all_metadata_sources(mapping_definitions)
+            paged_source, paged_properties = self._find_paged_source(grdm_access, mapping_definitions, metadata_sources)
+
+            # 各データ取得先からデータを取得
+            source_data = self._fetch_source_data(
+                grdm_access, [source for source in metadata_sources if source != paged_source],
+                project_metadata_id, self._find_source_paths(mapping_definitions))
+
+            if paged_source is not None:
+                # ページを受け取りながらマッピング
+                return self._map_source_pages(
+                    grdm_access, mapping_definitions, source_data, paged_source, paged_properties)
+
+            new_schemas = {}
+            for schema, mapping_definition in mapping_definitions.items():
+                new_schemas[schema] = self._map_source_data(mapping_definition, source_data)
+        return new_schemas
+
+    @classmethod
+    def get_metadata_sources(cls) -> list:
+        """マッピング定義のsourceに指定できるデータ取得先の名称の一覧を取得するメソッドです。
+
+        Returns:
+            list: データ取得先の名称の一覧
+        """
+        return list(cls._SOURCE_GETTERS)
+
+    def fetch_source_data(
+            self, schemas: list, token: str, project_id: str, filter_properties: list = None,
+            project_metadata_id: str = None, deadline: float = None) -> dict:
+        """マッピングを行わずに、スキーマのマッピングに必要なデータをGRDMから取得するメソッドです。
+
+        取得したデータはmapping_metadata_from_sourcesに渡すことで、GRDMにアクセスせずにマッピングできます。
+
+        Args:
+            schemas (list): スキーマを一意に定める文字列の一覧
+            token (str): GRDMの認証に用いるトークン
+            project_id (str): GRDMのプロジェクトを一意に定めるID
+            filter_properties (list): スキーマの絞り込みに用いるプロパティの一覧。デフォルトはNone
+            project_metadata_id (str): プロジェクトメタデータを一意に定めるID。デフォルトはNone.
+            deadline (float): このメソッド内で行うGRDMへのリクエスト全体の制限時間(秒)。デフォルトはNone(設定ファイルの値を使用)
+
+        Returns:
+            dict: データ取得先ごとのストレージのデータ
+
+        Raises:
+            InvalidSchemaError: スキーマ不正
+            MappingDefinitionError: マッピング定義の内容に誤りがある
+            APIError: GRDMのAPIでエラーが発生した、または通信に失敗した
+
+        """
+        grdm_access = GrdmAccess()
+        grdm_access.set_deadline(deadline)
+        with self._convert_http_error():
+            with span("check_authentication"):
+                grdm_access.check_authentication(token, project_id)
+
+            mapping_definitions = self._get_mapping_definitions(list(dict.fromkeys(schemas)), filter_properties)
+            metadata_sources = self._find_all_metadata_sources(mapping_definitions)
+            return self._fetch_source_data(
+                grdm_access, metadata_sources, project_metadata_id, self._find_source_paths(mapping_definitions))
 
-        # マッピング定義の取得
+    def mapping_metadata_from_sources(self, schema: str, source_data: dict, filter_properties: list = None) -> dict:
+        """GRDMにアクセスせずに、取得済みのデータからスキーマの定義に従いマッピングを行うメソッドです。
+
+        Args:
+            schema (str): スキーマを一意に定める文字列
+            source_data (dict): データ取得先ごとのストレージのデータ。fetch_source_dataの戻り値と同じ形式
+            filter_properties (list): スキーマの絞り込みに用いるプロパティの一覧。デフォルトはNone
+
+        Returns:
+            dict: スキーマにデータを挿入したもの
+
+        Raises:
+            InvalidSchemaError: スキーマ不正
+            MappingDefinitionError: マッピング定義の内容に誤りがある
+            MetadataNotFoundError: マッピングに必要なデータ取得先のデータが存在しない
+            KeyNotFoundError: 一致するキーが見つからない
+            DataTypeError: 型の変換ができない
+            DataFormatError: データの形式に誤りがある
+
+        """
+        with self._track_mapping():
+            mapping_definitions = self._get_mapping_definitions([schema], filter_properties)
+            metadata_sources = self._find_all_metadata_sources(mapping_definitions)
+
+            error_sources = [source for source in metadata_sources if source not in GrdmMapping._SOURCE_GETTERS]
+            if error_sources:
+                logger.error(f"メタデータ取得先が存在しない({error_sources})")
+                raise MappingDefinitionError(f"メタデータ取得先:{error_sources}が存在しません。")
+            missing_sources = [source for source in metadata_sources if source not in source_data]
+            if missing_sources:
+                logger.error(f"データ取得先のデータが存在しない({missing_sources})")
+                raise MetadataNotFoundError(f"データ取得先:{missing_sources}のデータが存在しません。")
+
+            return self._map_source_data(mapping_definitions[schema], source_data)
+
+    @contextlib.contextmanager
+    def _track_mapping(self, grdm_access: 'GrdmAccess' = None) -> Iterator[None]:
+        """ブロック内で行うマッピングの結果と処理時間をメトリクスに記録するコンテキストマネージャーです。
+
+        Args:
+            grdm_access (GrdmAccess, optional): GRDMへのアクセスに用いたインスタンス。
+                指定した場合はリクエストの数も記録する。デフォルトはNone
+        """
+        start = time.perf_counter()
         try:
-            storage = "GRDM"
-            self._mapping_definition = DefinitionManager.get_and_filter_mapping_definition(
-                schema, storage, filter_properties)
-        except MappingDefinitionNotFoundError as e:
-            raise InvalidSchemaError("対応していないスキーマが指定されました。") from e
+            yield
+        except Exception as e:
+            metrics.ERRORS.inc(type=type(e).__name__)
+            metrics.MAPPINGS.inc(result="error")
+            raise
+        else:
+            metrics.MAPPINGS.inc(result="success")
+        finally:
+            metrics.MAPPING_SECONDS.observe(time.perf_counter() - start)
+            if grdm_access is not None:
+                metrics.GRDM_REQUESTS_PER_MAPPING.observe(grdm_access._request_count)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _convert_http_error() -> Iterator[None]:
+        """ブロック内で発生した想定外のHTTPエラーをAPIErrorに変換するコンテキストマネージャーです。
+
+        呼び出し元がrequestsの例外を扱わずに、他のエラーと同じくMetadatamanagerErrorとして扱えるようにします。
+
+        Raises:
+            APIError: GRDMのAPIが想定外のステータスコードを返した
+        """
+        try:
+            yield
+        except requests.exceptions.HTTPError as e:
+            raise APIError(f"APIリクエストが失敗しました({e.response.status_code if e.response is not None else 'unknown'})") from e
+
+    def _get_mapping_definitions(self, schemas: list, filter_properties: list) -> dict:
+        """スキーマごとのマッピング定義を取得するメソッドです。
+
+        Args:
+            schemas (list): スキーマを一意に定める文字列の一覧
+            filter_properties (list): スキーマの絞り込みに用いるプロパティの一覧
+
+        Returns:
+            dict: スキーマの名称とマッピング定義の組
+
+        Raises:
+            InvalidSchemaError: スキーマ不正
+
+        """
+        mapping_definitions = {}
+        for schema in schemas:
+            try:
+                storage = "GRDM"
+                mapping_definitions[schema] = DefinitionManager.get_and_filter_mapping_definition(
+                    schema, storage, filter_properties)
+            except MappingDefinitionNotFoundError as e:
+                raise InvalidSchemaError("対応していないスキーマが指定されました。") from e
+        return mapping_definitions
+
+    def _find_all_metadata_sources(self, mapping_definitions: dict) -> list:
+        """すべてのマッピング定義で必要なメタデータの取得先の和集合を特定するメソッドです。
+
+        Args:
+            mapping_definitions (dict): スキーマの名称とマッピング定義の組
+
+        Returns:
+            list: メタデータの取得先の一覧
+
+        """
+        metadata_sources = []
+        for mapping_definition in mapping_definitions.values():
+            for source in self._find_metadata_sources(mapping_definition):
+                if source not in metadata_sources:
+                    metadata_sources.append(source)
+        return metadata_sources
 
-        # メタデータ取得先の特定
-        metadata_sources = self._find_metadata_sources()
+    def _find_source_paths(self, mapping_definitions: dict) -> dict:
+        """すべてのマッピング定義がデータ取得先ごとに参照するパスを特定するメソッドです。
+
+        Args:
+            mapping_definitions (dict): スキーマの名称とマッピング定義の組
+
+        Returns:
+            dict: データ取得先の名称と、参照するパス(キーのリスト)の一覧の組
+        """
+        source_paths = {}
+        for mapping_definition in mapping_definitions.values():
+            for components in mapping_definition.values():
+                source = components.get("source")
+                storage_path = components.get("value")
+                if source is None or storage_path is None:
+                    continue
+                # リストの定義のキーはvalueの途中までと一致するため、valueのみを用いる
+                paths = source_paths.setdefault(source, [])
+                keys = storage_path.split(".")
+                if keys not in paths:
+                    paths.append(keys)
+        return source_paths
+
+    def _fetch_source_data(
+            self, grdm_access: 'GrdmAccess', metadata_sources: list, project_metadata_id: str,
+            source_paths: dict = None) -> dict:
+        """各データ取得先からデータを取得するメソッドです。
 
-        # 各データ取得先からデータを取得
+        Args:
+            grdm_access (GrdmAccess): 認証済みのGRDMへのアクセスに用いるインスタンス
+            metadata_sources (list): メタデータの取得先の一覧
+            project_metadata_id (str): プロジェクトメタデータを一意に定めるID
+            source_paths (dict, optional): データ取得先の名称と、マッピング定義が参照するパスの一覧の組。デフォルトはNone
+
+        Returns:
+            dict: データ取得先ごとのストレージのデータ
+
+        Raises:
+            MappingDefinitionError: 存在しないデータ取得先が指定されている
+
+        """
         source_data = {}
         if metadata_sources:
-            source_mapping = {
-                "project_info": grdm_access.get_project_info,
-                "member_info": grdm_access.get_member_info,
-                "project_metadata": grdm_access.get_project_metadata,
-                "file_metadata": grdm_access.get_file_metadata,
-            }
             error_sources = []
             for source in metadata_sources:
-                if source in source_mapping:
+                if source in GrdmMapping._SOURCE_GETTERS:
                     param = {
-                        "project_metadata_id": project_metadata_id
+                        "project_metadata_id": project_metadata_id,
+                        "paths": (source_paths or {}).get(source),
                     }
-                    source_data[source] = source_mapping[source](**param)
+                    with span("fetch", source=source):
+                        source_data[source] = getattr(grdm_access, GrdmMapping._SOURCE_GETTERS[source])(**param)
                 else:
                     logger.error(f"メタデータ取得先が存在しない({source})")
                     error_sources.append(source)
             if error_sources:
                 raise MappingDefinitionError(f"メタデータ取得先:{error_sources}が存在しません。")
 
+        return source_data
+
+    def _find_paged_source(self, grdm_access: 'GrdmAccess', mapping_definitions: dict, metadata_sources: list) -> tuple:
+        """ページごとに受け取りながらマッピングするメタデータ取得先を特定するメソッドです。
+
+        設定ファイルのstream_member_infoが有効で、すべてのマッピング定義でその取得先のプロパティを
+        ページごとにマッピングできる場合のみ対象とします。マッピングの結果のキャッシュは取得先のデータ全体から
+        キーを計算するため、キャッシュを使用する場合は対象としません。
+
+        Args:
+            grdm_access (GrdmAccess): GRDMへのアクセスに用いるインスタンス
+            mapping_definitions (dict): スキーマの名称とマッピング定義の組
+            metadata_sources (list): メタデータの取得先の一覧
+
+        Returns:
+            tuple: メタデータ取得先の名称と、スキーマの名称とページごとにマッピングするプロパティの一覧の組。
+                対象がない場合は(None, None)
+        """
+        if not grdm_access._stream_member_info or GrdmMapping._result_cache is not None:
+            return None, None
+        for source, (_, list_key) in GrdmMapping._PAGED_SOURCES.items():
+            if source not in metadata_sources:
+                continue
+            paged_properties = {}
+            for schema, mapping_definition in mapping_definitions.items():
+                properties = self._find_paged_properties(mapping_definition, source, list_key)
+                if properties is None:
+                    break
+                paged_properties[schema] = properties
+            else:
+                return source, paged_properties
+        return None, None
+
+    def _find_paged_properties(self, mapping_definition: dict, source: str, list_key: str) -> Optional[list]:
+        """マッピング定義のうち、ページごとにマッピングするプロパティを特定するメソッドです。
+
+        ページごとのマッピングの結果をつなげたものが全体のマッピングの結果と同じになるよう、次の場合のみ対象とします。
+
+        - 取得先のプロパティがすべて、ページの項目のリストを同じスキーマのリストに対応させている
+        - そのスキーマのリストにほかの取得先のプロパティを挿入しない
+        - 取得先のプロパティがマッピング定義の中で連続している
+
+        Args:
+            mapping_definition (dict): マッピング定義
+            source (str): メタデータ取得先の名称
+            list_key (str): ページの項目のリストのキー
+
+        Returns:
+            Optional[list]: ページごとにマッピングするプロパティの一覧。対象にできない場合はNone
+        """
+        mapped_properties = [
+            schema_property for schema_property, components in mapping_definition.items()
+            if components.get("value") is not None]
+        paged_properties = [
+            schema_property for schema_property in mapped_properties
+            if mapping_definition[schema_property].get("source") == source]
+        if not paged_properties:
+            return paged_properties
+
+        schema_lists = set()
+        for schema_property in paged_properties:
+            components = mapping_definition[schema_property]
+            schema_lists.add((components.get("list") or {}).get(list_key))
+            if not components["value"].startswith(list_key + "."):
+                return None
+        schema_list = schema_lists.pop()
+        if schema_lists or not isinstance(schema_list, str):
+            return None
+
+        list_keys = schema_list.split(".")
+        for schema_property in mapped_properties:
+            base_keys = schema_property.replace("[]", "").split(".")
+            if base_keys[:len(list_keys)] == list_keys and schema_property not in paged_properties:
+                return None
+
+        start = mapped_properties.index(paged_properties[0])
+        if mapped_properties[start:start + len(paged_properties)] != paged_properties:
+            return None
+        return paged_properties
+
+    def _map_source_pages(
+            self, grdm_access: 'GrdmAccess', mapping_definitions: dict, source_data: dict,
+            paged_source: str, paged_properties: dict) -> dict:
+        """ページごとに受け取った取得先のデータを、受け取るたびにスキーマに挿入するメソッドです。
+
+        次のページは受け取ったページをマッピングしている間に取得し、マッピングを終えたページは保持しません。
+        プロパティの処理の順序とエラーの集計は、取得先のデータ全体をマッピングする場合と同じです。
+
+        Args:
+            grdm_access (GrdmAccess): 認証済みのGRDMへのアクセスに用いるインスタンス
+            mapping_definitions (dict): スキーマの名称とマッピング定義の組
+            source_data (dict): ページごとに受け取る取得先以外のデータ取得先ごとのストレージのデータ
+            paged_source (str): ページごとに受け取るメタデータ取得先の名称
+            paged_properties (dict): スキーマの名称と、ページごとにマッピングするプロパティの一覧の組
+
+        Returns:
+            dict: スキーマの名称と、そのスキーマにデータを挿入したものの組
+
+        Raises:
+            MappingDefinitionError: マッピング定義の内容に誤りがある
+            KeyNotFoundError: 一致するキーが見つからない
+            DataTypeError: 型の変換ができない
+            DataFormatError: データの形式に誤りがある
+        """
+        getter, list_key = GrdmMapping._PAGED_SOURCES[paged_source]
+        new_schemas = {schema: {} for schema in mapping_definitions}
+        property_errors = {
+            schema: {schema_property: MappingErrorCollector() for schema_property in mapping_definition}
+            for schema, mapping_definition in mapping_definitions.items()}
+
+        def extract(schema: str, schema_properties: list, data: dict):
+            # 取得先のデータが空の場合は_fill_unmapped_propertiesで追加する
+            mapping_definition = mapping_definitions[schema]
+            for schema_property in schema_properties:
+                components = mapping_definition[schema_property]
+                source = components.get("source")
+                if components.get("value") is None or not data[source]:
+                    continue
+                new_schemas[schema] = self._extract_property(
+                    new_schemas[schema], data[source], schema_property, components, property_errors[schema][schema_property])
+
+        with span("extraction"):
+            # ページごとにマッピングするプロパティより前のプロパティ
+            for schema, mapping_definition in mapping_definitions.items():
+                properties = paged_properties[schema]
+                end = list(mapping_definition).index(properties[0]) if properties else len(mapping_definition)
+                extract(schema, list(mapping_definition)[:end], source_data)
+
+            first_page = None
+            offset = 0
+            failed = set()
+            with contextlib.closing(self._prefetch_pages(getattr(grdm_access, getter)())) as pages:
+                for page in pages:
+                    if first_page is None:
+                        first_page = page
+                    for schema, properties in paged_properties.items():
+                        if not properties:
+                            continue
+                        schema_list = mapping_definitions[schema][properties[0]]["list"][list_key]
+                        for schema_property in properties:
+                            # 全体をマッピングする場合と同様に、型の変換に失敗したプロパティは以降の項目を処理しない
+                            if (schema, schema_property) in failed:
+                                continue
+                            errors = property_errors[schema][schema_property]
+                            new_schemas[schema] = self._extract_property(
+                                new_schemas[schema], page, schema_property, mapping_definitions[schema][schema_property],
+                                errors, {schema_list: offset})
+                            if errors.details(DATA_TYPE):
+                                failed.add((schema, schema_property))
+                    items = page.get(list_key) if isinstance(page, dict) else None
+                    offset += len(items) if isinstance(items, list) else 0
+            source_data = dict(source_data, **{paged_source: first_page})
+
+            # ページごとにマッピングするプロパティより後のプロパティ
+            for schema, mapping_definition in mapping_definitions.items():
+                properties = paged_properties[schema]
+                if properties:
+                    start = list(mapping_definition).index(properties[-1]) + 1
+                    extract(schema, list(mapping_definition)[start:], source_data)
+
+        for schema, mapping_definition in mapping_definitions.items():
+            errors = MappingErrorCollector()
+            for collector in property_errors[schema].values():
+                errors.add(collector, DATA_TYPE)
+            self._raise_mapping_errors(errors)
+            with span("unmapped_fill"):
+                new_schemas[schema] = self._fill_unmapped_properties(new_schemas[schema], mapping_definition, source_data)
+        return new_schemas
+
+    def _prefetch_pages(self, pages: Iterator[dict]) -> Iterator[dict]:
+        """呼び出し元が受け取ったページを処理している間に、次のページを別のスレッドで取得するジェネレーターです。
+
+        呼び出し元が途中で終了した場合は、取得中のページを待たずに終了し、その取得で発生したエラーはログに出力します。
+        途中で終了する場合は、closeを呼び出してください。
+
+        Args:
+            pages (Iterator[dict]): ページを1つずつ取得するイテレーター
+
+        Yields:
+            dict: 取得したページ
+        """
+        end = object()
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(next, pages, end)
+        try:
+            while True:
+                current, future = future, None
+                page = current.result()
+                if page is end:
+                    return
+                future = executor.submit(next, pages, end)
+                yield page
+        finally:
+            if future is not None:
+                future.add_done_callback(GrdmMapping._log_dropped_page)
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _log_dropped_page(future: Future):
+        """途中で終了したため受け取られなかったページの取得で発生したエラーを、ログに出力する関数です。
+
+        Args:
+            future (Future): ページの取得
+        """
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"受け取られなかったページの取得に失敗({future.exception()!r})")
+
+    def _map_source_data(self, mapping_definition: dict, source_data: dict) -> dict:
+        """取得したデータをマッピング定義に従いスキーマに挿入するメソッドです。
+
+        Args:
+            mapping_definition (dict): マッピング定義
+            source_data (dict): データ取得先ごとのストレージのデータ
+
+        Returns:
+            dict: スキーマにデータを挿入したもの
+
+        """
+        result_cache = GrdmMapping._result_cache
+        if result_cache is not None:
+            with span("result_cache"):
+                cache_key = SourceFingerprint.compute_for_definition(mapping_definition, source_data)
+                cached = result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         # 各プロパティに対するマッピング処理
+        with span("extraction"):
+            new_schema = self._extract_metadata(mapping_definition, source_data)
+
+        # マッピングできなかったプロパティをスキーマに追加
+        with span("unmapped_fill"):
+            new_schema = self._fill_unmapped_properties(new_schema, mapping_definition, source_data)
+
+        if result_cache is not None:
+            result_cache.put(cache_key, new_schema)
+        return new_schema
+
+    def _extract_metadata(self, mapping_definition: dict, source_data: dict) -> dict:
+        """マッピング定義の各プロパティについて、ストレージのデータを取り出してスキーマに挿入するメソッドです。
+
+        Args:
+            mapping_definition (dict): マッピング定義
+            source_data (dict): データ取得先ごとのストレージのデータ
+
+        Returns:
+            dict: データを挿入したスキーマ
+
+        Raises:
+            KeyNotFoundError: 一致するキーが見つからない
+            DataTypeError: 型の変換ができない
+            DataFormatError: キーの不一致と型の変換の失敗の両方が発生した
+
+        """
         new_schema = {}
-        error_keys = []
-        error_types = []
-        for schema_property, components in self._mapping_definition.items():
-            schema_link_list = {}
+        errors = MappingErrorCollector()
+        for schema_property, components in mapping_definition.items():
             source = components.get("source")
             storage_path = components.get("value")
             if storage_path is None or not source_data[source]:
                 continue
+            new_schema = self._extract_property(new_schema, source_data[source], schema_property, components, errors)
 
-            storage_keys = storage_path.split(".")
-            try:
-                new_schema = self._extract_and_insert_metadata(
-                    new_schema, source_data[source], schema_property, components, schema_link_list, storage_keys)
+        self._raise_mapping_errors(errors)
+        return new_schema
 
-            except KeyNotFoundError as e:
-                error_keys.extend(e.args[0])
+    def _extract_property(
+            self, new_schema: dict, source: dict, schema_property: str, components: dict,
+            errors: MappingErrorCollector, list_offsets: dict = None) -> dict:
+        """1つのプロパティについて、ストレージのデータを取り出してスキーマに挿入するメソッドです。
 
-            except DataTypeError as e:
-                error_types.append(str(e))
+        キーの不一致と型の変換の失敗は例外にせずに集計します。
 
-        if error_keys and error_types:
-            raise DataFormatError(
-                f"キーの不一致が確認されました。:{error_keys}, データの変換に失敗しました。：{error_types}")
-        elif error_keys:
-            raise KeyNotFoundError(f"キーの不一致が確認されました。:{error_keys}")
-        elif error_types:
-            raise DataTypeError(f"データの変換に失敗しました。：{error_types}")
+        Args:
+            new_schema (dict): 取得したデータを挿入するスキーマ
+            source (dict): マッピング定義に記載された取得先から得たストレージのデータ
+            schema_property (str): スキーマのプロパティまでのキーをつなげた文字列
+            components (dict): マッピング定義情報
+            errors (MappingErrorCollector): エラーの集計先
+            list_offsets (dict, optional): スキーマのリストと、ストレージのリストの項目を挿入し始める位置の組。デフォルトはNone
 
-        # マッピングできなかったプロパティをスキーマに追加
-        for schema_property, components in self._mapping_definition.items():
+        Returns:
+            dict: 取得したデータを挿入したスキーマ
+
+        """
+        plan = getattr(components, "plan", None)
+        storage_keys = list(plan.storage_keys) if plan is not None else components.get("value").split(".")
+        try:
+            new_schema = self._extract_and_insert_metadata(
+                new_schema, source, schema_property, components, {}, storage_keys, list_offsets=list_offsets)
+
+        except KeyNotFoundError as e:
+            errors.add(e.args[0], KEY_NOT_FOUND)
+
+        except DataTypeError as e:
+            errors.add(e.args[0] if e.args else str(e), DATA_TYPE)
+
+        return new_schema
+
+    def _raise_mapping_errors(self, errors: MappingErrorCollector):
+        """集計したエラーがある場合に、エラーの種類に応じた例外を発生させるメソッドです。
+
+        Args:
+            errors (MappingErrorCollector): 集計したエラー
+
+        Raises:
+            KeyNotFoundError: 一致するキーが見つからない
+            DataTypeError: 型の変換ができない
+            DataFormatError: キーの不一致と型の変換の失敗の両方が発生した
+
+        """
+        if errors:
+            for (schema_property, kind), count in errors.counts().items():
+                logger.error(f"マッピングに失敗したデータが存在する({kind}, {count}件)({schema_property})")
+            # メッセージは例外が表示されるときに作成する
+            summary = ErrorSummary(errors)
+            has_keys = bool(errors.details(KEY_NOT_FOUND))
+            has_types = bool(errors.details(DATA_TYPE))
+            if has_keys and has_types:
+                raise DataFormatError(summary)
+            elif has_keys:
+                raise KeyNotFoundError(summary)
+            else:
+                raise DataTypeError(summary)
+
+    def _fill_unmapped_properties(self, new_schema: dict, mapping_definition: dict, source_data: dict) -> dict:
+        """マッピングできなかったプロパティをスキーマに追加するメソッドです。
+
+        Args:
+            new_schema (dict): データを挿入したスキーマ
+            mapping_definition (dict): マッピング定義
+            source_data (dict): データ取得先ごとのストレージのデータ
+
+        Returns:
+            dict: プロパティを追加したスキーマ
+
+        Raises:
+            MappingDefinitionError: スキーマのデータ構造がほかのプロパティと異なる
+
+        """
+        for schema_property, components in mapping_definition.items():
             storage_path = components.get("value")
             source = components.get("source")
             if storage_path is not None and source_data[source]:
@@ -136,16 +733,19 @@ class GrdmMapping():
 
         return new_schema
 
-    def _find_metadata_sources(self) -> list:
+    def _find_metadata_sources(self, mapping_definition: dict) -> list:
         """メタデータの取得先を特定するメソッドです。
 
+        Args:
+            mapping_definition (dict): マッピング定義
+
         Returns:
             list: メタデータの取得先の一覧
 
         """
         metadata_sources = set()
 
-        for components in self._mapping_definition.values():
+        for components in mapping_definition.values():
             source = components.get("source")
             if source is not None:
                 metadata_sources.add(source)
@@ -154,7 +754,7 @@ class GrdmMapping():
 
     def _extract_and_insert_metadata(
             self, new_schema: dict, source: dict, schema_property: str,
-            components: dict, schema_link_list: dict, storage_keys: list) -> dict:
+            components: dict, schema_link_list: dict, storage_keys: list, list_offsets: dict = None) -> dict:
         """メタデータの取り出しとスキーマへの挿入を行うメソッドです。
 
         マッピング定義で指定されたデータをストレージのデータから取り出し、スキーマへと挿入したものを返します。
@@ -166,6 +766,7 @@ class GrdmMapping():
             components (dict): マッピング定義情報。取得するデータの場所や構造、スキーマの求めるデータ型の情報が記載されています。
             schema_link_list (dict): ストレージのリストと対応したスキーマのリストの情報。リストの項目数を保持しています。
             storage_keys (list): ストレージから取得するデータまでのキーのリスト
+            list_offsets (dict, optional): スキーマのリストと、ストレージのリストの項目を挿入し始める位置の組。デフォルトはNone
 
         Returns:
             dict: 取得したデータを挿入したスキーマ
@@ -174,7 +775,8 @@ class GrdmMapping():
         # キーを一つずつ取り出して処理を行う
         for index, key in enumerate(storage_keys[:-1]):
             source = self._check_and_handle_key_structure(
-                new_schema, source, schema_property, components, schema_link_list, storage_keys, index, key)
+                new_schema, source, schema_property, components, schema_link_list, storage_keys, index, key,
+                list_offsets)
 
             # ストレージのデータにあるリストと対応するリストがスキーマに存在する場合、このメソッドを再帰的に呼び出してデータの取り出しと挿入を行った後、Noneを返します。
             # そのため、sourceがNoneの場合は以降のデータ取り出し、挿入処理をスキップします。
@@ -190,7 +792,7 @@ class GrdmMapping():
 
     def _check_and_handle_key_structure(
             self, new_schema: dict, source: dict, schema_property: str, components: dict,
-            schema_link_list: dict, storage_keys: list, index: int, key: str) -> Optional[dict]:
+            schema_link_list: dict, storage_keys: list, index: int, key: str, list_offsets: dict = None) -> Optional[dict]:
         """キーの値がlistかdictかを判定し、対応した処理を実行するメソッドです。
 
         listだった場合は_handle_listを呼び出しリストの定義に応じた処理を実行し、dictだった場合はsourceをそのキーの値に更新します。
@@ -204,6 +806,7 @@ class GrdmMapping():
             storage_keys (list): ストレージから取得するデータまでのキーのリスト
             index (int): 処理中のキーのインデックス
             key (str): 処理中のキー
+            list_offsets (dict, optional): スキーマのリストと、ストレージのリストの項目を挿入し始める位置の組。デフォルトはNone
 
         Returns:
             Optional[dict]: ストレージのデータから処理中のキーで検索した値のデータ。
@@ -215,21 +818,19 @@ class GrdmMapping():
 
         """
         if key not in source:
-            logger.error(f"ストレージに対応するキーが存在しない({schema_property})")
-            raise KeyNotFoundError(
-                f"{key}と一致するストレージのキーが見つかりませんでした。({schema_property})")
+            # リストの項目ごとに発生しうるため、ログの出力とメッセージの作成は集計後に行う
+            raise KeyNotFoundError(ErrorDetail.key_not_found(key, schema_property))
         # 値がリスト構造の場合
         if isinstance(source[key], list):
             source = self._handle_list(
-                new_schema, source, schema_property, components, schema_link_list, storage_keys, index, key)
+                new_schema, source, schema_property, components, schema_link_list, storage_keys, index, key,
+                list_offsets)
 
         # 値がdict構造の場合
         elif isinstance(source[key], dict):
-            link_list_info = components.get("list")
-            complete_storage_keys = components.get("value").split(".")
-            current_key_index = index + len(complete_storage_keys) - len(storage_keys)
-            link_list_info = link_list_info.get(".".join(complete_storage_keys[:current_key_index + 1])) if link_list_info else None
-            if link_list_info:
+            if self._find_list_link(components, storage_keys, index):
+                complete_storage_keys = components.get("value").split(".")
+                current_key_index = index + len(complete_storage_keys) - len(storage_keys)
                 current_key = '.'.join(complete_storage_keys[:current_key_index + 1])
                 logger.error(f"{current_key}がリストとして定義されている({schema_property})")
                 raise MappingDefinitionError(f"オブジェクト：{current_key}がリストとして定義されています。({schema_property})")
@@ -243,7 +844,7 @@ class GrdmMapping():
 
     def _handle_list(
             self, new_schema: dict, source: dict, schema_property: str, components: dict,
-            schema_link_list: dict, storage_keys: list, index: int, key: str) -> Optional[dict]:
+            schema_link_list: dict, storage_keys: list, index: int, key: str, list_offsets: dict = None) -> Optional[dict]:
         """リスト構造だった場合の処理を実行するメソッドです。
 
         スキーマに対応するリストが存在する場合は_extract_and_insert_metadataを再帰的に呼び出し、データの取り出しとスキーマへの挿入を行います。
@@ -258,6 +859,7 @@ class GrdmMapping():
             storage_keys (list): ストレージから取得するデータまでのキーのリスト
             index (int): 処理中のキーのインデックス
             key (str): 処理中のキー
+            list_offsets (dict, optional): スキーマのリストと、ストレージのリストの項目を挿入し始める位置の組。デフォルトはNone
 
         Returns:
             Optional[dict]: ストレージデータから処理中のキーで検索して得られたリストの指定されたインデックスのデータ。再帰的な呼びだしを行った場合はNoneを返します。
@@ -267,36 +869,29 @@ class GrdmMapping():
             KeyNotFoundError: データの構造を示すキーが存在しない
 
         """
-        link_list_info = components.get("list")
-        complete_storage_keys = components.get("value").split(".")
-        current_key_index = index + len(complete_storage_keys) - len(storage_keys)
-        link_list_info = link_list_info.get(".".join(complete_storage_keys[:current_key_index + 1])) if link_list_info else None
+        link_list_info = self._find_list_link(components, storage_keys, index)
 
         if link_list_info is None:
             raise MappingDefinitionError(f"リスト：{key}の定義が不足しています。({schema_property})")
 
         # 対応するリストが存在する場合
         if isinstance(link_list_info, str):
-            error_keys = []
+            errors = MappingErrorCollector()
             storage_keys = storage_keys[index+1:]
+            offset = list_offsets.get(link_list_info, 0) if list_offsets else 0
             for i, item in enumerate(source[key]):
-                schema_link_list[link_list_info] = i + 1
+                schema_link_list[link_list_info] = offset + i + 1
 
                 try:
                     new_schema = self._extract_and_insert_metadata(
                         new_schema, item, schema_property, components, schema_link_list, storage_keys)
 
                 except KeyNotFoundError as e:
-                    if isinstance(e.args[0], str):
-                        error_keys.append(e.args[0])
-                    else:
-                        error_keys.extend(e.args[0])
+                    # 同じプロパティとキーのエラーは件数のみを集計する
+                    errors.add(e.args[0], KEY_NOT_FOUND)
                     continue
-            if error_keys:
-                if len(error_keys) > 1:
-                    # 重複削除(dictのkeyが順番を保持するので、それを利用して削除後の順番を保持する)
-                    error_keys = list(dict.fromkeys(error_keys))
-                raise KeyNotFoundError(error_keys)
+            if errors:
+                raise KeyNotFoundError(errors)
 
             return
 
@@ -309,6 +904,27 @@ class GrdmMapping():
                 raise MappingDefinitionError(
                     f"listで指定されたインデックス:{link_list_info}が存在しません。({schema_property})")
 
+    def _find_list_link(self, components: dict, storage_keys: list, index: int):
+        """処理中のキーまでのストレージのパスに対応する、マッピング定義のlistの値を取得するメソッドです。
+
+        検証済みのマッピング定義の場合は、計算済みの値を用います。
+
+        Args:
+            components (dict): マッピング定義情報
+            storage_keys (list): 処理中のストレージのデータから取得するデータまでのキーのリスト
+            index (int): 処理中のキーのインデックス
+
+        Returns:
+            Union[str, int, None]: 対応するスキーマのリスト、またはインデックス。定義がない場合はNone
+        """
+        plan = getattr(components, "plan", None)
+        if plan is not None:
+            return plan.links[index + len(plan.storage_keys) - len(storage_keys)]
+        link_list_info = components.get("list")
+        complete_storage_keys = components.get("value").split(".")
+        current_key_index = index + len(complete_storage_keys) - len(storage_keys)
+        return link_list_info.get(".".join(complete_storage_keys[:current_key_index + 1])) if link_list_info else None
+
     def _get_and_insert_final_key_value(
             self, new_schema: dict, source: dict, schema_property: str,
             components: dict, final_key: str, schema_link_list: dict) -> dict:
@@ -331,17 +947,16 @@ class GrdmMapping():
         """
         storage_data = []
         type = components.get("type")
+        plan = getattr(components, "plan", None)
 
         if final_key not in source:
             new_schema = self._add_property(
-                new_schema, schema_property, type, storage_data, schema_link_list)
+                new_schema, schema_property, type, storage_data, schema_link_list, plan=plan)
             return new_schema
 
         # 値がリスト構造の場合
         if isinstance(source[final_key], list):
-            link_list_info = components.get("list")
-            complete_storage_keys = components.get("value").split(".")
-            link_list_info = link_list_info.get(".".join(complete_storage_keys)) if link_list_info else None
+            link_list_info = self._find_list_link(components, [final_key], 0)
             if link_list_info:
                 # 対応するリストが存在する場合
                 if isinstance(link_list_info, str):
@@ -350,14 +965,14 @@ class GrdmMapping():
                         storage_data = []
                         storage_data.append(item)
                         new_schema = self._add_property(
-                            new_schema, schema_property, type, storage_data, schema_link_list)
+                            new_schema, schema_property, type, storage_data, schema_link_list, plan=plan)
                     return new_schema
                 # 対応するリストが存在しない場合
                 else:
                     if len(source[final_key]) > 0 and 0 <= link_list_info < len(source[final_key]):
                         storage_data.append(source[final_key][link_list_info])
                         new_schema = self._add_property(
-                            new_schema, schema_property, type, storage_data, schema_link_list)
+                            new_schema, schema_property, type, storage_data, schema_link_list, plan=plan)
                     else:
                         raise MappingDefinitionError(
                             f"listで指定されたインデックスが存在しません。({schema_property})")
@@ -368,7 +983,7 @@ class GrdmMapping():
             else:
                 storage_data.extend(source.get(final_key, []))
                 new_schema = self._add_property(
-                    new_schema, schema_property, type, storage_data, schema_link_list)
+                    new_schema, schema_property, type, storage_data, schema_link_list, plan=plan)
                 return new_schema
 
         # キーの数が不足している場合
@@ -382,12 +997,12 @@ class GrdmMapping():
             if value is not None:
                 storage_data.append(value)
             new_schema = self._add_property(
-                new_schema, schema_property, type, storage_data, schema_link_list)
+                new_schema, schema_property, type, storage_data, schema_link_list, plan=plan)
             return new_schema
 
     def _add_property(
             self, new_schema: dict, schema_property: str,
-            type: str, storage_data: list, schema_link_list: dict) -> dict:
+            type: str, storage_data: list, schema_link_list: dict, plan: PropertyPlan = None) -> dict:
         """取得したデータと対応したプロパティをスキーマに追加するメソッドです。
 
         スキーマに引数で指定したプロパティを追加し、そこに取得したデータを挿入します。
@@ -398,6 +1013,7 @@ class GrdmMapping():
             type(str): スキーマの要求するデータの型
             storage_data (list): ストレージから取得したデータ
             schema_link_list (dict): ストレージのリストと対応したスキーマのリストの情報。リストの項目数を保持している。
+            plan (PropertyPlan, optional): 検証済みのマッピング定義の計算済みの値。デフォルトはNone
 
         return:
             dict: データを挿入したスキーマ
@@ -407,6 +1023,9 @@ class GrdmMapping():
             DataTypeError: データの型が変換できない
 
         """
+        if plan is not None:
+            return self._add_planned_property(new_schema, schema_property, storage_data, schema_link_list, plan)
+
         keys = schema_property.split('.')
         current_schema = new_schema
 
@@ -464,9 +1083,8 @@ class GrdmMapping():
                     f"type:{type}は有効な型ではありません。({schema_property})") from e
 
             except Exception as e:
-                logger.error(f"{storage_data}を{type}に変換できない({schema_property})")
-                raise DataTypeError(
-                    f"型変換エラー：{storage_data}を{type}に変換できません。({schema_property})") from e
+                # リストの項目ごとに発生しうるため、ログの出力とメッセージの作成は集計後に行う
+                raise DataTypeError(ErrorDetail.data_type(type, storage_data, schema_property)) from e
 
         # 最終キーと値をスキーマに追加
         final_key = keys[-1]
@@ -482,6 +1100,65 @@ class GrdmMapping():
 
         return new_schema
 
+    def _add_planned_property(
+            self, new_schema: dict, schema_property: str, storage_data: list,
+            schema_link_list: dict, plan: PropertyPlan) -> dict:
+        """検証済みのマッピング定義に従い、取得したデータと対応したプロパティをスキーマに追加するメソッドです。
+
+        スキーマのデータ構造と型は検証済みのため、_add_propertyで項目ごとに行う確認を省きます。
+
+        Args:
+            new_schema(dict): プロパティを追加するスキーマ
+            schema_property(str): 追加するスキーマのプロパティまでのキーをつなげた固有の文字列
+            storage_data (list): ストレージから取得したデータ
+            schema_link_list (dict): ストレージのリストと対応したスキーマのリストの情報。リストの項目数を保持している。
+            plan (PropertyPlan): 検証済みのマッピング定義の計算済みの値
+
+        return:
+            dict: データを挿入したスキーマ
+
+        Raises:
+            MappingDefinitionError: 対応していないリストに複数の項目が存在する
+            DataTypeError: データの型が変換できない
+
+        """
+        current_schema = new_schema
+        for key, base_key, is_list, path in plan.schema_keys:
+            if not is_list:
+                current_schema = current_schema.setdefault(key, {})
+                continue
+            items = current_schema.get(base_key)
+            if items is None:
+                items = current_schema[base_key] = [{}]
+                current_schema = items[0]
+                continue
+            link_list_info = schema_link_list.get(path)
+            if link_list_info is not None:
+                for _ in range(link_list_info - len(items)):
+                    items.append({})
+                current_schema = items[link_list_info - 1]
+            elif len(items) <= 1:
+                current_schema = items[0]
+            else:
+                raise MappingDefinitionError(f"マッピング定義に誤りがあります。({schema_property})")
+
+        converted_storage_data = []
+        if storage_data:
+            convert = getattr(GrdmMapping, GrdmMapping._CONVERTERS[plan.type])
+            try:
+                converted_storage_data = [convert(value) for value in storage_data]
+            except Exception as e:
+                raise DataTypeError(ErrorDetail.data_type(plan.type, storage_data, schema_property)) from e
+
+        final_key = plan.final_key
+        if final_key.endswith("[]"):
+            values = current_schema.setdefault(final_key[:-2], [])
+            values.extend(converted_storage_data)
+        else:
+            current_schema[final_key] = converted_storage_data[0] if converted_storage_data else None
+
+        return new_schema
+
     def _convert_data_type(self, data: list, type: str) -> list:
         """データの型を要求された型へと変換するメソッドです。
 
@@ -497,34 +1174,36 @@ class GrdmMapping():
             MappingDefinitionError: マッピング定義に誤りがある
 
         """
-        converted_data = []
-        for value in data:
+        if type not in GrdmMapping._CONVERTERS:
+            raise MappingDefinitionError()
+        convert = getattr(GrdmMapping, GrdmMapping._CONVERTERS[type])
+        return [convert(value) for value in data]
 
-            if type == "string":
-                converted_data.append(str(value))
+    @staticmethod
+    def _convert_string(value: Any) -> str:
+        """値を文字列に変換する関数です。"""
+        return str(value)
 
-            elif type == "boolean":
-                if isinstance(value, bool):
-                    converted_data.append(value)
-                elif isinstance(value, str):
-                    if value.lower() == "true":
-                        converted_data.append(True)
-                    elif value.lower() == "false":
-                        value = False
-                        converted_data.append(False)
-                    else:
-                        raise DataTypeError()
-                else:
-                    raise DataTypeError()
+    @staticmethod
+    def _convert_boolean(value: Any) -> bool:
+        """値を真偽値に変換する関数です。
 
-            elif type == "number":
-                converted_data.append(
-                    float(value) if '.' in str(value) else int(value))
-
-            else:
-                raise MappingDefinitionError()
+        Raises:
+            DataTypeError: 真偽値、または"true"か"false"(大文字と小文字を区別しない)の文字列ではない
+        """
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            if value.lower() == "true":
+                return True
+            elif value.lower() == "false":
+                return False
+        raise DataTypeError()
 
-        return converted_data
+    @staticmethod
+    def _convert_number(value: Any) -> Union[int, float]:
+        """値を数値に変換する関数です。小数点を含む場合はfloat、含まない場合はintに変換します。"""
+        return float(value) if '.' in str(value) else int(value)
 
     def _add_unmap_property(self, current_schema: dict, schema_properties: list) -> dict:
         """マッピング先がないプロパティをスキーマに追加するメソッドです。
@@ -592,25 +1271,261 @@ class GrdmAccess():
     Attributes:
         class:
             _CONFIG_PATH(str):GRDMの設定ファイルのパス
+            _CONFIG_ENV(str):GRDMの設定ファイルのパスを上書きする環境変数の名前
             _ALLOWED_SCOPES(list):スコープの権限
+            _default_transport(BaseTransport):インスタンス作成時に指定がない場合に使用するトランスポート
+            _default_config_path(str):インスタンス作成時に指定がない場合に使用する設定ファイルのパス
+            _token_cache(dict):トークン検証結果のキャッシュ(トークンのハッシュ値と有効期限の組)
+            _token_cache_lock(threading.Lock):トークン検証結果のキャッシュのロック
+            _config_cache(dict):設定ファイルのパスと(更新日時, サイズ, ConfigParser)の組
         instance:
             _token(str):アクセストークン
             _project_id(str):プロジェクトid
+            _transport(BaseTransport):リクエストの送信に使用するトランスポート
             _config_file(ConfigParser):GRDMの設定ファイルのインスタンス
             _domain(str):GRDMのドメイン
-            _timeout(float):リクエストのタイムアウトする時間(秒)
+            _connect_timeout(float):接続のタイムアウトする時間(秒)
+            _read_timeout(float):レスポンスの読み込みのタイムアウトする時間(秒)
+            _deadline_seconds(float):リクエスト全体の制限時間(秒)。0以下の場合は無制限
+            _deadline(float):リクエスト全体の期限(time.monotonic()の値)。期限がない場合はNone
             _max_requests(int):リクエスト回数の上限
+            _token_cache_ttl(float):トークン検証結果をキャッシュする時間(秒)。0以下の場合はキャッシュしない
+            _stream_file_metadata(bool):ファイルメタデータのうち、マッピング定義が参照する部分のみを読み込むか
+            _stream_member_info(bool):メンバー情報をページごとに受け取りながらマッピングするか
+            _request_count(int):このインスタンスが送信したリクエストの数
     """
     _CONFIG_PATH = "data/storage/grdm.ini"
+    _CONFIG_ENV = "DG_MM_GRDM_CONFIG"
     _ALLOWED_SCOPES = ["osf.full_write", "osf.full_read"]
+    _default_transport = RequestsTransport()
+    _default_config_path = None
+    _token_cache = {}
+    _token_cache_lock = threading.Lock()
+    _config_cache = {}
 
-    def __init__(self):
-        """インスタンスの初期化メソッド"""
-        self._config_file = PackageFileReader.read_ini(GrdmAccess._CONFIG_PATH)
+    def __init__(self, transport: BaseTransport = None, config_path: str = None):
+        """インスタンスの初期化メソッド
+
+        設定ファイルは引数、configureで設定したパス、環境変数DG_MM_GRDM_CONFIG、パッケージ内の設定ファイルの順に探します。
+
+        Args:
+            transport (BaseTransport, optional): リクエストの送信に使用するトランスポート。デフォルトはNone
+            config_path (str, optional): 設定ファイルのパス。デフォルトはNone
+
+        Raises:
+            FileNotFoundError: 指定された設定ファイルが存在しない
+        """
+        self._transport = transport if transport is not None else GrdmAccess._default_transport
+        config_path = config_path or GrdmAccess._default_config_path or os.environ.get(GrdmAccess._CONFIG_ENV)
+        if config_path:
+            if not os.path.isfile(config_path):
+                raise FileNotFoundError(f"ファイルが見つかりません: '{config_path}'")
+        else:
+            config_path = str(PackageFileReader._get_absolute_path(GrdmAccess._CONFIG_PATH))
+        self._config_file = GrdmAccess._read_config(config_path)
         self._domain = self._config_file["settings"]["domain"]
-        self._timeout = self._config_file["settings"].getfloat("timeout")
-        self._max_requests = self._config_file["settings"].getint("max_requests")
+        settings = self._config_file["settings"]
+        # 旧形式の設定ファイル(timeoutのみ)にも対応する
+        timeout = settings.getfloat("timeout", fallback=None)
+        self._connect_timeout = settings.getfloat("connect_timeout", fallback=timeout)
+        self._read_timeout = settings.getfloat("read_timeout", fallback=timeout)
+        self._deadline_seconds = settings.getfloat("deadline", fallback=0)
+        self._deadline = None
+        self._max_requests = settings.getint("max_requests")
+        self._token_cache_ttl = settings.getfloat("token_cache_ttl", fallback=0)
+        self._stream_file_metadata = settings.getboolean("stream_file_metadata", fallback=False)
+        self._stream_member_info = settings.getboolean("stream_member_info", fallback=False)
         self._is_authenticated = None
+        self._request_count = 0
+
+    @classmethod
+    def configure(cls, transport: BaseTransport = None, config_path: str = None):
+        """以降に作成するインスタンスが使用するトランスポートと設定ファイルを設定するメソッドです。
+
+        Args:
+            transport (BaseTransport, optional): トランスポート。Noneの場合はRequestsTransportに戻す。
+            config_path (str, optional): 設定ファイルのパス。Noneの場合はパッケージ内の設定ファイルに戻す。
+        """
+        cls._default_transport = transport if transport is not None else RequestsTransport()
+        cls._default_config_path = config_path
+
+    @classmethod
+    def _read_config(cls, config_path: str) -> configparser.ConfigParser:
+        """設定ファイルを読み込むメソッドです。
+
+        読み込んだ内容はファイルの更新日時かサイズが変わるまで保持し、インスタンスの間で共有します。
+
+        Args:
+            config_path (str): 設定ファイルのパス
+
+        Returns:
+            configparser.ConfigParser: 設定ファイルのパーサー
+        """
+        try:
+            stat = os.stat(config_path)
+        except OSError:
+            stat = None
+        signature = (stat.st_mtime_ns, stat.st_size) if stat is not None else None
+        cached = cls._config_cache.get(config_path)
+        if cached is not None and signature is not None and cached[:2] == signature:
+            return cached[2]
+
+        config_file = configparser.ConfigParser()
+        config_file.read(config_path, encoding='utf-8')
+        if signature is not None:
+            cls._config_cache[config_path] = signature + (config_file,)
+        return config_file
+
+    @classmethod
+    def clear_token_cache(cls):
+        """トークン検証結果のキャッシュをすべて破棄するメソッドです。"""
+        with cls._token_cache_lock:
+            cls._token_cache.clear()
+
+    def _get_token_cache_key(self) -> str:
+        """トークン検証結果のキャッシュのキーを取得するメソッドです。
+
+        トークンそのものは保持せず、ドメインとトークンから計算したハッシュ値をキーとします。
+
+        Returns:
+            str: キャッシュのキー
+        """
+        return hashlib.sha256(f"{self._domain}\0{self._token}".encode('utf-8')).hexdigest()
+
+    def _is_token_cached(self) -> bool:
+        """トークンが有効であることがキャッシュされているかを確認するメソッドです。
+
+        Returns:
+            bool: 有効期限内のキャッシュが存在する場合はTrue
+        """
+        if self._token_cache_ttl <= 0:
+            return False
+        key = self._get_token_cache_key()
+        with GrdmAccess._token_cache_lock:
+            expires_at = GrdmAccess._token_cache.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del GrdmAccess._token_cache[key]
+                return False
+            return True
+
+    def _cache_token(self):
+        """トークンが有効であることをキャッシュするメソッドです。"""
+        if self._token_cache_ttl <= 0:
+            return
+        key = self._get_token_cache_key()
+        with GrdmAccess._token_cache_lock:
+            GrdmAccess._token_cache[key] = time.monotonic() + self._token_cache_ttl
+
+    def _invalidate_token_cache(self):
+        """トークン検証結果のキャッシュを破棄するメソッドです。"""
+        key = self._get_token_cache_key()
+        with GrdmAccess._token_cache_lock:
+            GrdmAccess._token_cache.pop(key, None)
+
+    def set_deadline(self, seconds: float = None):
+        """リクエスト全体の制限時間を設定し、計測を開始するメソッドです。
+
+        期限を過ぎた後のリクエストは送信されずにエラーとなり、期限前のリクエストも残り時間でタイムアウトします。
+
+        Args:
+            seconds (float, optional): 制限時間(秒)。Noneの場合は設定ファイルの値を使用し、0以下の場合は無制限とする。
+        """
+        if seconds is None:
+            seconds = self._deadline_seconds
+        self._deadline = time.monotonic() + seconds if seconds > 0 else None
+
+    def _get_timeout(self) -> tuple:
+        """リクエストに指定するタイムアウトを取得するメソッドです。
+
+        requestsの読み込みのタイムアウトはソケットの読み込み1回ごとの待ち時間の上限であり、レスポンス全体の受信時間の上限ではありません。
+        そのため、残り時間を上限としても、データを少しずつ送り続けるレスポンスの受信は期限を過ぎても続くことがあります。
+        期限を過ぎた後は、次のリクエストを送信しないことで処理を打ち切ります。
+
+        Returns:
+            tuple: 接続のタイムアウトと読み込みのタイムアウトの組(秒)。期限が設定されている場合は残り時間を上限とする。
+
+        Raises:
+            APIError: リクエスト全体の制限時間を超えている
+        """
+        if self._deadline is None:
+            return (self._connect_timeout, self._read_timeout)
+
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            logger.error("API request deadline exceeded")
+            raise APIError("APIリクエストの制限時間を超えました")
+        return (min(self._connect_timeout, remaining), min(self._read_timeout, remaining))
+
+    def _get(self, url: str, params: dict = None, endpoint: str = "unknown", stream: bool = False) -> requests.Response:
+        """GRDMのAPIにGETリクエストを送信するメソッドです。
+
+        レスポンスが401の場合はトークンが無効になったとみなし、トークン検証結果のキャッシュを破棄します。
+        リクエストの数、レスポンスを受け取るまでの時間、レスポンスボディの大きさをメトリクスに記録します。
+        streamがTrueの場合はレスポンスボディを読み込まずに返すため、レスポンスボディの大きさは_decodeで記録します。
+
+        Args:
+            url (str): リクエスト先のURL
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+            endpoint (str, optional): メトリクスのラベルに用いるAPIの名前。デフォルトはunknown
+            stream (bool, optional): Trueの場合はトランスポートのget_streamで送信する。デフォルトはFalse
+
+        Returns:
+            requests.Response: レスポンス
+
+        Raises:
+            APIError: リクエスト全体の制限時間を超えている、または接続の失敗などでリクエストを送信できない
+        """
+        headers = {'Authorization': f'Bearer {self._token}'}
+        timeout = self._get_timeout()
+        self._request_count += 1
+        start = time.perf_counter()
+        try:
+            get = self._transport.get_stream if stream else self._transport.get
+            response = get(url, headers=headers, params=params, timeout=timeout)
+        except requests.exceptions.Timeout:
+            metrics.GRDM_REQUESTS.inc(endpoint=endpoint, status="timeout")
+            raise
+        except requests.exceptions.RequestException as e:
+            metrics.GRDM_REQUESTS.inc(endpoint=endpoint, status="error")
+            logger.error(f"API request failed: {e}")
+            raise APIError("APIリクエストの送信に失敗しました") from e
+        metrics.GRDM_REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+        metrics.GRDM_REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+        if not stream:
+            metrics.GRDM_RESPONSE_BYTES.observe(len(response.content or b""), endpoint=endpoint)
+        if response.status_code == 401:
+            self._invalidate_token_cache()
+        return response
+
+    def _decode(self, response: requests.Response, endpoint: str = "unknown", paths: list = None, stream: bool = False) -> Any:
+        """レスポンスボディをJSONとして変換し、変換にかかった時間をメトリクスに記録するメソッドです。
+
+        文字列に変換する際のコピーを省くため、レスポンスボディのバイト列をそのままJSONの変換に渡します。
+        streamがTrueの場合は、レスポンスボディをresponse.rawから受信しながら変換し、受信した大きさもメトリクスに記録します。
+
+        Args:
+            response (requests.Response): レスポンス
+            endpoint (str, optional): メトリクスのラベルに用いるAPIの名前。デフォルトはunknown
+            paths (list, optional): 残すパス(キーのリスト)の一覧。指定した場合はそのパスの値のみを読み込む。デフォルトはNone
+            stream (bool, optional): レスポンスボディを読み込んでいないレスポンスか。pathsを指定した場合のみ使用する。デフォルトはFalse
+
+        Returns:
+            Any: 変換したデータ
+        """
+        start = time.perf_counter()
+        if paths is None:
+            data = json_backend.loads(response.content)
+        elif stream:
+            # Content-Encoding(gzipなど)を展開しながら読み込む
+            response.raw.decode_content = True
+            data = PrunedJsonParser.parse(response.raw, paths)
+            metrics.GRDM_RESPONSE_BYTES.observe(response.raw.tell(), endpoint=endpoint)
+        else:
+            data = PrunedJsonParser.parse_bytes(response.content, paths)
+        metrics.GRDM_JSON_DECODE_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+        return data
 
     def check_authentication(self, token: str, project_id: str) -> bool:
         """アクセス権の認証を行うメソッドです。
@@ -630,6 +1545,8 @@ class GrdmAccess():
     def _check_token_valid(self) -> bool:
         """トークンの存在とアクセス権の有無を確認するメソッドです。
 
+        有効と確認できたトークンは一定時間キャッシュし、その間は確認のリクエストを省略します。
+
         Returns:
             bool:認証結果を返す
 
@@ -638,13 +1555,17 @@ class GrdmAccess():
             AccessDeniedError:アクセス権不正のエラー
             APIError:APIのサーバーエラー、タイムアウト
         """
+        if self._is_token_cached():
+            metrics.TOKEN_CACHE.inc(result="hit")
+            return True
+        metrics.TOKEN_CACHE.inc(result="miss")
+
         base_url = self._config_file["url"]["token"]
         url = base_url.format(domain=self._domain)
-        headers = {'Authorization': f'Bearer {self._token}'}
         try:
-            response = requests.get(url, headers=headers, timeout=self._timeout)
+            response = self._get(url, endpoint="token")
             response.raise_for_status()
-            data = response.json()
+            data = self._decode(response, "token")
         except requests.exceptions.HTTPError as e:
             if response.status_code == 401:
                 logger.error(f"InvalidTokenError: {e}")
@@ -661,6 +1582,7 @@ class GrdmAccess():
         else:
             scope = data["scope"]
             if any(element in scope for element in GrdmAccess._ALLOWED_SCOPES):
+                self._cache_token()
                 return True
             else:
                 logger.error(f"token permisson error: {scope}")
@@ -679,11 +1601,10 @@ class GrdmAccess():
         """
         base_url = self._config_file["url"]["project_info"]
         url = base_url.format(domain=self._domain, project_id=self._project_id)
-        headers = {'Authorization': f'Bearer {self._token}'}
         try:
-            response = requests.get(url, headers=headers, timeout=self._timeout)
+            response = self._get(url, endpoint="project_info")
             response.raise_for_status()
-            result = response.json()
+            result = self._decode(response, "project_info")
         except requests.exceptions.HTTPError as e:
             if response.status_code == 403:
                 logger.error(f"Project permisson error: {e}")
@@ -726,19 +1647,20 @@ class GrdmAccess():
             logger.error(f"Executed without authentication process")
             raise UnauthorizedError("認証されていません")
         if project_metadata_id is None:
-            base_url = self._config_file["url"]["project_metadata"]
+            endpoint = "project_metadata"
+            base_url = self._config_file["url"][endpoint]
             url = base_url.format(domain=self._domain, project_id=self._project_id)
             params = {"sort": "-date_created"}
         else:
-            base_url = self._config_file["url"]["project_metadata_by_id"]
+            endpoint = "project_metadata_by_id"
+            base_url = self._config_file["url"][endpoint]
             url = base_url.format(domain=self._domain)
             params = {"filter[id]": f"{project_metadata_id}"}
 
-        headers = {'Authorization': f'Bearer {self._token}'}
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=self._timeout)
+            response = self._get(url, params=params, endpoint=endpoint)
             response.raise_for_status()
-            data = response.json()
+            data = self._decode(response, endpoint)
 
             # IDを指定しない場合は作成日が最新のデータ
             if project_metadata_id is None:
@@ -771,10 +1693,15 @@ class GrdmAccess():
             logger.error(f"API request timeout: {e}")
             raise APIError("APIリクエストがタイムアウトしました")
 
-    def get_file_metadata(self, **kwargs: Any) -> dict:
+    def get_file_metadata(self, paths: list = None, **kwargs: Any) -> dict:
         """ファイルメタデータを取得するメソッドです。
 
+        設定ファイルのstream_file_metadataが有効で、pathsを指定した場合は、レスポンスボディのうち
+        そのパスの値のみを読み込みます。トランスポートがget_streamを実装している場合は、レスポンスボディ全体を
+        保持せずに受信しながら読み込みます。
+
         Args:
+            paths (list, optional): マッピング定義が参照するパス(キーのリスト)の一覧。デフォルトはNone
             **kwargs(Any): 使用しない引数の受け皿
 
         Returns:
@@ -789,11 +1716,14 @@ class GrdmAccess():
             raise UnauthorizedError("認証されていません")
         base_url = self._config_file["url"]["file_metadata"]
         url = base_url.format(domain=self._domain, project_id=self._project_id)
-        headers = {'Authorization': f'Bearer {self._token}'}
+        paths = paths if self._stream_file_metadata else None
+        # レスポンスボディを読み込まずに返せるトランスポートの場合は、受信しながら参照するパスの値のみを組み立てる
+        stream = paths is not None and hasattr(self._transport, "get_stream")
+        response = None
         try:
-            response = requests.get(url, headers=headers, timeout=self._timeout)
+            response = self._get(url, endpoint="file_metadata", stream=stream)
             response.raise_for_status()
-            result = response.json()
+            result = self._decode(response, "file_metadata", paths, stream)
         except requests.exceptions.HTTPError as e:
             if response.status_code == 400:
                 # アドオンが無効の場合もエラーにしない
@@ -807,6 +1737,9 @@ class GrdmAccess():
         except requests.exceptions.Timeout as e:
             logger.error(f"API request timeout: {e}")
             raise APIError("APIリクエストがタイムアウトしました")
+        finally:
+            if stream and response is not None:
+                response.close()
         return result
 
     def get_project_info(self, **kwargs: Any) -> dict:
@@ -827,11 +1760,10 @@ class GrdmAccess():
             raise UnauthorizedError("認証されていません")
         base_url = self._config_file["url"]["project_info"]
         url = base_url.format(domain=self._domain, project_id=self._project_id)
-        headers = {'Authorization': f'Bearer {self._token}'}
         try:
-            response = requests.get(url, headers=headers, timeout=self._timeout)
+            response = self._get(url, endpoint="project_info")
             response.raise_for_status()
-            result = response.json()
+            result = self._decode(response, "project_info")
         except requests.exceptions.HTTPError as e:
             if response.status_code >= 500:
                 logger.error(f"API server error: {e}")
@@ -867,22 +1799,65 @@ class GrdmAccess():
             raise UnauthorizedError("認証されていません")
         base_url = self._config_file["url"]["member_info"]
         url = base_url.format(domain=self._domain, project_id=self._project_id)
-        headers = {'Authorization': f'Bearer {self._token}'}
         request_count = 0
         result = None
+        while url:
+            data = self._get_member_page(url)
+            if result is None:
+                result = data
+            else:
+                result["data"].extend(data["data"])
+            url = data["links"].get("next")
+            request_count += 1
+            if request_count >= self._max_requests:
+                raise APIError("リクエスト回数が上限を超えました")
+        return result
+
+    def iter_member_info(self, **kwargs: Any) -> Iterator[dict]:
+        """メンバー情報を1ページずつ取得するジェネレーターです。
+
+        次のページは、呼び出し元が受け取ったページの処理を終えて次を要求したときに取得します。
+
+        Args:
+            **kwargs(Any): 使用しない引数の受け皿
+
+        Yields:
+            dict: APIから取得した1ページ分のメンバー情報
+
+        Raises:
+            UnauthorizedError: 認証処理を実行せずに実行した場合のエラー
+            APIError:APIのサーバーエラー、タイムアウト、リクエスト回数の上限
+        """
+        if not self._is_authenticated:
+            logger.error(f"Executed without authentication process")
+            raise UnauthorizedError("認証されていません")
+        base_url = self._config_file["url"]["member_info"]
+        url = base_url.format(domain=self._domain, project_id=self._project_id)
+        request_count = 0
+        while url:
+            data = self._get_member_page(url)
+            url = data["links"].get("next")
+            request_count += 1
+            if request_count >= self._max_requests:
+                raise APIError("リクエスト回数が上限を超えました")
+            yield data
+
+    def _get_member_page(self, url: str) -> dict:
+        """メンバー情報の1ページを取得するメソッドです。
+
+        Args:
+            url (str): ページのURL
+
+        Returns:
+            dict: APIから取得した1ページ分のメンバー情報
+
+        Raises:
+            APIError:APIのサーバーエラー、タイムアウト
+        """
         try:
-            while url:
-                response = requests.get(url, headers=headers, timeout=self._timeout)
-                response.raise_for_status()
-                data = response.json()
-                if result is None:
-                    result = data
-                else:
-                    result["data"].extend(data["data"])
-                url = data["links"].get("next")
-                request_count += 1
-                if request_count >= self._max_requests:
-                    raise APIError("リクエスト回数が上限を超えました")
+            response = self._get(url, endpoint="member_info")
+            response.raise_for_status()
+            return self._decode(response, "member_info")
         except requests.exceptions.HTTPError as e:
             if response.status_code >= 500:
                 logger.error(f"API server error: {e}")
@@ -893,4 +1868,3 @@ class GrdmAccess():
         except requests.exceptions.Timeout as e:
             logger.error(f"API request timeout: {e}")
             raise APIError("APIリクエストがタイムアウトしました")
-        return result
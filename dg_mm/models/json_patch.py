@@ -0,0 +1,284 @@
+"""メタデータの差分をJSON Patch(RFC 6902)の形式で作成、適用するモジュールです。
+
+前回出力したメタデータとの差分のみを出力することで、少数のプロパティだけが変わる場合の出力量を減らします。
+作成する操作はadd、remove、replaceのみです。
+
+リスト(researcher[]やfunding[]など)は要素をJSONの正規形で比較し、一致する要素の並びを保ったまま
+追加、削除された要素のみを操作にします。位置が対応する要素が変わった場合は、要素の中の差分と
+要素全体の置き換えのうち、小さい方を用います。
+"""
+
+import difflib
+import json
+from logging import getLogger
+from typing import Any
+
+from dg_mm.errors import DataFormatError
+
+logger = getLogger(__name__)
+
+
+class JsonPatch():
+    """JSON Patchの作成と適用を行うクラスです。"""
+
+    @classmethod
+    def diff(cls, source: Any, target: Any) -> list:
+        """sourceをtargetに変換するJSON Patchを作成するメソッドです。
+
+        Args:
+            source (Any): 変換前のJSONに変換できる値。Noneの場合は前回の値がないものとして、全体を追加する
+            target (Any): 変換後のJSONに変換できる値
+
+        Returns:
+            list: JSON Patchの操作の一覧。差分がない場合は空のリスト
+        """
+        if source is None:
+            return [{"op": "add", "path": "", "value": target}]
+        operations = []
+        cls._diff(source, target, "", operations)
+        return operations
+
+    @classmethod
+    def apply(cls, document: Any, patch: list) -> Any:
+        """JSON Patchを適用するメソッドです。引数のdocumentは変更しません。
+
+        Args:
+            document (Any): 適用先の値
+            patch (list): JSON Patchの操作の一覧
+
+        Returns:
+            Any: 適用した結果
+
+        Raises:
+            DataFormatError: 対応していない操作、または適用先に存在しないパスが含まれる
+        """
+        result = json.loads(json.dumps(document))
+        for operation in patch:
+            op = operation.get("op")
+            if op not in ("add", "remove", "replace"):
+                logger.error(f"対応していないJSON Patchの操作({op})")
+                raise DataFormatError(f"対応していないJSON Patchの操作です。({op})")
+            tokens = cls._parse_pointer(operation.get("path", ""))
+            if not tokens:
+                # ルートへのaddとreplaceは値全体の置き換え
+                if op == "remove":
+                    raise DataFormatError("JSON Patchのパスに誤りがあります。()")
+                result = operation["value"]
+                continue
+
+            parent = cls._resolve(result, tokens[:-1], operation["path"])
+            key = tokens[-1]
+            try:
+                if isinstance(parent, list):
+                    index = len(parent) if key == "-" and op == "add" else _to_index(key)
+                    if op == "add":
+                        if index > len(parent):
+                            raise IndexError(index)
+                        parent.insert(index, operation["value"])
+                    elif op == "remove":
+                        del parent[index]
+                    else:
+                        parent[index] = operation["value"]
+                elif isinstance(parent, dict):
+                    if op == "add":
+                        parent[key] = operation["value"]
+                    elif op == "remove":
+                        del parent[key]
+                    else:
+                        if key not in parent:
+                            raise KeyError(key)
+                        parent[key] = operation["value"]
+                else:
+                    raise TypeError(type(parent).__name__)
+            except (IndexError, KeyError, ValueError, TypeError) as e:
+                logger.error(f"JSON Patchのパスが存在しない({operation['path']}: {e})")
+                raise DataFormatError(f"JSON Patchのパスに誤りがあります。({operation['path']})") from e
+        return result
+
+    @classmethod
+    def _diff(cls, source: Any, target: Any, path: str, operations: list):
+        """2つの値の差分の操作を追加するメソッドです。
+
+        Args:
+            source (Any): 変換前の値
+            target (Any): 変換後の値
+            path (str): 値のJSON Pointer
+            operations (list): 操作の追加先
+        """
+        # JSONではtrueと1を区別するため、型が異なる場合は値が等しくても置き換える
+        if type(source) is not type(target):
+            operations.append({"op": "replace", "path": path, "value": target})
+        elif isinstance(source, dict):
+            cls._diff_dict(source, target, path, operations)
+        elif isinstance(source, list):
+            cls._diff_list(source, target, path, operations)
+        elif source != target:
+            operations.append({"op": "replace", "path": path, "value": target})
+
+    @classmethod
+    def _diff_dict(cls, source: dict, target: dict, path: str, operations: list):
+        """オブジェクトの差分の操作を追加するメソッドです。
+
+        Args:
+            source (dict): 変換前のオブジェクト
+            target (dict): 変換後のオブジェクト
+            path (str): オブジェクトのJSON Pointer
+            operations (list): 操作の追加先
+        """
+        for key in source:
+            if key not in target:
+                operations.append({"op": "remove", "path": f"{path}/{cls._escape(key)}"})
+        for key, value in target.items():
+            child_path = f"{path}/{cls._escape(key)}"
+            if key in source:
+                cls._diff(source[key], value, child_path, operations)
+            else:
+                operations.append({"op": "add", "path": child_path, "value": value})
+
+    @classmethod
+    def _diff_list(cls, source: list, target: list, path: str, operations: list):
+        """リストの差分の操作を追加するメソッドです。
+
+        要素の正規形の並びから一致する区間を求め、区間の間の要素を追加、削除、または要素ごとに比較します。
+        操作は先頭から順に適用するため、処理中の区間より前のリストは変換後の要素の並びになっています。
+        そのため、変換前のi番目から始まる区間は、適用時には変換後の位置(j1)から始まります。
+
+        Args:
+            source (list): 変換前のリスト
+            target (list): 変換後のリスト
+            path (str): リストのJSON Pointer
+            operations (list): 操作の追加先
+        """
+        source_items = cls._canonical_items(source)
+        target_items = cls._canonical_items(target)
+        if source_items == target_items:
+            return
+        matcher = difflib.SequenceMatcher(None, source_items, target_items, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            paired = min(i2 - i1, j2 - j1)
+            for k in range(paired):
+                cls._diff_item(source[i1 + k], target[j1 + k], f"{path}/{j1 + k}", operations)
+            for _ in range(i2 - i1 - paired):
+                operations.append({"op": "remove", "path": f"{path}/{j1 + paired}"})
+            for k in range(paired, j2 - j1):
+                operations.append({"op": "add", "path": f"{path}/{j1 + k}", "value": target[j1 + k]})
+
+    @classmethod
+    def _diff_item(cls, source: Any, target: Any, path: str, operations: list):
+        """位置が対応するリストの要素の差分の操作を、要素全体の置き換えより小さい場合に追加するメソッドです。
+
+        Args:
+            source (Any): 変換前の要素
+            target (Any): 変換後の要素
+            path (str): 要素のJSON Pointer
+            operations (list): 操作の追加先
+        """
+        replace = {"op": "replace", "path": path, "value": target}
+        if not isinstance(target, (dict, list)):
+            operations.append(replace)
+            return
+        item_operations = []
+        cls._diff(source, target, path, item_operations)
+        if _size(item_operations) < _size([replace]):
+            operations.extend(item_operations)
+        else:
+            operations.append(replace)
+
+    @classmethod
+    def _canonical_items(cls, items: list) -> list:
+        """リストの要素を比較するための正規形に変換するメソッドです。
+
+        Args:
+            items (list): リスト
+
+        Returns:
+            list: 要素ごとのキーを並べ替えたJSON
+        """
+        return [json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=False) for item in items]
+
+    @classmethod
+    def _escape(cls, key: str) -> str:
+        """オブジェクトのキーをJSON Pointerの参照トークンに変換するメソッドです。
+
+        Args:
+            key (str): オブジェクトのキー
+
+        Returns:
+            str: 「~」を「~0」に、「/」を「~1」に置き換えた参照トークン
+        """
+        return str(key).replace("~", "~0").replace("/", "~1")
+
+    @classmethod
+    def _parse_pointer(cls, pointer: str) -> list:
+        """JSON Pointerを参照トークンの一覧に変換するメソッドです。
+
+        Args:
+            pointer (str): JSON Pointer
+
+        Returns:
+            list: 参照トークンの一覧。ルートの場合は空のリスト
+
+        Raises:
+            DataFormatError: JSON Pointerの形式に誤りがある
+        """
+        if pointer == "":
+            return []
+        if not pointer.startswith("/"):
+            logger.error(f"JSON Pointerの形式が不正({pointer})")
+            raise DataFormatError(f"JSON Patchのパスに誤りがあります。({pointer})")
+        return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+    @classmethod
+    def _resolve(cls, document: Any, tokens: list, pointer: str) -> Any:
+        """参照トークンの一覧が指す値を取得するメソッドです。
+
+        Args:
+            document (Any): 参照先の値
+            tokens (list): 参照トークンの一覧
+            pointer (str): エラーメッセージに用いるJSON Pointer
+
+        Returns:
+            Any: 参照トークンの一覧が指す値
+
+        Raises:
+            DataFormatError: 参照先に存在しないパスである
+        """
+        current = document
+        try:
+            for token in tokens:
+                current = current[_to_index(token)] if isinstance(current, list) else current[token]
+        except (IndexError, KeyError, ValueError, TypeError) as e:
+            logger.error(f"JSON Patchのパスが存在しない({pointer}: {e})")
+            raise DataFormatError(f"JSON Patchのパスに誤りがあります。({pointer})") from e
+        return current
+
+
+def _size(operations: list) -> int:
+    """操作の一覧をJSONに変換した際の大きさを取得する関数です。
+
+    Args:
+        operations (list): 操作の一覧
+
+    Returns:
+        int: JSONの文字数
+    """
+    return len(json.dumps(operations, separators=(",", ":"), ensure_ascii=False))
+
+
+def _to_index(token: str) -> int:
+    """参照トークンをリストの位置に変換する関数です。
+
+    Args:
+        token (str): 参照トークン
+
+    Returns:
+        int: リストの位置
+
+    Raises:
+        ValueError: 0以上の整数ではない
+    """
+    if not token.isdigit():
+        raise ValueError(token)
+    return int(token)
@@ -1,6 +1,18 @@
-"""マッピング定義を管理するモジュールです。"""
+"""マッピング定義を管理するモジュールです。
+
+マッピング定義ファイル({ストレージの名称}_{スキーマの名称}_mapping.json)は、次の順にフォルダを探します。
+同じ名前のファイルが複数のフォルダにある場合は、先に見つかったものを使用します。
+
+1. DefinitionManager.configure_search_pathで設定したフォルダ(コマンドラインの--mapping-path)
+2. 環境変数DG_MM_MAPPING_PATHのフォルダ(os.pathsepで区切って複数指定できる)
+3. パッケージ内のフォルダ(dg_mm/data/mapping)
+
+各フォルダの一覧は1回の走査で索引にまとめ、フォルダの更新日時が変わるまで再利用します。
+"""
 
 import os
+import threading
+import time
 from logging import getLogger
 
 from dg_mm.errors import (
@@ -8,13 +20,171 @@ from dg_mm.errors import (
     MappingDefinitionNotFoundError,
     KeyNotFoundError
 )
+from dg_mm.instrumentation import span
+from dg_mm.models.definition_artifact import DefinitionArtifact
 from dg_mm.util import PackageFileReader
 
 logger = getLogger(__name__)
 
 
 class DefinitionManager():
-    """マッピング定義の管理を行うクラスです。"""
+    """マッピング定義の管理を行うクラスです。
+
+    Attributes:
+        class:
+            _cache(dict):マッピング定義ファイルのパスと(更新日時, サイズ, マッピング定義)の組。
+                キャッシュが無効の場合はNone
+            _cache_lock(threading.Lock):キャッシュの更新に用いるロック
+            DEFINITION_DIR(str):パッケージ内のマッピング定義ファイルのフォルダ(dg_mmフォルダからの相対パス)
+            DEFINITION_SUFFIX(str):マッピング定義ファイルの名前の、ストレージとスキーマの名称に続く部分
+            SEARCH_PATH_ENV(str):マッピング定義ファイルを探すフォルダを指定する環境変数
+            _search_path(list):configure_search_pathで設定したフォルダの一覧
+            _resolved_search_path(tuple):フォルダの一覧を決める値(設定、環境変数、作業フォルダ)と、絶対パスにしたフォルダの一覧の組
+            _index(tuple):フォルダごとの(パス, 走査時の更新日時)の組の一覧と、「{ストレージ}_{スキーマ}」とファイルのパスの組。
+                作成していない場合はNone
+            _index_lock(threading.Lock):索引の更新に用いるロック
+    """
+    DEFINITION_DIR = 'data/mapping'
+    DEFINITION_SUFFIX = '_mapping.json'
+    SEARCH_PATH_ENV = 'DG_MM_MAPPING_PATH'
+    _cache = None
+    _cache_lock = threading.Lock()
+    _search_path = []
+    _resolved_search_path = None
+    _index = None
+    _index_lock = threading.Lock()
+
+    # 更新日時の精度が粗いファイルシステムでは、走査と同じ時刻のうちに追加されたファイルを更新日時で検知できないため、
+    # 走査の時点で更新から経過した時間がこれより短いフォルダの索引は、次の検索で作成し直す
+    _RACY_NS = 2 * 10 ** 9
+
+    @classmethod
+    def enable_cache(cls, enabled: bool = True):
+        """読み込んだマッピング定義をプロセス内で保持するかを設定するメソッドです。
+
+        常駐するサーバーなどで、リクエストごとのマッピング定義ファイルの読み込みを省くために使用します。
+        保持したマッピング定義は、ファイルの更新日時かサイズが変わった場合に読み込み直します。
+        保持したマッピング定義は呼び出し元の間で共有されるため、変更せずに使用してください。
+
+        Args:
+            enabled (bool, optional): Trueの場合は保持する。Falseの場合は保持せず、保持した内容を破棄する。デフォルトはTrue
+        """
+        with cls._cache_lock:
+            cls._cache = {} if enabled else None
+
+    @classmethod
+    def configure_search_path(cls, search_path: list = None):
+        """マッピング定義ファイルを探すフォルダを設定するメソッドです。
+
+        設定したフォルダは、環境変数DG_MM_MAPPING_PATHのフォルダとパッケージ内のフォルダより先に探します。
+
+        Args:
+            search_path (list, optional): フォルダのパスの一覧。Noneの場合は設定を解除する
+        """
+        with cls._index_lock:
+            cls._search_path = list(search_path or [])
+            cls._index = None
+
+    @classmethod
+    def get_search_path(cls) -> list:
+        """マッピング定義ファイルを探すフォルダの一覧を、探す順に取得するメソッドです。
+
+        Returns:
+            list: フォルダの絶対パスの一覧
+        """
+        key = (tuple(cls._search_path), os.environ.get(cls.SEARCH_PATH_ENV, ""), os.getcwd())
+        resolved = cls._resolved_search_path
+        if resolved is not None and resolved[0] == key:
+            return list(resolved[1])
+
+        search_path = cls._search_path + [path for path in key[1].split(os.pathsep) if path]
+        search_path = [os.path.abspath(path) for path in search_path]
+        search_path.append(str(PackageFileReader._get_absolute_path(cls.DEFINITION_DIR)))
+        search_path = tuple(dict.fromkeys(search_path))
+        cls._resolved_search_path = (key, search_path)
+        return list(search_path)
+
+    @classmethod
+    def list_definitions(cls) -> dict:
+        """利用可能なマッピング定義ファイルの一覧を取得するメソッドです。
+
+        Returns:
+            dict: 「{ストレージ}_{スキーマ}」とマッピング定義ファイルのパスの組
+        """
+        return dict(cls._get_index())
+
+    @classmethod
+    def find_definition(cls, schema: str, storage: str) -> str:
+        """スキーマとストレージに対応するマッピング定義ファイルを探すメソッドです。
+
+        Args:
+            schema (str): スキーマを一意に定める文字列
+            storage (str): ストレージを一意に定める文字列
+
+        Returns:
+            str: マッピング定義ファイルのパス。存在しない場合はNone
+        """
+        return cls._get_index().get(f"{storage}_{schema}")
+
+    @classmethod
+    def _get_index(cls) -> dict:
+        """マッピング定義ファイルの索引を取得するメソッドです。
+
+        フォルダの一覧か、いずれかのフォルダの更新日時が変わった場合は作成し直します。
+
+        Returns:
+            dict: 「{ストレージ}_{スキーマ}」とマッピング定義ファイルのパスの組
+        """
+        directories = tuple((path, cls._get_mtime_ns(path)) for path in cls.get_search_path())
+        index = cls._index
+        if index is not None and index[0] == directories:
+            return index[1]
+
+        with cls._index_lock:
+            scanned_ns = time.time_ns()
+            definitions = {}
+            for path, _ in directories:
+                for name, file_path in cls._scan(path):
+                    definitions.setdefault(name, file_path)
+            if all(mtime_ns is None or scanned_ns - mtime_ns >= cls._RACY_NS for _, mtime_ns in directories):
+                cls._index = (directories, definitions)
+            else:
+                cls._index = None
+        return definitions
+
+    @classmethod
+    def _scan(cls, path: str) -> list:
+        """フォルダのマッピング定義ファイルの一覧を取得するメソッドです。
+
+        Args:
+            path (str): フォルダのパス
+
+        Returns:
+            list: 「{ストレージ}_{スキーマ}」とマッピング定義ファイルのパスの組の一覧。フォルダが存在しない場合は空のリスト
+        """
+        try:
+            with os.scandir(path) as entries:
+                return [
+                    (entry.name[:-len(cls.DEFINITION_SUFFIX)], entry.path) for entry in entries
+                    if entry.name.endswith(cls.DEFINITION_SUFFIX) and entry.is_file()]
+        except OSError:
+            logger.error(f"マッピング定義ファイルのフォルダを読み込めない({path})")
+            return []
+
+    @classmethod
+    def _get_mtime_ns(cls, path: str) -> int:
+        """フォルダの更新日時を取得するメソッドです。
+
+        Args:
+            path (str): フォルダのパス
+
+        Returns:
+            int: 更新日時(ナノ秒)。フォルダが存在しない場合はNone
+        """
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
 
     @classmethod
     def get_and_filter_mapping_definition(cls, schema: str, storage: str, filter_properties: list = None) -> dict:
@@ -38,39 +208,60 @@ class DefinitionManager():
             raise KeyNotFoundError("絞り込むプロパティが指定されていません。")
 
         # マッピング定義ファイルの読み込み
-        mapping_definition = cls._read_mapping_definition(schema, storage)
+        with span("definition_load", schema=schema, storage=storage):
+            mapping_definition = cls._read_mapping_definition(schema, storage)
 
         # 要素が存在する場合のみ絞り込みを行います。
         if filter_properties:
-            filtered_definition = {}
-            error_keys = []
+            with span("definition_filter"):
+                return cls.filter_mapping_definition(mapping_definition, filter_properties)
+        else:
+            return mapping_definition
 
-            sanitized_mapping_keys = {
-                k.replace('[]', ''): k for k in mapping_definition.keys()}
+    @classmethod
+    def filter_mapping_definition(cls, mapping_definition: dict, filter_properties: list) -> dict:
+        """マッピング定義の絞り込みを行うメソッドです。
 
-            for key in filter_properties:
-                matched_keys = [sanitized_mapping_keys[sanitized_key]
-                                for sanitized_key in sanitized_mapping_keys if sanitized_key.startswith(key)]
+        Args:
+            mapping_definition (dict): マッピング定義
+            filter_properties (list): スキーマの絞り込みに用いるプロパティの一覧
 
-                if matched_keys:
-                    for matched_key in matched_keys:
-                        filtered_definition[matched_key] = mapping_definition[matched_key]
-                else:
-                    logger.error(f"プロパティが存在しない({key})")
-                    error_keys.append(key)
+        Returns:
+            dict: 絞り込んだマッピング定義
 
-            if error_keys:
-                raise KeyNotFoundError(f"指定したプロパティ: {error_keys} が存在しません。")
+        Raises:
+            KeyNotFoundError: 引数として渡されたプロパティが存在しない。
 
-            return filtered_definition
+        """
+        filtered_definition = {}
+        error_keys = []
 
-        else:
-            return mapping_definition
+        sanitized_mapping_keys = {
+            k.replace('[]', ''): k for k in mapping_definition.keys()}
+
+        for key in filter_properties:
+            matched_keys = [sanitized_mapping_keys[sanitized_key]
+                            for sanitized_key in sanitized_mapping_keys if sanitized_key.startswith(key)]
+
+            if matched_keys:
+                for matched_key in matched_keys:
+                    filtered_definition[matched_key] = mapping_definition[matched_key]
+            else:
+                logger.error(f"プロパティが存在しない({key})")
+                error_keys.append(key)
+
+        if error_keys:
+            raise KeyNotFoundError(f"指定したプロパティ: {error_keys} が存在しません。")
+
+        return filtered_definition
 
     @classmethod
     def _read_mapping_definition(cls, schema: str, storage: str) -> dict:
         """マッピング定義ファイルの読み取りを行うメソッドです。
 
+        読み込んだマッピング定義は検証し、マッピングの処理に用いる形式に変換します。
+        検証済みのマッピング定義を保存したファイルが有効な場合は、そちらを読み込みます。
+
         Args:
             schema (str): スキーマを一意に定める文字列
             storage (str): ストレージを一意に定める文字列
@@ -80,21 +271,37 @@ class DefinitionManager():
 
         Raises:
             MappingDefinitionNotFoundError: マッピング定義ファイルが存在しない
+            MappingDefinitionError: マッピング定義ファイルの読み込みに失敗した、またはマッピング定義に誤りがある
 
         """
-        dir_path = 'data/mapping'
-        file_name = f"{storage}_{schema}_mapping.json"
-
-        file_path = os.path.join(dir_path, file_name)
+        file_path = cls.find_definition(schema, storage)
+        if file_path is None:
+            logger.error(f"マッピング定義ファイルが存在しない({storage}_{schema}{cls.DEFINITION_SUFFIX})")
+            raise MappingDefinitionNotFoundError("マッピング定義ファイルが見つかりません。")
 
-        if not PackageFileReader.is_file(file_path):
+        cache = cls._cache
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            # 索引の作成後に削除された場合
             logger.error(f"マッピング定義ファイルが存在しない({file_path})")
+            with cls._index_lock:
+                cls._index = None
             raise MappingDefinitionNotFoundError("マッピング定義ファイルが見つかりません。")
+        if cache is not None:
+            cached = cache.get(file_path)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached[2]
 
         try:
-            mapping_definition = PackageFileReader.read_json(file_path, encoding='utf-8')
+            mapping_definition = DefinitionArtifact.load(file_path)
+        except MappingDefinitionError:
+            raise
         except Exception as e:
             logger.error(f"マッピング定義ファイルの読み込みに失敗({file_path})")
             raise MappingDefinitionError("マッピング定義ファイルの読み込みに失敗しました。") from e
 
+        if cache is not None:
+            with cls._cache_lock:
+                cache[file_path] = (stat.st_mtime_ns, stat.st_size, mapping_definition)
         return mapping_definition
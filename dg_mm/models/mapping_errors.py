@@ -0,0 +1,249 @@
+"""マッピング中に発生したエラーを集計するモジュールです。
+
+リストの項目ごとに発生したエラーをプロパティとエラーの種類ごとに件数として集計し、
+エラーの原因となった値は一部のみを保持します。エラーメッセージは例外が表示されるときに作成します。
+"""
+
+import reprlib
+from typing import Any, Iterator
+
+KEY_NOT_FOUND = "key"
+DATA_TYPE = "type"
+
+_repr = reprlib.Repr()
+_repr.maxlist = 5
+_repr.maxlevel = 3
+_repr.maxstring = 200
+_repr.maxother = 200
+
+
+class ErrorDetail():
+    """プロパティとエラーの種類ごとのエラーの情報です。
+
+    Attributes:
+        class:
+            MAX_SAMPLES(int):保持するエラーの原因となった値の数の上限
+        instance:
+            kind(str):エラーの種類(key:キーの不一致、type:型変換の失敗)
+            schema_property(str):エラーが発生したスキーマのプロパティ
+            detail(str):一致しなかったストレージのキー、または変換先の型
+            samples(list):エラーの原因となった値の一部
+            count(int):エラーの発生件数
+            message(str):作成済みのメッセージ。メッセージを作成せずに発生したエラーの場合のみ保持する
+    """
+    MAX_SAMPLES = _repr.maxlist
+
+    __slots__ = ("kind", "schema_property", "detail", "samples", "count", "message")
+
+    def __init__(self, kind: str, schema_property: str = None, detail: str = None,
+                 samples: list = None, message: str = None):
+        """インスタンスの初期化メソッド
+
+        Args:
+            kind (str): エラーの種類
+            schema_property (str, optional): エラーが発生したスキーマのプロパティ。デフォルトはNone
+            detail (str, optional): 一致しなかったストレージのキー、または変換先の型。デフォルトはNone
+            samples (list, optional): エラーの原因となった値。MAX_SAMPLESを超える分は保持しない。デフォルトはNone
+            message (str, optional): 作成済みのメッセージ。デフォルトはNone
+        """
+        self.kind = kind
+        self.schema_property = schema_property
+        self.detail = detail
+        # 上限を超えたことを表示できるよう、上限より1件多く保持する
+        self.samples = list(samples[:ErrorDetail.MAX_SAMPLES + 1]) if samples else []
+        self.count = 1
+        self.message = message
+
+    @classmethod
+    def key_not_found(cls, key: str, schema_property: str) -> 'ErrorDetail':
+        """ストレージのキーが見つからないエラーの情報を作成するメソッドです。
+
+        Args:
+            key (str): 一致しなかったストレージのキー
+            schema_property (str): エラーが発生したスキーマのプロパティ
+
+        Returns:
+            ErrorDetail: エラーの情報
+        """
+        return cls(KEY_NOT_FOUND, schema_property, key)
+
+    @classmethod
+    def data_type(cls, type: str, values: list, schema_property: str) -> 'ErrorDetail':
+        """型変換に失敗したエラーの情報を作成するメソッドです。
+
+        Args:
+            type (str): 変換先の型
+            values (list): 変換できなかった値
+            schema_property (str): エラーが発生したスキーマのプロパティ
+
+        Returns:
+            ErrorDetail: エラーの情報
+        """
+        return cls(DATA_TYPE, schema_property, type, values)
+
+    @property
+    def key(self) -> tuple:
+        """集計に用いるキーです。"""
+        return (self.kind, self.schema_property, self.detail, self.message)
+
+    def merge(self, other: 'ErrorDetail'):
+        """同じキーのエラーの情報を集計するメソッドです。
+
+        Args:
+            other (ErrorDetail): 集計するエラーの情報
+        """
+        self.count += other.count
+        room = ErrorDetail.MAX_SAMPLES + 1 - len(self.samples)
+        if room > 0:
+            self.samples.extend(other.samples[:room])
+
+    def __str__(self) -> str:
+        if self.message is not None:
+            return self.message
+        if self.kind == KEY_NOT_FOUND:
+            return f"{self.detail}と一致するストレージのキーが見つかりませんでした。({self.schema_property})"
+        return f"型変換エラー：{_repr.repr(self.samples)}を{self.detail}に変換できません。({self.schema_property})"
+
+    def __repr__(self) -> str:
+        return f"ErrorDetail({self.kind!r}, {self.schema_property!r}, {self.detail!r}, count={self.count})"
+
+
+class MappingErrorCollector():
+    """マッピング中に発生したエラーをプロパティとエラーの種類ごとに集計するクラスです。
+
+    Attributes:
+        instance:
+            _details(dict):集計に用いるキーとエラーの情報の組
+    """
+
+    def __init__(self):
+        """インスタンスの初期化メソッド"""
+        self._details = {}
+
+    def add(self, error: Any, kind: str):
+        """エラーを集計するメソッドです。
+
+        Args:
+            error (Any): 例外の引数。ErrorDetail、MappingErrorCollector、ErrorSummary、メッセージの文字列またはそのリスト
+            kind (str): メッセージの文字列の場合のエラーの種類
+        """
+        if isinstance(error, ErrorDetail):
+            self._add_detail(error)
+        elif isinstance(error, (MappingErrorCollector, ErrorSummary)):
+            for detail in error:
+                self._add_detail(detail)
+        elif isinstance(error, (list, tuple)):
+            for item in error:
+                self.add(item, kind)
+        else:
+            self._add_detail(ErrorDetail(kind, message=str(error)))
+
+    def _add_detail(self, detail: ErrorDetail):
+        """エラーの情報を集計するメソッドです。
+
+        Args:
+            detail (ErrorDetail): エラーの情報
+        """
+        existing = self._details.get(detail.key)
+        if existing is None:
+            copied = ErrorDetail(detail.kind, detail.schema_property, detail.detail, detail.samples, detail.message)
+            copied.count = detail.count
+            self._details[detail.key] = copied
+        else:
+            existing.merge(detail)
+
+    def details(self, kind: str = None) -> list:
+        """集計したエラーの情報を取得するメソッドです。
+
+        Args:
+            kind (str, optional): エラーの種類。デフォルトはNone(すべての種類)
+
+        Returns:
+            list: 発生順のエラーの情報の一覧
+        """
+        return [detail for detail in self._details.values() if kind is None or detail.kind == kind]
+
+    def counts(self) -> dict:
+        """プロパティとエラーの種類ごとのエラーの発生件数を取得するメソッドです。
+
+        Returns:
+            dict: (スキーマのプロパティ, エラーの種類)と発生件数の組
+        """
+        counts = {}
+        for detail in self._details.values():
+            key = (detail.schema_property, detail.kind)
+            counts[key] = counts.get(key, 0) + detail.count
+        return counts
+
+    def __iter__(self) -> Iterator[ErrorDetail]:
+        return iter(self._details.values())
+
+    def __len__(self) -> int:
+        return len(self._details)
+
+    def __repr__(self) -> str:
+        return f"MappingErrorCollector({list(self._details.values())!r})"
+
+
+class ErrorSummary():
+    """集計したエラーのメッセージを表示するときに作成する、例外の引数です。
+
+    Attributes:
+        class:
+            MAX_MESSAGES(int):エラーの種類ごとに表示するメッセージの数の上限
+        instance:
+            errors(MappingErrorCollector):集計したエラー
+    """
+    MAX_MESSAGES = 20
+
+    def __init__(self, errors: MappingErrorCollector):
+        """インスタンスの初期化メソッド
+
+        Args:
+            errors (MappingErrorCollector): 集計したエラー
+        """
+        self.errors = errors
+
+    def counts(self) -> dict:
+        """プロパティとエラーの種類ごとのエラーの発生件数を取得するメソッドです。
+
+        Returns:
+            dict: (スキーマのプロパティ, エラーの種類)と発生件数の組
+        """
+        return self.errors.counts()
+
+    def __iter__(self) -> Iterator[ErrorDetail]:
+        return iter(self.errors)
+
+    def _render(self, kind: str) -> str:
+        """エラーの種類ごとのメッセージの一覧を作成するメソッドです。
+
+        Args:
+            kind (str): エラーの種類
+
+        Returns:
+            str: メッセージの一覧の文字列
+        """
+        details = self.errors.details(kind)
+        messages = []
+        for detail in details[:ErrorSummary.MAX_MESSAGES]:
+            message = str(detail)
+            if detail.count > 1:
+                message += f"(全{detail.count}件)"
+            messages.append(message)
+        rendered = str(messages)
+        if len(details) > ErrorSummary.MAX_MESSAGES:
+            rendered = rendered[:-1] + f", ...他{len(details) - ErrorSummary.MAX_MESSAGES}種類]"
+        return rendered
+
+    def __str__(self) -> str:
+        has_keys = bool(self.errors.details(KEY_NOT_FOUND))
+        has_types = bool(self.errors.details(DATA_TYPE))
+        if has_keys and has_types:
+            return f"キーの不一致が確認されました。:{self._render(KEY_NOT_FOUND)}, データの変換に失敗しました。：{self._render(DATA_TYPE)}"
+        elif has_keys:
+            return f"キーの不一致が確認されました。:{self._render(KEY_NOT_FOUND)}"
+        return f"データの変換に失敗しました。：{self._render(DATA_TYPE)}"
+
+    def __repr__(self) -> str:
+        return f"ErrorSummary({self.errors!r})"
@@ -1,10 +1,13 @@
 """ユーザーからのアクセスが行われるクラスを記載したモジュールです。"""
 
 from logging import getLogger
+from typing import Callable
 
+from dg_mm import metrics
+from dg_mm.instrumentation import use_span_hooks
 from dg_mm.models.base import BaseMapping
-from dg_mm.models.grdm import GrdmMapping
-from dg_mm.errors import InvalidStorageError
+from dg_mm.models.source_archive import SourceArchive
+from dg_mm.models.storage_registry import StorageRegistry
 
 logger = getLogger(__name__)
 
@@ -13,13 +16,61 @@ class MetadataManager():
     """メタデータの管理を行うクラスです。
 
     Attributes:
-        class:
-            _ACTIVE_STORAGES(dict):利用可能なストレージの一覧
+        instance:
+            _span_hooks(list):処理時間の計測結果を通知するフックの一覧
 
     """
-    _ACTIVE_STORAGES = {"GRDM": "GrdmMapping"}
 
-    def get_metadata(self, schema: str, storage: str, token: str = None, id: str = None, filter_properties: list = None, project_metadata_id: str = None) -> dict:
+    def __init__(self):
+        """インスタンスの初期化メソッド"""
+        self._span_hooks = []
+
+    def add_span_hook(self, hook: Callable[[str, float, dict], None]):
+        """処理時間の計測結果を通知するフックを登録するメソッドです。
+
+        フックは認証、データ取得先ごとの取得、マッピング定義の読み込みと絞り込み、マッピング処理などの
+        処理が終わるたびに、(スパンの名前, 処理時間(秒), 付加情報)を引数として呼び出されます。
+
+        Args:
+            hook (Callable[[str, float, dict], None]): 登録するフック
+        """
+        self._span_hooks.append(hook)
+
+    def remove_span_hook(self, hook: Callable[[str, float, dict], None]):
+        """登録したフックを削除するメソッドです。
+
+        Args:
+            hook (Callable[[str, float, dict], None]): 削除するフック
+        """
+        self._span_hooks.remove(hook)
+
+    @classmethod
+    def get_metrics(cls) -> dict:
+        """プロセス内で記録したメトリクスを辞書として取得するメソッドです。
+
+        GRDMへのリクエストの数、レスポンスの大きさ、JSONの変換時間、トークン検証結果のキャッシュの参照結果、
+        マッピングの実行結果、エラーの種類ごとの数などが含まれます。
+
+        Returns:
+            dict: メトリクスの名前ごとの種類、説明、ラベルごとの値
+        """
+        return metrics.REGISTRY.snapshot()
+
+    @classmethod
+    def export_metrics(cls, path: str = None) -> str:
+        """プロセス内で記録したメトリクスをPrometheusのテキスト形式で出力するメソッドです。
+
+        Args:
+            path (str, optional): 出力先のファイルのパス。デフォルトはNone(ファイルに出力しない)
+
+        Returns:
+            str: Prometheusのテキスト形式の文字列
+        """
+        if path is not None:
+            metrics.REGISTRY.write_prometheus(path)
+        return metrics.REGISTRY.to_prometheus()
+
+    def get_metadata(self, schema: str, storage: str, token: str = None, id: str = None, filter_properties: list = None, project_metadata_id: str = None, deadline: float = None) -> dict:
         """引数で指定されたストレージからスキーマの定義に則ったメタデータを取得するメソッドです。
 
         Args:
@@ -29,15 +80,12 @@ class MetadataManager():
             id (str, optional): ストレージを特定する情報。 デフォルトはNone.
             filter_properties (list, optional): スキーマの一部のキー。デフォルトはNone.
             project_metadata_id (str, optional): プロジェクトメタデータのid。デフォルトはNone.
+            deadline (float, optional): ストレージへのリクエスト全体の制限時間(秒)。デフォルトはNone(ストレージの設定の値を使用)
 
         Returns:
             dict: マッピングしたメタデータ
         """
-        if storage not in MetadataManager._ACTIVE_STORAGES:
-            logger.error(f"ストレージが存在しない({storage})")
-            raise InvalidStorageError("対応していないストレージが指定されました。")
-        mapping_cls: BaseMapping = globals()[MetadataManager._ACTIVE_STORAGES[storage]]
-        instance = mapping_cls()
+        instance = self._get_mapping_instance(storage)
         param = {
             "schema": schema,
             "token": token,
@@ -45,4 +93,101 @@ class MetadataManager():
             "filter_properties": filter_properties,
             "project_metadata_id": project_metadata_id
         }
-        return instance.mapping_metadata(**param)
+        if deadline is not None:
+            param["deadline"] = deadline
+        with use_span_hooks(self._span_hooks):
+            return instance.mapping_metadata(**param)
+
+    def get_metadata_for_schemas(self, schemas: list, storage: str, token: str = None, id: str = None, filter_properties: list = None, project_metadata_id: str = None, deadline: float = None) -> dict:
+        """引数で指定されたストレージから複数のスキーマの定義に則ったメタデータを取得するメソッドです。
+
+        ストレージへの認証とデータの取得は、スキーマの数によらず1回だけ行います。
+
+        Args:
+            schemas (list): スキーマの名称の一覧
+            storage (str): ストレージの名称
+            token (str, optional): ストレージの認証情報。 デフォルトはNone。
+            id (str, optional): ストレージを特定する情報。 デフォルトはNone.
+            filter_properties (list, optional): スキーマの一部のキー。すべてのスキーマに適用する。デフォルトはNone.
+            project_metadata_id (str, optional): プロジェクトメタデータのid。デフォルトはNone.
+            deadline (float, optional): ストレージへのリクエスト全体の制限時間(秒)。デフォルトはNone(ストレージの設定の値を使用)
+
+        Returns:
+            dict: スキーマの名称とマッピングしたメタデータの組
+        """
+        instance = self._get_mapping_instance(storage)
+        param = {
+            "schemas": schemas,
+            "token": token,
+            "project_id": id,
+            "filter_properties": filter_properties,
+            "project_metadata_id": project_metadata_id
+        }
+        if deadline is not None:
+            param["deadline"] = deadline
+        with use_span_hooks(self._span_hooks):
+            return instance.mapping_metadata_for_schemas(**param)
+
+    def get_source_data(self, schemas: list, storage: str, token: str = None, id: str = None, filter_properties: list = None, project_metadata_id: str = None, deadline: float = None) -> dict:
+        """マッピングを行わずに、スキーマのマッピングに必要なデータをストレージから取得するメソッドです。
+
+        取得したデータはget_metadata_from_sourcesに渡すか、SourceArchive.saveで保存して後からマッピングに用いることができます。
+
+        Args:
+            schemas (list): スキーマの名称の一覧
+            storage (str): ストレージの名称
+            token (str, optional): ストレージの認証情報。 デフォルトはNone。
+            id (str, optional): ストレージを特定する情報。 デフォルトはNone.
+            filter_properties (list, optional): スキーマの一部のキー。デフォルトはNone.
+            project_metadata_id (str, optional): プロジェクトメタデータのid。デフォルトはNone.
+            deadline (float, optional): ストレージへのリクエスト全体の制限時間(秒)。デフォルトはNone(ストレージの設定の値を使用)
+
+        Returns:
+            dict: データ取得先ごとのストレージのデータ
+        """
+        instance = self._get_mapping_instance(storage)
+        param = {
+            "schemas": schemas,
+            "token": token,
+            "project_id": id,
+            "filter_properties": filter_properties,
+            "project_metadata_id": project_metadata_id
+        }
+        if deadline is not None:
+            param["deadline"] = deadline
+        with use_span_hooks(self._span_hooks):
+            return instance.fetch_source_data(**param)
+
+    def get_metadata_from_sources(self, schema: str, storage: str, sources, filter_properties: list = None) -> dict:
+        """ストレージにアクセスせずに、取得済みのデータからスキーマの定義に則ったメタデータを作成するメソッドです。
+
+        Args:
+            schema (str): スキーマの名称
+            storage (str): ストレージの名称
+            sources (Union[dict, str]): データ取得先ごとのストレージのデータ、
+                またはそれを保存したフォルダかバンドルのファイルのパス
+            filter_properties (list, optional): スキーマの一部のキー。デフォルトはNone.
+
+        Returns:
+            dict: マッピングしたメタデータ
+        """
+        instance = self._get_mapping_instance(storage)
+        source_data = sources if isinstance(sources, dict) else SourceArchive.load(sources)
+        with use_span_hooks(self._span_hooks):
+            return instance.mapping_metadata_from_sources(schema, source_data, filter_properties)
+
+    def _get_mapping_instance(self, storage: str) -> BaseMapping:
+        """ストレージのマッピングクラスのインスタンスを取得するメソッドです。
+
+        マッピングクラスのモジュールは、そのストレージが初めて指定されたときに読み込みます。
+
+        Args:
+            storage (str): ストレージの名称
+
+        Returns:
+            BaseMapping: マッピングクラスのインスタンス
+
+        Raises:
+            InvalidStorageError: 対応していないストレージが指定された
+        """
+        return StorageRegistry.get_instance(storage)
@@ -0,0 +1,270 @@
+"""マッピングの結果を再利用するキャッシュのモジュールです。
+
+キャッシュのキーはマッピングの入力のフィンガープリント(SourceFingerprint)です。データ取得先のデータと
+マッピング定義が前回と同じであれば、マッピングを行わずに前回の結果を返します。
+結果はJSONに変換して保持するため、取り出した結果を変更してもキャッシュには影響しません。
+
+- MemoryResultCache: プロセス内に保持する。常駐サーバー向け
+- DiskResultCache: フォルダに保持する。コマンドの実行をまたいで再利用する場合向け
+"""
+
+import collections
+import os
+import threading
+from abc import ABC, abstractmethod
+from logging import getLogger
+from typing import Any, Optional
+
+from dg_mm import json_backend, metrics
+
+logger = getLogger(__name__)
+
+MEMORY = "memory"
+
+
+class BaseResultCache(ABC):
+    """マッピングの結果のキャッシュの共通処理をまとめたクラスです。
+
+    継承したクラスは_load、_store、_usageを実装します。
+
+    Attributes:
+        instance:
+            max_bytes(int):保持する結果の合計の大きさの上限(バイト)
+            _hits(int):キャッシュから結果を返した回数
+            _misses(int):キャッシュに結果がなかった回数
+            _lock(threading.RLock):キャッシュの更新に用いるロック
+    """
+
+    def __init__(self, max_bytes: int):
+        """インスタンスの初期化メソッド
+
+        Args:
+            max_bytes (int): 保持する結果の合計の大きさの上限(バイト)
+        """
+        self.max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """キャッシュから結果を取得するメソッドです。
+
+        Args:
+            key (str): キャッシュのキー
+
+        Returns:
+            Optional[Any]: 保持していた結果。保持していない場合はNone
+        """
+        content = self._load(key)
+        with self._lock:
+            if content is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        metrics.RESULT_CACHE.inc(result="miss" if content is None else "hit")
+        return json_backend.loads(content) if content is not None else None
+
+    def put(self, key: str, value: Any):
+        """結果をキャッシュに保持するメソッドです。上限を超える場合は最も古く参照された結果から破棄します。
+
+        Args:
+            key (str): キャッシュのキー
+            value (Any): JSONに変換できる結果
+        """
+        content = json_backend.dumps(value)
+        if len(content) > self.max_bytes:
+            return
+        self._store(key, content)
+
+    def stats(self) -> dict:
+        """キャッシュの参照結果と保持している結果の統計を取得するメソッドです。
+
+        Returns:
+            dict: 参照の成功数(hits)、失敗数(misses)、成功率(hit_ratio)、保持している結果の数(entries)と合計の大きさ(bytes)
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            entries, size = self._usage()
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "bytes": size,
+            }
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[bytes]:
+        """保持している結果を読み込むメソッドです。"""
+
+    @abstractmethod
+    def _store(self, key: str, content: bytes):
+        """結果を保持するメソッドです。"""
+
+    @abstractmethod
+    def _usage(self) -> tuple:
+        """保持している結果の数と合計の大きさを取得するメソッドです。"""
+
+
+class MemoryResultCache(BaseResultCache):
+    """マッピングの結果をプロセス内に保持するLRUキャッシュです。
+
+    Attributes:
+        instance:
+            _entries(collections.OrderedDict):キャッシュのキーとJSONに変換した結果の組。参照された順に並ぶ
+            _size(int):保持している結果の合計の大きさ(バイト)
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """インスタンスの初期化メソッド
+
+        Args:
+            max_bytes (int, optional): 保持する結果の合計の大きさの上限(バイト)。デフォルトは64MiB
+        """
+        super().__init__(max_bytes)
+        self._entries = collections.OrderedDict()
+        self._size = 0
+
+    def _load(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def _store(self, key: str, content: bytes):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = content
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _usage(self) -> tuple:
+        return len(self._entries), self._size
+
+
+class DiskResultCache(BaseResultCache):
+    """マッピングの結果をフォルダに保持するキャッシュです。
+
+    結果は「フォルダ/キーの先頭2文字/キー.json」に保存します。参照した結果はファイルの更新日時を更新し、
+    上限を超えた場合は更新日時が最も古いものから削除します。
+
+    Attributes:
+        instance:
+            directory(str):結果を保存するフォルダ
+            _index(dict):キャッシュのキーと(更新日時, 大きさ)の組。作成時にフォルダを走査して作成する
+            _size(int):保持している結果の合計の大きさ(バイト)
+    """
+    _EXTENSION = ".json"
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """インスタンスの初期化メソッド
+
+        Args:
+            directory (str): 結果を保存するフォルダ。存在しない場合は作成する
+            max_bytes (int, optional): 保持する結果の合計の大きさの上限(バイト)。デフォルトは256MiB
+        """
+        super().__init__(max_bytes)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._index = {}
+        self._size = 0
+        for entry in os.scandir(directory):
+            if not entry.is_dir():
+                continue
+            for file_entry in os.scandir(entry.path):
+                key, extension = os.path.splitext(file_entry.name)
+                if extension != DiskResultCache._EXTENSION or not file_entry.is_file():
+                    continue
+                stat = file_entry.stat()
+                self._index[key] = (stat.st_mtime, stat.st_size)
+                self._size += stat.st_size
+
+    def _get_path(self, key: str) -> str:
+        """結果を保存するファイルのパスを取得するメソッドです。
+
+        Args:
+            key (str): キャッシュのキー
+
+        Returns:
+            str: ファイルのパス
+        """
+        return os.path.join(self.directory, key[:2], key + DiskResultCache._EXTENSION)
+
+    def _load(self, key: str) -> Optional[bytes]:
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            os.utime(path)
+        except OSError:
+            # 別のプロセスが削除した場合を含め、読み込めない結果は保持していないものとして扱う
+            with self._lock:
+                entry = self._index.pop(key, None)
+                if entry is not None:
+                    self._size -= entry[1]
+            return None
+        with self._lock:
+            previous = self._index.get(key)
+            if previous is None:
+                self._size += len(content)
+            self._index[key] = (os.path.getmtime(path), len(content))
+        return content
+
+    def _store(self, key: str, content: bytes):
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.error(f"マッピングの結果の保存に失敗({path})")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            previous = self._index.get(key)
+            if previous is not None:
+                self._size -= previous[1]
+            self._index[key] = (os.path.getmtime(path), len(content))
+            self._size += len(content)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """合計の大きさが上限以下になるまで、更新日時が古い結果から削除するメソッドです。"""
+        for key, (_, size) in sorted(self._index.items(), key=lambda item: item[1][0]):
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(self._get_path(key))
+            except FileNotFoundError:
+                pass
+            del self._index[key]
+            self._size -= size
+
+    def _usage(self) -> tuple:
+        return len(self._index), self._size
+
+
+def create_result_cache(location: str, max_bytes: int = None) -> BaseResultCache:
+    """保存先を指定してマッピングの結果のキャッシュを作成する関数です。
+
+    Args:
+        location (str): 「memory」の場合はプロセス内、それ以外の場合は結果を保存するフォルダのパス
+        max_bytes (int, optional): 保持する結果の合計の大きさの上限(バイト)。デフォルトはNone(キャッシュごとの既定値)
+
+    Returns:
+        BaseResultCache: 作成したキャッシュ
+    """
+    kwargs = {"max_bytes": max_bytes} if max_bytes is not None else {}
+    if location == MEMORY:
+        return MemoryResultCache(**kwargs)
+    return DiskResultCache(location, **kwargs)
@@ -0,0 +1,102 @@
+"""ストレージから取得したデータの保存と読み込みを行うモジュールです。
+
+保存したデータを用いると、ストレージにアクセスせずにマッピングを行うことができます。
+保存形式は次の2種類です。
+
+- フォルダ: データ取得先ごとに「データ取得先の名称.json」のファイルを置いたフォルダ
+- バンドル: データ取得先の名称とデータの組を1つにまとめたJSONファイル
+"""
+
+import os
+from logging import getLogger
+
+from dg_mm import json_backend
+from dg_mm.errors import DataFormatError
+
+logger = getLogger(__name__)
+
+
+class SourceArchive():
+    """ストレージから取得したデータの保存と読み込みを行うクラスです。"""
+
+    _EXTENSION = ".json"
+
+    @classmethod
+    def load(cls, path: str) -> dict:
+        """保存したデータを読み込むメソッドです。
+
+        Args:
+            path (str): データを保存したフォルダ、またはバンドルのファイルのパス
+
+        Returns:
+            dict: データ取得先ごとのストレージのデータ
+
+        Raises:
+            FileNotFoundError: 指定したパスが存在しない
+            DataFormatError: ファイルの形式に誤りがある
+        """
+        if os.path.isdir(path):
+            source_data = {}
+            for file_name in sorted(os.listdir(path)):
+                source, extension = os.path.splitext(file_name)
+                if extension != cls._EXTENSION:
+                    continue
+                source_data[source] = cls._read_json(os.path.join(path, file_name))
+            return source_data
+
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"ファイルが見つかりません: '{path}'")
+        source_data = cls._read_json(path)
+        if not isinstance(source_data, dict):
+            logger.error(f"バンドルの形式が不正({path})")
+            raise DataFormatError(f"データのバンドルの形式に誤りがあります。({path})")
+        return source_data
+
+    @classmethod
+    def save(cls, source_data: dict, path: str, bundle: bool = False):
+        """データを保存するメソッドです。
+
+        Args:
+            source_data (dict): データ取得先ごとのストレージのデータ
+            path (str): 保存先のフォルダ、またはバンドルのファイルのパス
+            bundle (bool, optional): Trueの場合はバンドルとして保存する。デフォルトはFalse
+        """
+        if bundle:
+            cls._write_json(source_data, path)
+            return
+
+        os.makedirs(path, exist_ok=True)
+        for source, data in source_data.items():
+            cls._write_json(data, os.path.join(path, source + cls._EXTENSION))
+
+    @classmethod
+    def _read_json(cls, file_path: str) -> dict:
+        """JSONファイルを読み込むメソッドです。
+
+        Args:
+            file_path (str): ファイルのパス
+
+        Returns:
+            dict: jsonから変換したPythonオブジェクト
+
+        Raises:
+            DataFormatError: JSONとして読み込めない
+        """
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        try:
+            return json_backend.loads(content)
+        except ValueError as e:
+            logger.error(f"データの読み込みに失敗({file_path})")
+            raise DataFormatError(f"データのフォーマットに誤りがあります。({file_path})") from e
+
+    @classmethod
+    def _write_json(cls, data: dict, file_path: str):
+        """JSONファイルに書き込むメソッドです。
+
+        Args:
+            data (dict): 書き込むデータ
+            file_path (str): ファイルのパス
+        """
+        with open(file_path, 'wb') as f:
+            f.write(json_backend.dumps_pretty(data))
@@ -0,0 +1,148 @@
+"""ストレージのマッピングクラスを管理するモジュールです。
+
+マッピングクラスはパッケージのエントリーポイント(グループ: dg_mm.storages)から探し、
+そのストレージが初めて指定されたときにモジュールを読み込みます。
+ほかのパッケージからストレージを追加する場合は、pyproject.tomlに次のように記載します。
+
+    [project.entry-points."dg_mm.storages"]
+    MYSTORAGE = "my_package.mapping:MyStorageMapping"
+"""
+
+import importlib
+import threading
+from logging import getLogger
+
+from dg_mm.errors import InvalidStorageError
+from dg_mm.models.base import BaseMapping
+
+logger = getLogger(__name__)
+
+
+class StorageRegistry():
+    """ストレージの名称とマッピングクラスの対応を管理するクラスです。
+
+    Attributes:
+        class:
+            ENTRY_POINT_GROUP(str):マッピングクラスを探すエントリーポイントのグループ
+            _BUILTIN_STORAGES(dict):パッケージに含まれるストレージの名称とマッピングクラスの参照(モジュール:クラス名)の組。
+                パッケージがインストールされていない場合にも利用できるよう、エントリーポイントとは別に保持する
+            _storages(dict):ストレージの名称とマッピングクラスの参照の組。初めて参照されたときに作成する
+            _instances(dict):ストレージの名称と作成済みのマッピングクラスのインスタンスの組
+            _lock(threading.RLock):クラス変数の更新に用いるロック
+    """
+    ENTRY_POINT_GROUP = "dg_mm.storages"
+    _BUILTIN_STORAGES = {"GRDM": "dg_mm.models.grdm:GrdmMapping"}
+    _storages = None
+    _instances = {}
+    _lock = threading.RLock()
+
+    @classmethod
+    def get_storage_names(cls) -> list:
+        """利用可能なストレージの名称の一覧を取得するメソッドです。
+
+        Returns:
+            list: ストレージの名称の一覧
+        """
+        return list(cls._get_storages())
+
+    @classmethod
+    def get_instance(cls, storage: str) -> BaseMapping:
+        """ストレージのマッピングクラスのインスタンスを取得するメソッドです。
+
+        インスタンスはプロセスごとに1つだけ作成し、以降は同じインスタンスを返します。
+
+        Args:
+            storage (str): ストレージの名称
+
+        Returns:
+            BaseMapping: マッピングクラスのインスタンス
+
+        Raises:
+            InvalidStorageError: 対応していないストレージが指定された
+        """
+        instance = cls._instances.get(storage)
+        if instance is not None:
+            return instance
+        with cls._lock:
+            if storage not in cls._instances:
+                cls._instances[storage] = cls.get_class(storage)()
+            return cls._instances[storage]
+
+    @classmethod
+    def get_class(cls, storage: str) -> type:
+        """ストレージのマッピングクラスを取得するメソッドです。
+
+        Args:
+            storage (str): ストレージの名称
+
+        Returns:
+            type: マッピングクラス
+
+        Raises:
+            InvalidStorageError: 対応していないストレージが指定された、またはマッピングクラスを読み込めない
+        """
+        target = cls._get_storages().get(storage)
+        if target is None:
+            logger.error(f"ストレージが存在しない({storage})")
+            raise InvalidStorageError("対応していないストレージが指定されました。")
+
+        module_name, _, class_name = target.partition(":")
+        try:
+            module = importlib.import_module(module_name)
+            return getattr(module, class_name)
+        except (ImportError, AttributeError) as e:
+            logger.error(f"マッピングクラスの読み込みに失敗({storage}: {target})")
+            raise InvalidStorageError(f"ストレージ:{storage}のマッピングクラスを読み込めません。") from e
+
+    @classmethod
+    def register(cls, storage: str, target: str):
+        """ストレージのマッピングクラスを登録するメソッドです。
+
+        Args:
+            storage (str): ストレージの名称
+            target (str): マッピングクラスの参照(モジュール:クラス名)
+        """
+        with cls._lock:
+            cls._get_storages()[storage] = target
+            cls._instances.pop(storage, None)
+
+    @classmethod
+    def clear(cls):
+        """登録内容と作成済みのインスタンスを破棄するメソッドです。次の参照時にエントリーポイントを探し直します。"""
+        with cls._lock:
+            cls._storages = None
+            cls._instances.clear()
+
+    @classmethod
+    def _get_storages(cls) -> dict:
+        """ストレージの名称とマッピングクラスの参照の組を取得するメソッドです。
+
+        Returns:
+            dict: ストレージの名称とマッピングクラスの参照の組
+        """
+        storages = cls._storages
+        if storages is not None:
+            return storages
+        with cls._lock:
+            if cls._storages is None:
+                storages = dict(cls._BUILTIN_STORAGES)
+                for entry_point in cls._find_entry_points():
+                    storages[entry_point.name] = entry_point.value
+                cls._storages = storages
+            return cls._storages
+
+    @classmethod
+    def _find_entry_points(cls) -> list:
+        """マッピングクラスのエントリーポイントを探すメソッドです。
+
+        Returns:
+            list: エントリーポイントの一覧
+        """
+        # importlib.metadataの読み込みには時間がかかるため、エントリーポイントを探すときに読み込む
+        import importlib.metadata
+
+        entry_points = importlib.metadata.entry_points()
+        # Python 3.10以降はselect、それより前は辞書として取得する
+        if hasattr(entry_points, "select"):
+            return list(entry_points.select(group=cls.ENTRY_POINT_GROUP))
+        return list(entry_points.get(cls.ENTRY_POINT_GROUP, []))
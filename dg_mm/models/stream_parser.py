@@ -0,0 +1,206 @@
+"""JSONのうち、マッピング定義が参照する部分のみを読み込むモジュールです。
+
+ijsonがインストールされている場合は、レスポンスボディを一定の大きさずつ読み込みながらイベントとして解析し、
+参照するパスの値のみを組み立てます。参照しない部分はオブジェクトを作成せずに読み飛ばすため、
+保持するデータの大きさはレスポンスボディ全体ではなく、マッピングに用いる部分の大きさに比例します。
+インストールされていない場合は全体を変換した後に、参照するパスの値のみを残します。
+
+    pip install dg-metadata-manager[stream]
+
+参照するパスはマッピング定義のキーを「.」で分割したリストで指定します。途中のリストは各要素に同じキーを適用し、
+パスの末尾の値はその中身をすべて残します。マッピングの処理が同じ結果になるよう、次のように扱います。
+
+- 参照するキーが存在しない場合は、そのまま存在しないものとする
+- 途中の値がオブジェクトでもリストでもない場合は、その値を残す
+- 最上位のオブジェクトの参照しないキーは値をNoneにして残す(データが空かどうかを変えないため)
+"""
+
+import io
+from typing import Any, BinaryIO, Iterator
+
+from dg_mm import json_backend
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - インストールされている環境のみ
+    ijson = None
+
+# 一度に読み込むレスポンスボディの大きさ
+_CHUNK_SIZE = 64 * 1024
+
+
+class PrunedJsonParser():
+    """JSONのうち、指定したパスの値のみを読み込むクラスです。"""
+
+    @classmethod
+    def parse(cls, stream: BinaryIO, paths: list) -> Any:
+        """JSONを読み込み、指定したパスの値のみを残した値に変換するメソッドです。
+
+        Args:
+            stream (BinaryIO): UTF-8のJSONの読み込み元
+            paths (list): 残すパス(キーのリスト)の一覧
+
+        Returns:
+            Any: 指定したパスの値のみを残した値
+
+        Raises:
+            ValueError: JSONの形式に誤りがある
+        """
+        tree = cls.build_tree(paths)
+        if ijson is None:
+            return cls._prune(json_backend.loads(stream.read()), tree, True)
+
+        events = ijson.basic_parse(stream, buf_size=_CHUNK_SIZE, use_float=True)
+        try:
+            event, value = next(events)
+            result = cls._build(events, event, value, tree, {}, True)
+            for _ in events:
+                pass
+        except StopIteration:
+            raise ValueError("JSONのフォーマットに誤りがあります。")
+        except ijson.JSONError as e:
+            raise ValueError(f"JSONのフォーマットに誤りがあります。({e})") from e
+        return result
+
+    @classmethod
+    def parse_bytes(cls, content: bytes, paths: list) -> Any:
+        """バイト列のJSONを、指定したパスの値のみを残した値に変換するメソッドです。
+
+        Args:
+            content (bytes): UTF-8のJSON
+            paths (list): 残すパス(キーのリスト)の一覧
+
+        Returns:
+            Any: 指定したパスの値のみを残した値
+
+        Raises:
+            ValueError: JSONの形式に誤りがある
+        """
+        return cls.parse(io.BytesIO(content), paths)
+
+    @classmethod
+    def prune(cls, data: Any, paths: list) -> Any:
+        """変換済みの値から、指定したパスの値のみを残した値を作成するメソッドです。引数のdataは変更しません。
+
+        Args:
+            data (Any): JSONから変換した値
+            paths (list): 残すパス(キーのリスト)の一覧
+
+        Returns:
+            Any: 指定したパスの値のみを残した値
+        """
+        return cls._prune(data, cls.build_tree(paths), True)
+
+    @classmethod
+    def build_tree(cls, paths: list) -> dict:
+        """パスの一覧を、キーごとに次のキーの辞書をたどる木に変換するメソッドです。
+
+        パスの末尾のキーの値はNoneで、その値の中身をすべて残すことを表します。
+        あるパスがほかのパスの途中までと一致する場合は、短い方のパスを優先します。
+
+        Args:
+            paths (list): パス(キーのリスト)の一覧
+
+        Returns:
+            dict: パスの木
+        """
+        tree = {}
+        for path in paths:
+            node = tree
+            for key in path[:-1]:
+                child = node.setdefault(key, {})
+                if child is None:
+                    break
+                node = child
+            else:
+                if path:
+                    node[path[-1]] = None
+        return tree
+
+    @classmethod
+    def _prune(cls, data: Any, node: dict, is_root: bool = False) -> Any:
+        """変換済みの値から、パスの木に含まれる値のみを残すメソッドです。
+
+        Args:
+            data (Any): JSONから変換した値
+            node (dict): パスの木。Noneの場合は値をすべて残す
+            is_root (bool, optional): 最上位の値の場合はTrue
+
+        Returns:
+            Any: パスの木に含まれる値のみを残した値
+        """
+        if node is None:
+            return data
+        if isinstance(data, dict):
+            result = {}
+            for key, value in data.items():
+                if key in node:
+                    result[key] = cls._prune(value, node[key])
+                elif is_root:
+                    result[key] = None
+            return result
+        if isinstance(data, list):
+            return [cls._prune(item, node) for item in data]
+        return data
+
+    @classmethod
+    def _build(
+            cls, events: Iterator[tuple], event: str, value: Any, node: dict, keys: dict, is_root: bool = False) -> Any:
+        """解析したイベントから、パスの木に含まれる値のみを組み立てるメソッドです。
+
+        同じ名前のキーは1つの文字列を共有します(json.loadsと同様)。
+
+        Args:
+            events (Iterator[tuple]): 残りのイベントと値の組
+            event (str): 組み立てる値の最初のイベント
+            value (Any): 最初のイベントの値
+            node (dict): パスの木。Noneの場合は値をすべて残す
+            keys (dict): 読み込んだキーの文字列
+            is_root (bool, optional): 最上位の値の場合はTrue
+
+        Returns:
+            Any: パスの木に含まれる値のみを残した値
+        """
+        if event == "start_map":
+            result = {}
+            for event, key in events:
+                if event == "end_map":
+                    return result
+                event, value = next(events)
+                if node is None:
+                    result[keys.setdefault(key, key)] = cls._build(events, event, value, None, keys)
+                elif key in node:
+                    result[keys.setdefault(key, key)] = cls._build(events, event, value, node[key], keys)
+                else:
+                    cls._skip(events, event)
+                    if is_root:
+                        result[key] = None
+            raise StopIteration
+        if event == "start_array":
+            result = []
+            for event, value in events:
+                if event == "end_array":
+                    return result
+                result.append(cls._build(events, event, value, node, keys))
+            raise StopIteration
+        return value
+
+    @classmethod
+    def _skip(cls, events: Iterator[tuple], event: str):
+        """値を組み立てずに、値の終わりまでイベントを読み飛ばすメソッドです。
+
+        Args:
+            events (Iterator[tuple]): 残りのイベントと値の組
+            event (str): 読み飛ばす値の最初のイベント
+        """
+        if event not in ("start_map", "start_array"):
+            return
+        depth = 1
+        for event, _ in events:
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if depth == 0:
+                    return
+        raise StopIteration
@@ -0,0 +1,313 @@
+"""GRDMへのHTTP通信を行うトランスポートを記載したモジュールです。
+
+GrdmAccessはトランスポートを介してリクエストを送信するため、通信の方法を差し替えることができます。
+レスポンスボディを読み込まずに返すget_streamを実装したトランスポート(RequestsTransport、SessionTransport)では、
+GrdmAccessはファイルメタデータを受信しながら変換します。レスポンスボディ全体を必要とするCachingTransportと
+RecordingTransport、記録を返すReplayTransportは実装しないため、レスポンスボディ全体を受信してから変換します。
+"""
+
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+from logging import getLogger
+from typing import Protocol, Union
+
+import requests
+
+from dg_mm.errors import APIError
+
+logger = getLogger(__name__)
+
+
+class BaseTransport(Protocol):
+    """トランスポートのプロトコルです。"""
+
+    def get(self, url: str, headers: dict = None, params: dict = None, timeout: Union[float, tuple] = None) -> requests.Response:
+        """GETリクエストを送信し、レスポンスを返すメソッドです。"""
+
+
+class RequestsTransport():
+    """requestsのモジュール関数でリクエストを送信するトランスポートです。"""
+
+    def get(self, url: str, headers: dict = None, params: dict = None, timeout: Union[float, tuple] = None) -> requests.Response:
+        """GETリクエストを送信するメソッドです。
+
+        Args:
+            url (str): リクエスト先のURL
+            headers (dict, optional): リクエストヘッダー。デフォルトはNone
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+            timeout (Union[float, tuple], optional): タイムアウト(秒)。デフォルトはNone
+
+        Returns:
+            requests.Response: レスポンス
+        """
+        return requests.get(url, headers=headers, params=params, timeout=timeout)
+
+    def get_stream(self, url: str, headers: dict = None, params: dict = None, timeout: Union[float, tuple] = None) -> requests.Response:
+        """GETリクエストを送信し、レスポンスボディを読み込まずにレスポンスを返すメソッドです。
+
+        レスポンスボディはresponse.rawから読み込み、読み込んだ後にresponse.close()で接続を解放します。
+
+        Args:
+            url (str): リクエスト先のURL
+            headers (dict, optional): リクエストヘッダー。デフォルトはNone
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+            timeout (Union[float, tuple], optional): タイムアウト(秒)。デフォルトはNone
+
+        Returns:
+            requests.Response: レスポンスボディを読み込んでいないレスポンス
+        """
+        return requests.get(url, headers=headers, params=params, timeout=timeout, stream=True)
+
+
+class SessionTransport():
+    """requests.Sessionを用いて接続を再利用するトランスポートです。
+
+    Attributes:
+        instance:
+            _session(requests.Session): 接続プールを保持するセッション
+    """
+
+    def __init__(self, pool_maxsize: int = 10):
+        """インスタンスの初期化メソッド
+
+        Args:
+            pool_maxsize (int, optional): ホストごとに保持する接続数の上限。デフォルトは10
+        """
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+    def get(self, url: str, headers: dict = None, params: dict = None, timeout: Union[float, tuple] = None) -> requests.Response:
+        """GETリクエストを送信するメソッドです。
+
+        Args:
+            url (str): リクエスト先のURL
+            headers (dict, optional): リクエストヘッダー。デフォルトはNone
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+            timeout (Union[float, tuple], optional): タイムアウト(秒)。デフォルトはNone
+
+        Returns:
+            requests.Response: レスポンス
+        """
+        return self._session.get(url, headers=headers, params=params, timeout=timeout)
+
+    def get_stream(self, url: str, headers: dict = None, params: dict = None, timeout: Union[float, tuple] = None) -> requests.Response:
+        """GETリクエストを送信し、レスポンスボディを読み込まずにレスポンスを返すメソッドです。
+
+        レスポンスボディはresponse.rawから読み込み、読み込んだ後にresponse.close()で接続を解放します。
+
+        Args:
+            url (str): リクエスト先のURL
+            headers (dict, optional): リクエストヘッダー。デフォルトはNone
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+            timeout (Union[float, tuple], optional): タイムアウト(秒)。デフォルトはNone
+
+        Returns:
+            requests.Response: レスポンスボディを読み込んでいないレスポンス
+        """
+        return self._session.get(url, headers=headers, params=params, timeout=timeout, stream=True)
+
+    def close(self):
+        """保持している接続をすべて閉じるメソッドです。"""
+        self._session.close()
+
+
+class CachingTransport():
+    """別のトランスポートから得た成功レスポンスを一定時間再利用するトランスポートです。
+
+    常駐するサーバーなどで、同じプロジェクトへの短時間の繰り返しのリクエストを減らすために使用します。
+    キャッシュのキーにはリクエストヘッダー(トークン)のハッシュ値を含めるため、異なるトークンのリクエストでは共有されません。
+
+    Attributes:
+        instance:
+            _transport(BaseTransport): 実際にリクエストを送信するトランスポート
+            _ttl(float): レスポンスを再利用する時間(秒)
+            _max_entries(int): 保持するレスポンスの数の上限。超えた場合は最も古く参照されたものから破棄する
+            _entries(collections.OrderedDict): キャッシュのキーと(有効期限, レスポンス)の組
+            _lock(threading.Lock): キャッシュの更新に用いるロック
+    """
+
+    def __init__(self, transport: BaseTransport = None, ttl: float = 30, max_entries: int = 256):
+        """インスタンスの初期化メソッド
+
+        Args:
+            transport (BaseTransport, optional): 実際にリクエストを送信するトランスポート。デフォルトはRequestsTransport
+            ttl (float, optional): レスポンスを再利用する時間(秒)。デフォルトは30
+            max_entries (int, optional): 保持するレスポンスの数の上限。デフォルトは256
+        """
+        self._transport = transport if transport is not None else RequestsTransport()
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: dict = None, params: dict = None, timeout: Union[float, tuple] = None) -> requests.Response:
+        """GETリクエストを送信するメソッドです。有効期限内のレスポンスがある場合はそれを返します。
+
+        Args:
+            url (str): リクエスト先のURL
+            headers (dict, optional): リクエストヘッダー。デフォルトはNone
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+            timeout (Union[float, tuple], optional): タイムアウト(秒)。デフォルトはNone
+
+        Returns:
+            requests.Response: レスポンス
+        """
+        key = self._get_key(url, headers, params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        response = self._transport.get(url, headers=headers, params=params, timeout=timeout)
+        # 認証エラーやサーバーエラーは再利用しない
+        if response.status_code == 200:
+            with self._lock:
+                self._entries[key] = (now + self._ttl, response)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return response
+
+    def clear(self):
+        """保持しているレスポンスをすべて破棄するメソッドです。"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def _get_key(url: str, headers: dict = None, params: dict = None) -> str:
+        """キャッシュのキーを取得するメソッドです。
+
+        Args:
+            url (str): リクエスト先のURL
+            headers (dict, optional): リクエストヘッダー。デフォルトはNone
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+
+        Returns:
+            str: キャッシュのキー
+        """
+        key = json.dumps([url, sorted((params or {}).items()), sorted((headers or {}).items())], ensure_ascii=False)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class RecordingTransport():
+    """別のトランスポートから得たレスポンスをファイルに記録するトランスポートです。
+
+    記録したファイルはReplayTransportで再生できます。リクエストヘッダー(トークン)は記録しません。
+
+    Attributes:
+        instance:
+            _directory(str): 記録先のフォルダ
+            _transport(BaseTransport): 実際にリクエストを送信するトランスポート
+    """
+
+    def __init__(self, directory: str, transport: BaseTransport = None):
+        """インスタンスの初期化メソッド
+
+        Args:
+            directory (str): 記録先のフォルダ。存在しない場合は作成する
+            transport (BaseTransport, optional): 実際にリクエストを送信するトランスポート。デフォルトはRequestsTransport
+        """
+        self._directory = directory
+        self._transport = transport if transport is not None else RequestsTransport()
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, url: str, headers: dict = None, params: dict = None, timeout: Union[float, tuple] = None) -> requests.Response:
+        """GETリクエストを送信し、レスポンスを記録するメソッドです。
+
+        Args:
+            url (str): リクエスト先のURL
+            headers (dict, optional): リクエストヘッダー。デフォルトはNone
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+            timeout (Union[float, tuple], optional): タイムアウト(秒)。デフォルトはNone
+
+        Returns:
+            requests.Response: レスポンス
+        """
+        response = self._transport.get(url, headers=headers, params=params, timeout=timeout)
+        record = {
+            "url": url,
+            "params": params,
+            "status_code": response.status_code,
+            "content_type": response.headers.get("Content-Type"),
+            "body": response.content.decode('utf-8'),
+        }
+        path = os.path.join(self._directory, get_record_file_name(url, params))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, indent=4)
+        return response
+
+
+class ReplayTransport():
+    """RecordingTransportで記録したレスポンスを返すトランスポートです。
+
+    Attributes:
+        instance:
+            _directory(str): 記録ファイルのフォルダ
+    """
+
+    def __init__(self, directory: str):
+        """インスタンスの初期化メソッド
+
+        Args:
+            directory (str): 記録ファイルのフォルダ
+        """
+        self._directory = directory
+
+    def get(self, url: str, headers: dict = None, params: dict = None, timeout: Union[float, tuple] = None) -> requests.Response:
+        """記録ファイルからレスポンスを作成するメソッドです。
+
+        Args:
+            url (str): リクエスト先のURL
+            headers (dict, optional): 使用しない
+            params (dict, optional): クエリパラメータ。デフォルトはNone
+            timeout (Union[float, tuple], optional): 使用しない
+
+        Returns:
+            requests.Response: 記録されたレスポンス
+
+        Raises:
+            APIError: リクエストに対応する記録ファイルが存在しない
+        """
+        path = os.path.join(self._directory, get_record_file_name(url, params))
+        if not os.path.isfile(path):
+            logger.error(f"Recorded response not found: {url} {params}")
+            raise APIError("記録されたレスポンスが存在しません。")
+        with open(path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+
+        response = requests.models.Response()
+        response.status_code = record["status_code"]
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = record["body"].encode('utf-8')
+        if record.get("content_type"):
+            response.headers["Content-Type"] = record["content_type"]
+        return response
+
+
+def get_record_file_name(url: str, params: dict = None) -> str:
+    """リクエストに対応する記録ファイルの名前を取得する関数です。
+
+    Args:
+        url (str): リクエスト先のURL
+        params (dict, optional): クエリパラメータ。デフォルトはNone
+
+    Returns:
+        str: 記録ファイルの名前
+    """
+    key = json.dumps([url, sorted((params or {}).items())], ensure_ascii=False)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '.json'
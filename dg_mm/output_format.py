@@ -0,0 +1,519 @@
+"""メタデータの出力形式を扱うモジュールです。
+
+次の形式に対応します。MessagePackとCBORは、対応するパッケージ(msgpack、cbor2)がインストールされている場合は
+それを使用し、インストールされていない場合はこのモジュールの実装で変換します。
+
+- json: インデントを付けたJSON(従来の出力)
+- jsonl: 1行のJSON。複数のファイルを連結するとJSON Lines形式になる
+- msgpack: MessagePack
+- cbor: CBOR(RFC 8949)
+
+    pip install dg-metadata-manager[msgpack,cbor]
+"""
+
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO
+
+from dg_mm import json_backend
+from dg_mm.errors import DataFormatError
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - インストールされている環境のみ
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover - インストールされている環境のみ
+    cbor2 = None
+
+
+class OutputFormat(ABC):
+    """出力形式の共通処理をまとめたクラスです。
+
+    継承したクラスはdumpsとloadsを実装します。
+
+    Attributes:
+        class:
+            name(str):出力形式の名称
+            extension(str):ファイルの拡張子
+    """
+    name = None
+    extension = None
+
+    @classmethod
+    @abstractmethod
+    def dumps(cls, value: Any) -> bytes:
+        """値を出力形式のバイト列に変換するメソッドです。
+
+        Args:
+            value (Any): JSONに変換できる値
+
+        Returns:
+            bytes: 変換したバイト列
+        """
+
+    @classmethod
+    @abstractmethod
+    def loads(cls, content: bytes) -> Any:
+        """出力形式のバイト列を値に変換するメソッドです。
+
+        Args:
+            content (bytes): 出力形式のバイト列
+
+        Returns:
+            Any: 変換した値
+
+        Raises:
+            DataFormatError: バイト列の形式に誤りがある
+        """
+
+    @classmethod
+    def dump(cls, value: Any, stream: BinaryIO):
+        """値を出力形式に変換して書き込むメソッドです。
+
+        Args:
+            value (Any): JSONに変換できる値
+            stream (BinaryIO): 出力先
+        """
+        stream.write(cls.dumps(value))
+
+
+class JsonFormat(OutputFormat):
+    """インデントを付けたJSONの出力形式です。"""
+    name = "json"
+    extension = ".json"
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        return json_backend.dumps_pretty(value)
+
+    @classmethod
+    def loads(cls, content: bytes) -> Any:
+        try:
+            return json_backend.loads(content)
+        except ValueError as e:
+            raise DataFormatError("JSONのフォーマットに誤りがあります。") from e
+
+    @classmethod
+    def dump(cls, value: Any, stream: BinaryIO):
+        json_backend.dump_pretty(value, stream)
+
+
+class JsonLinesFormat(JsonFormat):
+    """1行のJSONの出力形式です。"""
+    name = "jsonl"
+    extension = ".jsonl"
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        return json_backend.dumps(value) + b"\n"
+
+    @classmethod
+    def dump(cls, value: Any, stream: BinaryIO):
+        stream.write(cls.dumps(value))
+
+
+class MessagePackFormat(OutputFormat):
+    """MessagePackの出力形式です。"""
+    name = "msgpack"
+    extension = ".msgpack"
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        if msgpack is not None:
+            return msgpack.packb(value, use_bin_type=True)
+        buffer = bytearray()
+        _pack_msgpack(value, buffer)
+        return bytes(buffer)
+
+    @classmethod
+    def loads(cls, content: bytes) -> Any:
+        if msgpack is not None:
+            try:
+                return msgpack.unpackb(content, raw=False)
+            except ValueError as e:
+                raise DataFormatError("MessagePackのフォーマットに誤りがあります。") from e
+        return _Decoder(content, "MessagePack").decode(_unpack_msgpack)
+
+
+class CborFormat(OutputFormat):
+    """CBORの出力形式です。"""
+    name = "cbor"
+    extension = ".cbor"
+
+    @classmethod
+    def dumps(cls, value: Any) -> bytes:
+        if cbor2 is not None:
+            return cbor2.dumps(value)
+        buffer = bytearray()
+        _encode_cbor(value, buffer)
+        return bytes(buffer)
+
+    @classmethod
+    def loads(cls, content: bytes) -> Any:
+        if cbor2 is not None:
+            try:
+                return cbor2.loads(content)
+            except ValueError as e:
+                raise DataFormatError("CBORのフォーマットに誤りがあります。") from e
+        return _Decoder(content, "CBOR").decode(_decode_cbor)
+
+
+_FORMATS = {output_format.name: output_format for output_format in (
+    JsonFormat, JsonLinesFormat, MessagePackFormat, CborFormat)}
+
+FORMAT_NAMES = tuple(_FORMATS)
+
+
+def get_format(name: str) -> type:
+    """名称に対応する出力形式を取得する関数です。
+
+    Args:
+        name (str): 出力形式の名称
+
+    Returns:
+        type: 出力形式のクラス
+
+    Raises:
+        DataFormatError: 対応していない出力形式である
+    """
+    if name not in _FORMATS:
+        raise DataFormatError(f"対応していない出力形式が指定されました。({name})")
+    return _FORMATS[name]
+
+
+def _pack_msgpack(value: Any, buffer: bytearray):
+    """値をMessagePackに変換してバッファに追加する関数です。
+
+    Args:
+        value (Any): JSONに変換できる値
+        buffer (bytearray): 追加先のバッファ
+
+    Raises:
+        DataFormatError: MessagePackに変換できない値である
+    """
+    if value is None:
+        buffer.append(0xc0)
+    elif value is True:
+        buffer.append(0xc3)
+    elif value is False:
+        buffer.append(0xc2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80 or -0x20 <= value < 0:
+            buffer += struct.pack(">b" if value < 0 else ">B", value)
+        elif value >= 0:
+            for marker, code, limit in ((0xcc, ">B", 1 << 8), (0xcd, ">H", 1 << 16),
+                                        (0xce, ">I", 1 << 32), (0xcf, ">Q", 1 << 64)):
+                if value < limit:
+                    buffer.append(marker)
+                    buffer += struct.pack(code, value)
+                    break
+            else:
+                raise DataFormatError(f"MessagePackに変換できない整数です。({value})")
+        else:
+            for marker, code, limit in ((0xd0, ">b", 1 << 7), (0xd1, ">h", 1 << 15),
+                                        (0xd2, ">i", 1 << 31), (0xd3, ">q", 1 << 63)):
+                if value >= -limit:
+                    buffer.append(marker)
+                    buffer += struct.pack(code, value)
+                    break
+            else:
+                raise DataFormatError(f"MessagePackに変換できない整数です。({value})")
+    elif isinstance(value, float):
+        buffer.append(0xcb)
+        buffer += struct.pack(">d", value)
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        _pack_msgpack_header(len(encoded), buffer, 0xa0, 32, (0xd9, 0xda, 0xdb))
+        buffer += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        _pack_msgpack_header(len(value), buffer, None, 0, (0xc4, 0xc5, 0xc6))
+        buffer += value
+    elif isinstance(value, (list, tuple)):
+        _pack_msgpack_header(len(value), buffer, 0x90, 16, (None, 0xdc, 0xdd))
+        for item in value:
+            _pack_msgpack(item, buffer)
+    elif isinstance(value, dict):
+        _pack_msgpack_header(len(value), buffer, 0x80, 16, (None, 0xde, 0xdf))
+        for key, item in value.items():
+            _pack_msgpack(key, buffer)
+            _pack_msgpack(item, buffer)
+    else:
+        raise DataFormatError(f"MessagePackに変換できない値です。({type(value).__name__})")
+
+
+def _pack_msgpack_header(length: int, buffer: bytearray, fix_marker: int, fix_limit: int, markers: tuple):
+    """MessagePackの文字列、バイナリ、配列、マップの長さを表す先頭部分をバッファに追加する関数です。
+
+    Args:
+        length (int): 長さ
+        buffer (bytearray): 追加先のバッファ
+        fix_marker (int): 長さを含む1バイトの形式の先頭の値。その形式がない場合はNone
+        fix_limit (int): 長さを含む1バイトの形式で表せる長さの上限(この値を含まない)
+        markers (tuple): 長さを1、2、4バイトで表す形式の先頭の値。その形式がない場合はNone
+    """
+    if fix_marker is not None and length < fix_limit:
+        buffer.append(fix_marker | length)
+        return
+    for marker, code, limit in zip(markers, (">B", ">H", ">I"), (1 << 8, 1 << 16, 1 << 32)):
+        if marker is not None and length < limit:
+            buffer.append(marker)
+            buffer += struct.pack(code, length)
+            return
+    raise DataFormatError(f"MessagePackに変換できない長さです。({length})")
+
+
+def _encode_cbor(value: Any, buffer: bytearray):
+    """値をCBORに変換してバッファに追加する関数です。
+
+    Args:
+        value (Any): JSONに変換できる値
+        buffer (bytearray): 追加先のバッファ
+
+    Raises:
+        DataFormatError: CBORに変換できない値である
+    """
+    if value is None:
+        buffer.append(0xf6)
+    elif value is True:
+        buffer.append(0xf5)
+    elif value is False:
+        buffer.append(0xf4)
+    elif isinstance(value, int):
+        if value >= 0:
+            _encode_cbor_head(0, value, buffer)
+        else:
+            _encode_cbor_head(1, -1 - value, buffer)
+    elif isinstance(value, float):
+        buffer.append(0xfb)
+        buffer += struct.pack(">d", value)
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        _encode_cbor_head(3, len(encoded), buffer)
+        buffer += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        _encode_cbor_head(2, len(value), buffer)
+        buffer += value
+    elif isinstance(value, (list, tuple)):
+        _encode_cbor_head(4, len(value), buffer)
+        for item in value:
+            _encode_cbor(item, buffer)
+    elif isinstance(value, dict):
+        _encode_cbor_head(5, len(value), buffer)
+        for key, item in value.items():
+            _encode_cbor(key, buffer)
+            _encode_cbor(item, buffer)
+    else:
+        raise DataFormatError(f"CBORに変換できない値です。({type(value).__name__})")
+
+
+def _encode_cbor_head(major: int, argument: int, buffer: bytearray):
+    """CBORのデータ項目の先頭部分(メジャータイプと引数)をバッファに追加する関数です。
+
+    Args:
+        major (int): メジャータイプ
+        argument (int): 引数(整数の値、または長さ)
+        buffer (bytearray): 追加先のバッファ
+
+    Raises:
+        DataFormatError: 引数が8バイトで表せない
+    """
+    if argument < 24:
+        buffer.append(major << 5 | argument)
+        return
+    for additional, code, limit in ((24, ">B", 1 << 8), (25, ">H", 1 << 16), (26, ">I", 1 << 32), (27, ">Q", 1 << 64)):
+        if argument < limit:
+            buffer.append(major << 5 | additional)
+            buffer += struct.pack(code, argument)
+            return
+    raise DataFormatError(f"CBORに変換できない整数です。({argument})")
+
+
+class _Decoder():
+    """バイト列を先頭から読み込むクラスです。
+
+    Attributes:
+        instance:
+            content(bytes):読み込むバイト列
+            offset(int):次に読み込む位置
+            format_name(str):エラーメッセージに用いる形式の名称
+    """
+
+    def __init__(self, content: bytes, format_name: str):
+        """インスタンスの初期化メソッド
+
+        Args:
+            content (bytes): 読み込むバイト列
+            format_name (str): エラーメッセージに用いる形式の名称
+        """
+        self.content = bytes(content)
+        self.offset = 0
+        self.format_name = format_name
+
+    def decode(self, decode_item) -> Any:
+        """バイト列全体を1つの値として読み込むメソッドです。
+
+        Args:
+            decode_item (Callable): 1つの値を読み込む関数
+
+        Returns:
+            Any: 読み込んだ値
+
+        Raises:
+            DataFormatError: バイト列の形式に誤りがある
+        """
+        try:
+            value = decode_item(self)
+        except (struct.error, UnicodeDecodeError, IndexError, TypeError) as e:
+            raise self.error() from e
+        if self.offset != len(self.content):
+            raise self.error()
+        return value
+
+    def read(self, size: int) -> bytes:
+        """指定した長さのバイト列を読み込むメソッドです。
+
+        Args:
+            size (int): 長さ
+
+        Returns:
+            bytes: 読み込んだバイト列
+
+        Raises:
+            DataFormatError: バイト列が途中で終わっている
+        """
+        end = self.offset + size
+        if end > len(self.content):
+            raise self.error()
+        chunk = self.content[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def unpack(self, code: str) -> Any:
+        """struct形式の値を1つ読み込むメソッドです。
+
+        Args:
+            code (str): structの書式
+
+        Returns:
+            Any: 読み込んだ値
+        """
+        return struct.unpack(code, self.read(struct.calcsize(code)))[0]
+
+    def error(self) -> DataFormatError:
+        """形式の誤りを表す例外を作成するメソッドです。
+
+        Returns:
+            DataFormatError: 作成した例外
+        """
+        return DataFormatError(f"{self.format_name}のフォーマットに誤りがあります。")
+
+
+_MSGPACK_SCALARS = {
+    0xca: ">f", 0xcb: ">d",
+    0xcc: ">B", 0xcd: ">H", 0xce: ">I", 0xcf: ">Q",
+    0xd0: ">b", 0xd1: ">h", 0xd2: ">i", 0xd3: ">q",
+}
+_MSGPACK_LENGTHS = {
+    0xc4: ("bin", ">B"), 0xc5: ("bin", ">H"), 0xc6: ("bin", ">I"),
+    0xd9: ("str", ">B"), 0xda: ("str", ">H"), 0xdb: ("str", ">I"),
+    0xdc: ("array", ">H"), 0xdd: ("array", ">I"),
+    0xde: ("map", ">H"), 0xdf: ("map", ">I"),
+}
+
+
+def _unpack_msgpack(decoder: _Decoder) -> Any:
+    """MessagePackの値を1つ読み込む関数です。
+
+    Args:
+        decoder (_Decoder): 読み込み元
+
+    Returns:
+        Any: 読み込んだ値
+
+    Raises:
+        DataFormatError: 対応していない形式である
+    """
+    marker = decoder.read(1)[0]
+    if marker <= 0x7f:
+        return marker
+    if marker >= 0xe0:
+        return marker - 0x100
+    if 0x80 <= marker <= 0x8f:
+        kind, length = "map", marker & 0x0f
+    elif 0x90 <= marker <= 0x9f:
+        kind, length = "array", marker & 0x0f
+    elif 0xa0 <= marker <= 0xbf:
+        kind, length = "str", marker & 0x1f
+    elif marker in (0xc0, 0xc2, 0xc3):
+        return {0xc0: None, 0xc2: False, 0xc3: True}[marker]
+    elif marker in _MSGPACK_SCALARS:
+        return decoder.unpack(_MSGPACK_SCALARS[marker])
+    elif marker in _MSGPACK_LENGTHS:
+        kind, code = _MSGPACK_LENGTHS[marker]
+        length = decoder.unpack(code)
+    else:
+        raise decoder.error()
+
+    if kind == "str":
+        return decoder.read(length).decode('utf-8')
+    if kind == "bin":
+        return decoder.read(length)
+    if kind == "array":
+        return [_unpack_msgpack(decoder) for _ in range(length)]
+    result = {}
+    for _ in range(length):
+        key = _unpack_msgpack(decoder)
+        result[key] = _unpack_msgpack(decoder)
+    return result
+
+
+def _decode_cbor(decoder: _Decoder) -> Any:
+    """CBORの値を1つ読み込む関数です。長さを指定しない形式とタグには対応しません。
+
+    Args:
+        decoder (_Decoder): 読み込み元
+
+    Returns:
+        Any: 読み込んだ値
+
+    Raises:
+        DataFormatError: 対応していない形式である
+    """
+    initial = decoder.read(1)[0]
+    major, additional = initial >> 5, initial & 0x1f
+    if major == 7:
+        simple = {20: False, 21: True, 22: None}
+        if additional in simple:
+            return simple[additional]
+        floats = {25: ">e", 26: ">f", 27: ">d"}
+        if additional in floats:
+            return decoder.unpack(floats[additional])
+        raise decoder.error()
+
+    if additional < 24:
+        argument = additional
+    elif additional <= 27:
+        argument = decoder.unpack({24: ">B", 25: ">H", 26: ">I", 27: ">Q"}[additional])
+    else:
+        raise decoder.error()
+
+    if major == 0:
+        return argument
+    if major == 1:
+        return -1 - argument
+    if major == 2:
+        return decoder.read(argument)
+    if major == 3:
+        return decoder.read(argument).decode('utf-8')
+    if major == 4:
+        return [_decode_cbor(decoder) for _ in range(argument)]
+    if major == 5:
+        result = {}
+        for _ in range(argument):
+            key = _decode_cbor(decoder)
+            result[key] = _decode_cbor(decoder)
+        return result
+    raise decoder.error()
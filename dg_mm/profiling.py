@@ -0,0 +1,118 @@
+"""処理のプロファイリングを行うモジュールです。
+
+ブロック内の処理をcProfileで計測し、pstats形式のファイルと、flamegraph.plやspeedscopeなどで
+読み込めるcollapsed stack形式のファイルを出力します。
+
+    with profile("get.prof"):
+        MetadataManager().get_metadata(...)
+"""
+
+import contextlib
+import cProfile
+import os
+import pstats
+from typing import Iterator
+
+FOLDED_SUFFIX = ".folded"
+
+
+@contextlib.contextmanager
+def profile(path: str, min_weight: int = 1) -> Iterator[cProfile.Profile]:
+    """ブロック内の処理をプロファイリングするコンテキストマネージャーです。
+
+    ブロックを抜けると、pathにpstats形式の計測結果を、pathに.foldedを付けたファイルにcollapsed stack形式の計測結果を出力します。
+    例外が発生した場合も、そこまでの計測結果を出力します。
+
+    Args:
+        path (str): pstats形式の計測結果の出力先
+        min_weight (int, optional): collapsed stack形式で出力するスタックの最小の重み(マイクロ秒)。デフォルトは1
+
+    Yields:
+        cProfile.Profile: 計測に用いるプロファイラ
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        write_collapsed_stacks(pstats.Stats(profiler), path + FOLDED_SUFFIX, min_weight)
+
+
+def write_collapsed_stacks(stats: pstats.Stats, path: str, min_weight: int = 1):
+    """計測結果をcollapsed stack形式でファイルに出力する関数です。
+
+    Args:
+        stats (pstats.Stats): 計測結果
+        path (str): 出力先
+        min_weight (int, optional): 出力するスタックの最小の重み(マイクロ秒)。デフォルトは1
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, weight in sorted(collapse_stacks(stats, min_weight).items()):
+            f.write(f"{stack} {weight}\n")
+
+
+def collapse_stacks(stats: pstats.Stats, min_weight: int = 1) -> dict:
+    """計測結果をcollapsed stack形式に変換する関数です。
+
+    cProfileは呼び出し元と呼び出し先の組ごとの時間しか記録しないため、各関数の処理時間を
+    呼び出し元ごとの累積時間の比率で按分して、呼び出し経路ごとの時間を推定します。
+    再帰呼び出しは経路上で最初に現れた位置にまとめます。
+
+    Args:
+        stats (pstats.Stats): 計測結果
+        min_weight (int, optional): 出力するスタックの最小の重み(マイクロ秒)。これより小さい経路は辿らない。デフォルトは1
+
+    Returns:
+        dict: 「;」で連結した呼び出し経路と重み(マイクロ秒)の組
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+
+    stacks = {}
+
+    def walk(func: tuple, path: tuple, names: tuple, fraction: float):
+        _, _, tottime, cumtime, _ = entries[func]
+        names = names + (_format_frame(func),)
+        path = path + (func,)
+        weight = int(tottime * fraction * 1_000_000)
+        if weight >= min_weight:
+            key = ";".join(names)
+            stacks[key] = stacks.get(key, 0) + weight
+        for callee in callees.get(func, []):
+            if callee in path:
+                continue
+            callee_cumtime = entries[callee][3]
+            if callee_cumtime <= 0:
+                continue
+            share = entries[callee][4][func][3] / callee_cumtime
+            if callee_cumtime * fraction * share * 1_000_000 < min_weight:
+                continue
+            walk(callee, path, names, fraction * share)
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(func, (), (), 1.0)
+    return stacks
+
+
+def _format_frame(func: tuple) -> str:
+    """関数を表す組をフレーム名に変換する関数です。
+
+    Args:
+        func (tuple): (ファイル名, 行番号, 関数名)の組
+
+    Returns:
+        str: フレーム名
+    """
+    filename, lineno, name = func
+    if filename == "~":
+        frame = name
+    else:
+        frame = f"{name} ({os.path.basename(filename)}:{lineno})"
+    # 「;」は呼び出し経路の区切り文字のため置き換える
+    return frame.replace(";", ":")
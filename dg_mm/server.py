@@ -0,0 +1,504 @@
+"""メタデータの取得をHTTPで受け付ける常駐サーバーのモジュールです。
+
+プロセスを常駐させることで、モジュールの読み込み、設定ファイルとマッピング定義の解析、GRDMへの接続を
+リクエストごとに繰り返さずに済みます。ローカルのTCPポート、またはUnixドメインソケットで待ち受けます。
+
+    POST /metadata  メタデータを取得する。リクエストボディはMetadataManager.get_metadataの引数のJSON
+    GET  /health    サーバーの状態を取得する
+    GET  /metrics   メトリクスをPrometheusのテキスト形式で取得する
+
+    metadatamanager serve --socket /tmp/dg_mm.sock --workers 8
+    curl --unix-socket /tmp/dg_mm.sock -X POST http://localhost/metadata \\
+        -H 'Authorization: Bearer <token>' -d '{"schema": "RF", "storage": "GRDM", "id": "<project_id>"}'
+"""
+
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger
+from typing import Union
+
+from dg_mm import json_backend, metrics
+from dg_mm.errors import (
+    AccessDeniedError,
+    APIError,
+    DataFormatError,
+    DataTypeError,
+    InvalidIdError,
+    InvalidSchemaError,
+    InvalidStorageError,
+    InvalidTokenError,
+    KeyNotFoundError,
+    MetadataNotFoundError,
+    MetadatamanagerError,
+    UnauthorizedError,
+)
+from dg_mm.models.grdm import GrdmAccess, GrdmMapping
+from dg_mm.models.mapping_definition import DefinitionManager
+from dg_mm.models.metadata_manager import MetadataManager
+from dg_mm.models.result_cache import BaseResultCache
+from dg_mm.models.storage_registry import StorageRegistry
+from dg_mm.models.transport import CachingTransport, SessionTransport
+
+logger = getLogger(__name__)
+
+# 例外の種類とレスポンスのステータスコードの組。上から順に判定する
+_ERROR_STATUSES = (
+    (InvalidTokenError, 401),
+    (UnauthorizedError, 401),
+    (AccessDeniedError, 403),
+    (InvalidIdError, 404),
+    (MetadataNotFoundError, 404),
+    (InvalidSchemaError, 400),
+    (InvalidStorageError, 400),
+    (KeyNotFoundError, 422),
+    (DataTypeError, 422),
+    (DataFormatError, 422),
+    (APIError, 502),
+)
+
+_REQUEST_KEYS = ("schema", "storage", "token", "id", "filter_properties", "project_metadata_id", "deadline")
+
+
+class MetadataService():
+    """常駐サーバーが受け付けたリクエストを処理するクラスです。
+
+    HTTPの処理とは独立しており、リクエストボディを受け取ってステータスコードとレスポンスの内容を返します。
+
+    Attributes:
+        instance:
+            max_workers(int):同時に処理するメタデータの取得の数の上限
+            queue_timeout(float):処理の順番を待つ時間の上限(秒)。超えた場合は503を返す
+            result_cache(BaseResultCache):マッピングの結果のキャッシュ。状態の取得で統計を返す。Noneの場合は使用しない
+            _manager(MetadataManager):メタデータの取得に用いるインスタンス
+            _slots(threading.BoundedSemaphore):同時に処理する数を制限するセマフォ
+            _condition(threading.Condition):処理中の数の更新を通知する条件変数
+            _in_flight(int):処理中のリクエストの数
+            _draining(bool):停止処理中の場合はTrue
+    """
+
+    def __init__(self, max_workers: int = 4, queue_timeout: float = 10.0, result_cache: BaseResultCache = None):
+        """インスタンスの初期化メソッド
+
+        Args:
+            max_workers (int, optional): 同時に処理するメタデータの取得の数の上限。デフォルトは4
+            queue_timeout (float, optional): 処理の順番を待つ時間の上限(秒)。デフォルトは10
+            result_cache (BaseResultCache, optional): マッピングの結果のキャッシュ。デフォルトはNone
+        """
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self.result_cache = result_cache
+        self._manager = MetadataManager()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._draining = False
+
+    @property
+    def in_flight(self) -> int:
+        """処理中のリクエストの数です。"""
+        with self._condition:
+            return self._in_flight
+
+    @property
+    def draining(self) -> bool:
+        """停止処理中の場合はTrueです。"""
+        with self._condition:
+            return self._draining
+
+    def warm_up(self):
+        """利用可能なストレージのマッピングクラスを読み込み、インスタンスを作成しておくメソッドです。"""
+        for storage in StorageRegistry.get_storage_names():
+            try:
+                StorageRegistry.get_instance(storage)
+            except InvalidStorageError:
+                logger.error(f"マッピングクラスの事前読み込みに失敗({storage})")
+
+    def handle_metadata(self, body: bytes, authorization: str = None) -> tuple:
+        """メタデータの取得のリクエストを処理するメソッドです。
+
+        リクエストボディのschemaに文字列を指定した場合はメタデータを、リストを指定した場合は
+        スキーマの名称とメタデータの組を返します。トークンはリクエストボディのtoken、
+        またはAuthorizationヘッダー(Bearer)で指定します。
+
+        Args:
+            body (bytes): リクエストボディ
+            authorization (str, optional): Authorizationヘッダーの値。デフォルトはNone
+
+        Returns:
+            tuple: ステータスコードとレスポンスの内容の組
+        """
+        try:
+            params = self._parse_request(body, authorization)
+        except ValueError as e:
+            return 400, _error_body("BadRequest", str(e))
+
+        with self._condition:
+            if self._draining:
+                return 503, _error_body("ServiceUnavailable", "サーバーは停止処理中です。")
+            self._in_flight += 1
+        try:
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                logger.error(f"処理待ちのタイムアウト({self.queue_timeout}秒)")
+                return 503, _error_body("ServiceUnavailable", "サーバーが混雑しています。時間をおいて再度実行してください。")
+            try:
+                return 200, self._get_metadata(params)
+            except MetadatamanagerError as e:
+                return _get_error_status(e), _error_body(type(e).__name__, str(e))
+            except FileNotFoundError as e:
+                return 500, _error_body(type(e).__name__, str(e))
+            except Exception:
+                logger.exception("メタデータの取得中に予期しないエラーが発生")
+                return 500, _error_body("InternalServerError", "サーバー内部でエラーが発生しました。")
+            finally:
+                self._slots.release()
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def health(self) -> tuple:
+        """サーバーの状態を取得するメソッドです。
+
+        Returns:
+            tuple: ステータスコードとレスポンスの内容の組。停止処理中の場合のステータスコードは503
+        """
+        with self._condition:
+            draining = self._draining
+            in_flight = self._in_flight
+        body = {
+            "status": "draining" if draining else "ok",
+            "in_flight": in_flight,
+            "max_workers": self.max_workers,
+        }
+        if self.result_cache is not None:
+            body["result_cache"] = self.result_cache.stats()
+        return (503 if draining else 200), body
+
+    def begin_drain(self):
+        """停止処理を開始するメソッドです。以降のメタデータの取得のリクエストには503を返します。"""
+        with self._condition:
+            self._draining = True
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """処理中のリクエストがすべて終わるまで待つメソッドです。
+
+        Args:
+            timeout (float, optional): 待つ時間の上限(秒)。Noneの場合は無制限。デフォルトはNone
+
+        Returns:
+            bool: 処理中のリクエストがすべて終わった場合はTrue
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def _parse_request(self, body: bytes, authorization: str = None) -> dict:
+        """リクエストボディをget_metadataの引数に変換するメソッドです。
+
+        Args:
+            body (bytes): リクエストボディ
+            authorization (str, optional): Authorizationヘッダーの値。デフォルトはNone
+
+        Returns:
+            dict: get_metadataの引数
+
+        Raises:
+            ValueError: リクエストボディの形式に誤りがある
+        """
+        try:
+            params = json_backend.loads(body) if body else {}
+        except ValueError:
+            raise ValueError("リクエストボディをJSONとして読み込めません。")
+        if not isinstance(params, dict):
+            raise ValueError("リクエストボディはJSONのオブジェクトで指定してください。")
+
+        unknown_keys = [key for key in params if key not in _REQUEST_KEYS]
+        if unknown_keys:
+            raise ValueError(f"不明なパラメータが指定されました。: {unknown_keys}")
+        schema = params.get("schema")
+        if not schema or not isinstance(schema, (str, list)):
+            raise ValueError("schemaを指定してください。")
+        if not params.get("storage"):
+            raise ValueError("storageを指定してください。")
+        deadline = params.get("deadline")
+        if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))):
+            raise ValueError("deadlineは数値で指定してください。")
+
+        if params.get("token") is None and authorization and authorization.startswith("Bearer "):
+            params["token"] = authorization[len("Bearer "):]
+        return params
+
+    def _get_metadata(self, params: dict) -> dict:
+        """メタデータを取得するメソッドです。
+
+        Args:
+            params (dict): get_metadataの引数
+
+        Returns:
+            dict: スキーマが文字列の場合はメタデータ、リストの場合はスキーマの名称とメタデータの組
+        """
+        params = dict(params)
+        schema = params.pop("schema")
+        if isinstance(schema, str):
+            return self._manager.get_metadata(schema=schema, **params)
+        return self._manager.get_metadata_for_schemas(schemas=list(dict.fromkeys(schema)), **params)
+
+
+class MetadataServer():
+    """MetadataServiceをHTTPで公開するサーバーです。
+
+    unix_socketを指定した場合はUnixドメインソケットで、指定しない場合はTCPポートで待ち受けます。
+    リクエストはスレッドごとに処理し、メタデータの取得の同時実行数はMetadataServiceで制限します。
+
+    Attributes:
+        instance:
+            service(MetadataService):リクエストを処理するインスタンス
+            drain_timeout(float):停止時に処理中のリクエストの終了を待つ時間の上限(秒)
+            unix_socket(str):待ち受けるUnixドメインソケットのパス。TCPポートで待ち受ける場合はNone
+            _httpd(socketserver.BaseServer):HTTPサーバー
+            _thread(threading.Thread):startで起動した場合のサーバーのスレッド
+    """
+
+    def __init__(self, service: MetadataService, host: str = '127.0.0.1', port: int = 8080,
+                 unix_socket: str = None, drain_timeout: float = 30.0):
+        """インスタンスの初期化メソッド
+
+        Args:
+            service (MetadataService): リクエストを処理するインスタンス
+            host (str, optional): 待ち受けるホスト。デフォルトは127.0.0.1
+            port (int, optional): 待ち受けるポート。0の場合は空いているポートを使用する。デフォルトは8080
+            unix_socket (str, optional): 待ち受けるUnixドメインソケットのパス。デフォルトはNone
+            drain_timeout (float, optional): 停止時に処理中のリクエストの終了を待つ時間の上限(秒)。デフォルトは30
+
+        Raises:
+            OSError: 待ち受けを開始できない
+        """
+        self.service = service
+        self.drain_timeout = drain_timeout
+        self.unix_socket = unix_socket
+        self._thread = None
+        handler = _make_handler(service)
+        if unix_socket is not None:
+            _remove_stale_socket(unix_socket)
+            self._httpd = _UnixHTTPServer(unix_socket, handler)
+            # トークンを受け付けるため、ソケットには所有者のみがアクセスできるようにする
+            os.chmod(unix_socket, 0o600)
+        else:
+            self._httpd = ThreadingHTTPServer((host, port), handler)
+            self._httpd.daemon_threads = True
+
+    @property
+    def address(self) -> Union[str, tuple]:
+        """待ち受けているアドレスです。Unixドメインソケットの場合はパス、TCPポートの場合は(ホスト, ポート)の組です。"""
+        if self.unix_socket is not None:
+            return self.unix_socket
+        return tuple(self._httpd.server_address[:2])
+
+    def serve_forever(self) -> bool:
+        """stopが呼ばれるまでリクエストを受け付け、処理中のリクエストが終わるのを待ってから終了するメソッドです。
+
+        Returns:
+            bool: 処理中のリクエストがすべて終わってから終了した場合はTrue
+        """
+        try:
+            self._httpd.serve_forever()
+        finally:
+            drained = self.service.wait_idle(self.drain_timeout)
+            if not drained:
+                logger.error(f"処理中のリクエストが残ったまま停止({self.service.in_flight}件)")
+            self._httpd.server_close()
+            if self.unix_socket is not None and os.path.exists(self.unix_socket):
+                os.remove(self.unix_socket)
+        return drained
+
+    def start(self) -> 'MetadataServer':
+        """別スレッドでサーバーを起動するメソッドです。
+
+        Returns:
+            MetadataServer: 自身のインスタンス
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """新しいリクエストの受け付けを止め、サーバーを停止するメソッドです。
+
+        serve_foreverを実行しているスレッドとは別のスレッドから呼び出してください。
+        startで起動した場合は、処理中のリクエストが終わってサーバーが停止するまで待ちます。
+        """
+        self.service.begin_drain()
+        self._httpd.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'MetadataServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def create_server(host: str = '127.0.0.1', port: int = 8080, unix_socket: str = None, max_workers: int = 4,
+                  queue_timeout: float = 10.0, drain_timeout: float = 30.0, response_cache_ttl: float = 0,
+                  response_cache_size: int = 256, result_cache: BaseResultCache = None) -> MetadataServer:
+    """リクエストの間で接続、設定、マッピング定義を再利用するよう設定し、サーバーを作成する関数です。
+
+    GrdmAccessが使用するトランスポート、マッピング定義のキャッシュ、マッピングの結果のキャッシュは
+    プロセス全体の設定として変更します。
+
+    Args:
+        host (str, optional): 待ち受けるホスト。デフォルトは127.0.0.1
+        port (int, optional): 待ち受けるポート。デフォルトは8080
+        unix_socket (str, optional): 待ち受けるUnixドメインソケットのパス。デフォルトはNone
+        max_workers (int, optional): 同時に処理するメタデータの取得の数の上限。デフォルトは4
+        queue_timeout (float, optional): 処理の順番を待つ時間の上限(秒)。デフォルトは10
+        drain_timeout (float, optional): 停止時に処理中のリクエストの終了を待つ時間の上限(秒)。デフォルトは30
+        response_cache_ttl (float, optional): GRDMの成功レスポンスを再利用する時間(秒)。0以下の場合は再利用しない。デフォルトは0
+        response_cache_size (int, optional): 再利用のために保持するレスポンスの数の上限。デフォルトは256
+        result_cache (BaseResultCache, optional): マッピングの結果のキャッシュ。デフォルトはNone(使用しない)
+
+    Returns:
+        MetadataServer: 作成したサーバー
+    """
+    # 同時に処理する数だけ接続を保持する
+    transport = SessionTransport(pool_maxsize=max_workers)
+    if response_cache_ttl > 0:
+        transport = CachingTransport(transport, ttl=response_cache_ttl, max_entries=response_cache_size)
+    GrdmAccess.configure(transport=transport, config_path=GrdmAccess._default_config_path)
+    DefinitionManager.enable_cache()
+    GrdmMapping.configure_result_cache(result_cache)
+
+    service = MetadataService(max_workers=max_workers, queue_timeout=queue_timeout, result_cache=result_cache)
+    service.warm_up()
+    return MetadataServer(service, host=host, port=port, unix_socket=unix_socket, drain_timeout=drain_timeout)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unixドメインソケットで待ち受け、リクエストをスレッドごとに処理するサーバーです。"""
+    daemon_threads = True
+
+
+def _remove_stale_socket(path: str):
+    """前回の起動で残ったUnixドメインソケットのファイルを削除する関数です。
+
+    Args:
+        path (str): Unixドメインソケットのパス
+
+    Raises:
+        OSError: ソケット以外のファイルが存在する、または別のサーバーが待ち受けている
+    """
+    if not os.path.exists(path):
+        return
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        raise OSError(f"ソケット以外のファイルが存在します: '{path}'")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+        except OSError:
+            os.remove(path)
+            return
+    raise OSError(f"別のサーバーが待ち受けています: '{path}'")
+
+
+def _get_error_status(error: MetadatamanagerError) -> int:
+    """例外に対応するステータスコードを取得する関数です。
+
+    Args:
+        error (MetadatamanagerError): 発生した例外
+
+    Returns:
+        int: ステータスコード
+    """
+    for error_type, status in _ERROR_STATUSES:
+        if isinstance(error, error_type):
+            return status
+    return 500
+
+
+def _error_body(error: str, message: str) -> dict:
+    """エラーのレスポンスの内容を作成する関数です。
+
+    Args:
+        error (str): エラーの種類
+        message (str): エラーメッセージ
+
+    Returns:
+        dict: エラーのレスポンスの内容
+    """
+    return {"error": error, "message": message}
+
+
+def _make_handler(service: MetadataService) -> type:
+    """常駐サーバーのリクエストハンドラーを作成する関数です。
+
+    Args:
+        service (MetadataService): リクエストを処理するインスタンス
+
+    Returns:
+        type: リクエストハンドラーのクラス
+    """
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # ヘッダーとボディを1回で送信し、接続を再利用するクライアントで遅延ACKの待ちが発生しないようにする
+        wbufsize = -1
+
+        def do_GET(self):
+            start = time.perf_counter()
+            if self.path == "/health":
+                status, body = service.health()
+                self._send_json(status, body)
+            elif self.path == "/metrics":
+                status = 200
+                content = MetadataManager.export_metrics().encode('utf-8')
+                self._send(status, "text/plain; version=0.0.4; charset=utf-8", content)
+            else:
+                status = 404
+                self._send_json(status, _error_body("NotFound", f"存在しないパスです。: {self.path}"))
+            self._record(start, status)
+
+        def do_POST(self):
+            start = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length > 0 else b""
+            if self.path == "/metadata":
+                status, content = service.handle_metadata(body, self.headers.get("Authorization"))
+            else:
+                status, content = 404, _error_body("NotFound", f"存在しないパスです。: {self.path}")
+            self._send_json(status, content)
+            self._record(start, status)
+
+        def _send_json(self, status: int, body: dict):
+            # CLIの標準出力と同じ形式で出力する
+            content = json_backend.dumps_pretty(body) + b"\n"
+            self._send(status, "application/json; charset=utf-8", content)
+
+        def _send(self, status: int, content_type: str, content: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            if service.draining:
+                self.send_header("Connection", "close")
+                self.close_connection = True
+            self.end_headers()
+            self.wfile.write(content)
+
+        def _record(self, start: float, status: int):
+            endpoint = self.path if self.path in ("/metadata", "/health", "/metrics") else "other"
+            metrics.SERVER_REQUESTS.inc(endpoint=endpoint, status=str(status))
+            metrics.SERVER_REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+
+        def address_string(self) -> str:
+            # Unixドメインソケットの場合は接続元のアドレスがない
+            return self.client_address[0] if self.client_address else "unix"
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return _Handler
@@ -1,7 +1,9 @@
+import codecs
 import configparser
-import json
 import pathlib
 
+from dg_mm import json_backend
+
 
 class PackageFileReader():
     """パッケージ内のファイルの読み込み処理をまとめたクラスです。"""
@@ -23,17 +25,37 @@ class PackageFileReader():
     def read_json(cls, relative_path: str, encoding: str = None) -> dict:
         """JSONファイルを読み込むメソッドです。
 
+        UTF-8のファイルは文字列に変換せずにバイト列のままJSONの変換に渡します。
+
         Args:
             relative_path (str): ファイルパス(dg_mmフォルダからの相対パス)
-            encoding (str): 文字エンコード
+            encoding (str): 文字エンコード。Noneの場合はUTF-8(BOM付きを含む)として読み込む
 
         Returns:
             dict: jsonから変換したPythonオブジェクト
         """
 
         file_path = cls._get_absolute_path(relative_path)
-        with open(file_path, mode='r', encoding=encoding) as f:
-            return json.load(f)
+        with open(file_path, mode='rb') as f:
+            content = f.read()
+        return cls.decode_json(content, encoding)
+
+    @classmethod
+    def decode_json(cls, content: bytes, encoding: str = None) -> dict:
+        """読み込んだJSONファイルの内容を変換するメソッドです。
+
+        Args:
+            content (bytes): JSONファイルの内容
+            encoding (str): 文字エンコード。Noneの場合はUTF-8(BOM付きを含む)として変換する
+
+        Returns:
+            dict: jsonから変換したPythonオブジェクト
+        """
+        if encoding is not None and codecs.lookup(encoding).name != 'utf-8':
+            return json_backend.loads(content.decode(encoding))
+        if content.startswith(codecs.BOM_UTF8):
+            content = content[len(codecs.BOM_UTF8):]
+        return json_backend.loads(content)
 
     @classmethod
     def read_ini(cls, relative_path: str) -> configparser.ConfigParser:
@@ -2,6 +2,25 @@ import json
 import os
 import pytest
 
+from dg_mm.models.definition_artifact import DefinitionArtifact
+from dg_mm.models.grdm import GrdmAccess
+
+
+def remove_definition(path):
+    """マッピング定義ファイルと、検証済みのマッピング定義を保存したファイルを削除します。"""
+    os.remove(path)
+    artifact_path = DefinitionArtifact.get_path(path)
+    if os.path.exists(artifact_path):
+        os.remove(artifact_path)
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """テスト間でトークン検証結果のキャッシュが共有されないようにします。"""
+    GrdmAccess.clear_token_cache()
+    yield
+    GrdmAccess.clear_token_cache()
+
 
 @pytest.fixture
 def create_dummy_definition():
@@ -18,7 +37,7 @@ def create_dummy_definition():
 
     # 後処理
     # ファイル削除
-    os.remove(path)
+    remove_definition(path)
 
 
 @pytest.fixture
@@ -30,13 +49,13 @@ def create_test_definition():
     path = f'dg_mm/data/mapping/{storage}_{schema}_mapping.json'
     # ファイル作成
     with open(path, mode='w') as f:
-        json.dump({"test_property": {"test_definition": "value"}}, f)
+        json.dump({"test_property": {"type": "string", "source": "test_source", "value": "value"}}, f)
 
     yield schema, storage
 
     # 後処理
     # ファイル削除
-    os.remove(path)
+    remove_definition(path)
 
 
 @pytest.fixture
@@ -54,7 +73,7 @@ def create_invalid_test_definition():
 
     # 後処理
     # ファイル削除
-    os.remove(path)
+    remove_definition(path)
 
 
 @pytest.fixture
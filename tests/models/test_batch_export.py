@@ -0,0 +1,220 @@
+"""batch_export.pyをテストするためのモジュールです。"""
+import gzip
+import json
+
+import pytest
+import requests
+
+from dg_mm.errors import DataFormatError, InvalidTokenError
+from dg_mm.fake_grdm import FakeGrdmServer
+from dg_mm.models.batch_export import BatchExporter, ExportState, read_project_ids
+from dg_mm.models.grdm import GrdmAccess
+from dg_mm.models.transport import RequestsTransport
+from dg_mm.output_format import MessagePackFormat
+
+DEFINITION = {
+    "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+}
+
+
+def make_source_data(title):
+    return {"project_info": {"data": {"attributes": {"title": title}}}}
+
+
+@pytest.fixture
+def manager(mocker):
+    """プロジェクトIDごとのデータを返すMetadataManagerのモックを作成します。"""
+    mocker.patch('dg_mm.models.mapping_definition.DefinitionManager._read_mapping_definition', return_value=DEFINITION)
+    titles = {"p1": "title1", "p2": "title2"}
+
+    def get_source_data(schemas, storage, token, id, filter_properties):
+        if id not in titles:
+            raise InvalidTokenError("トークンが無効です。")
+        return make_source_data(titles[id])
+
+    manager = mocker.MagicMock()
+    manager.titles = titles
+    manager.get_source_data.side_effect = get_source_data
+    manager.get_metadata_from_sources.side_effect = lambda schema, storage, source_data, filter_properties: {
+        "name": source_data["project_info"]["data"]["attributes"]["title"]}
+    return manager
+
+
+class TestBatchExporter():
+    def test_export_success_1(self, manager, tmp_path):
+        """前回から変わっていないプロジェクトはマッピングと出力を省略する"""
+
+        state_path = str(tmp_path / "state.json")
+        output_dir = str(tmp_path / "out")
+
+        # テスト実行
+        first = BatchExporter(["RF"], "GRDM", output_dir, state=ExportState(state_path), manager=manager).export(["p1", "p2"])
+        manager.titles["p2"] = "changed"
+        second = BatchExporter(["RF"], "GRDM", output_dir, state=ExportState(state_path), manager=manager).export(["p1", "p2"])
+
+        # 結果の確認
+        assert (first.skipped, first.updated, first.failed) == ([], ["p1", "p2"], {})
+        assert (second.skipped, second.updated, second.failed) == (["p1"], ["p2"], {})
+        assert second.summary() == "skipped: 1, updated: 1, failed: 0"
+        assert manager.get_metadata_from_sources.call_count == 3
+        with open(tmp_path / "out" / "RF" / "p2.json", encoding='utf-8') as f:
+            assert json.load(f) == {"name": "changed"}
+
+    def test_export_success_2(self, manager, tmp_path):
+        """出力が削除されている場合と、forceを指定した場合は出力し直す"""
+
+        state_path = str(tmp_path / "state.json")
+        output_dir = str(tmp_path / "out")
+        BatchExporter(["RF"], "GRDM", output_dir, state=ExportState(state_path), manager=manager).export(["p1", "p2"])
+        (tmp_path / "out" / "RF" / "p1.json").unlink()
+
+        # テスト実行
+        report = BatchExporter(["RF"], "GRDM", output_dir, state=ExportState(state_path), manager=manager).export(["p1", "p2"])
+        forced = BatchExporter(["RF"], "GRDM", output_dir, state=ExportState(state_path), force=True,
+                               manager=manager).export(["p1", "p2"])
+
+        # 結果の確認
+        assert (report.skipped, report.updated) == (["p2"], ["p1"])
+        assert (forced.skipped, forced.updated) == ([], ["p1", "p2"])
+
+    def test_export_success_3(self, manager, tmp_path):
+        """差分の出力先を指定した場合は、前回の出力からの差分をJSON Patchの形式で出力する"""
+
+        output_dir = str(tmp_path / "out")
+        patch_dir = str(tmp_path / "patch")
+        BatchExporter(["RF"], "GRDM", output_dir, manager=manager).export(["p1"])
+        manager.titles["p1"] = "changed"
+
+        # テスト実行
+        BatchExporter(["RF"], "GRDM", output_dir, manager=manager, patch_dir=patch_dir).export(["p1", "p2"])
+
+        # 結果の確認
+        with open(tmp_path / "patch" / "RF" / "p1.json", encoding='utf-8') as f:
+            assert json.load(f) == [{"op": "replace", "path": "/name", "value": "changed"}]
+        with open(tmp_path / "patch" / "RF" / "p2.json", encoding='utf-8') as f:
+            assert json.load(f) == [{"op": "add", "path": "", "value": {"name": "title2"}}]
+        with open(tmp_path / "out" / "RF" / "p1.json", encoding='utf-8') as f:
+            assert json.load(f) == {"name": "changed"}
+
+    def test_export_success_4(self, manager, tmp_path):
+        """前回の出力から差分がない場合は差分を出力しない"""
+
+        output_dir = str(tmp_path / "out")
+        BatchExporter(["RF"], "GRDM", output_dir, manager=manager).export(["p1"])
+
+        # テスト実行
+        report = BatchExporter(["RF"], "GRDM", output_dir, manager=manager,
+                               patch_dir=str(tmp_path / "patch")).export(["p1"])
+
+        # 結果の確認
+        assert report.updated == ["p1"]
+        assert not (tmp_path / "patch" / "RF" / "p1.json").exists()
+
+    def test_export_success_5(self, manager, tmp_path):
+        """出力形式を指定した場合は、その形式と拡張子でメタデータと差分を出力する"""
+
+        output_dir = str(tmp_path / "out")
+        BatchExporter(["RF"], "GRDM", output_dir, manager=manager, output_format=MessagePackFormat).export(["p1"])
+        manager.titles["p1"] = "changed"
+
+        # テスト実行
+        BatchExporter(["RF"], "GRDM", output_dir, manager=manager, output_format=MessagePackFormat,
+                      patch_dir=str(tmp_path / "patch")).export(["p1"])
+
+        # 結果の確認
+        content = (tmp_path / "out" / "RF" / "p1.msgpack").read_bytes()
+        assert MessagePackFormat.loads(content) == {"name": "changed"}
+        patch = (tmp_path / "patch" / "RF" / "p1.msgpack").read_bytes()
+        assert MessagePackFormat.loads(patch) == [{"op": "replace", "path": "/name", "value": "changed"}]
+
+    def test_export_success_6(self, manager, tmp_path):
+        """圧縮方式を指定した場合は、圧縮したメタデータと差分を出力する"""
+
+        output_dir = str(tmp_path / "out")
+        BatchExporter(["RF"], "GRDM", output_dir, manager=manager, compression="gzip").export(["p1"])
+        manager.titles["p1"] = "changed"
+
+        # テスト実行
+        BatchExporter(["RF"], "GRDM", output_dir, manager=manager, compression="gzip", compress_level=1,
+                      patch_dir=str(tmp_path / "patch")).export(["p1"])
+
+        # 結果の確認
+        content = gzip.decompress((tmp_path / "out" / "RF" / "p1.json.gz").read_bytes())
+        assert json.loads(content) == {"name": "changed"}
+        patch = gzip.decompress((tmp_path / "patch" / "RF" / "p1.json.gz").read_bytes())
+        assert json.loads(patch) == [{"op": "replace", "path": "/name", "value": "changed"}]
+
+    def test_export_failure_1(self, manager, tmp_path):
+        """失敗したプロジェクトを記録し、残りのプロジェクトの処理を続ける"""
+
+        state_path = str(tmp_path / "state.json")
+
+        # テスト実行
+        report = BatchExporter(["RF"], "GRDM", str(tmp_path / "out"), state=ExportState(state_path),
+                               manager=manager).export(["unknown", "../p1", "p1"])
+
+        # 結果の確認
+        assert report.updated == ["p1"]
+        assert report.failed == {
+            "unknown": "トークンが無効です。",
+            "../p1": "ファイル名に使用できないプロジェクトIDが指定されました。",
+        }
+        assert ExportState(state_path).get("p1", "RF") is not None
+        assert ExportState(state_path).get("unknown", "RF") is None
+
+    def test_export_failure_2(self, tmp_path):
+        """通信に失敗したプロジェクトを記録し、残りのプロジェクトの処理を続ける"""
+
+        class FailingTransport(RequestsTransport):
+            def get(self, url, headers=None, params=None, timeout=None):
+                if "/p0002/" in url:
+                    raise requests.exceptions.ConnectionError("接続できません。")
+                return super().get(url, headers=headers, params=params, timeout=timeout)
+
+        state_path = str(tmp_path / "state.json")
+        config_path = str(tmp_path / "fake_grdm.ini")
+
+        # モック化
+        with FakeGrdmServer(members=3, registrations=1, files=1, token="fake_token") as server:
+            server.write_config(config_path)
+            GrdmAccess.configure(transport=FailingTransport(), config_path=config_path)
+            try:
+                # テスト実行
+                report = BatchExporter(["RF"], "GRDM", str(tmp_path / "out"), token="fake_token",
+                                       state=ExportState(state_path)).export(["p0001", "p0002", "p0003"])
+            finally:
+                GrdmAccess.configure()
+
+        # 結果の確認
+        assert report.updated == ["p0001", "p0003"]
+        assert report.failed == {"p0002": "APIリクエストの送信に失敗しました"}
+        assert report.summary() == "skipped: 0, updated: 2, failed: 1"
+        assert ExportState(state_path).get("p0002", "RF") is None
+
+
+class TestExportState():
+    def test_init_failure_1(self, tmp_path):
+        """状態ファイルの形式に誤りがある"""
+
+        path = tmp_path / "state.json"
+        path.write_text("[]", encoding='utf-8')
+
+        with pytest.raises(DataFormatError):
+            ExportState(str(path))
+
+    def test_init_success_1(self, tmp_path):
+        """形式のバージョンが異なる状態ファイルの記録は引き継がない"""
+
+        path = tmp_path / "state.json"
+        path.write_text(json.dumps({"version": 0, "projects": {"p1": {"RF": "x"}}}), encoding='utf-8')
+
+        assert ExportState(str(path)).get("p1", "RF") is None
+
+
+def test_read_project_ids_1(tmp_path):
+    """空行と#で始まる行を除いたプロジェクトIDの一覧を読み込む"""
+
+    path = tmp_path / "ids.txt"
+    path.write_text("p1\n\n# comment\n  p2  \n", encoding='utf-8')
+
+    assert read_project_ids(str(path)) == ["p1", "p2"]
@@ -0,0 +1,174 @@
+"""definition_artifact.pyをテストするためのモジュールです。"""
+import json
+import os
+
+import pytest
+
+import dg_mm
+from dg_mm.errors import MappingDefinitionError
+from dg_mm.models.definition_artifact import DefinitionArtifact
+from dg_mm.models.definition_compiler import CompiledComponents, DefinitionCompiler
+
+DEFINITION = {
+    "a[].b": {"type": "string", "source": "member_info", "value": "data.id", "list": {"data": "a"}},
+    "c": {"type": "number"},
+}
+
+
+@pytest.fixture
+def source_path(tmp_path, mocker):
+    """テスト用のマッピング定義ファイルを作成し、保存を有効にします。"""
+    mocker.patch("sys.dont_write_bytecode", False)
+    path = tmp_path / "TEST_S1_mapping.json"
+    path.write_text(json.dumps(DEFINITION), encoding='utf-8')
+    return str(path)
+
+
+class TestDefinitionArtifact():
+    def test_get_path_success_1(self):
+        """(正常系テスト)マッピング定義ファイルと同じフォルダの__pycache__に保存する"""
+
+        # テスト実行・結果の確認
+        assert DefinitionArtifact.get_path(os.path.join("dir", "GRDM_RF_mapping.json")) == os.path.join(
+            "dir", "__pycache__", "GRDM_RF_mapping.marshal")
+
+    def test_load_success_1(self, source_path, mocker):
+        """(正常系テスト)初回はJSONから読み込んで保存し、2回目は保存した内容を1回の読み込みで使用する"""
+
+        # モック化
+        mock_compile = mocker.spy(DefinitionCompiler, "compile")
+
+        # テスト実行
+        first = DefinitionArtifact.load(source_path)
+        second = DefinitionArtifact.load(source_path)
+
+        # 結果の確認
+        assert first == second == DEFINITION
+        assert mock_compile.call_count == 1
+        assert os.path.exists(DefinitionArtifact.get_path(source_path))
+        assert isinstance(second["a[].b"], CompiledComponents)
+        assert second["a[].b"].plan.to_state() == first["a[].b"].plan.to_state()
+
+    def test_load_success_2(self, source_path, mocker):
+        """(正常系テスト)更新日時のみが異なる場合は、ハッシュ値が一致すれば検証をやり直さずに保存し直す"""
+
+        DefinitionArtifact.load(source_path)
+        stat = os.stat(source_path)
+        os.utime(source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        # モック化
+        mock_compile = mocker.spy(DefinitionCompiler, "compile")
+
+        # テスト実行
+        result = DefinitionArtifact.load(source_path)
+
+        # 結果の確認
+        assert result == DEFINITION
+        assert mock_compile.call_count == 0
+        header, _ = DefinitionArtifact._read(DefinitionArtifact.get_path(source_path))
+        assert header["mtime_ns"] == stat.st_mtime_ns + 10 ** 9
+
+    def test_load_success_3(self, source_path, mocker):
+        """(正常系テスト)マッピング定義ファイルが更新された場合はJSONから読み込み直す"""
+
+        DefinitionArtifact.load(source_path)
+        updated = {"d": {"type": "boolean"}}
+        with open(source_path, mode='w', encoding='utf-8') as f:
+            json.dump(updated, f)
+
+        # テスト実行
+        result = DefinitionArtifact.load(source_path)
+
+        # 結果の確認
+        assert result == updated
+        assert DefinitionArtifact.load(source_path) == updated
+
+    @pytest.mark.parametrize("artifact", [
+        b"",
+        b"DGMMDEF not json\n",
+        b'DGMMDEF {"format": 1}\n',
+        b"DGMMDEF " + json.dumps({"format": 0, "version": dg_mm.__version__}).encode() + b"\n",
+        b"OTHER\n",
+    ])
+    def test_load_success_4(self, source_path, artifact):
+        """(正常系テスト)保存したファイルの形式やバージョンが異なる場合は使用しない"""
+
+        artifact_path = DefinitionArtifact.get_path(source_path)
+        os.makedirs(os.path.dirname(artifact_path))
+        with open(artifact_path, mode='wb') as f:
+            f.write(artifact)
+
+        # テスト実行
+        result = DefinitionArtifact.load(source_path)
+
+        # 結果の確認
+        assert result == DEFINITION
+        assert DefinitionArtifact._read(artifact_path)[0] is not None
+
+    def test_load_success_5(self, source_path, mocker):
+        """(正常系テスト)保存したマッピング定義を復元できない場合はJSONから読み込む"""
+
+        DefinitionArtifact.load(source_path)
+        artifact_path = DefinitionArtifact.get_path(source_path)
+        with open(artifact_path, mode='rb') as f:
+            header_line = f.readline()
+        with open(artifact_path, mode='wb') as f:
+            f.write(header_line + b"broken")
+
+        # テスト実行
+        result = DefinitionArtifact.load(source_path)
+
+        # 結果の確認
+        assert result == DEFINITION
+        assert isinstance(result["c"], CompiledComponents)
+
+    def test_load_success_6(self, source_path, mocker):
+        """(正常系テスト)sys.dont_write_bytecodeが設定されている場合と、保存に失敗した場合は保存しない"""
+
+        # モック化
+        mocker.patch("sys.dont_write_bytecode", True)
+
+        # テスト実行
+        result = DefinitionArtifact.load(source_path)
+
+        # 結果の確認
+        assert result == DEFINITION
+        assert not os.path.exists(DefinitionArtifact.get_path(source_path))
+
+        # モック化
+        mocker.patch("sys.dont_write_bytecode", False)
+        mocker.patch("os.replace", side_effect=PermissionError())
+
+        # テスト実行
+        result = DefinitionArtifact.load(source_path)
+
+        # 結果の確認
+        assert result == DEFINITION
+        assert os.listdir(os.path.dirname(DefinitionArtifact.get_path(source_path))) == []
+
+    def test_load_failure_1(self, source_path):
+        """(異常系テスト)マッピング定義に誤りがある場合は保存しない"""
+
+        with open(source_path, mode='w', encoding='utf-8') as f:
+            json.dump({"a": {"type": "text"}}, f)
+
+        # テスト実行・結果の確認
+        with pytest.raises(MappingDefinitionError):
+            DefinitionArtifact.load(source_path)
+
+        assert not os.path.exists(DefinitionArtifact.get_path(source_path))
+
+    def test_build_success_1(self, source_path, mocker):
+        """(正常系テスト)sys.dont_write_bytecodeに関わらず保存する"""
+
+        # モック化
+        mocker.patch("sys.dont_write_bytecode", True)
+
+        # テスト実行
+        artifact_path = DefinitionArtifact.build(source_path)
+
+        # 結果の確認
+        assert artifact_path == DefinitionArtifact.get_path(source_path)
+        header, payload = DefinitionArtifact._read(artifact_path)
+        assert header["size"] == os.stat(source_path).st_size
+        assert DefinitionArtifact._restore(payload) == DEFINITION
@@ -0,0 +1,120 @@
+"""definition_compiler.pyをテストするためのモジュールです。"""
+import copy
+import pickle
+
+import pytest
+
+from dg_mm.errors import MappingDefinitionError
+from dg_mm.models.definition_compiler import CompiledComponents, DefinitionCompiler
+from dg_mm.util import PackageFileReader
+
+SOURCES = ["project_info", "member_info"]
+
+
+class TestDefinitionCompiler():
+    def test_validate_success_1(self):
+        """(正常系テスト)パッケージに含まれるマッピング定義に誤りがない"""
+
+        mapping_definition = PackageFileReader.read_json("data/mapping/GRDM_RF_mapping.json", encoding='utf-8')
+
+        # テスト実行・結果の確認
+        assert DefinitionCompiler.validate(mapping_definition, SOURCES + ["project_metadata", "file_metadata"]) == []
+
+    @pytest.mark.parametrize(("mapping_definition", "expected"), [
+        ({"a": {"type": "string", "source": "project_info", "value": "x", "note": 1}},
+         ["不明なキー:['note']が指定されています。(a)"]),
+        ({"a": {"type": "text"}},
+         ["type:textは有効な型ではありません。(a)"]),
+        ({"a": {"type": "string", "source": "project_info", "value": "x..y"}},
+         ["value:x..yはキーを「.」でつなげた文字列で指定してください。(a)"]),
+        ({"a": {"type": "string", "value": "x"}},
+         ["sourceが指定されていません。(a)"]),
+        ({"a": {"type": "string", "source": "dummy", "value": "x"}},
+         ["メタデータ取得先:dummyが存在しません。(a)"]),
+        ({"a[]": {"type": "string", "source": "member_info", "value": "data.id", "list": {"data.name": "a"}}},
+         ["listのキー:data.nameがvalueのパスに含まれていません。(a[])"]),
+        ({"a": {"type": "string", "source": "member_info", "value": "data.id", "list": {"data": -1}}},
+         ["list:dataのインデックス:-1は0以上で指定してください。(a)"]),
+        ({"a": {"type": "string", "source": "member_info", "value": "data.id", "list": {"data": True}}},
+         ["list:dataにはスキーマのリストかインデックスを指定してください。(a)"]),
+        ({"a": {"type": "string", "source": "member_info", "value": "data.id", "list": {"data": "a"}}},
+         ["list:dataに対応するスキーマのリスト:aがプロパティに含まれていません。(a)"]),
+        ({"a[]": {"type": "string", "source": "member_info", "value": "data.id", "list": {"data": "a", "data.id": "a"}}},
+         ["スキーマのリスト:aに複数のlist:['data', 'data.id']が対応しています。(a[])"]),
+        ({"a.b": {"type": "string"}, "a[].c": {"type": "string"}},
+         ["aのデータ構造がプロパティ:a.bと異なっています。(a[].c)"]),
+        ({"a.b": {"type": "string"}, "a.b.c": {"type": "string"}},
+         ["a.bのデータ構造がプロパティ:a.bと異なっています。(a.b.c)"]),
+        ({"a[]x.b": {"type": "string"}},
+         ["キー:a[]xの形式に誤りがあります。(a[]x.b)"]),
+        ("not a definition",
+         ["マッピング定義はオブジェクトで指定してください。"]),
+    ])
+    def test_validate_failure_1(self, mapping_definition, expected):
+        """(異常系テスト)マッピング定義の誤りを示す"""
+
+        # テスト実行・結果の確認
+        assert DefinitionCompiler.validate(mapping_definition, SOURCES) == expected
+
+    def test_validate_success_2(self):
+        """(正常系テスト)sourcesを指定しない場合はデータ取得先を確認しない"""
+
+        mapping_definition = {"a": {"type": "string", "source": "dummy", "value": "x"}}
+
+        # テスト実行・結果の確認
+        assert DefinitionCompiler.validate(mapping_definition) == []
+
+    def test_compile_success_1(self):
+        """(正常系テスト)プロパティごとに計算済みの値を持つ、元の定義と等しいdictに変換する"""
+
+        mapping_definition = {
+            "a[].b[]": {"type": "number", "source": "member_info", "value": "data.attributes.ids",
+                        "list": {"data": "a"}},
+            "c": {"type": "boolean"},
+        }
+
+        # テスト実行
+        result = DefinitionCompiler.compile(mapping_definition)
+
+        # 結果の確認
+        assert result == mapping_definition
+        plan = result["a[].b[]"].plan
+        assert plan.type == "number"
+        assert plan.storage_keys == ("data", "attributes", "ids")
+        assert plan.links == ("a", None, None)
+        assert plan.schema_keys == (("a[]", "a", True, "a"),)
+        assert plan.final_key == "b[]"
+        assert result["c"].plan.storage_keys == ()
+
+    def test_compile_success_2(self):
+        """(正常系テスト)変換したマッピング定義は複製とpickleで計算済みの値を保つ"""
+
+        result = DefinitionCompiler.compile({
+            "a[].b": {"type": "string", "source": "member_info", "value": "data.id", "list": {"data": "a"}}})
+
+        # テスト実行
+        copied = copy.deepcopy(result)
+        loaded = pickle.loads(pickle.dumps(result))
+
+        # 結果の確認
+        for value in (copied, loaded):
+            assert value == result
+            assert isinstance(value["a[].b"], CompiledComponents)
+            assert value["a[].b"].plan.links == result["a[].b"].plan.links
+            assert value["a[].b"].plan.schema_keys == result["a[].b"].plan.schema_keys
+
+    def test_compile_failure_1(self):
+        """(異常系テスト)誤りがある場合はすべての誤りを示す"""
+
+        mapping_definition = {
+            "a": {"type": "text"},
+            "b": {"type": "string", "source": "dummy", "value": "x"},
+        }
+
+        # テスト実行・結果の確認
+        with pytest.raises(MappingDefinitionError) as e:
+            DefinitionCompiler.compile(mapping_definition, SOURCES)
+
+        assert str(e.value) == (
+            "マッピング定義に2件の誤りがあります。:type:textは有効な型ではありません。(a), "
+            "メタデータ取得先:dummyが存在しません。(b)")
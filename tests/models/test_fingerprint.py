@@ -0,0 +1,48 @@
+"""fingerprint.pyをテストするためのモジュールです。"""
+from dg_mm.models.fingerprint import SourceFingerprint
+
+DEFINITION = {
+    "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+    "researcher[].name": {"source": "member_info", "value": "data[].attributes.full_name", "type": "string"},
+    "field": {"value": None, "type": "string"},
+}
+
+
+class TestSourceFingerprint():
+    def test_compute_success_1(self, mocker):
+        """キーの順序によらず同じ値になり、参照しないデータ取得先の変更は影響しない"""
+
+        # モック化
+        mocker.patch('dg_mm.models.mapping_definition.DefinitionManager._read_mapping_definition', return_value=DEFINITION)
+        source_data = {"project_info": {"a": 1, "b": [1, 2]}, "member_info": {"data": []}, "file_metadata": {"x": 1}}
+        reordered = {"member_info": {"data": []}, "project_info": {"b": [1, 2], "a": 1}, "file_metadata": {"x": 2}}
+
+        # テスト実行
+        actual = SourceFingerprint.compute("RF", "GRDM", source_data)
+
+        # 結果の確認
+        assert actual == SourceFingerprint.compute("RF", "GRDM", reordered)
+        assert len(actual) == 64
+
+    def test_compute_success_2(self, mocker):
+        """データ取得先のデータ、絞り込み、マッピング定義が変わると異なる値になる"""
+
+        # モック化
+        mock_read = mocker.patch(
+            'dg_mm.models.mapping_definition.DefinitionManager._read_mapping_definition', return_value=DEFINITION)
+        source_data = {"project_info": {"a": 1}, "member_info": {"data": []}}
+
+        # テスト実行
+        base = SourceFingerprint.compute("RF", "GRDM", source_data)
+        changed_data = SourceFingerprint.compute("RF", "GRDM", dict(source_data, project_info={"a": 2}))
+        filtered = SourceFingerprint.compute("RF", "GRDM", source_data, ["name"])
+        mock_read.return_value = dict(DEFINITION, field={"value": None, "type": "number"})
+        changed_definition = SourceFingerprint.compute("RF", "GRDM", source_data)
+
+        # 結果の確認
+        assert len({base, changed_data, filtered, changed_definition}) == 4
+
+    def test_get_sources_success_1(self):
+        """マッピング定義が参照するデータ取得先を名前順に取得する"""
+
+        assert SourceFingerprint.get_sources(DEFINITION) == ["member_info", "project_info"]
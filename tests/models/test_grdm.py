@@ -1,5 +1,8 @@
 """grdm.pyをテストするためのモジュールです。"""
+import io
 import json
+import threading
+import time
 import pytest
 import requests
 from multiprocessing import AuthenticationError
@@ -7,7 +10,14 @@ from typing import Counter
 from unittest.mock import Mock
 
 
+from dg_mm import metrics
+from dg_mm.models.definition_compiler import DefinitionCompiler
 from dg_mm.models.grdm import GrdmAccess, GrdmMapping
+from dg_mm.models.mapping_definition import DefinitionManager
+from dg_mm.models.result_cache import MemoryResultCache
+from dg_mm.models.stream_parser import PrunedJsonParser
+from dg_mm.models.transport import CachingTransport
+from dg_mm.util import PackageFileReader
 from dg_mm.errors import (
     MappingDefinitionNotFoundError,
     InvalidSchemaError,
@@ -27,15 +37,39 @@ from dg_mm.errors import (
 def create_mock_response(code, body=None):
     response = requests.models.Response()
     response.status_code = code
+    response._content = json.dumps(body).encode('utf-8')
     response.json = Mock(return_value=body)
     return response
 
 
+def create_stream_response(code, body=None):
+    """レスポンスボディを読み込んでいない(stream=Trueで受け取った)レスポンスを作成します。"""
+    response = requests.models.Response()
+    response.status_code = code
+    response.raw = io.BytesIO(json.dumps(body).encode('utf-8'))
+    return response
+
+
 def read_json(path):
     with open(path, mode='r') as f:
         return json.load(f)
 
 
+@pytest.fixture
+def stream_member_info(tmp_path):
+    """メンバー情報をページごとに受け取りながらマッピングする設定にします。"""
+    config = PackageFileReader.read_ini('data/storage/grdm.ini')
+    config["settings"]["stream_member_info"] = "true"
+    config_path = str(tmp_path / "grdm.ini")
+    with open(config_path, 'w', encoding='utf-8') as f:
+        config.write(f)
+    GrdmAccess.configure(config_path=config_path)
+
+    yield
+
+    GrdmAccess.configure()
+
+
 def create_authorized_grdm_access():
     instance = GrdmAccess()
     instance._token = "valid_token"
@@ -372,6 +406,469 @@ class TestGrdmMapping():
 
         assert str(e.value) == "データ構造が定義と異なっています。(sc1[].sc3[].sc4[])"
 
+    def test_mapping_metadata_metrics_1(self, mocker):
+        """マッピングに失敗した場合はエラーの種類ごとの数が記録されるテストケースです。"""
+
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication", side_effect=InvalidTokenError())
+        errors_before = metrics.ERRORS.get(type="InvalidTokenError")
+        mappings_before = metrics.MAPPINGS.get(result="error")
+
+        with pytest.raises(InvalidTokenError):
+            target_class = GrdmMapping()
+            target_class.mapping_metadata("RF", "invalid_token", "valid_project_id")
+
+        assert metrics.ERRORS.get(type="InvalidTokenError") == errors_before + 1
+        assert metrics.MAPPINGS.get(result="error") == mappings_before + 1
+
+    def test_mapping_metadata_for_schemas_1(self, mocker):
+        """(正常系テスト)複数のスキーマで必要なデータ取得先から1回ずつデータを取得する場合のテストケースです。"""
+
+        definition1 = {
+            "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+        }
+        definition2 = {
+            "title": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+            "member[]": {"source": "member_info", "value": "data.id", "type": "string",
+                         "list": {"data": "member"}},
+        }
+        project_info = {"data": {"attributes": {"title": "title1"}}}
+        member_info = {"data": [{"id": "m1"}, {"id": "m2"}]}
+
+        mock_check_authentication = mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication")
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition",
+                     side_effect=[definition1, definition2])
+        mock_get_project_info = mocker.patch("dg_mm.models.grdm.GrdmAccess.get_project_info", return_value=project_info)
+        mock_get_member_info = mocker.patch("dg_mm.models.grdm.GrdmAccess.get_member_info", return_value=member_info)
+
+        target_class = GrdmMapping()
+        result = target_class.mapping_metadata_for_schemas(["S1", "S2"], "valid_token", "valid_project_id")
+
+        assert result == {
+            "S1": {"name": "title1"},
+            "S2": {"title": "title1", "member": ["m1", "m2"]},
+        }
+        assert mock_check_authentication.call_count == 1
+        assert mock_get_project_info.call_count == 1
+        assert mock_get_member_info.call_count == 1
+
+    def test_mapping_metadata_for_schemas_2(self, mocker):
+        """(異常系テスト)いずれかのスキーマが存在しない場合はデータを取得しないテストケースです。"""
+
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication")
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition",
+                     side_effect=[{}, MappingDefinitionNotFoundError()])
+        mock_get_project_info = mocker.patch("dg_mm.models.grdm.GrdmAccess.get_project_info")
+
+        with pytest.raises(InvalidSchemaError) as e:
+            target_class = GrdmMapping()
+            target_class.mapping_metadata_for_schemas(["RF", "invalid_schema"], "valid_token", "valid_project_id")
+
+        assert str(e.value) == "対応していないスキーマが指定されました。"
+        mock_get_project_info.assert_not_called()
+
+    @pytest.mark.parametrize("member_info", [
+        {"data": [
+            {"id": "m1", "attributes": {"full_name": "name1", "tags": ["a", "b"], "active": "TRUE", "count": "1"}},
+            {"id": "m2", "attributes": {"full_name": "name2", "tags": [], "active": False, "count": "2.5"}},
+        ]},
+        {"data": [{"id": "m1", "attributes": {"full_name": "name1"}}]},
+    ])
+    def test_mapping_metadata_compiled_1(self, mocker, member_info):
+        """(正常系テスト)検証済みのマッピング定義は、検証前のマッピング定義と同じ結果になるテストケースです。"""
+
+        definition = {
+            "title": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+            "member[].id": {"source": "member_info", "value": "data.id", "type": "string",
+                            "list": {"data": "member"}},
+            "member[].name": {"source": "member_info", "value": "data.attributes.full_name", "type": "string",
+                              "list": {"data": "member"}},
+            "member[].tag[]": {"source": "member_info", "value": "data.attributes.tags", "type": "string",
+                               "list": {"data": "member"}},
+            "member[].active": {"source": "member_info", "value": "data.attributes.active", "type": "boolean",
+                                "list": {"data": "member"}},
+            "member[].count": {"source": "member_info", "value": "data.attributes.count", "type": "number",
+                               "list": {"data": "member"}},
+            "first.name": {"source": "member_info", "value": "data.attributes.full_name", "type": "string",
+                           "list": {"data": 0}},
+            "note": {"type": "string"},
+        }
+        source_data = {
+            "project_info": {"data": {"attributes": {"title": "title1"}}},
+            "member_info": member_info,
+        }
+        compiled_definition = DefinitionCompiler.compile(definition)
+
+        # モック化
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition",
+                     side_effect=[definition, compiled_definition])
+        mock__add_planned_property = mocker.spy(GrdmMapping, "_add_planned_property")
+
+        # テスト実行
+        target_class = GrdmMapping()
+        expected = target_class.mapping_metadata_from_sources("RF", source_data)
+        planned_calls = mock__add_planned_property.call_count
+        result = target_class.mapping_metadata_from_sources("RF", source_data)
+
+        # 結果の確認
+        assert result == expected
+        assert planned_calls == 0
+        assert mock__add_planned_property.call_count > 0
+
+    def test_mapping_metadata_compiled_2(self, mocker):
+        """(異常系テスト)検証済みのマッピング定義でも、型変換の失敗はプロパティごとに集計されるテストケースです。"""
+
+        definition = {
+            "member[].active": {"source": "member_info", "value": "data.active", "type": "boolean",
+                                "list": {"data": "member"}},
+            "member[].count": {"source": "member_info", "value": "data.count", "type": "number",
+                               "list": {"data": "member"}},
+        }
+        source_data = {"member_info": {"data": [{"active": "yes", "count": "x"}, {"active": "no", "count": "1"}]}}
+
+        # モック化
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition",
+                     side_effect=[definition, DefinitionCompiler.compile(definition)])
+
+        # テスト実行
+        target_class = GrdmMapping()
+        with pytest.raises(DataTypeError) as expected:
+            target_class.mapping_metadata_from_sources("RF", source_data)
+        with pytest.raises(DataTypeError) as e:
+            target_class.mapping_metadata_from_sources("RF", source_data)
+
+        # 結果の確認
+        assert str(e.value) == str(expected.value)
+
+    def test_mapping_metadata_from_sources_1(self, mocker):
+        """(正常系テスト)取得済みのデータからGRDMにアクセスせずにマッピングする場合のテストケースです。"""
+
+        definition = {
+            "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+            "member[]": {"source": "member_info", "value": "data.id", "type": "string",
+                         "list": {"data": "member"}},
+        }
+        source_data = {
+            "project_info": {"data": {"attributes": {"title": "title1"}}},
+            "member_info": {"data": [{"id": "m1"}, {"id": "m2"}]},
+        }
+
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition", return_value=definition)
+        mock_get = mocker.patch("requests.get")
+
+        target_class = GrdmMapping()
+        result = target_class.mapping_metadata_from_sources("RF", source_data)
+
+        assert result == {"name": "title1", "member": ["m1", "m2"]}
+        mock_get.assert_not_called()
+
+    def test_mapping_metadata_from_sources_2(self, mocker):
+        """(異常系テスト)マッピングに必要なデータ取得先のデータが存在しない場合のテストケースです。"""
+
+        definition = {
+            "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+        }
+
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition", return_value=definition)
+
+        with pytest.raises(MetadataNotFoundError) as e:
+            target_class = GrdmMapping()
+            target_class.mapping_metadata_from_sources("RF", {"member_info": {}})
+
+        assert str(e.value) == "データ取得先:['project_info']のデータが存在しません。"
+
+    def test_get_metadata_sources_1(self):
+        """(正常系テスト)マッピング定義のsourceに指定できるデータ取得先の一覧を取得するテストケースです。"""
+
+        # テスト実行・結果の確認
+        assert GrdmMapping().get_metadata_sources() == ["project_info", "member_info", "project_metadata", "file_metadata"]
+
+    def test_fetch_source_data_1(self, mocker):
+        """(正常系テスト)マッピングを行わずにデータ取得先のデータを取得する場合のテストケースです。"""
+
+        definition = {
+            "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+        }
+        project_info = {"data": {"attributes": {"title": "title1"}}}
+
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication")
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition", return_value=definition)
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.get_project_info", return_value=project_info)
+        mock__extract_metadata = mocker.patch("dg_mm.models.grdm.GrdmMapping._extract_metadata")
+
+        target_class = GrdmMapping()
+        result = target_class.fetch_source_data(["RF"], "valid_token", "valid_project_id")
+
+        assert result == {"project_info": project_info}
+        mock__extract_metadata.assert_not_called()
+
+    @pytest.mark.parametrize("method, args", [
+        ("fetch_source_data", (["RF"], "valid_token", "valid_project_id")),
+        ("mapping_metadata", ("RF", "valid_token", "valid_project_id")),
+    ])
+    def test_fetch_source_data_failure_1(self, mocker, method, args):
+        """(異常系テスト)GRDMのAPIが想定外のステータスコードを返した場合はAPIErrorになる場合のテストケースです。"""
+
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication",
+                     side_effect=requests.HTTPError(response=create_mock_response(429)))
+
+        with pytest.raises(APIError, match=r"APIリクエストが失敗しました\(429\)") as e:
+            getattr(GrdmMapping(), method)(*args)
+
+        assert isinstance(e.value.__cause__, requests.HTTPError)
+
+    def test_mapping_metadata_from_sources_3(self):
+        """(正常系テスト)1つのインスタンスを複数のスレッドから同時に使用する場合のテストケースです。"""
+
+        from concurrent.futures import ThreadPoolExecutor
+        from dg_mm.fake_grdm import make_file_metadata, make_member_info, make_project_info, make_project_metadata
+
+        def make_source_data(i):
+            project_id = f"p{i:04d}"
+            return {
+                "project_info": make_project_info(project_id),
+                "member_info": make_member_info(project_id, 20 + i),
+                "project_metadata": make_project_metadata(project_id, 1),
+                "file_metadata": make_file_metadata(project_id, 20 + i),
+            }
+
+        source_data_list = [make_source_data(i) for i in range(16)]
+        expected = [GrdmMapping().mapping_metadata_from_sources("RF", data) for data in source_data_list]
+
+        target_class = GrdmMapping()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda data: target_class.mapping_metadata_from_sources("RF", data), source_data_list))
+
+        assert results == expected
+
+    def test_mapping_metadata_from_sources_4(self, mocker):
+        """(正常系テスト)マッピングの結果のキャッシュに同じ入力の結果がある場合のテストケースです。"""
+
+        definition = {
+            "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+        }
+        source_data = {"project_info": {"data": {"attributes": {"title": "title1"}}}}
+
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition", return_value=definition)
+        GrdmMapping.configure_result_cache(MemoryResultCache())
+        try:
+            target_class = GrdmMapping()
+            first = target_class.mapping_metadata_from_sources("RF", source_data)
+            spy__extract_metadata = mocker.spy(GrdmMapping, "_extract_metadata")
+            second = target_class.mapping_metadata_from_sources("RF", source_data)
+            stats = GrdmMapping._result_cache.stats()
+        finally:
+            GrdmMapping.configure_result_cache()
+
+        assert first == second == {"name": "title1"}
+        spy__extract_metadata.assert_not_called()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_mapping_metadata_from_sources_5(self, mocker):
+        """(正常系テスト)ストレージのデータが変わった場合はキャッシュを使用せずにマッピングするテストケースです。"""
+
+        definition = {
+            "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+        }
+
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition", return_value=definition)
+        GrdmMapping.configure_result_cache(MemoryResultCache())
+        try:
+            target_class = GrdmMapping()
+            first = target_class.mapping_metadata_from_sources("RF", {"project_info": {"data": {"attributes": {"title": "title1"}}}})
+            second = target_class.mapping_metadata_from_sources("RF", {"project_info": {"data": {"attributes": {"title": "title2"}}}})
+            stats = GrdmMapping._result_cache.stats()
+        finally:
+            GrdmMapping.configure_result_cache()
+
+        assert first == {"name": "title1"}
+        assert second == {"name": "title2"}
+        assert stats["hits"] == 0
+        assert stats["misses"] == 2
+
+    def test_mapping_metadata_for_schemas_paged_1(self, mocker, stream_member_info):
+        """(正常系テスト)メンバー情報をページごとにマッピングした結果が、全体をマッピングした結果と同じになるテストケースです。"""
+
+        definition = {
+            "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+            "researcher[].name": {"source": "member_info", "value": "data.attributes.full_name", "type": "string",
+                                  "list": {"data": "researcher"}},
+            "researcher[].order": {"source": "member_info", "value": "data.attributes.order", "type": "number",
+                                   "list": {"data": "researcher"}},
+            "researcher[].note": {"type": "string", "value": None},
+            "title": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+        }
+        project_info = {"data": {"attributes": {"title": "title1"}}}
+        pages = [
+            {"data": [{"attributes": {"full_name": "r0", "order": 0}}, {"attributes": {}}], "links": {"next": "p2"}},
+            {"data": [{}, {"attributes": {"full_name": "r3", "order": "x"}}], "links": {"next": "p3"}},
+            {"data": [{"attributes": {"full_name": "r4", "order": 4}}, {}], "links": {"next": None}},
+        ]
+        member_info = {"data": [item for page in pages for item in page["data"]], "links": pages[0]["links"]}
+
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication")
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition", return_value=definition)
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.get_project_info", return_value=project_info)
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.iter_member_info", return_value=iter(pages))
+        mock_get_member_info = mocker.patch("dg_mm.models.grdm.GrdmAccess.get_member_info")
+
+        with pytest.raises(DataFormatError) as expected:
+            GrdmMapping().mapping_metadata_from_sources("RF", {"project_info": project_info, "member_info": member_info})
+
+        # テスト実行
+        with pytest.raises(DataFormatError) as actual:
+            GrdmMapping().mapping_metadata("RF", "valid_token", "valid_project_id")
+
+        # 結果の確認
+        assert str(actual.value) == str(expected.value)
+        assert mock_get_member_info.call_count == 0
+
+    def test_mapping_metadata_for_schemas_paged_2(self, mocker, stream_member_info):
+        """(正常系テスト)ページごとにマッピングした結果の項目の位置と、プロパティの順序が全体をマッピングした場合と同じになるテストケースです。"""
+
+        definition = {
+            "name": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+            "researcher[].name": {"source": "member_info", "value": "data.attributes.full_name", "type": "string",
+                                  "list": {"data": "researcher"}},
+            "researcher[].email[]": {"source": "member_info", "value": "data.attributes.email", "type": "string",
+                                     "list": {"data": "researcher"}},
+            "title": {"source": "project_info", "value": "data.attributes.title", "type": "string"},
+        }
+        project_info = {"data": {"attributes": {"title": "title1"}}}
+        pages = [
+            {"data": [{"attributes": {"full_name": "r0", "email": "e0"}}, {"attributes": {"email": "e1"}}, {}]},
+            {"data": [{}, {"attributes": {"full_name": "r4"}}]},
+        ]
+        member_info = {"data": [item for page in pages for item in page["data"]]}
+
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication")
+        mocker.patch("dg_mm.models.mapping_definition.DefinitionManager.get_and_filter_mapping_definition", return_value=definition)
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.get_project_info", return_value=project_info)
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.iter_member_info", return_value=iter(pages))
+        mocker.patch("dg_mm.models.grdm.GrdmMapping._raise_mapping_errors")
+        expected = GrdmMapping().mapping_metadata_from_sources("RF", {"project_info": project_info, "member_info": member_info})
+
+        # テスト実行
+        actual = GrdmMapping().mapping_metadata("RF", "valid_token", "valid_project_id")
+
+        # 結果の確認
+        assert actual == expected
+        assert list(actual) == list(expected) == ["name", "researcher", "title"]
+        assert [list(item) for item in actual["researcher"]] == [list(item) for item in expected["researcher"]]
+        assert len(actual["researcher"]) == 5
+
+    @pytest.mark.parametrize("definition, expected", [
+        ({
+            "a": {"source": "project_info", "value": "x", "type": "string"},
+            "researcher[].name": {"source": "member_info", "value": "data.name", "type": "string", "list": {"data": "researcher"}},
+            "researcher[].note": {"type": "string", "value": None},
+            "researcher[].email": {"source": "member_info", "value": "data.email", "type": "string", "list": {"data": "researcher"}},
+        }, ["researcher[].name", "researcher[].email"]),
+        ({
+            "a": {"source": "project_info", "value": "x", "type": "string"},
+        }, []),
+        ({
+            "researcher[].name": {"source": "member_info", "value": "data.name", "type": "string", "list": {"data": "researcher"}},
+            "a": {"source": "project_info", "value": "x", "type": "string"},
+            "researcher[].email": {"source": "member_info", "value": "data.email", "type": "string", "list": {"data": "researcher"}},
+        }, None),
+        ({
+            "researcher[].name": {"source": "member_info", "value": "data.name", "type": "string", "list": {"data": "researcher"}},
+            "researcher[].orcid": {"source": "project_info", "value": "x", "type": "string"},
+        }, None),
+        ({
+            "researcher[].name": {"source": "member_info", "value": "data.name", "type": "string", "list": {"data": "researcher"}},
+            "total": {"source": "member_info", "value": "meta.total", "type": "number"},
+        }, None),
+        ({
+            "researcher[].name": {"source": "member_info", "value": "data.name", "type": "string", "list": {"data": 0}},
+        }, None),
+    ])
+    def test__find_paged_properties_1(self, definition, expected):
+        """(正常系テスト)ページごとにマッピングできるプロパティを特定するテストケースです。"""
+
+        # テスト実行
+        result = GrdmMapping()._find_paged_properties(definition, "member_info", "data")
+
+        # 結果の確認
+        assert result == expected
+
+    def test__prefetch_pages_success_1(self):
+        """受け取ったページを処理している間に次のページを取得する"""
+
+        requested = threading.Event()
+
+        def pages():
+            yield 1
+            requested.set()
+            yield 2
+
+        # テスト実行
+        prefetched = GrdmMapping()._prefetch_pages(pages())
+        first = next(prefetched)
+        fetched = requested.wait(5)
+        rest = list(prefetched)
+
+        # 結果の確認
+        assert first == 1
+        assert fetched
+        assert rest == [2]
+
+    def test__prefetch_pages_success_2(self, caplog):
+        """途中で終了した場合は取得中のページを待たず、その取得で発生したエラーをログに出力する"""
+
+        release = threading.Event()
+
+        def pages():
+            yield 1
+            release.wait(5)
+            raise APIError("APIサーバーでエラーが発生しました")
+
+        # テスト実行
+        prefetched = GrdmMapping()._prefetch_pages(pages())
+        first = next(prefetched)
+        prefetched.close()
+        logged_before_release = "受け取られなかったページの取得に失敗" in caplog.text
+        release.set()
+        for _ in range(50):
+            if "受け取られなかったページの取得に失敗" in caplog.text:
+                break
+            time.sleep(0.1)
+
+        # 結果の確認
+        assert first == 1
+        assert not logged_before_release
+        assert "APIサーバーでエラーが発生しました" in caplog.text
+
+    def test__prefetch_pages_failure_1(self):
+        """ページの取得で発生したエラーは呼び出し元に送出する"""
+
+        def pages():
+            yield 1
+            raise APIError("APIサーバーでエラーが発生しました")
+
+        # テスト実行
+        prefetched = GrdmMapping()._prefetch_pages(pages())
+        first = next(prefetched)
+
+        # 結果の確認
+        assert first == 1
+        with pytest.raises(APIError):
+            next(prefetched)
+
+    def test__find_paged_properties_2(self):
+        """(正常系テスト)RFのマッピング定義ではメンバー情報のプロパティをすべてページごとにマッピングできるテストケースです。"""
+
+        definition = DefinitionManager.get_and_filter_mapping_definition("RF", "GRDM")
+
+        # テスト実行
+        result = GrdmMapping()._find_paged_properties(definition, "member_info", "data")
+
+        # 結果の確認
+        assert result == [schema_property for schema_property, components in definition.items()
+                          if components.get("source") == "member_info"]
+
     def test__find_metadata_sources_1(self, read_test_mapping_definition):
         """(正常系テスト 7)マッピング定義にある全取得先を取得する場合のテストケースです。"""
 
@@ -380,10 +877,7 @@ class TestGrdmMapping():
         test_mapping_definition = read_test_mapping_definition["test__find_metadata_sources_1"]
 
         target_class = GrdmMapping()
-        # インスタンス変数にテスト用のマッピング定義を設定
-        target_class._mapping_definition = test_mapping_definition
-
-        metadata_sources = target_class._find_metadata_sources()
+        metadata_sources = target_class._find_metadata_sources(test_mapping_definition)
 
         assert Counter(metadata_sources) == Counter(expected_metadata_sources)
 
@@ -393,8 +887,7 @@ class TestGrdmMapping():
         test_mapping_definition = read_test_mapping_definition["test__find_metadata_sources_2"]
 
         target_class = GrdmMapping()
-        target_class._mapping_definition = test_mapping_definition
-        metadata_sources = target_class._find_metadata_sources()
+        metadata_sources = target_class._find_metadata_sources(test_mapping_definition)
 
         assert not metadata_sources
 
@@ -867,7 +1360,7 @@ class TestGrdmMapping():
             target_class._handle_list(
                 new_schema, sources, schema_property, components, schema_link_list, storage_keys, index, key)
 
-        assert e.value.args[0] == [f"st2と一致するストレージのキーが見つかりませんでした。({schema_property})"]
+        assert [str(detail) for detail in e.value.args[0]] == [f"st2と一致するストレージのキーが見つかりませんでした。({schema_property})"]
 
     def test__handle_list_2(self, read_test_source_data, read_test_components):
         """（異常系テスト）異なる複数のリスト内にキーが存在しないオブジェクトが存在する場合のテストケースです。"""
@@ -886,8 +1379,8 @@ class TestGrdmMapping():
             target_class._handle_list(
                 new_schema, sources, schema_property, components, schema_link_list, storage_keys, index, key)
 
-        assert e.value.args[0] == [f"st2と一致するストレージのキーが見つかりませんでした。({schema_property})",
-                                   f"st3と一致するストレージのキーが見つかりませんでした。({schema_property})"]
+        assert [str(detail) for detail in e.value.args[0]] == [f"st2と一致するストレージのキーが見つかりませんでした。({schema_property})",
+                                                                f"st3と一致するストレージのキーが見つかりませんでした。({schema_property})"]
 
     def test__handle_list_3(self, read_test_source_data, read_test_components):
         """（異常系テスト）マッピング定義の'list'で指定されたインデックスに対応するデータがストレージに存在しない場合のテストケースです。"""
@@ -1102,6 +1595,69 @@ class TestGrdmMapping():
 
         assert str(e.value) == f"type:{type}は有効な型ではありません。({schema_property})"
 
+    def test__add_property_8(self, read_test_new_schema, read_test_expected_schema):
+        """（正常系テスト）検証済みのマッピング定義の計算済みの値を用いる場合も、同じスキーマになるテストケースです。"""
+
+        cases = [
+            ("test__add_property_1", "sc1[].sc3", ["value2"], {}),
+            ("test__add_property_4", "sc1.sc2[]", ["value3", "value4"], {}),
+        ]
+        for name, schema_property, storage_data, schema_link_list in cases:
+            components = DefinitionCompiler.compile(
+                {schema_property: {"type": "string", "source": "member_info", "value": "st1"}})[schema_property]
+
+            # テスト実行
+            target_class = GrdmMapping()
+            new_schema = target_class._add_property(
+                read_test_new_schema[name], schema_property, "string", storage_data, schema_link_list,
+                plan=components.plan)
+
+            # 結果の確認
+            assert new_schema == read_test_expected_schema[name]
+
+    def test__add_property_9(self):
+        """（正常系テスト）検証済みのマッピング定義で、スキーマのリストの対応に従って項目を追加するテストケースです。"""
+
+        schema_property = "sc1[].sc2[].sc3"
+        components = DefinitionCompiler.compile(
+            {schema_property: {"type": "number", "source": "member_info", "value": "st1"}})[schema_property]
+        new_schema = {"sc1": [{"sc2": [{"sc3": 1}]}]}
+
+        # テスト実行
+        target_class = GrdmMapping()
+        new_schema = target_class._add_property(
+            new_schema, schema_property, "number", ["2"], {"sc1": 1, "sc1.sc2": 3}, plan=components.plan)
+
+        # 結果の確認
+        assert new_schema == {"sc1": [{"sc2": [{"sc3": 1}, {}, {"sc3": 2}]}]}
+
+    def test__add_property_10(self):
+        """（異常系テスト）検証済みのマッピング定義で、対応していないリストに複数の項目が存在する場合のテストケースです。"""
+
+        schema_property = "sc1[].sc3"
+        components = DefinitionCompiler.compile(
+            {schema_property: {"type": "string", "source": "member_info", "value": "st1"}})[schema_property]
+        new_schema = {"sc1": [{"sc3": "value1"}, {"sc3": "value2"}]}
+
+        # テスト実行・結果の確認
+        with pytest.raises(MappingDefinitionError) as e:
+            target_class = GrdmMapping()
+            target_class._add_property(new_schema, schema_property, "string", ["value3"], {}, plan=components.plan)
+
+        assert str(e.value) == f"マッピング定義に誤りがあります。({schema_property})"
+
+    def test__add_property_11(self):
+        """（異常系テスト）検証済みのマッピング定義で、データの型が変換できない場合のテストケースです。"""
+
+        schema_property = "sc1"
+        components = DefinitionCompiler.compile(
+            {schema_property: {"type": "boolean", "source": "member_info", "value": "st1"}})[schema_property]
+
+        # テスト実行・結果の確認
+        with pytest.raises(DataTypeError):
+            target_class = GrdmMapping()
+            target_class._add_property({}, schema_property, "boolean", [10], {}, plan=components.plan)
+
     def test__convert_data_type_1(self):
         """（正常系テスト）bool型のデータをstring型に変換する場合のテストケースです。"""
         data = [True, False]
@@ -1680,6 +2236,75 @@ class TestGrdmAccess():
         # 結果の確認
         assert actual == {}
 
+    def test_get_file_metadata_success_5(self, mocker):
+        """stream_file_metadataが有効な場合はマッピング定義が参照するパスの値のみを取得する"""
+
+        # モック化
+        api_res = read_json('tests/models/data/grdm_api_file_metadata_2.json')
+        mock_get = mocker.patch('requests.get', side_effect=lambda *args, stream=False, **kwargs: (
+            create_stream_response(200, api_res) if stream else create_mock_response(200, api_res)))
+        paths = GrdmMapping()._find_source_paths(
+            {"RF": DefinitionManager.get_and_filter_mapping_definition("RF", "GRDM")})["file_metadata"]
+
+        # テスト実行
+        instance = create_authorized_grdm_access()
+        instance._stream_file_metadata = True
+        actual = instance.get_file_metadata(paths=paths)
+        stream_kwargs = mock_get.call_args.kwargs
+        instance._stream_file_metadata = False
+        unpruned = instance.get_file_metadata(paths=paths)
+
+        # 結果の確認
+        assert actual == PrunedJsonParser.prune(api_res, paths)
+        assert actual != api_res
+        assert stream_kwargs["stream"] is True
+        assert "stream" not in mock_get.call_args.kwargs
+        assert unpruned == api_res
+
+    def test_get_file_metadata_success_7(self, mocker):
+        """レスポンスボディ全体を必要とするトランスポートでは、受信した後に参照するパスの値のみを残す"""
+
+        # モック化
+        api_res = read_json('tests/models/data/grdm_api_file_metadata_2.json')
+        mock_get = mocker.patch('requests.get', return_value=create_mock_response(200, api_res))
+        mock_parse = mocker.spy(PrunedJsonParser, "parse_bytes")
+        paths = GrdmMapping()._find_source_paths(
+            {"RF": DefinitionManager.get_and_filter_mapping_definition("RF", "GRDM")})["file_metadata"]
+
+        # テスト実行
+        instance = create_authorized_grdm_access()
+        instance._transport = CachingTransport()
+        instance._stream_file_metadata = True
+        actual = instance.get_file_metadata(paths=paths)
+
+        # 結果の確認
+        assert actual == PrunedJsonParser.prune(api_res, paths)
+        assert mock_parse.call_count == 1
+        assert "stream" not in mock_get.call_args.kwargs
+
+    def test_get_file_metadata_success_6(self):
+        """参照するパスの値のみを残したファイルメタデータからも同じマッピングの結果になる"""
+
+        from dg_mm.fake_grdm import make_file_metadata, make_member_info, make_project_info, make_project_metadata
+
+        source_data = {
+            "project_info": make_project_info("p1"),
+            "member_info": make_member_info("p1", 3),
+            "project_metadata": make_project_metadata("p1", 1),
+            "file_metadata": make_file_metadata("p1", 30),
+        }
+        definition = DefinitionManager.get_and_filter_mapping_definition("RF", "GRDM")
+        paths = GrdmMapping()._find_source_paths({"RF": definition})["file_metadata"]
+        pruned_data = dict(source_data, file_metadata=PrunedJsonParser.prune(source_data["file_metadata"], paths))
+
+        # テスト実行
+        expected = GrdmMapping().mapping_metadata_from_sources("RF", source_data)
+        actual = GrdmMapping().mapping_metadata_from_sources("RF", pruned_data)
+
+        # 結果の確認
+        assert actual == expected
+        assert len(json.dumps(pruned_data["file_metadata"])) < len(json.dumps(source_data["file_metadata"]))
+
     def test_get_file_metadata_failure_1(self):
         """認証前に関数実行"""
 
@@ -1826,6 +2451,27 @@ class TestGrdmAccess():
         assert len(actual["data"]) == 11
         assert mock_obj.call_count == 2
 
+    def test_iter_member_info_success_1(self, mocker):
+        """次のページは、受け取ったページの処理を終えて次を要求したときに取得する"""
+
+        # モック化
+        api_res1 = read_json('tests/models/data/grdm_api_contributors_3.json')  # メンバー情報が11件登録されている場合の1回目のレスポンス
+        api_res2 = read_json('tests/models/data/grdm_api_contributors_4.json')  # メンバー情報が11件登録されている場合の2回目のレスポンス
+        mock_get = mocker.patch(
+            'requests.get', side_effect=[create_mock_response(200, api_res1), create_mock_response(200, api_res2)])
+
+        # テスト実行
+        instance = create_authorized_grdm_access()
+        pages = instance.iter_member_info()
+        first = next(pages)
+        call_count = mock_get.call_count
+        rest = list(pages)
+
+        # 結果の確認
+        assert first == api_res1
+        assert call_count == 1
+        assert rest == [api_res2]
+
     def test_get_member_info_failure_1(self):
         """認証前に関数実行"""
 
@@ -1883,3 +2529,166 @@ class TestGrdmAccess():
 
         # 結果の確認
         assert mock_obj.call_count == max_requests
+
+    def test_set_deadline_success_1(self):
+        """制限時間を指定しない場合は設定ファイルの値(無制限)が使われる"""
+
+        # テスト実行
+        target_class = GrdmAccess()
+        target_class.set_deadline()
+
+        # 結果の確認
+        assert target_class._deadline is None
+        assert target_class._get_timeout() == (target_class._connect_timeout, target_class._read_timeout)
+
+    def test_set_deadline_success_2(self, mocker):
+        """制限時間を指定した場合はタイムアウトが残り時間以下になる"""
+
+        # モック化
+        mocker.patch('dg_mm.models.grdm.time.monotonic', side_effect=[100.0, 104.0])
+
+        # テスト実行
+        target_class = GrdmAccess()
+        target_class.set_deadline(5)
+        connect_timeout, read_timeout = target_class._get_timeout()
+
+        # 結果の確認
+        assert connect_timeout == min(target_class._connect_timeout, 1.0)
+        assert read_timeout == 1.0
+
+    def test_set_deadline_failure_1(self, mocker):
+        """制限時間を超えた後はリクエストを送信せずにエラーとなる"""
+
+        # モック化
+        mocker.patch('dg_mm.models.grdm.time.monotonic', side_effect=[100.0, 106.0])
+        mock_obj = mocker.patch('requests.get')
+
+        # テスト実行
+        instance = create_authorized_grdm_access()
+        instance.set_deadline(5)
+        with pytest.raises(APIError, match="APIリクエストの制限時間を超えました"):
+            instance.get_project_info()
+
+        # 結果の確認
+        assert mock_obj.call_count == 0
+
+    def test__get_timeout_success_1(self, mocker):
+        """接続と読み込みのタイムアウトが個別にリクエストに渡される"""
+
+        # モック化
+        api_res = read_json('tests/models/data/grdm_api_node_1.json')
+        mock_obj = mocker.patch('requests.get', return_value=create_mock_response(200, api_res))
+
+        # テスト実行
+        instance = create_authorized_grdm_access()
+        instance._connect_timeout = 3.0
+        instance._read_timeout = 30.0
+        instance.get_project_info()
+
+        # 結果の確認
+        assert mock_obj.call_args.kwargs["timeout"] == (3.0, 30.0)
+
+    def test__check_token_valid_cache_1(self, mocker):
+        """有効と確認したトークンは再度確認のリクエストを送信しない"""
+
+        # モック化
+        api_res = read_json('tests/models/data/grdm_api_profile_1.json')
+        mock_obj = mocker.patch('requests.get', return_value=create_mock_response(200, api_res))
+
+        # テスト実行
+        for _ in range(2):
+            target_class = GrdmAccess()
+            target_class._token = "valid_token"
+            assert target_class._check_token_valid() == True
+
+        # 結果の確認
+        assert mock_obj.call_count == 1
+        assert "valid_token" not in str(GrdmAccess._token_cache)
+
+    def test__check_token_valid_cache_2(self, mocker):
+        """キャッシュの有効期限が切れた場合は再度確認する"""
+
+        # モック化
+        api_res = read_json('tests/models/data/grdm_api_profile_1.json')
+        mock_obj = mocker.patch('requests.get', return_value=create_mock_response(200, api_res))
+        mocker.patch('dg_mm.models.grdm.time.monotonic', side_effect=[0.0, 1000.0, 1000.0])
+
+        # テスト実行
+        for _ in range(2):
+            target_class = GrdmAccess()
+            target_class._token = "valid_token"
+            target_class._check_token_valid()
+
+        # 結果の確認
+        assert mock_obj.call_count == 2
+
+    def test__check_token_valid_cache_3(self, mocker):
+        """401が返った場合はキャッシュが破棄される"""
+
+        # モック化
+        api_res = read_json('tests/models/data/grdm_api_profile_1.json')
+        mocker.patch('requests.get', return_value=create_mock_response(200, api_res))
+
+        instance = create_authorized_grdm_access()
+        instance._check_token_valid()
+        assert instance._is_token_cached()
+
+        mocker.patch('requests.get', return_value=create_mock_response(401))
+
+        # テスト実行
+        with pytest.raises(requests.HTTPError):
+            instance.get_project_info()
+
+        # 結果の確認
+        assert not instance._is_token_cached()
+
+    def test__get_metrics_1(self, mocker):
+        """リクエストの数、レスポンスの大きさ、JSONの変換時間が記録される"""
+
+        # モック化
+        response = create_mock_response(200, {"data": {}})
+        response._content = b'{"data": {}}'
+        mocker.patch('requests.get', return_value=response)
+        instance = create_authorized_grdm_access()
+        requests_before = metrics.GRDM_REQUESTS.get(endpoint="project_info", status=200)
+        bytes_before = metrics.GRDM_RESPONSE_BYTES.get(endpoint="project_info")
+        decode_before = metrics.GRDM_JSON_DECODE_SECONDS.get(endpoint="project_info")
+
+        # テスト実行
+        instance.get_project_info()
+
+        # 結果の確認
+        assert metrics.GRDM_REQUESTS.get(endpoint="project_info", status=200) == requests_before + 1
+        assert metrics.GRDM_RESPONSE_BYTES.get(endpoint="project_info")["sum"] == bytes_before["sum"] + 12
+        assert metrics.GRDM_JSON_DECODE_SECONDS.get(endpoint="project_info")["count"] == decode_before["count"] + 1
+        assert instance._request_count == 1
+
+    def test__get_failure_1(self, mocker):
+        """接続に失敗した場合はAPIErrorになり、エラーの数が記録される"""
+
+        # モック化
+        mocker.patch('requests.get', side_effect=requests.exceptions.ConnectionError)
+        instance = create_authorized_grdm_access()
+        before = metrics.GRDM_REQUESTS.get(endpoint="project_info", status="error")
+
+        # テスト実行
+        with pytest.raises(APIError, match="APIリクエストの送信に失敗しました"):
+            instance.get_project_info()
+
+        # 結果の確認
+        assert metrics.GRDM_REQUESTS.get(endpoint="project_info", status="error") == before + 1
+
+    def test__get_metrics_2(self, mocker):
+        """タイムアウトした場合もリクエストの数が記録される"""
+
+        # モック化
+        mocker.patch('requests.get', side_effect=requests.exceptions.Timeout)
+        instance = create_authorized_grdm_access()
+        before = metrics.GRDM_REQUESTS.get(endpoint="file_metadata", status="timeout")
+
+        # テスト実行
+        with pytest.raises(APIError):
+            instance.get_file_metadata()
+
+        # 結果の確認
+        assert metrics.GRDM_REQUESTS.get(endpoint="file_metadata", status="timeout") == before + 1
@@ -0,0 +1,155 @@
+"""json_patch.pyをテストするためのモジュールです。"""
+import copy
+import json
+import random
+
+import pytest
+
+from dg_mm.errors import DataFormatError
+from dg_mm.fake_grdm import make_file_metadata, make_member_info, make_project_info, make_project_metadata
+from dg_mm.models.grdm import GrdmMapping
+from dg_mm.models.json_patch import JsonPatch
+
+
+class TestJsonPatch():
+    def test_diff_success_1(self):
+        """(正常系テスト)オブジェクトのキーの追加、削除、値の変更を操作にする"""
+
+        source = {"name": "a", "url": "u", "field": {"code": "1", "name": "x"}}
+        target = {"name": "a", "field": {"code": "2", "name": "x"}, "description": "d"}
+
+        # テスト実行
+        patch = JsonPatch.diff(source, target)
+
+        # 結果の確認
+        assert patch == [
+            {"op": "remove", "path": "/url"},
+            {"op": "replace", "path": "/field/code", "value": "2"},
+            {"op": "add", "path": "/description", "value": "d"},
+        ]
+        assert JsonPatch.apply(source, patch) == target
+
+    def test_diff_success_2(self):
+        """(正常系テスト)リストは一致する要素を保ったまま、追加、削除した要素のみを操作にする"""
+
+        source = {"researcher": [{"name": "r1"}, {"name": "r2"}, {"name": "r3"}]}
+        target = {"researcher": [{"name": "r0"}, {"name": "r1"}, {"name": "r3"}]}
+
+        # テスト実行
+        patch = JsonPatch.diff(source, target)
+
+        # 結果の確認
+        assert patch == [
+            {"op": "add", "path": "/researcher/0", "value": {"name": "r0"}},
+            {"op": "remove", "path": "/researcher/2"},
+        ]
+        assert JsonPatch.apply(source, patch) == target
+
+    def test_diff_success_3(self):
+        """(正常系テスト)リストの要素の一部が変わった場合は要素の中の差分を操作にする"""
+
+        source = {"funding": [{"name": "f1", "funder": [{"name": "n1"}], "japanGrantNumber": "JP1"}]}
+        target = {"funding": [{"name": "f1", "funder": [{"name": "n1"}], "japanGrantNumber": "JP2"}]}
+
+        # テスト実行
+        patch = JsonPatch.diff(source, target)
+
+        # 結果の確認
+        assert patch == [{"op": "replace", "path": "/funding/0/japanGrantNumber", "value": "JP2"}]
+
+    def test_diff_success_4(self):
+        """(正常系テスト)要素の中の差分が要素全体より大きい場合は要素全体を置き換える"""
+
+        source = [{"a": 1, "b": 2, "c": 3}]
+        target = [{"x": 1}]
+
+        # テスト実行
+        patch = JsonPatch.diff(source, target)
+
+        # 結果の確認
+        assert patch == [{"op": "replace", "path": "/0", "value": {"x": 1}}]
+
+    def test_diff_success_5(self):
+        """(正常系テスト)前回の値がない場合と、差分がない場合"""
+
+        # テスト実行・結果の確認
+        assert JsonPatch.diff(None, {"name": "a"}) == [{"op": "add", "path": "", "value": {"name": "a"}}]
+        assert JsonPatch.diff({"name": "a", "list": [1, True]}, {"name": "a", "list": [1, True]}) == []
+
+    def test_diff_success_6(self):
+        """(正常系テスト)型が異なる値と、JSON Pointerで特殊な文字を含むキー"""
+
+        source = {"flag": 1, "a/b": "x", "c~d": None}
+        target = {"flag": True, "a/b": "y", "c~d": None}
+
+        # テスト実行
+        patch = JsonPatch.diff(source, target)
+
+        # 結果の確認
+        assert patch == [
+            {"op": "replace", "path": "/flag", "value": True},
+            {"op": "replace", "path": "/a~1b", "value": "y"},
+        ]
+        assert JsonPatch.apply(source, patch) == target
+
+    def test_diff_success_7(self):
+        """(正常系テスト)無作為に変更したリストに適用すると変更後の値になる"""
+
+        generator = random.Random(0)
+        for _ in range(500):
+            source = [{"id": generator.randint(0, 5)} for _ in range(generator.randint(0, 8))]
+            target = [{"id": generator.randint(0, 5), "x": [1]} if generator.random() < 0.3
+                      else {"id": generator.randint(0, 5)} for _ in range(generator.randint(0, 8))]
+
+            # テスト実行・結果の確認
+            assert JsonPatch.apply(source, JsonPatch.diff(source, target)) == target
+
+    def test_diff_success_8(self):
+        """(正常系テスト)RFのメタデータの一部が変わった場合の差分はメタデータ全体より十分に小さい"""
+
+        source_data = {
+            "project_info": make_project_info("p1"),
+            "member_info": make_member_info("p1", 30),
+            "project_metadata": make_project_metadata("p1", 3),
+            "file_metadata": make_file_metadata("p1", 30),
+        }
+        source = GrdmMapping().mapping_metadata_from_sources("RF", source_data)
+        target = copy.deepcopy(source)
+        target["researcher"][3]["name"] = "changed"
+        del target["funding"][0]
+
+        # テスト実行
+        patch = JsonPatch.diff(source, target)
+
+        # 結果の確認
+        assert JsonPatch.apply(source, patch) == target
+        assert len(json.dumps(patch)) * 10 < len(json.dumps(target))
+
+    def test_apply_success_1(self):
+        """(正常系テスト)適用先の値は変更しない"""
+
+        document = {"list": [1, 2]}
+
+        # テスト実行
+        result = JsonPatch.apply(document, [{"op": "add", "path": "/list/-", "value": 3}])
+
+        # 結果の確認
+        assert result == {"list": [1, 2, 3]}
+        assert document == {"list": [1, 2]}
+
+    @pytest.mark.parametrize("patch, message", [
+        ([{"op": "move", "from": "/a", "path": "/b"}], "対応していないJSON Patchの操作です。(move)"),
+        ([{"op": "remove", "path": "/missing"}], "JSON Patchのパスに誤りがあります。(/missing)"),
+        ([{"op": "replace", "path": "/list/5", "value": 1}], "JSON Patchのパスに誤りがあります。(/list/5)"),
+        ([{"op": "add", "path": "/list/-1", "value": 1}], "JSON Patchのパスに誤りがあります。(/list/-1)"),
+        ([{"op": "add", "path": "list", "value": 1}], "JSON Patchのパスに誤りがあります。(list)"),
+    ])
+    def test_apply_failure_1(self, patch, message):
+        """(異常系テスト)対応していない操作と、存在しないパス"""
+
+        # テスト実行
+        with pytest.raises(DataFormatError) as e:
+            JsonPatch.apply({"a": 1, "list": [1]}, patch)
+
+        # 結果の確認
+        assert str(e.value) == message
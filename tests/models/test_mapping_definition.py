@@ -1,4 +1,7 @@
 """mappyng_definition.pyをテストするためのモジュールです。"""
+import json
+import os
+
 import pytest
 
 from dg_mm.errors import (MappingDefinitionError, KeyNotFoundError, MappingDefinitionNotFoundError)
@@ -167,7 +170,7 @@ class TestDefinitionManager():
     def test__read_mapping_definition_1(self, create_test_definition):
         """(正常系テスト 43)Json形式のマッピング定義ファイルを読み込むテストケースです。"""
         # 検証用の期待されるマッピング定義
-        expected_schema = {"test_property": {"test_definition": "value"}}
+        expected_schema = {"test_property": {"type": "string", "source": "test_source", "value": "value"}}
 
         # テストを実行
         target_class = DefinitionManager()
@@ -175,6 +178,7 @@ class TestDefinitionManager():
 
         # 検証
         assert mapping_definition == expected_schema
+        assert mapping_definition["test_property"].plan.storage_keys == ("value",)
 
     def test__read_mapping_definition_2(self):
         """(異常系テスト 44)指定したスキーマ、ストレージに対応したファイルが存在しない場合のテストケースです。"""
@@ -201,3 +205,144 @@ class TestDefinitionManager():
             target_class._read_mapping_definition(*create_invalid_test_definition)
 
         assert str(e.value) == "マッピング定義ファイルの読み込みに失敗しました。"
+
+    def test__read_mapping_definition_4(self, create_test_definition):
+        """キャッシュが有効な場合は、ファイルが更新されるまで読み込んだマッピング定義を再利用するテストケースです。"""
+        schema, storage = create_test_definition
+        path = f'dg_mm/data/mapping/{storage}_{schema}_mapping.json'
+
+        DefinitionManager.enable_cache()
+        try:
+            # テストを実行
+            first = DefinitionManager._read_mapping_definition(schema, storage)
+            second = DefinitionManager._read_mapping_definition(schema, storage)
+            with open(path, mode='w') as f:
+                json.dump({"updated_property": {"type": "number", "source": "test_source", "value": "updated_value"}}, f)
+            third = DefinitionManager._read_mapping_definition(schema, storage)
+        finally:
+            DefinitionManager.enable_cache(False)
+
+        # 検証
+        assert first is second
+        assert third == {"updated_property": {"type": "number", "source": "test_source", "value": "updated_value"}}
+        assert DefinitionManager._cache is None
+
+    def test__read_mapping_definition_5(self, create_test_definition):
+        """マッピング定義に誤りがある場合は、すべての誤りを示して読み込みを中止するテストケースです。"""
+        schema, storage = create_test_definition
+        path = f'dg_mm/data/mapping/{storage}_{schema}_mapping.json'
+        with open(path, mode='w') as f:
+            json.dump({
+                "a.b": {"type": "text", "source": "test_source", "value": "value"},
+                "a[].c": {"type": "string", "source": "test_source", "value": "value"},
+            }, f)
+
+        # テストを実行
+        with pytest.raises(MappingDefinitionError) as e:
+            DefinitionManager._read_mapping_definition(schema, storage)
+
+        # 検証
+        assert str(e.value) == (
+            "マッピング定義に2件の誤りがあります。:type:textは有効な型ではありません。(a.b), "
+            "aのデータ構造がプロパティ:a.bと異なっています。(a[].c)")
+
+
+@pytest.fixture
+def search_path(tmp_path, monkeypatch):
+    """マッピング定義ファイルを探すフォルダを2つ作成し、設定を元に戻します。"""
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    monkeypatch.delenv(DefinitionManager.SEARCH_PATH_ENV, raising=False)
+    yield first, second
+    DefinitionManager.configure_search_path(None)
+
+
+def write_definition(directory, name, type="string", mtime_ns=None):
+    """マッピング定義ファイルを作成し、フォルダの更新日時を設定します。"""
+    path = directory / f"{name}_mapping.json"
+    path.write_text(json.dumps({"p": {"type": type}}), encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(directory, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+class TestDefinitionSearchPath():
+    """マッピング定義ファイルを探すフォルダと索引のテストを行うクラスです。"""
+
+    def test_find_definition_1(self, search_path, monkeypatch):
+        """設定したフォルダ、環境変数のフォルダ、パッケージ内のフォルダの順に探すテストケースです。"""
+        first, second = search_path
+        write_definition(first, "GRDM_RF", "number")
+        second_path = write_definition(second, "GRDM_PRIVATE")
+        write_definition(second, "GRDM_OTHER")
+        monkeypatch.setenv(DefinitionManager.SEARCH_PATH_ENV, os.pathsep.join([str(second), ""]))
+        DefinitionManager.configure_search_path([str(first)])
+
+        # テストを実行
+        mapping_definition = DefinitionManager._read_mapping_definition("RF", "GRDM")
+        private_path = DefinitionManager.find_definition("PRIVATE", "GRDM")
+        definitions = DefinitionManager.list_definitions()
+
+        # 検証
+        assert mapping_definition == {"p": {"type": "number"}}
+        assert private_path == second_path
+        assert DefinitionManager.get_search_path()[:2] == [str(first), str(second)]
+        assert {"GRDM_RF", "GRDM_PRIVATE", "GRDM_OTHER"} <= set(definitions)
+        assert definitions["GRDM_RF"] == str(first / "GRDM_RF_mapping.json")
+
+    def test_find_definition_2(self, search_path, mocker):
+        """フォルダの更新日時が変わるまで、フォルダを走査し直さないテストケースです。"""
+        first, _ = search_path
+        write_definition(first, "GRDM_A", mtime_ns=10 ** 18)
+        DefinitionManager.configure_search_path([str(first)])
+        # パッケージ内のフォルダの更新日時に関わらず、索引を再利用するようにする
+        mocker.patch.object(DefinitionManager, "_RACY_NS", 0)
+        mock__scan = mocker.spy(DefinitionManager, "_scan")
+
+        # テストを実行
+        found_a = [DefinitionManager.find_definition("A", "GRDM") for _ in range(3)]
+        scans_before = mock__scan.call_count
+        write_definition(first, "GRDM_B", mtime_ns=10 ** 18 + 1)
+        found_b = DefinitionManager.find_definition("B", "GRDM")
+
+        # 検証
+        assert found_a == [str(first / "GRDM_A_mapping.json")] * 3
+        assert scans_before == len(DefinitionManager.get_search_path())
+        assert found_b == str(first / "GRDM_B_mapping.json")
+        assert mock__scan.call_count == scans_before * 2
+
+    def test_find_definition_3(self, search_path, mocker):
+        """走査の直前に更新されたフォルダは、次の検索で走査し直すテストケースです。"""
+        first, _ = search_path
+        DefinitionManager.configure_search_path([str(first)])
+
+        # テストを実行
+        missing = DefinitionManager.find_definition("A", "GRDM")
+        # 更新日時の精度が粗く、フォルダの更新日時が変わらない場合
+        stat = os.stat(first)
+        write_definition(first, "GRDM_A")
+        os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        found = DefinitionManager.find_definition("A", "GRDM")
+
+        # 検証
+        assert missing is None
+        assert found == str(first / "GRDM_A_mapping.json")
+
+    def test_read_mapping_definition_1(self, search_path):
+        """索引の作成後にファイルが削除された場合のテストケースです。"""
+        first, _ = search_path
+        path = write_definition(first, "GRDM_A", mtime_ns=10 ** 18)
+        DefinitionManager.configure_search_path([str(first)])
+        DefinitionManager.find_definition("A", "GRDM")
+        os.remove(path)
+        os.utime(first, ns=(10 ** 18, 10 ** 18))
+
+        # テストを実行
+        with pytest.raises(MappingDefinitionNotFoundError) as e:
+            DefinitionManager._read_mapping_definition("A", "GRDM")
+
+        # 検証
+        assert str(e.value) == "マッピング定義ファイルが見つかりません。"
+        assert DefinitionManager._index is None
@@ -0,0 +1,90 @@
+"""mapping_errors.pyをテストするためのモジュールです。"""
+from dg_mm.errors import DataTypeError, KeyNotFoundError
+from dg_mm.models.mapping_errors import (
+    DATA_TYPE,
+    KEY_NOT_FOUND,
+    ErrorDetail,
+    ErrorSummary,
+    MappingErrorCollector,
+)
+
+
+class TestErrorDetail():
+    def test___str___1(self):
+        """キーの不一致のメッセージが作成される"""
+
+        detail = ErrorDetail.key_not_found("st1", "sc1[].sc2")
+
+        assert str(KeyNotFoundError(detail)) == "st1と一致するストレージのキーが見つかりませんでした。(sc1[].sc2)"
+
+    def test___str___2(self):
+        """型変換の失敗のメッセージには上限までの値のみが含まれる"""
+
+        detail = ErrorDetail.data_type("number", [f"value{i}" for i in range(10000)], "sc1")
+
+        assert len(detail.samples) == ErrorDetail.MAX_SAMPLES + 1
+        assert str(DataTypeError(detail)) == (
+            "型変換エラー：['value0', 'value1', 'value2', 'value3', 'value4', ...]をnumberに変換できません。(sc1)")
+
+
+class TestMappingErrorCollector():
+    def test_add_1(self):
+        """同じプロパティとキーのエラーは件数として集計される"""
+
+        errors = MappingErrorCollector()
+        for _ in range(10000):
+            errors.add(ErrorDetail.key_not_found("st1", "sc1[].sc2"), KEY_NOT_FOUND)
+        errors.add(ErrorDetail.key_not_found("st2", "sc1[].sc3"), KEY_NOT_FOUND)
+        errors.add(ErrorDetail.data_type("number", ["a"], "sc4"), DATA_TYPE)
+        errors.add(ErrorDetail.data_type("number", ["b"], "sc4"), DATA_TYPE)
+
+        assert len(errors) == 3
+        assert errors.counts() == {
+            ("sc1[].sc2", KEY_NOT_FOUND): 10000,
+            ("sc1[].sc3", KEY_NOT_FOUND): 1,
+            ("sc4", DATA_TYPE): 2,
+        }
+        assert errors.details(DATA_TYPE)[0].samples == ["a", "b"]
+
+    def test_add_2(self):
+        """メッセージの文字列とそのリスト、集計済みのエラーを集計できる"""
+
+        inner = MappingErrorCollector()
+        inner.add(ErrorDetail.key_not_found("st1", "sc1"), KEY_NOT_FOUND)
+
+        errors = MappingErrorCollector()
+        errors.add(["message1", "message2"], KEY_NOT_FOUND)
+        errors.add("message1", KEY_NOT_FOUND)
+        errors.add("message3", DATA_TYPE)
+        errors.add(inner, KEY_NOT_FOUND)
+
+        assert [str(detail) for detail in errors.details(KEY_NOT_FOUND)] == [
+            "message1", "message2", "st1と一致するストレージのキーが見つかりませんでした。(sc1)"]
+        assert [str(detail) for detail in errors.details(DATA_TYPE)] == ["message3"]
+
+
+class TestErrorSummary():
+    def test___str___1(self):
+        """件数が複数のエラーは件数と共に表示される"""
+
+        errors = MappingErrorCollector()
+        for _ in range(3):
+            errors.add(ErrorDetail.key_not_found("st1", "sc1[].sc2"), KEY_NOT_FOUND)
+        errors.add("message", DATA_TYPE)
+
+        assert str(ErrorSummary(errors)) == (
+            "キーの不一致が確認されました。:['st1と一致するストレージのキーが見つかりませんでした。(sc1[].sc2)(全3件)'], "
+            "データの変換に失敗しました。：['message']")
+
+    def test___str___2(self):
+        """表示するメッセージの数には上限がある"""
+
+        errors = MappingErrorCollector()
+        for i in range(ErrorSummary.MAX_MESSAGES + 5):
+            errors.add(ErrorDetail.data_type("number", ["a"], f"sc{i}"), DATA_TYPE)
+
+        message = str(ErrorSummary(errors))
+
+        assert message.startswith("データの変換に失敗しました。：[\"型変換エラー：['a']をnumberに変換できません。(sc0)\"")
+        assert message.endswith(", ...他5種類]")
+        assert message.count("型変換エラー") == ErrorSummary.MAX_MESSAGES
@@ -54,6 +54,21 @@ class TestMetadataManager:
         mock_obj.assert_called_with(schema="RF", token="valid", project_id="valid",
                                     filter_properties=["valid_property"], project_metadata_id=None)
 
+    def test_get_metadata_success_3(self, mocker):
+        """リクエスト全体の制限時間を指定"""
+
+        # モック化
+        mock_obj = mocker.patch("dg_mm.models.grdm.GrdmMapping.mapping_metadata", return_value={"key: value"})
+
+        # テスト実行
+        target_class = MetadataManager()
+        result = target_class.get_metadata("RF", "GRDM", token="valid", id="valid", deadline=1.5)
+
+        # 結果の確認
+        assert result == {"key: value"}
+        mock_obj.assert_called_with(schema="RF", token="valid", project_id="valid",
+                                    filter_properties=None, project_metadata_id=None, deadline=1.5)
+
     def test_get_metadata_failure_1(self, mocker):
         """対応していないスキーマを指定"""
 
@@ -152,3 +167,107 @@ class TestMetadataManager:
         target_class = MetadataManager()
         with pytest.raises(KeyNotFoundError):
             target_class.get_metadata(**param)
+
+    def test_add_span_hook_success_1(self, mocker):
+        """登録したフックにマッピング中のスパンが通知される"""
+
+        # モック化
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication")
+        mocker.patch("dg_mm.models.grdm.GrdmMapping._find_metadata_sources", return_value=["project_info"])
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.get_project_info", return_value={})
+
+        # テスト実行
+        spans = []
+        target_class = MetadataManager()
+        target_class.add_span_hook(lambda name, duration, attributes: spans.append((name, attributes)))
+        target_class.get_metadata("RF", "GRDM", token="valid", id="valid", filter_properties=["name"])
+
+        # 結果の確認
+        assert [name for name, _ in spans] == [
+            "check_authentication", "definition_load", "definition_filter", "fetch", "extraction", "unmapped_fill"]
+        assert spans[3][1] == {"source": "project_info"}
+
+    def test_remove_span_hook_success_1(self, mocker):
+        """削除したフックには通知されない"""
+
+        # モック化
+        mocker.patch("dg_mm.models.grdm.GrdmMapping.mapping_metadata", return_value={})
+
+        # テスト実行
+        spans = []
+        hook = lambda name, duration, attributes: spans.append(name)
+        target_class = MetadataManager()
+        target_class.add_span_hook(hook)
+        target_class.remove_span_hook(hook)
+        target_class.get_metadata("RF", "GRDM", token="valid", id="valid")
+
+        # 結果の確認
+        assert spans == []
+
+    def test_get_metrics_success_1(self, mocker):
+        """マッピングの実行結果がメトリクスに含まれる"""
+
+        # モック化
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.check_authentication")
+        mocker.patch("dg_mm.models.grdm.GrdmMapping._find_metadata_sources", return_value=["project_info"])
+        mocker.patch("dg_mm.models.grdm.GrdmAccess.get_project_info", return_value={})
+
+        # テスト実行
+        target_class = MetadataManager()
+        target_class.get_metadata("RF", "GRDM", token="valid", id="valid", filter_properties=["name"])
+        snapshot = MetadataManager.get_metrics()
+
+        # 結果の確認
+        assert snapshot["dg_mm_mappings_total"]["type"] == "counter"
+        assert {"labels": {"result": "success"}, "value": mocker.ANY} in snapshot["dg_mm_mappings_total"]["values"]
+
+    def test_export_metrics_success_1(self, tmp_path):
+        """Prometheusのテキスト形式でファイルに出力される"""
+
+        # テスト実行
+        path = tmp_path / "metrics.prom"
+        text = MetadataManager.export_metrics(str(path))
+
+        # 結果の確認
+        assert "# TYPE dg_mm_grdm_requests_total counter" in text
+        assert path.read_text(encoding='utf-8') == text
+
+    def test_get_metadata_for_schemas_success_1(self, mocker):
+        """スキーマの名称ごとのメタデータが取得される"""
+
+        # モック化
+        mock_obj = mocker.patch("dg_mm.models.grdm.GrdmMapping.mapping_metadata_for_schemas",
+                                return_value={"RF": {}, "RF2": {}})
+
+        # テスト実行
+        target_class = MetadataManager()
+        result = target_class.get_metadata_for_schemas(["RF", "RF2"], "GRDM", token="valid", id="valid")
+
+        # 結果の確認
+        assert result == {"RF": {}, "RF2": {}}
+        mock_obj.assert_called_once_with(
+            schemas=["RF", "RF2"], token="valid", project_id="valid", filter_properties=None, project_metadata_id=None)
+
+    def test_get_metadata_for_schemas_error_1(self):
+        """対応していないストレージが指定された場合はエラーになる"""
+
+        # テスト実行
+        target_class = MetadataManager()
+        with pytest.raises(InvalidStorageError):
+            target_class.get_metadata_for_schemas(["RF"], "invalid_storage")
+
+    def test_get_metadata_from_sources_success_1(self, mocker):
+        """保存済みのデータのパスを指定した場合は読み込んだデータでマッピングされる"""
+
+        # モック化
+        source_data = {"project_info": {}}
+        mocker.patch("dg_mm.models.source_archive.SourceArchive.load", return_value=source_data)
+        mock_obj = mocker.patch("dg_mm.models.grdm.GrdmMapping.mapping_metadata_from_sources", return_value={})
+
+        # テスト実行
+        target_class = MetadataManager()
+        result = target_class.get_metadata_from_sources("RF", "GRDM", "sources", filter_properties=["name"])
+
+        # 結果の確認
+        assert result == {}
+        mock_obj.assert_called_once_with("RF", source_data, ["name"])
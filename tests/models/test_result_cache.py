@@ -0,0 +1,163 @@
+"""result_cache.pyをテストするためのモジュールです。"""
+import os
+
+import pytest
+
+from dg_mm import metrics
+from dg_mm.models.result_cache import BaseResultCache, DiskResultCache, MemoryResultCache, create_result_cache
+
+
+class TestBaseResultCache():
+    def test_init_failure_1(self):
+        """(異常系テスト)保持の処理を実装していないキャッシュは作成できない"""
+
+        class IncompleteResultCache(BaseResultCache):
+            def _load(self, key):
+                return None
+
+        # テスト実行・結果の確認
+        with pytest.raises(TypeError):
+            IncompleteResultCache(max_bytes=1024)
+
+
+class TestMemoryResultCache():
+    def test_get_success_1(self):
+        """(正常系テスト)保持した結果を取得し、参照結果を統計に記録する"""
+
+        target_class = MemoryResultCache()
+
+        # テスト実行
+        missing = target_class.get("key1")
+        target_class.put("key1", {"name": "プロジェクト", "member": ["m1"]})
+        result = target_class.get("key1")
+
+        # 結果の確認
+        assert missing is None
+        assert result == {"name": "プロジェクト", "member": ["m1"]}
+        stats = target_class.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["entries"] == 1
+
+    def test_get_success_2(self):
+        """(正常系テスト)取り出した結果を変更してもキャッシュには影響しない"""
+
+        target_class = MemoryResultCache()
+        target_class.put("key1", {"member": ["m1"]})
+
+        # テスト実行
+        target_class.get("key1")["member"].append("m2")
+
+        # 結果の確認
+        assert target_class.get("key1") == {"member": ["m1"]}
+
+    def test_get_success_3(self, mocker):
+        """(正常系テスト)参照結果をメトリクスに記録する"""
+
+        # モック化
+        mock_inc = mocker.patch.object(metrics.RESULT_CACHE, "inc")
+        target_class = MemoryResultCache()
+        target_class.put("key1", {})
+
+        # テスト実行
+        target_class.get("key1")
+        target_class.get("key2")
+
+        # 結果の確認
+        assert mock_inc.call_args_list == [mocker.call(result="hit"), mocker.call(result="miss")]
+
+    def test_put_success_1(self):
+        """(正常系テスト)上限を超えた場合は最も古く参照された結果から破棄する"""
+
+        target_class = MemoryResultCache(max_bytes=40)
+        target_class.put("key1", {"value": "aaaa"})
+        target_class.put("key2", {"value": "bbbb"})
+
+        # テスト実行
+        target_class.get("key1")
+        target_class.put("key3", {"value": "cccc"})
+
+        # 結果の確認
+        assert target_class.get("key1") == {"value": "aaaa"}
+        assert target_class.get("key2") is None
+        assert target_class.get("key3") == {"value": "cccc"}
+        assert target_class.stats()["bytes"] <= 40
+
+    def test_put_success_2(self):
+        """(正常系テスト)上限より大きい結果は保持しない"""
+
+        target_class = MemoryResultCache(max_bytes=10)
+
+        # テスト実行
+        target_class.put("key1", {"value": "too large"})
+
+        # 結果の確認
+        assert target_class.get("key1") is None
+        assert target_class.stats()["entries"] == 0
+
+
+class TestDiskResultCache():
+    def test_get_success_1(self, tmp_path):
+        """(正常系テスト)別のインスタンスが保存した結果を取得する"""
+
+        DiskResultCache(str(tmp_path)).put("abcdef", {"name": "プロジェクト"})
+
+        # テスト実行
+        target_class = DiskResultCache(str(tmp_path))
+        result = target_class.get("abcdef")
+
+        # 結果の確認
+        assert result == {"name": "プロジェクト"}
+        assert os.path.isfile(tmp_path / "ab" / "abcdef.json")
+        stats = target_class.stats()
+        assert stats["hits"] == 1
+        assert stats["entries"] == 1
+
+    def test_get_success_2(self, tmp_path):
+        """(正常系テスト)ファイルが削除された結果は保持していないものとして扱う"""
+
+        target_class = DiskResultCache(str(tmp_path))
+        target_class.put("abcdef", {"name": "プロジェクト"})
+        os.remove(tmp_path / "ab" / "abcdef.json")
+
+        # テスト実行
+        result = target_class.get("abcdef")
+
+        # 結果の確認
+        assert result is None
+        assert target_class.stats()["entries"] == 0
+        assert target_class.stats()["bytes"] == 0
+
+    def test_put_success_1(self, tmp_path):
+        """(正常系テスト)上限を超えた場合は更新日時が最も古い結果から削除する"""
+
+        target_class = DiskResultCache(str(tmp_path), max_bytes=40)
+        target_class.put("aa01", {"value": "aaaa"})
+        target_class.put("bb01", {"value": "bbbb"})
+        os.utime(tmp_path / "aa" / "aa01.json", (1, 1))
+        target_class._index["aa01"] = (1, target_class._index["aa01"][1])
+
+        # テスト実行
+        target_class.put("cc01", {"value": "cccc"})
+
+        # 結果の確認
+        assert not os.path.exists(tmp_path / "aa" / "aa01.json")
+        assert target_class.get("bb01") == {"value": "bbbb"}
+        assert target_class.get("cc01") == {"value": "cccc"}
+        assert target_class.stats()["bytes"] <= 40
+
+
+class TestCreateResultCache():
+    def test_create_result_cache_success_1(self, tmp_path):
+        """(正常系テスト)指定した保存先に応じたキャッシュを作成する"""
+
+        # テスト実行
+        memory = create_result_cache("memory")
+        disk = create_result_cache(str(tmp_path), max_bytes=1024)
+
+        # 結果の確認
+        assert isinstance(memory, MemoryResultCache)
+        assert isinstance(disk, DiskResultCache)
+        assert disk.directory == str(tmp_path)
+        assert disk.max_bytes == 1024
@@ -0,0 +1,86 @@
+"""source_archive.pyをテストするためのモジュールです。"""
+import json
+
+import pytest
+
+from dg_mm import json_backend
+from dg_mm.errors import DataFormatError
+from dg_mm.models.source_archive import SourceArchive
+
+SOURCE_DATA = {
+    "project_info": {"data": {"id": "p1", "attributes": {"title": "プロジェクト"}}},
+    "member_info": {"data": [{"id": "m1"}]},
+}
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def backend(request):
+    """JSONの変換方法を切り替え、テスト後に元に戻します。"""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    previous = json_backend._backend
+    json_backend.set_backend(request.param)
+    yield request.param
+    json_backend._backend = previous
+
+
+class TestSourceArchive():
+    def test_save_and_load_1(self, tmp_path):
+        """フォルダに保存したデータを読み込める"""
+
+        directory = tmp_path / "sources"
+
+        SourceArchive.save(SOURCE_DATA, str(directory))
+
+        assert sorted(path.name for path in directory.iterdir()) == ["member_info.json", "project_info.json"]
+        assert SourceArchive.load(str(directory)) == SOURCE_DATA
+
+    def test_save_and_load_2(self, tmp_path):
+        """バンドルとして保存したデータを読み込める"""
+
+        path = tmp_path / "bundle.json"
+
+        SourceArchive.save(SOURCE_DATA, str(path), bundle=True)
+
+        assert SourceArchive.load(str(path)) == SOURCE_DATA
+
+    def test_save_and_load_3(self, tmp_path, backend):
+        """どちらのJSONの変換方法でも、インデントを付けたUTF-8のJSONで保存し、読み込める"""
+
+        path = tmp_path / "bundle.json"
+
+        SourceArchive.save(SOURCE_DATA, str(path), bundle=True)
+
+        assert path.read_bytes() == json.dumps(SOURCE_DATA, indent=4, ensure_ascii=False).encode('utf-8')
+        assert SourceArchive.load(str(path)) == SOURCE_DATA
+
+    def test_load_1(self, tmp_path):
+        """フォルダ内のjson以外のファイルは読み込まない"""
+
+        (tmp_path / "project_info.json").write_text(json.dumps(SOURCE_DATA["project_info"]), encoding='utf-8')
+        (tmp_path / "README.txt").write_text("dummy", encoding='utf-8')
+
+        assert SourceArchive.load(str(tmp_path)) == {"project_info": SOURCE_DATA["project_info"]}
+
+    def test_load_2(self, tmp_path):
+        """存在しないパスを指定した場合はエラーになる"""
+
+        with pytest.raises(FileNotFoundError):
+            SourceArchive.load(str(tmp_path / "not_found.json"))
+
+    def test_load_3(self, tmp_path, backend):
+        """jsonとして読み込めないファイルの場合はエラーになる"""
+
+        (tmp_path / "project_info.json").write_text("{", encoding='utf-8')
+
+        with pytest.raises(DataFormatError):
+            SourceArchive.load(str(tmp_path))
+
+    def test_load_4(self, tmp_path):
+        """バンドルがオブジェクトでない場合はエラーになる"""
+
+        path = tmp_path / "bundle.json"
+        path.write_text("[]", encoding='utf-8')
+
+        with pytest.raises(DataFormatError):
+            SourceArchive.load(str(path))
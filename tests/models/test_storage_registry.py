@@ -0,0 +1,72 @@
+"""storage_registry.pyをテストするためのモジュールです。"""
+import importlib.metadata
+
+import pytest
+
+from dg_mm.errors import InvalidStorageError
+from dg_mm.models.storage_registry import StorageRegistry
+
+
+class DummyMapping():
+    def mapping_metadata(self, schema, **kwargs):
+        return {"schema": schema}
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    StorageRegistry.clear()
+    yield
+    StorageRegistry.clear()
+
+
+class TestStorageRegistry():
+    def test_get_instance_success_1(self):
+        """パッケージに含まれるストレージのインスタンスが取得され、同じインスタンスが再利用される"""
+
+        from dg_mm.models.grdm import GrdmMapping
+
+        instance = StorageRegistry.get_instance("GRDM")
+
+        assert isinstance(instance, GrdmMapping)
+        assert StorageRegistry.get_instance("GRDM") is instance
+
+    def test_get_instance_success_2(self, mocker):
+        """エントリーポイントで指定されたマッピングクラスが読み込まれる"""
+
+        # モック化
+        entry_point = importlib.metadata.EntryPoint(
+            name="DUMMY", value=f"{__name__}:DummyMapping", group=StorageRegistry.ENTRY_POINT_GROUP)
+        mocker.patch("dg_mm.models.storage_registry.StorageRegistry._find_entry_points", return_value=[entry_point])
+
+        # テスト実行
+        instance = StorageRegistry.get_instance("DUMMY")
+
+        # 結果の確認
+        assert isinstance(instance, DummyMapping)
+        assert StorageRegistry.get_storage_names() == ["GRDM", "DUMMY"]
+
+    def test_get_instance_error_1(self):
+        """対応していないストレージが指定された場合はエラーになる"""
+
+        with pytest.raises(InvalidStorageError) as e:
+            StorageRegistry.get_instance("invalid_storage")
+
+        assert str(e.value) == "対応していないストレージが指定されました。"
+
+    def test_get_instance_error_2(self):
+        """マッピングクラスを読み込めない場合はエラーになる"""
+
+        StorageRegistry.register("BROKEN", "dg_mm.models.not_found:NotFoundMapping")
+
+        with pytest.raises(InvalidStorageError) as e:
+            StorageRegistry.get_instance("BROKEN")
+
+        assert str(e.value) == "ストレージ:BROKENのマッピングクラスを読み込めません。"
+
+    def test_register_success_1(self):
+        """登録したマッピングクラスが使用される"""
+
+        StorageRegistry.register("DUMMY", f"{__name__}:DummyMapping")
+
+        assert isinstance(StorageRegistry.get_instance("DUMMY"), DummyMapping)
+        assert "DUMMY" in StorageRegistry.get_storage_names()
@@ -0,0 +1,140 @@
+"""stream_parser.pyをテストするためのモジュールです。"""
+import json
+
+import pytest
+
+from dg_mm.fake_grdm import make_file_metadata
+from dg_mm.models import stream_parser
+from dg_mm.models.stream_parser import PrunedJsonParser
+
+PATHS = [
+    ["data", "attributes", "files", "items", "data", "grdm-file:title-ja", "value"],
+    ["data", "attributes", "files", "items", "data", "grdm-file:data-research-field", "value"],
+]
+
+DOCUMENT = {
+    "data": {
+        "id": "p1",
+        "attributes": {
+            "files": [
+                {"path": "/a", "items": [{"data": {"grdm-file:title-ja": {"value": "タイトル", "extra": [1]}, "other": 1}}]},
+                {"path": "/b", "items": "not a list"},
+                {"path": "/c"},
+            ],
+            "editable": True,
+        },
+    },
+    "included": [{"large": "x" * 100}],
+}
+
+EXPECTED = {
+    "data": {
+        "attributes": {
+            "files": [
+                {"items": [{"data": {"grdm-file:title-ja": {"value": "タイトル"}}}]},
+                {"items": "not a list"},
+                {},
+            ],
+        },
+    },
+    "included": None,
+}
+
+
+def generate_events(value):
+    """ijson.basic_parseと同じ形式のイベントを値から作成します。"""
+    if isinstance(value, dict):
+        yield "start_map", None
+        for key, item in value.items():
+            yield "map_key", key
+            yield from generate_events(item)
+        yield "end_map", None
+    elif isinstance(value, list):
+        yield "start_array", None
+        for item in value:
+            yield from generate_events(item)
+        yield "end_array", None
+    elif value is None:
+        yield "null", None
+    elif isinstance(value, bool):
+        yield "boolean", value
+    elif isinstance(value, str):
+        yield "string", value
+    else:
+        yield "number", value
+
+
+def build_from_events(value, paths):
+    events = generate_events(value)
+    event, first = next(events)
+    return PrunedJsonParser._build(events, event, first, PrunedJsonParser.build_tree(paths), {}, True)
+
+
+class TestPrunedJsonParser():
+    def test_prune_success_1(self):
+        """(正常系テスト)参照するパスの値のみを残し、最上位の参照しないキーの値はNoneにする"""
+
+        # テスト実行
+        result = PrunedJsonParser.prune(DOCUMENT, PATHS)
+
+        # 結果の確認
+        assert result == EXPECTED
+        assert DOCUMENT["data"]["id"] == "p1"
+
+    def test_prune_success_2(self):
+        """(正常系テスト)パスの末尾の値は中身をすべて残す"""
+
+        # テスト実行
+        result = PrunedJsonParser.prune(DOCUMENT, [["data", "attributes"], ["data", "attributes", "editable"]])
+
+        # 結果の確認
+        assert result == {"data": {"attributes": DOCUMENT["data"]["attributes"]}, "included": None}
+
+    def test_build_tree_success_1(self):
+        """(正常系テスト)短い方のパスを優先する"""
+
+        # テスト実行・結果の確認
+        assert PrunedJsonParser.build_tree([["a", "b", "c"], ["a", "b"], ["a", "b", "d"], ["x"]]) == {
+            "a": {"b": None}, "x": None}
+
+    def test_build_success_1(self):
+        """(正常系テスト)イベントから組み立てた値は、変換済みの値から残した値と同じになる"""
+
+        # テスト実行・結果の確認
+        assert build_from_events(DOCUMENT, PATHS) == EXPECTED
+        assert build_from_events([DOCUMENT, 1], PATHS) == [
+            PrunedJsonParser._prune(DOCUMENT, PrunedJsonParser.build_tree(PATHS)), 1]
+        assert build_from_events("text", PATHS) == "text"
+
+    def test_parse_success_1(self, mocker):
+        """(正常系テスト)ijsonがインストールされていない場合は全体を変換した後に残す"""
+
+        # モック化
+        mocker.patch.object(stream_parser, "ijson", None)
+
+        # テスト実行
+        result = PrunedJsonParser.parse_bytes(json.dumps(DOCUMENT).encode('utf-8'), PATHS)
+
+        # 結果の確認
+        assert result == EXPECTED
+
+    def test_parse_success_2(self):
+        """(正常系テスト)ijsonで読み込んだ結果は、全体を変換した後に残した結果と同じになる"""
+
+        pytest.importorskip("ijson")
+        document = make_file_metadata("p1", 300)
+        content = json.dumps(document, ensure_ascii=False).encode('utf-8')
+
+        # テスト実行
+        result = PrunedJsonParser.parse_bytes(content, PATHS)
+
+        # 結果の確認
+        assert result == PrunedJsonParser.prune(document, PATHS)
+        assert len(json.dumps(result)) < len(content)
+
+    def test_parse_failure_1(self):
+        """(異常系テスト)形式に誤りがあるJSON"""
+
+        # テスト実行・結果の確認
+        with pytest.raises(ValueError):
+            PrunedJsonParser.parse_bytes(b'{"data": [1, 2', PATHS)
@@ -0,0 +1,211 @@
+"""transport.pyをテストするためのモジュールです。"""
+import os
+
+import pytest
+import requests
+
+from dg_mm.errors import APIError
+from dg_mm.models.grdm import GrdmAccess
+from dg_mm.models.transport import (
+    CachingTransport,
+    RecordingTransport,
+    ReplayTransport,
+    RequestsTransport,
+    get_record_file_name,
+)
+
+
+def create_response(code, content):
+    response = requests.models.Response()
+    response.status_code = code
+    response._content = content.encode('utf-8')
+    response.encoding = 'utf-8'
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+class DummyTransport():
+    """固定のレスポンスを返すトランスポートです。"""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.calls.append((url, headers, params, timeout))
+        return self.response
+
+
+class TestRequestsTransport():
+    def test_get_success_1(self, mocker):
+        """requests.getに引数がそのまま渡される"""
+
+        # モック化
+        mock_obj = mocker.patch('requests.get', return_value=create_response(200, '{}'))
+
+        # テスト実行
+        RequestsTransport().get("https://example.org", headers={"a": "b"}, params={"c": "d"}, timeout=(1, 2))
+
+        # 結果の確認
+        mock_obj.assert_called_with("https://example.org", headers={"a": "b"}, params={"c": "d"}, timeout=(1, 2))
+
+    def test_get_stream_success_1(self, mocker):
+        """requests.getにstream=Trueを付けて引数が渡される"""
+
+        # モック化
+        mock_obj = mocker.patch('requests.get', return_value=create_response(200, '{}'))
+
+        # テスト実行
+        RequestsTransport().get_stream("https://example.org", headers={"a": "b"}, params={"c": "d"}, timeout=(1, 2))
+
+        # 結果の確認
+        mock_obj.assert_called_with(
+            "https://example.org", headers={"a": "b"}, params={"c": "d"}, timeout=(1, 2), stream=True)
+
+
+class TestRecordingAndReplayTransport():
+    def test_record_and_replay_success_1(self, tmp_path):
+        """記録したレスポンスを再生できる"""
+
+        inner = DummyTransport(create_response(200, '{"key": "値"}'))
+        recorder = RecordingTransport(str(tmp_path), inner)
+
+        # テスト実行
+        recorded = recorder.get("https://example.org/a", headers={'Authorization': 'Bearer secret'}, params={"p": "1"})
+        replayed = ReplayTransport(str(tmp_path)).get("https://example.org/a", params={"p": "1"})
+
+        # 結果の確認
+        assert recorded.json() == {"key": "値"}
+        assert replayed.status_code == 200
+        assert replayed.json() == {"key": "値"}
+        with open(os.path.join(tmp_path, get_record_file_name("https://example.org/a", {"p": "1"})), encoding='utf-8') as f:
+            assert "secret" not in f.read()
+
+    def test_record_and_replay_success_2(self, tmp_path):
+        """エラーのステータスコードも再生できる"""
+
+        inner = DummyTransport(create_response(404, '{}'))
+        RecordingTransport(str(tmp_path), inner).get("https://example.org/b")
+
+        # テスト実行
+        replayed = ReplayTransport(str(tmp_path)).get("https://example.org/b")
+
+        # 結果の確認
+        with pytest.raises(requests.HTTPError):
+            replayed.raise_for_status()
+
+    def test_replay_failure_1(self, tmp_path):
+        """記録されていないリクエスト"""
+
+        with pytest.raises(APIError, match="記録されたレスポンスが存在しません。"):
+            ReplayTransport(str(tmp_path)).get("https://example.org/c")
+
+
+class TestCachingTransport():
+    def test_get_success_1(self):
+        """有効期限内の同じリクエストにはキャッシュしたレスポンスを返す"""
+
+        inner = DummyTransport(create_response(200, '{}'))
+        transport = CachingTransport(inner, ttl=60)
+
+        # テスト実行
+        first = transport.get("https://example.org/a", headers={'Authorization': 'Bearer t1'}, params={"p": "1"})
+        second = transport.get("https://example.org/a", headers={'Authorization': 'Bearer t1'}, params={"p": "1"})
+        transport.get("https://example.org/a", headers={'Authorization': 'Bearer t2'}, params={"p": "1"})
+
+        # 結果の確認
+        assert first is second
+        assert len(inner.calls) == 2
+
+    def test_get_success_2(self):
+        """成功以外のレスポンスと有効期限切れのレスポンスは再利用しない"""
+
+        inner = DummyTransport(create_response(401, '{}'))
+        transport = CachingTransport(inner, ttl=60)
+
+        # テスト実行
+        transport.get("https://example.org/a")
+        transport.get("https://example.org/a")
+        inner.response = create_response(200, '{}')
+        expired = CachingTransport(inner, ttl=0)
+        expired.get("https://example.org/a")
+        expired.get("https://example.org/a")
+
+        # 結果の確認
+        assert len(inner.calls) == 4
+
+    def test_get_success_3(self):
+        """上限を超えた場合は最も古く参照されたレスポンスを破棄する"""
+
+        inner = DummyTransport(create_response(200, '{}'))
+        transport = CachingTransport(inner, ttl=60, max_entries=2)
+
+        # テスト実行
+        transport.get("https://example.org/a")
+        transport.get("https://example.org/b")
+        transport.get("https://example.org/a")
+        transport.get("https://example.org/c")
+        transport.get("https://example.org/a")
+        transport.get("https://example.org/b")
+
+        # 結果の確認
+        assert len(transport) == 2
+        assert [call[0] for call in inner.calls] == [
+            "https://example.org/a", "https://example.org/b", "https://example.org/c", "https://example.org/b"]
+
+
+class TestGrdmAccessTransport():
+    def test_transport_success_1(self):
+        """GrdmAccessが指定したトランスポートでリクエストを送信する"""
+
+        transport = DummyTransport(create_response(200, '{"data": {"id": "valid_project_id"}}'))
+
+        # テスト実行
+        instance = GrdmAccess(transport=transport)
+        instance._token = "valid_token"
+        instance._project_id = "valid_project_id"
+        instance._is_authenticated = True
+        actual = instance.get_project_info()
+
+        # 結果の確認
+        assert actual == {"data": {"id": "valid_project_id"}}
+        assert transport.calls[0][1] == {'Authorization': 'Bearer valid_token'}
+
+    def test_configure_success_1(self):
+        """configureで設定したトランスポートが既定になる"""
+
+        transport = DummyTransport(create_response(200, '{}'))
+
+        # テスト実行
+        GrdmAccess.configure(transport=transport)
+        try:
+            instance = GrdmAccess()
+        finally:
+            GrdmAccess.configure()
+
+        # 結果の確認
+        assert instance._transport is transport
+        assert isinstance(GrdmAccess()._transport, RequestsTransport)
+
+    def test_config_path_success_1(self, tmp_path):
+        """設定ファイルは更新されるまで読み込んだ内容を再利用する"""
+
+        config_path = tmp_path / "grdm.ini"
+        config_path.write_text("[settings]\ndomain = https://a.example.org\nmax_requests = 10\n", encoding='utf-8')
+
+        # テスト実行
+        first = GrdmAccess(config_path=str(config_path))
+        second = GrdmAccess(config_path=str(config_path))
+        config_path.write_text("[settings]\ndomain = https://b.example.org\nmax_requests = 100\n", encoding='utf-8')
+        third = GrdmAccess(config_path=str(config_path))
+
+        # 結果の確認
+        assert first._config_file is second._config_file
+        assert third._domain == "https://b.example.org"
+        assert third._max_requests == 100
+
+    def test_config_path_failure_1(self, tmp_path):
+        """存在しない設定ファイルを指定"""
+
+        with pytest.raises(FileNotFoundError):
+            GrdmAccess(config_path=str(tmp_path / "not_exist.ini"))
@@ -0,0 +1,131 @@
+"""client.pyをテストするためのモジュールです。"""
+import argparse
+import io
+import subprocess
+import sys
+
+import pytest
+
+from dg_mm.__main__ import forward_to_daemon
+from dg_mm.client import DaemonClient
+from dg_mm.errors import InvalidSchemaError, MetadatamanagerError
+from dg_mm.server import MetadataServer, MetadataService
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Unixドメインソケットで待ち受ける常駐サーバーを起動します。"""
+    socket_path = str(tmp_path / "dg_mm.sock")
+    server = MetadataServer(MetadataService(), unix_socket=socket_path).start()
+
+    yield server
+
+    server.stop()
+
+
+class TestDaemonClient():
+    def test_get_metadata_success_1(self, mocker, daemon):
+        """常駐サーバーの結果をCLIの標準出力と同じ形式で出力する"""
+
+        # モック化
+        mock_get_metadata = mocker.patch(
+            'dg_mm.models.metadata_manager.MetadataManager.get_metadata', return_value={"name": "プロジェクト"})
+        output = io.BytesIO()
+
+        # テスト実行
+        params = {"schema": "RF", "storage": "GRDM", "token": "token", "id": "p1",
+                  "filter_properties": None, "project_metadata_id": None}
+        result = DaemonClient(daemon.address).get_metadata(params, output)
+
+        # 結果の確認
+        assert result is True
+        assert output.getvalue().decode('utf-8') == '{\n    "name": "プロジェクト"\n}\n'
+        mock_get_metadata.assert_called_once_with(schema="RF", storage="GRDM", id="p1", token="token")
+
+    def test_get_metadata_success_2(self, tmp_path):
+        """常駐サーバーが起動していない場合はFalseを返す"""
+
+        output = io.BytesIO()
+
+        # テスト実行
+        result = DaemonClient(str(tmp_path / "not_exist.sock")).get_metadata({"schema": "RF", "storage": "GRDM"}, output)
+
+        # 結果の確認
+        assert result is False
+        assert output.getvalue() == b""
+
+    def test_get_metadata_success_3(self, daemon):
+        """常駐サーバーが停止処理中の場合はFalseを返す"""
+
+        daemon.service.begin_drain()
+
+        # テスト実行
+        result = DaemonClient(daemon.address).get_metadata({"schema": "RF", "storage": "GRDM"}, io.BytesIO())
+
+        # 結果の確認
+        assert result is False
+
+    def test_get_metadata_failure_1(self, mocker, daemon):
+        """常駐サーバーで発生した例外と同じ種類の例外が発生する"""
+
+        # モック化
+        mocker.patch('dg_mm.models.metadata_manager.MetadataManager.get_metadata',
+                     side_effect=InvalidSchemaError("対応していないスキーマが指定されました。"))
+
+        # テスト実行
+        with pytest.raises(InvalidSchemaError) as e:
+            DaemonClient(daemon.address).get_metadata({"schema": "XX", "storage": "GRDM"}, io.BytesIO())
+
+        # 結果の確認
+        assert str(e.value) == "対応していないスキーマが指定されました。"
+
+    def test_get_metadata_failure_2(self, daemon):
+        """リクエストの形式の誤りはMetadatamanagerErrorとして発生する"""
+
+        with pytest.raises(MetadatamanagerError) as e:
+            DaemonClient(daemon.address).get_metadata({"storage": "GRDM"}, io.BytesIO())
+
+        assert str(e.value) == "schemaを指定してください。"
+
+
+def make_get_args(socket_path, **options):
+    """getコマンドのコマンドライン引数を作成します。"""
+    args = argparse.Namespace(
+        socket=socket_path, no_daemon=False, timings=False, metrics_file=None, profile=None, source_dir=None,
+        save_sources=None, diff=None, mapping_path=None, format="json", compress=None, result_cache=None, file=None)
+    for name, value in options.items():
+        setattr(args, name, value)
+    return args
+
+
+@pytest.mark.parametrize("options, expected", [
+    ({}, True),
+    ({"result_cache": "cache"}, False),
+    ({"mapping_path": ["definitions"]}, False),
+    ({"format": "msgpack"}, False),
+    ({"diff": "previous.json"}, False),
+])
+def test_forward_to_daemon_success_1(mocker, capsys, daemon, options, expected):
+    """このプロセスで処理する必要があるオプションを指定した場合は常駐サーバーに依頼しない"""
+
+    # モック化
+    mock_get_metadata = mocker.patch(
+        'dg_mm.models.metadata_manager.MetadataManager.get_metadata', return_value={"name": "プロジェクト"})
+    params = {"storage": "GRDM", "token": "token", "id": "p1", "filter_properties": None, "project_metadata_id": None}
+
+    # テスト実行
+    result = forward_to_daemon(make_get_args(daemon.address, **options), ["RF"], params)
+    capsys.readouterr()
+
+    # 結果の確認
+    assert result is expected
+    assert mock_get_metadata.call_count == (1 if expected else 0)
+
+
+def test_import_success_1():
+    """CLIの読み込みではrequestsとGRDMのモジュールを読み込まない"""
+
+    code = "import sys, dg_mm.__main__; print('requests' in sys.modules, 'dg_mm.models.grdm' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False False"
@@ -0,0 +1,118 @@
+"""compression.pyをテストするためのモジュールです。"""
+import gzip
+import io
+import lzma
+import sys
+
+import pytest
+
+from dg_mm.compression import check_options, compressed_writer, decompressed_reader, get_extension
+from dg_mm.errors import MetadatamanagerError
+from dg_mm.output_format import JsonFormat
+
+DOCUMENT = {"researcher": [{"name": f"研究者{i}", "email": [f"r{i}@example.com"]} for i in range(200)]}
+
+
+class TestCompression():
+    @pytest.mark.parametrize("method, decompress", [("gzip", gzip.decompress), ("xz", lzma.decompress)])
+    def test_compressed_writer_success_1(self, method, decompress):
+        """(正常系テスト)書き込んだデータを圧縮し、出力先は閉じない"""
+
+        stream = io.BytesIO()
+
+        # テスト実行
+        with compressed_writer(stream, method, 1) as writer:
+            JsonFormat.dump(DOCUMENT, writer)
+
+        # 結果の確認
+        assert not stream.closed
+        assert decompress(stream.getvalue()) == JsonFormat.dumps(DOCUMENT)
+        assert len(stream.getvalue()) < len(JsonFormat.dumps(DOCUMENT)) / 5
+
+    def test_compressed_writer_success_2(self):
+        """(正常系テスト)gzipは同じ内容から同じバイト列を作成する"""
+
+        outputs = []
+        for _ in range(2):
+            stream = io.BytesIO()
+            with compressed_writer(stream, "gzip") as writer:
+                writer.write(b"metadata")
+            outputs.append(stream.getvalue())
+
+        assert outputs[0] == outputs[1]
+
+    def test_compressed_writer_success_3(self):
+        """(正常系テスト)圧縮方式を指定しない場合は出力先にそのまま書き込む"""
+
+        stream = io.BytesIO()
+
+        with compressed_writer(stream) as writer:
+            writer.write(b"metadata")
+
+        assert writer is stream
+        assert stream.getvalue() == b"metadata"
+
+    @pytest.mark.parametrize("method", ["gzip", "xz", None])
+    def test_decompressed_reader_success_1(self, method):
+        """(正常系テスト)圧縮したデータを展開して読み込む"""
+
+        stream = io.BytesIO()
+        with compressed_writer(stream, method) as writer:
+            writer.write(b"metadata")
+        stream.seek(0)
+
+        # テスト実行
+        with decompressed_reader(stream, method) as reader:
+            content = reader.read()
+
+        # 結果の確認
+        assert content == b"metadata"
+
+    def test_zstd_success_1(self):
+        """(正常系テスト)zstandardがインストールされている場合はzstdで圧縮、展開する"""
+
+        pytest.importorskip("zstandard")
+        stream = io.BytesIO()
+
+        with compressed_writer(stream, "zstd", 19) as writer:
+            JsonFormat.dump(DOCUMENT, writer)
+        stream.seek(0)
+        with decompressed_reader(stream, "zstd") as reader:
+            content = reader.read()
+
+        assert content == JsonFormat.dumps(DOCUMENT)
+
+    def test_get_extension_success_1(self):
+        """(正常系テスト)圧縮方式に対応する拡張子を取得する"""
+
+        assert get_extension("gzip") == ".gz"
+        assert get_extension("xz") == ".xz"
+        assert get_extension("zstd") == ".zst"
+        assert get_extension(None) == ""
+
+    @pytest.mark.parametrize("method, level, message", [
+        ("gzip", 0, "gzipの圧縮レベルは1から9の範囲で指定してください。"),
+        ("xz", 10, "xzの圧縮レベルは0から9の範囲で指定してください。"),
+        ("zstd", 23, "zstdの圧縮レベルは1から22の範囲で指定してください。"),
+        ("bzip2", None, "対応していない圧縮方式が指定されました。(bzip2)"),
+    ])
+    def test_check_options_failure_1(self, method, level, message):
+        """(異常系テスト)対応していない圧縮方式と、範囲外の圧縮レベル"""
+
+        with pytest.raises(MetadatamanagerError) as e:
+            check_options(method, level)
+
+        assert str(e.value) == message
+
+    def test_check_options_failure_2(self, mocker):
+        """(異常系テスト)zstandardがインストールされていない"""
+
+        # モック化
+        mocker.patch.dict(sys.modules, {"zstandard": None})
+
+        # テスト実行
+        with pytest.raises(MetadatamanagerError) as e:
+            check_options("zstd")
+
+        # 結果の確認
+        assert str(e.value) == "zstdを使用するにはzstandardをインストールしてください。"
@@ -0,0 +1,134 @@
+"""fake_grdm.pyをテストするためのモジュールです。"""
+import pytest
+import requests
+
+from dg_mm.__main__ import main
+from dg_mm.fake_grdm import FakeGrdmServer
+from dg_mm.models.grdm import GrdmAccess, GrdmMapping
+from dg_mm.models.metadata_manager import MetadataManager
+from dg_mm.errors import APIError, InvalidTokenError
+
+
+@pytest.fixture
+def fake_grdm_server(tmp_path):
+    """疑似GRDMサーバーを起動し、GrdmAccessの接続先に設定します。"""
+    server = FakeGrdmServer(members=25, registrations=2, files=3, token="fake_token").start()
+    config_path = str(tmp_path / "fake_grdm.ini")
+    server.write_config(config_path)
+    GrdmAccess.configure(config_path=config_path)
+
+    yield server
+
+    GrdmAccess.configure()
+    server.stop()
+
+
+def test_mapping_metadata_success_1(fake_grdm_server):
+    """疑似GRDMサーバーからメタデータを取得できる"""
+
+    metadata = GrdmMapping().mapping_metadata("RF", "fake_token", "p0001")
+
+    assert metadata["name"] == "Synthetic project p0001"
+    assert len(metadata["researcher"]) == 25
+    assert metadata["researcher"][24]["name"] == "Researcher 24"
+    assert len(metadata["projectItem"]) == 3
+    assert metadata["funding"][0]["name"] == "研究プログラム1"
+
+
+def test_mapping_metadata_success_2(fake_grdm_server):
+    """プロジェクトメタデータのIDを指定して取得できる"""
+
+    metadata = GrdmMapping().mapping_metadata("RF", "fake_token", "p0001", project_metadata_id="p0001-r0000")
+
+    assert metadata["funding"][0]["name"] == "研究プログラム0"
+
+
+def test_mapping_metadata_success_3(fake_grdm_server, tmp_path):
+    """メンバー情報をページごとに受け取りながらマッピングしても同じ結果になる"""
+
+    expected = GrdmMapping().mapping_metadata("RF", "fake_token", "p0001")
+    config = fake_grdm_server.make_config()
+    config["settings"]["stream_member_info"] = "true"
+    config_path = str(tmp_path / "stream.ini")
+    with open(config_path, 'w', encoding='utf-8') as f:
+        config.write(f)
+    GrdmAccess.configure(config_path=config_path)
+
+    metadata = GrdmMapping().mapping_metadata("RF", "fake_token", "p0001")
+
+    assert metadata == expected
+    assert list(metadata["researcher"][0]) == list(expected["researcher"][0])
+
+
+def test_mapping_metadata_success_4(tmp_path):
+    """メンバー情報のページ数がパッケージの設定のリクエスト回数の上限を超えても取得できる"""
+
+    with FakeGrdmServer(members=1000, registrations=1, files=1, token="fake_token") as server:
+        config_path = str(tmp_path / "fake_grdm.ini")
+        server.write_config(config_path)
+        GrdmAccess.configure(config_path=config_path)
+        try:
+            metadata = GrdmMapping().mapping_metadata("RF", "fake_token", "p0001")
+        finally:
+            GrdmAccess.configure()
+
+    assert len(metadata["researcher"]) == 1000
+    assert metadata["researcher"][999]["name"] == "Researcher 999"
+
+
+def test_mapping_metadata_failure_1(fake_grdm_server):
+    """疑似GRDMサーバーが受け付けないトークンを指定"""
+
+    with pytest.raises(InvalidTokenError):
+        GrdmMapping().mapping_metadata("RF", "invalid_token", "p0001")
+
+
+def test_get_metadata_failure_1(tmp_path):
+    """制限時間を指定した場合は、制限時間を過ぎた後のリクエストを送信しない"""
+
+    with FakeGrdmServer(members=50, latency=0.05, token="fake_token") as server:
+        config_path = str(tmp_path / "fake_grdm.ini")
+        server.write_config(config_path)
+        GrdmAccess.configure(config_path=config_path)
+        try:
+            with pytest.raises((APIError, requests.exceptions.Timeout)):
+                MetadataManager().get_metadata("RF", "GRDM", token="fake_token", id="p0001", deadline=0.12)
+            request_count = server.request_count
+            metadata = MetadataManager().get_metadata("RF", "GRDM", token="fake_token", id="p0001", deadline=0)
+        finally:
+            GrdmAccess.configure()
+
+    assert request_count <= 3
+    assert len(metadata["researcher"]) == 50
+
+
+def test_main_get_failure_1(tmp_path, mocker, capsys):
+    """--deadlineで指定した制限時間を過ぎた場合はエラーになる"""
+
+    with FakeGrdmServer(members=50, latency=0.05, token="fake_token") as server:
+        config_path = str(tmp_path / "fake_grdm.ini")
+        server.write_config(config_path)
+        GrdmAccess.configure(config_path=config_path)
+        mocker.patch("sys.argv", [
+            "metadatamanager", "get", "--schema", "RF", "--storage", "GRDM", "--token", "fake_token",
+            "--id", "p0001", "--deadline", "0.12", "--no-daemon"])
+        try:
+            rt = main()
+        finally:
+            GrdmAccess.configure()
+    out, err = capsys.readouterr()
+
+    assert rt != 0
+    assert out == ""
+    assert "エラーが発生しました" in err
+    assert server.request_count <= 3
+
+
+def test_latency_success_1():
+    """指定した待ち時間の後にレスポンスが返る"""
+
+    with FakeGrdmServer(latency=0.2) as server:
+        response = requests.get(f"{server.base_url}/v2/nodes/p0001/", timeout=5)
+
+    assert response.elapsed.total_seconds() >= 0.2
+    assert server.request_count == 1
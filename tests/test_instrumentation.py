@@ -0,0 +1,65 @@
+"""instrumentation.pyをテストするためのモジュールです。"""
+import pytest
+
+from dg_mm.instrumentation import TimingRecorder, span, use_span_hooks
+
+
+class TestSpan():
+    def test_span_success_1(self):
+        """フックが登録されていない場合は何も通知されない"""
+
+        recorder = TimingRecorder()
+        with span("dummy"):
+            pass
+
+        assert recorder.spans == []
+
+    def test_span_success_2(self):
+        """フックが登録されている場合は処理時間と付加情報が通知される"""
+
+        recorder = TimingRecorder()
+        with use_span_hooks([recorder]):
+            with span("fetch", source="project_info"):
+                pass
+
+        assert len(recorder.spans) == 1
+        name, duration, attributes = recorder.spans[0]
+        assert name == "fetch"
+        assert duration >= 0
+        assert attributes == {"source": "project_info"}
+
+    def test_span_success_3(self):
+        """例外が発生した場合もエラーの種類と共に通知される"""
+
+        recorder = TimingRecorder()
+        with pytest.raises(ValueError):
+            with use_span_hooks([recorder]), span("extraction"):
+                raise ValueError()
+
+        assert recorder.spans[0][2] == {"error": "ValueError"}
+
+    def test_use_span_hooks_success_1(self):
+        """ブロックを抜けるとフックの登録が解除される"""
+
+        recorder = TimingRecorder()
+        with use_span_hooks([recorder]):
+            pass
+        with span("dummy"):
+            pass
+
+        assert recorder.spans == []
+
+
+class TestTimingRecorder():
+    def test_format_success_1(self):
+        """スパンごとに1行の文字列に変換される"""
+
+        recorder = TimingRecorder()
+        recorder("fetch", 0.5, {"source": "member_info"})
+        recorder("extraction", 0.25, {})
+
+        lines = recorder.format().split("\n")
+
+        assert lines[0].startswith("fetch (source=member_info)")
+        assert lines[0].endswith("500.000 ms")
+        assert lines[1].startswith("extraction")
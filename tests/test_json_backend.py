@@ -0,0 +1,108 @@
+"""json_backend.pyをテストするためのモジュールです。"""
+import io
+import json
+import sys
+
+import pytest
+
+from dg_mm import json_backend
+from dg_mm.errors import MetadatamanagerError
+from dg_mm.json_backend import OrjsonBackend, StdlibBackend
+
+DOCUMENTS = [
+    {"name": "プロジェクト", "researcher": [{"name": "研究者", "email": [], "order": 1}], "empty": {}},
+    [None, True, False, 0, -1, 0.5, 1.0, "\x1f\t\"\\", " "],
+    {"number": [1e16, 1e-07, 1.2345678901234568e+17], "text": "1e5,"},
+    {"large": 2 ** 70},
+    {"rate": [float("nan"), float("inf"), -float("inf")], "value": None},
+    {"nested": [{"rate": (1.0, float("nan"))}]},
+]
+
+
+@pytest.fixture
+def restore_backend():
+    """テストで変更した変換方法を元に戻します。"""
+    backend = json_backend._backend
+    yield
+    json_backend._backend = backend
+
+
+class TestJsonBackend():
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_dumps_success_1(self, document):
+        """(正常系テスト)orjsonでも標準ライブラリと同じJSONに変換する"""
+
+        pytest.importorskip("orjson")
+
+        # テスト実行
+        compact = OrjsonBackend.dumps(document)
+        pretty = OrjsonBackend.dumps_pretty(document)
+        stream = io.BytesIO()
+        OrjsonBackend.dump_pretty(document, stream)
+
+        # 結果の確認
+        assert compact == json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        assert pretty == json.dumps(document, indent=4, ensure_ascii=False).encode('utf-8')
+        assert stream.getvalue() == pretty
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_dump_pretty_success_1(self, document):
+        """(正常系テスト)標準ライブラリでは書き込みながら変換し、出力先は閉じない"""
+
+        stream = io.BytesIO()
+
+        # テスト実行
+        StdlibBackend.dump_pretty(document, stream)
+
+        # 結果の確認
+        assert not stream.closed
+        assert stream.getvalue() == StdlibBackend.dumps_pretty(document)
+
+    @pytest.mark.parametrize("backend", [StdlibBackend, OrjsonBackend])
+    def test_loads_success_1(self, backend):
+        """(正常系テスト)UTF-8のバイト列から変換する"""
+
+        if backend is OrjsonBackend:
+            pytest.importorskip("orjson")
+
+        # テスト実行・結果の確認
+        assert backend.loads('{"name": "プロジェクト"}'.encode('utf-8')) == {"name": "プロジェクト"}
+        with pytest.raises(ValueError):
+            backend.loads(b'{"name": ')
+
+    def test_set_backend_success_1(self, restore_backend, mocker):
+        """(正常系テスト)指定しない場合はorjsonがインストールされていればorjsonを使用する"""
+
+        # モック化
+        mocker.patch.dict(sys.modules, {"orjson": None})
+
+        # テスト実行
+        json_backend.set_backend()
+
+        # 結果の確認
+        assert json_backend.get_backend() is StdlibBackend
+
+    def test_get_backend_success_1(self, restore_backend, monkeypatch):
+        """(正常系テスト)環境変数で指定した変換方法を使用する"""
+
+        monkeypatch.setenv(json_backend.BACKEND_ENV, "stdlib")
+        json_backend._backend = None
+
+        # テスト実行・結果の確認
+        assert json_backend.get_backend() is StdlibBackend
+        assert json_backend.dumps_pretty({"a": 1}) == b'{\n    "a": 1\n}'
+
+    def test_set_backend_failure_1(self, restore_backend, mocker):
+        """(異常系テスト)対応していない名称と、インストールされていないライブラリ"""
+
+        # モック化
+        mocker.patch.dict(sys.modules, {"orjson": None})
+
+        # テスト実行・結果の確認
+        with pytest.raises(MetadatamanagerError) as e:
+            json_backend.set_backend("simplejson")
+        assert str(e.value) == "対応していないJSONの変換方法が指定されました。(simplejson)"
+
+        with pytest.raises(MetadatamanagerError) as e:
+            json_backend.set_backend("orjson")
+        assert str(e.value) == "orjsonを使用するにはorjsonをインストールしてください。"
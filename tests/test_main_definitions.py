@@ -0,0 +1,116 @@
+"""マッピング定義に関するコマンド(__main__.py)をテストするためのモジュールです。
+
+GRDMにアクセスしないため、test___main__.pyと異なり認証情報の環境変数を必要としません。
+"""
+import json
+import os
+import shutil
+
+import pytest
+
+import dg_mm
+
+from dg_mm.__main__ import main
+from dg_mm.models.mapping_definition import DefinitionManager
+
+PACKAGE_MAPPING_DIR = os.path.join(os.path.dirname(dg_mm.__file__), "data", "mapping")
+
+
+@pytest.fixture(autouse=True)
+def reset_search_path():
+    """コマンドで設定したマッピング定義ファイルを探すフォルダを元に戻します。"""
+    yield
+    DefinitionManager.configure_search_path(None)
+
+
+def run_main(mocker, args):
+    """コマンドライン引数を指定してmainを実行します。"""
+    mocker.patch("sys.argv", ["metadatamanager"] + args)
+    return main()
+
+
+def test_main_validate_definition_success_1(mocker, capsys):
+    """パッケージに含まれるマッピング定義ファイルに誤りがない"""
+
+    rt = run_main(mocker, ["validate-definition", "dg_mm/data/mapping/GRDM_RF_mapping.json", "--storage", "GRDM"])
+    out, err = capsys.readouterr()
+
+    assert rt == 0
+    assert out.startswith("マッピング定義に誤りはありません。")
+    assert err == ""
+
+
+def test_main_validate_definition_failure_1(mocker, capsys, tmp_path):
+    """マッピング定義ファイルの誤りをすべて出力する"""
+
+    path = tmp_path / "definition.json"
+    path.write_text(json.dumps({
+        "a.b": {"type": "text", "source": "project_info", "value": "x"},
+        "a[].c": {"type": "string", "source": "dummy", "value": "x"},
+    }), encoding='utf-8')
+
+    rt = run_main(mocker, ["validate-definition", str(path), "--storage", "GRDM"])
+    out, err = capsys.readouterr()
+
+    assert rt != 0
+    assert out == ""
+    assert "エラーが発生しました: マッピング定義に3件の誤りがあります。" in err
+
+
+def test_main_validate_definition_failure_2(mocker, capsys, tmp_path):
+    """マッピング定義ファイルがjson形式ではない"""
+
+    path = tmp_path / "definition.json"
+    path.write_text("dummy text", encoding='utf-8')
+
+    rt = run_main(mocker, ["validate-definition", str(path)])
+    out, err = capsys.readouterr()
+
+    assert rt != 0
+    assert "エラーが発生しました: マッピング定義ファイルのフォーマットに誤りがあります。" in err
+
+
+def test_main_build_definitions_success_1(mocker, capsys, tmp_path):
+    """指定したフォルダのマッピング定義ファイルを、パッケージに含まれるものより優先して検証し、保存する"""
+
+    shutil.copy(os.path.join(PACKAGE_MAPPING_DIR, "GRDM_RF_mapping.json"), tmp_path / "GRDM_RF_mapping.json")
+
+    rt = run_main(mocker, ["build-definitions", "--mapping-path", str(tmp_path)])
+    out, err = capsys.readouterr()
+
+    assert rt == 0
+    assert out.splitlines() == [str(tmp_path / "__pycache__" / "GRDM_RF_mapping.marshal")]
+    assert os.path.exists(tmp_path / "__pycache__" / "GRDM_RF_mapping.marshal")
+    assert not os.path.exists(os.path.join(PACKAGE_MAPPING_DIR, "__pycache__", "GRDM_RF_mapping.marshal"))
+    assert err == ""
+
+
+def test_main_build_definitions_success_2(mocker, capsys, tmp_path):
+    """指定したフォルダにのみ存在するマッピング定義ファイルも検証し、保存する"""
+
+    shutil.copy(os.path.join(PACKAGE_MAPPING_DIR, "GRDM_RF_mapping.json"), tmp_path / "GRDM_RF_mapping.json")
+    (tmp_path / "GRDM_PRIVATE_mapping.json").write_text(
+        json.dumps({"name": {"type": "string", "source": "project_info", "value": "data.attributes.title"}}),
+        encoding='utf-8')
+
+    rt = run_main(mocker, ["build-definitions", "--mapping-path", str(tmp_path)])
+    out, err = capsys.readouterr()
+
+    assert rt == 0
+    assert out.splitlines() == [
+        str(tmp_path / "__pycache__" / "GRDM_PRIVATE_mapping.marshal"),
+        str(tmp_path / "__pycache__" / "GRDM_RF_mapping.marshal")]
+    assert err == ""
+
+
+def test_main_build_definitions_failure_1(mocker, capsys, tmp_path):
+    """マッピング定義に誤りがある場合は保存しない"""
+
+    (tmp_path / "GRDM_RF_mapping.json").write_text(json.dumps({"a": {"type": "text"}}), encoding='utf-8')
+
+    rt = run_main(mocker, ["build-definitions", "--mapping-path", str(tmp_path)])
+    out, err = capsys.readouterr()
+
+    assert rt != 0
+    assert "エラーが発生しました: マッピング定義に1件の誤りがあります。" in err
+    assert not os.path.exists(tmp_path / "__pycache__")
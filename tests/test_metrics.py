@@ -0,0 +1,89 @@
+"""metrics.pyをテストするためのモジュールです。"""
+import os
+
+from dg_mm.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry():
+    def test_counter_success_1(self):
+        """ラベルごとに値が集計される"""
+
+        registry = MetricsRegistry()
+        counter = registry.counter("dummy_total", "dummy")
+
+        counter.inc(endpoint="token")
+        counter.inc(2, endpoint="token")
+        counter.inc(endpoint="member_info")
+
+        assert counter.get(endpoint="token") == 3
+        assert counter.get(endpoint="member_info") == 1
+        assert counter.get(endpoint="file_metadata") == 0
+
+    def test_counter_success_2(self):
+        """同じ名前で取得した場合は同じメトリクスが返る"""
+
+        registry = MetricsRegistry()
+
+        assert registry.counter("dummy_total", "dummy") is registry.counter("dummy_total", "dummy")
+
+    def test_histogram_success_1(self):
+        """値がバケットごとに累積して集計される"""
+
+        registry = MetricsRegistry()
+        histogram = registry.histogram("dummy_seconds", "dummy", buckets=(0.1, 1.0))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        snapshot = registry.snapshot()
+        assert snapshot["dummy_seconds"]["type"] == "histogram"
+        assert snapshot["dummy_seconds"]["values"] == [{
+            "labels": {},
+            "buckets": {"0.1": 1, "1": 2, "+Inf": 3},
+            "sum": 5.55,
+            "count": 3,
+        }]
+
+    def test_to_prometheus_success_1(self):
+        """Prometheusのテキスト形式で出力される"""
+
+        registry = MetricsRegistry()
+        registry.counter("dummy_total", "dummy counter").inc(endpoint='a"b')
+        registry.histogram("dummy_bytes", "dummy histogram", buckets=(10,)).observe(3, endpoint="token")
+
+        assert registry.to_prometheus() == (
+            '# HELP dummy_total dummy counter\n'
+            '# TYPE dummy_total counter\n'
+            'dummy_total{endpoint="a\\"b"} 1\n'
+            '# HELP dummy_bytes dummy histogram\n'
+            '# TYPE dummy_bytes histogram\n'
+            'dummy_bytes_bucket{endpoint="token",le="10"} 1\n'
+            'dummy_bytes_bucket{endpoint="token",le="+Inf"} 1\n'
+            'dummy_bytes_sum{endpoint="token"} 3\n'
+            'dummy_bytes_count{endpoint="token"} 1\n'
+        )
+
+    def test_write_prometheus_success_1(self, tmp_path):
+        """ファイルに出力され、一時ファイルが残らない"""
+
+        registry = MetricsRegistry()
+        registry.counter("dummy_total", "dummy").inc()
+        path = tmp_path / "metrics.prom"
+
+        registry.write_prometheus(str(path))
+
+        assert path.read_text(encoding='utf-8') == registry.to_prometheus()
+        assert os.listdir(tmp_path) == ["metrics.prom"]
+
+    def test_reset_success_1(self):
+        """値が破棄される"""
+
+        registry = MetricsRegistry()
+        counter = registry.counter("dummy_total", "dummy")
+        counter.inc()
+
+        registry.reset()
+
+        assert counter.get() == 0
+        assert registry.snapshot()["dummy_total"]["values"] == []
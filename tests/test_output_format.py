@@ -0,0 +1,135 @@
+"""output_format.pyをテストするためのモジュールです。"""
+import inspect
+import io
+import json
+
+import pytest
+
+from dg_mm import output_format
+from dg_mm.errors import DataFormatError
+from dg_mm.output_format import (
+    FORMAT_NAMES, CborFormat, JsonFormat, JsonLinesFormat, MessagePackFormat, OutputFormat, get_format)
+
+DOCUMENT = {
+    "name": "プロジェクト",
+    "researcher": [{"name": "研究者", "email": ["a@example.com"], "order": 1}] * 20,
+    "dataStarted": None,
+    "flag": True,
+    "empty": False,
+    "rate": 0.25,
+    "negative": [-1, -32, -33, -200, -70000, -2 ** 40],
+    "positive": [0, 127, 128, 255, 256, 65536, 2 ** 40],
+    "text": "x" * 300,
+    "map": {str(i): i for i in range(20)},
+}
+
+
+@pytest.fixture
+def pure_python(mocker):
+    """msgpackとcbor2がインストールされていない状態にします。"""
+    mocker.patch.object(output_format, "msgpack", None)
+    mocker.patch.object(output_format, "cbor2", None)
+
+
+class TestOutputFormat():
+    @pytest.mark.parametrize("formatter", [JsonFormat, JsonLinesFormat, MessagePackFormat, CborFormat])
+    def test_dumps_success_1(self, pure_python, formatter):
+        """(正常系テスト)変換したバイト列を元の値に戻せる"""
+
+        # テスト実行
+        content = formatter.dumps(DOCUMENT)
+
+        # 結果の確認
+        assert formatter.loads(content) == DOCUMENT
+
+    def test_dumps_success_2(self, pure_python):
+        """(正常系テスト)MessagePackとCBORの仕様どおりのバイト列に変換する"""
+
+        # テスト実行・結果の確認
+        assert MessagePackFormat.dumps({"a": [1, -1, None, True]}) == b"\x81\xa1a\x94\x01\xff\xc0\xc3"
+        assert MessagePackFormat.dumps(300) == b"\xcd\x01\x2c"
+        assert MessagePackFormat.dumps(1.5) == b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"
+        assert CborFormat.dumps({"a": [1, -1, None, True]}) == b"\xa1\x61a\x84\x01\x20\xf6\xf5"
+        assert CborFormat.dumps(1000) == b"\x19\x03\xe8"
+        assert CborFormat.dumps(1.5) == b"\xfb\x3f\xf8\x00\x00\x00\x00\x00\x00"
+
+    def test_dumps_success_3(self):
+        """(正常系テスト)jsonは従来の出力と同じ、jsonlは改行で終わる1行のJSONに変換する"""
+
+        # テスト実行
+        stream = io.BytesIO()
+        JsonFormat.dump(DOCUMENT, stream)
+        line = JsonLinesFormat.dumps(DOCUMENT)
+
+        # 結果の確認
+        assert stream.getvalue() == json.dumps(DOCUMENT, indent=4, ensure_ascii=False).encode('utf-8')
+        assert not stream.closed
+        assert line.endswith(b"\n") and line.count(b"\n") == 1
+
+    def test_loads_success_1(self, pure_python):
+        """(正常系テスト)CBORの半精度と単精度の浮動小数点数を読み込む"""
+
+        # テスト実行・結果の確認
+        assert CborFormat.loads(b"\xf9\x3e\x00") == 1.5
+        assert CborFormat.loads(b"\xfa\x3f\xc0\x00\x00") == 1.5
+
+    @pytest.mark.parametrize("formatter, content, message", [
+        (MessagePackFormat, b"\x92\x01", "MessagePackのフォーマットに誤りがあります。"),
+        (MessagePackFormat, b"\x01\x02", "MessagePackのフォーマットに誤りがあります。"),
+        (MessagePackFormat, b"\xc1", "MessagePackのフォーマットに誤りがあります。"),
+        (CborFormat, b"\x9f\x01\xff", "CBORのフォーマットに誤りがあります。"),
+        (CborFormat, b"\x62a", "CBORのフォーマットに誤りがあります。"),
+        (JsonFormat, b"{", "JSONのフォーマットに誤りがあります。"),
+    ])
+    def test_loads_failure_1(self, pure_python, formatter, content, message):
+        """(異常系テスト)形式に誤りがあるバイト列"""
+
+        # テスト実行
+        with pytest.raises(DataFormatError) as e:
+            formatter.loads(content)
+
+        # 結果の確認
+        assert str(e.value) == message
+
+    def test_dumps_failure_1(self, pure_python):
+        """(異常系テスト)変換できない値"""
+
+        with pytest.raises(DataFormatError) as e:
+            MessagePackFormat.dumps({"value": object()})
+
+        assert str(e.value) == "MessagePackに変換できない値です。(object)"
+
+    def test_get_format_success_1(self):
+        """(正常系テスト)名称に対応する出力形式を取得する"""
+
+        assert get_format("msgpack") is MessagePackFormat
+        assert get_format("jsonl").extension == ".jsonl"
+
+    def test_get_format_failure_1(self):
+        """(異常系テスト)対応していない出力形式"""
+
+        with pytest.raises(DataFormatError) as e:
+            get_format("xml")
+
+        assert str(e.value) == "対応していない出力形式が指定されました。(xml)"
+
+    def test_output_format_success_1(self):
+        """(正常系テスト)すべての出力形式が変換の処理を実装している"""
+
+        assert inspect.isabstract(OutputFormat)
+        assert not any(inspect.isabstract(get_format(name)) for name in FORMAT_NAMES)
+
+    def test_output_format_failure_1(self):
+        """(異常系テスト)変換の処理を実装していない出力形式は抽象クラスになる"""
+
+        class IncompleteFormat(OutputFormat):
+            name = "incomplete"
+
+            @classmethod
+            def dumps(cls, value):
+                return b""
+
+        # テスト実行・結果の確認
+        assert inspect.isabstract(IncompleteFormat)
+        with pytest.raises(TypeError):
+            IncompleteFormat()
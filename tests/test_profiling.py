@@ -0,0 +1,71 @@
+"""profiling.pyをテストするためのモジュールです。"""
+import pstats
+
+import pytest
+
+from dg_mm.profiling import collapse_stacks, profile
+
+
+def _leaf(n):
+    return sum(i * i for i in range(n))
+
+
+def _branch():
+    return _leaf(20000) + _leaf(20000)
+
+
+class TestProfile():
+    def test_profile_success_1(self, tmp_path):
+        """pstats形式とcollapsed stack形式の結果が出力される"""
+
+        path = tmp_path / "result.prof"
+        with profile(str(path)):
+            result = _branch()
+
+        assert result == 2 * _leaf(20000)
+        stats = pstats.Stats(str(path))
+        assert any(func[2] == "_branch" for func in stats.stats)
+        lines = (tmp_path / "result.prof.folded").read_text(encoding='utf-8').splitlines()
+        assert lines
+        for line in lines:
+            stack, weight = line.rsplit(" ", 1)
+            assert int(weight) >= 1
+        assert any("_branch (test_profiling.py:" in line and "_leaf (test_profiling.py:" in line for line in lines)
+
+    def test_profile_success_2(self, tmp_path):
+        """例外が発生した場合も結果が出力される"""
+
+        path = tmp_path / "result.prof"
+        with pytest.raises(ValueError):
+            with profile(str(path)):
+                _branch()
+                raise ValueError()
+
+        assert path.exists()
+        assert (tmp_path / "result.prof.folded").exists()
+
+
+class TestCollapseStacks():
+    def test_collapse_stacks_success_1(self):
+        """呼び出し経路ごとの時間が呼び出し元の比率で按分される"""
+
+        stats = pstats.Stats.__new__(pstats.Stats)
+        root = ("a.py", 1, "root")
+        left = ("a.py", 2, "left")
+        right = ("a.py", 3, "right")
+        shared = ("a.py", 4, "shared")
+        stats.stats = {
+            root: (1, 1, 0.0, 1.0, {}),
+            left: (1, 1, 0.1, 0.4, {root: (1, 1, 0.1, 0.4)}),
+            right: (1, 1, 0.1, 0.6, {root: (1, 1, 0.1, 0.6)}),
+            shared: (2, 2, 0.8, 0.8, {left: (1, 1, 0.3, 0.3), right: (1, 1, 0.5, 0.5)}),
+        }
+
+        result = collapse_stacks(stats)
+
+        assert result == {
+            "root (a.py:1);left (a.py:2)": 100000,
+            "root (a.py:1);left (a.py:2);shared (a.py:4)": 300000,
+            "root (a.py:1);right (a.py:3)": 100000,
+            "root (a.py:1);right (a.py:3);shared (a.py:4)": 500000,
+        }
@@ -0,0 +1,247 @@
+"""server.pyをテストするためのモジュールです。"""
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+import requests
+
+from dg_mm.errors import InvalidTokenError
+from dg_mm.fake_grdm import FakeGrdmServer
+from dg_mm.models.grdm import GrdmAccess
+from dg_mm.models.mapping_definition import DefinitionManager
+from dg_mm.models.result_cache import MemoryResultCache
+from dg_mm.server import MetadataServer, MetadataService, create_server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """Unixドメインソケットに接続するHTTPクライアントです。"""
+
+    def __init__(self, path):
+        super().__init__("localhost")
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._path)
+
+
+@pytest.fixture
+def fake_grdm_server(tmp_path):
+    """疑似GRDMサーバーを起動し、GrdmAccessの接続先に設定します。"""
+    server = FakeGrdmServer(members=3, registrations=1, files=2, token="fake_token").start()
+    config_path = str(tmp_path / "fake_grdm.ini")
+    server.write_config(config_path)
+    GrdmAccess.configure(config_path=config_path)
+
+    yield server
+
+    GrdmAccess.configure()
+    DefinitionManager.enable_cache(False)
+    server.stop()
+
+
+class TestMetadataService():
+    def test_handle_metadata_success_1(self, mocker):
+        """リクエストボディとAuthorizationヘッダーの内容でget_metadataを実行する"""
+
+        # モック化
+        mock_get_metadata = mocker.patch(
+            'dg_mm.models.metadata_manager.MetadataManager.get_metadata', return_value={"name": "test"})
+
+        # テスト実行
+        body = json.dumps({"schema": "RF", "storage": "GRDM", "id": "p1"}).encode('utf-8')
+        status, content = MetadataService().handle_metadata(body, "Bearer token")
+
+        # 結果の確認
+        assert status == 200
+        assert content == {"name": "test"}
+        mock_get_metadata.assert_called_once_with(schema="RF", storage="GRDM", id="p1", token="token")
+
+    def test_handle_metadata_success_2(self, mocker):
+        """schemaにリストを指定した場合は複数のスキーマを取得する"""
+
+        # モック化
+        mock_get_metadata_for_schemas = mocker.patch(
+            'dg_mm.models.metadata_manager.MetadataManager.get_metadata_for_schemas', return_value={"RF": {}})
+
+        # テスト実行
+        body = json.dumps({"schema": ["RF", "RF"], "storage": "GRDM", "token": "t", "id": "p1"}).encode('utf-8')
+        status, content = MetadataService().handle_metadata(body)
+
+        # 結果の確認
+        assert status == 200
+        mock_get_metadata_for_schemas.assert_called_once_with(schemas=["RF"], storage="GRDM", token="t", id="p1")
+
+    @pytest.mark.parametrize("body, message", [
+        (b"{", "リクエストボディをJSONとして読み込めません。"),
+        (b"[]", "リクエストボディはJSONのオブジェクトで指定してください。"),
+        (b'{"storage": "GRDM"}', "schemaを指定してください。"),
+        (b'{"schema": "RF"}', "storageを指定してください。"),
+        (b'{"schema": "RF", "storage": "GRDM", "unknown": 1}', "不明なパラメータが指定されました。: ['unknown']"),
+        (b'{"schema": "RF", "storage": "GRDM", "deadline": "1"}', "deadlineは数値で指定してください。"),
+    ])
+    def test_handle_metadata_failure_1(self, body, message):
+        """リクエストボディの形式に誤りがある"""
+
+        status, content = MetadataService().handle_metadata(body)
+
+        assert status == 400
+        assert content == {"error": "BadRequest", "message": message}
+
+    def test_handle_metadata_failure_2(self, mocker):
+        """発生した例外に対応するステータスコードとメッセージを返す"""
+
+        # モック化
+        mocker.patch('dg_mm.models.metadata_manager.MetadataManager.get_metadata',
+                     side_effect=InvalidTokenError("トークンが無効です。"))
+
+        # テスト実行
+        status, content = MetadataService().handle_metadata(b'{"schema": "RF", "storage": "GRDM"}')
+
+        # 結果の確認
+        assert status == 401
+        assert content == {"error": "InvalidTokenError", "message": "トークンが無効です。"}
+
+    def test_handle_metadata_failure_3(self, mocker):
+        """同時に処理する数の上限に達している場合は、待ち時間の上限を過ぎると503を返す"""
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get_metadata(**kwargs):
+            started.set()
+            release.wait(5)
+            return {}
+
+        # モック化
+        mocker.patch('dg_mm.models.metadata_manager.MetadataManager.get_metadata', side_effect=slow_get_metadata)
+        service = MetadataService(max_workers=1, queue_timeout=0.05)
+        body = b'{"schema": "RF", "storage": "GRDM"}'
+        thread = threading.Thread(target=service.handle_metadata, args=(body,))
+        thread.start()
+        started.wait(5)
+
+        # テスト実行
+        status, content = service.handle_metadata(body)
+        release.set()
+        thread.join()
+
+        # 結果の確認
+        assert status == 503
+        assert content["error"] == "ServiceUnavailable"
+        assert service.in_flight == 0
+
+    def test_health_success_1(self):
+        """マッピングの結果のキャッシュを使用する場合は統計を返す"""
+
+        result_cache = MemoryResultCache()
+        result_cache.put("key1", {"name": "プロジェクト"})
+        result_cache.get("key1")
+        service = MetadataService(result_cache=result_cache)
+
+        # テスト実行
+        status, content = service.health()
+
+        # 結果の確認
+        assert status == 200
+        assert content["result_cache"]["hits"] == 1
+        assert content["result_cache"]["hit_ratio"] == 1.0
+        assert content["result_cache"]["entries"] == 1
+
+    def test_begin_drain_success_1(self):
+        """停止処理中は新しいリクエストを受け付けない"""
+
+        service = MetadataService()
+
+        # テスト実行
+        service.begin_drain()
+        status, content = service.handle_metadata(b'{"schema": "RF", "storage": "GRDM"}')
+        health_status, health = service.health()
+
+        # 結果の確認
+        assert status == 503
+        assert content == {"error": "ServiceUnavailable", "message": "サーバーは停止処理中です。"}
+        assert health_status == 503
+        assert health == {"status": "draining", "in_flight": 0, "max_workers": 4}
+
+
+class TestMetadataServer():
+    def test_serve_success_1(self, fake_grdm_server):
+        """TCPポートで受け付けたリクエストからメタデータを取得する"""
+
+        with create_server(port=0, max_workers=2) as server:
+            host, port = server.address
+            base_url = f"http://{host}:{port}"
+
+            # テスト実行
+            response = requests.post(f"{base_url}/metadata", headers={"Authorization": "Bearer fake_token"},
+                                     json={"schema": "RF", "storage": "GRDM", "id": "p0001"}, timeout=10)
+            error_response = requests.post(f"{base_url}/metadata", headers={"Authorization": "Bearer invalid"},
+                                           json={"schema": "RF", "storage": "GRDM", "id": "p0001"}, timeout=10)
+            health = requests.get(f"{base_url}/health", timeout=10)
+            metrics = requests.get(f"{base_url}/metrics", timeout=10)
+            not_found = requests.get(f"{base_url}/unknown", timeout=10)
+
+        # 結果の確認
+        assert response.status_code == 200
+        assert response.json()["name"] == "Synthetic project p0001"
+        assert len(response.json()["researcher"]) == 3
+        assert error_response.status_code == 401
+        assert error_response.json()["error"] == "InvalidTokenError"
+        assert health.json() == {"status": "ok", "in_flight": 0, "max_workers": 2}
+        assert 'dg_mm_server_requests_total{endpoint="/metadata",status="200"}' in metrics.text
+        assert not_found.status_code == 404
+
+    def test_serve_success_2(self, fake_grdm_server, tmp_path):
+        """Unixドメインソケットで受け付けたリクエストからメタデータを取得し、停止時にソケットを削除する"""
+
+        socket_path = str(tmp_path / "dg_mm.sock")
+        with create_server(unix_socket=socket_path) as server:
+            connection = _UnixHTTPConnection(socket_path)
+            body = json.dumps({"schema": "RF", "storage": "GRDM", "token": "fake_token", "id": "p0001"})
+
+            # テスト実行
+            connection.request("POST", "/metadata", body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            content = json.loads(response.read().decode('utf-8'))
+            connection.close()
+
+        # 結果の確認
+        assert server.address == socket_path
+        assert response.status == 200
+        assert content["name"] == "Synthetic project p0001"
+        assert not (tmp_path / "dg_mm.sock").exists()
+
+    def test_stop_success_1(self, mocker):
+        """停止時は処理中のリクエストが終わるのを待つ"""
+
+        started = threading.Event()
+
+        def slow_get_metadata(**kwargs):
+            started.set()
+            # 停止処理が始まってから処理を終える
+            while not service.draining:
+                threading.Event().wait(0.01)
+            return {"name": "done"}
+
+        # モック化
+        mocker.patch('dg_mm.models.metadata_manager.MetadataManager.get_metadata', side_effect=slow_get_metadata)
+        service = MetadataService()
+        server = MetadataServer(service, port=0).start()
+        host, port = server.address
+        results = []
+        thread = threading.Thread(target=lambda: results.append(requests.post(
+            f"http://{host}:{port}/metadata", json={"schema": "RF", "storage": "GRDM"}, timeout=10)))
+        thread.start()
+        started.wait(5)
+
+        # テスト実行
+        server.stop()
+        thread.join()
+
+        # 結果の確認
+        assert results[0].status_code == 200
+        assert results[0].json() == {"name": "done"}
+        assert service.in_flight == 0
@@ -14,3 +14,14 @@ class TestPackageFileReader():
     def test_read_ini(self, create_dummy_ini):
         ini_obj = PackageFileReader.read_ini(create_dummy_ini)
         assert ini_obj['section1']['key1'] == 'value1'
+
+    def test_read_json_encoding(self, mocker, tmp_path):
+        bom_path = tmp_path / "bom.json"
+        bom_path.write_bytes('\ufeff{"key1": "値1"}'.encode('utf-8'))
+        sjis_path = tmp_path / "sjis.json"
+        sjis_path.write_bytes('{"key1": "値1"}'.encode('shift_jis'))
+
+        mocker.patch.object(PackageFileReader, "_get_absolute_path", side_effect=lambda path: tmp_path / path)
+        assert PackageFileReader.read_json("bom.json")['key1'] == '値1'
+        assert PackageFileReader.read_json("bom.json", encoding='utf-8')['key1'] == '値1'
+        assert PackageFileReader.read_json("sjis.json", encoding='shift_jis')['key1'] == '値1'